@@ -3,7 +3,7 @@ from events.models import Field, Operator, Telescope, Instrument, Filter, Event
 from events.models import EventName, SingleModel, BinaryModel
 from events.models import EventReduction, ObsRequest, DataFile
 from events.models import SubObsRequest
-from events.models import Tap, TapLima, Image, EventStatus
+from events.models import Tap, TapLima, Image, EventStatus, ImageStats, ObsCompletionStats
  
 # Register your models here.
 admin.site.register(Field)
@@ -23,4 +23,6 @@ admin.site.register(DataFile)
 admin.site.register(Tap)
 admin.site.register(TapLima)
 admin.site.register(Image)
+admin.site.register(ImageStats)
+admin.site.register(ObsCompletionStats)
 
@@ -39,6 +39,20 @@ class EventPositionForm(forms.Form):
    dec_min = forms.FloatField(label='dec_min',min_value=-90.0,max_value=90.0)
    dec_max = forms.FloatField(label='dec_max',min_value=-90.0,max_value=90.0)
 
+class EventConeSearchForm(forms.Form):
+   class Meta:
+      fields = ('ra', 'dec', 'radius',)
+   ra = forms.CharField(label='ra',max_length=50)
+   dec = forms.CharField(label='dec',max_length=50)
+   radius = forms.FloatField(label='radius',min_value=0.0,max_value=3600.0,initial=60.0)
+
+class EventCrossmatchForm(forms.Form):
+   class Meta:
+      fields = ('positions', 'position_file', 'radius',)
+   positions = forms.CharField(label='positions',widget=forms.Textarea,required=False)
+   position_file = forms.FileField(label='position_file',required=False)
+   radius = forms.FloatField(label='radius',min_value=0.0,max_value=3600.0,initial=2.5)
+
 class EventSearchForm(forms.Form):
     class Meta:
         fields = ('field', 'operator', 'status', 'anomaly_rank', 
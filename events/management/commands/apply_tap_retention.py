@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:41:09 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.db import connection
+from datetime import datetime
+from os import path
+from scripts import tap_retention
+
+class Command(BaseCommand):
+    help = 'Thin old Tap and TapLima entries to one per event per day, archiving the entries removed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--table', type=str, default='all',
+                            choices=['all']+list(tap_retention.RETENTION_MODELS.keys()),
+                            help='Table to thin (default: all)')
+        parser.add_argument('--keep-days', type=int, default=30,
+                            help='Number of recent days to keep at full resolution (default: 30)')
+        parser.add_argument('--archive-dir', type=str,
+                            default=path.join(settings.BASE_DIR,'archive','tap'),
+                            help='Directory for the archive files')
+        parser.add_argument('--start-date', type=str, default=None,
+                            help='First day to thin, YYYY-MM-DD (default: resume from the last run)')
+        parser.add_argument('--max-days', type=int, default=None,
+                            help='Maximum number of days to thin in this run')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report the number of entries that would be removed only')
+        parser.add_argument('--vacuum', action='store_true',
+                            help='Return the space freed to the filesystem (SQLite only)')
+
+    def _apply_tap_retention(self,*args, **options):
+
+        if options['table'] == 'all':
+            tables = list(tap_retention.RETENTION_MODELS.keys())
+        else:
+            tables = [ options['table'] ]
+
+        start_date = None
+        if options['start_date'] != None:
+            start_date = datetime.strptime(options['start_date'],'%Y-%m-%d').date()
+
+        for table in tables:
+            report = tap_retention.apply_tap_retention(
+                                    tap_retention.RETENTION_MODELS[table],
+                                    options['archive_dir'],
+                                    keep_days=options['keep_days'],
+                                    start_date=start_date,
+                                    max_days=options['max_days'],
+                                    dry_run=options['dry_run'])
+
+            print(report['table']+': '+str(report['days'])+' days processed, '+\
+                  str(report['removed'])+' entries removed, '+\
+                  str(report['archive_bytes'])+' bytes archived, '+\
+                  str(report['db_bytes_freed'])+' bytes freed in DB')
+
+        if options['vacuum'] and not options['dry_run'] and connection.vendor == 'sqlite':
+            size0 = path.getsize(connection.settings_dict['NAME'])
+            with connection.cursor() as cursor:
+                cursor.execute('VACUUM')
+            size1 = path.getsize(connection.settings_dict['NAME'])
+            print('VACUUM reclaimed '+str(size0-size1)+' bytes from the DB file')
+
+    def handle(self,*args, **options):
+        self._apply_tap_retention(*args,**options)
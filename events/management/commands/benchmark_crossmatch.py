@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 04:05:33 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from scripts import benchmark_utilities, query_db
+from events.models import Event
+import numpy as np
+
+class Command(BaseCommand):
+    help = 'Time the crossmatch of a list of positions with the events, against a cone search per position'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=30000,
+                            help='Number of synthetic events (default: 30000)')
+        parser.add_argument('--positions', type=int, default=1000,
+                            help='Number of positions crossmatched (default: 1000)')
+        parser.add_argument('--radius', type=float, default=2.5,
+                            help='Search radius in arcsec (default: 2.5)')
+
+    def _positions(self, n_positions):
+        """Half of the positions lie close to known events and half are
+        scattered across the Bulge"""
+
+        rng = np.random.RandomState(3)
+        coords = np.array(list(Event.objects.order_by('pk').values_list('ra','dec')[0:n_positions//2]),
+                          dtype=float)
+        n_random = n_positions - len(coords)
+        ra = np.concatenate([ coords[:,0] + rng.normal(0.0,0.0003,len(coords)),
+                              rng.uniform(260.0,275.0,n_random) ])
+        dec = np.concatenate([ coords[:,1] + rng.normal(0.0,0.0003,len(coords)),
+                               rng.uniform(-35.0,-20.0,n_random) ])
+
+        return ra, dec
+
+    def _cone_search_each(self, ra, dec, radius):
+
+        return [ query_db.cone_search(ra[i], dec[i], radius) for i in range(len(ra)) ]
+
+    def _benchmark_crossmatch(self,*args, **options):
+
+        with benchmark_utilities.synthetic_database():
+            benchmark_utilities.populate_events(options['events'], n_entries=0)
+            (ra, dec) = self._positions(options['positions'])
+
+            (loop_time, loop_queries) = benchmark_utilities.time_function(self._cone_search_each,
+                                                                          ra, dec, options['radius'])
+            (batch_time, batch_queries) = benchmark_utilities.time_function(query_db.crossmatch_positions,
+                                                                            ra, dec, options['radius'])
+            matches = query_db.crossmatch_positions(ra, dec, options['radius'])
+
+        print('Crossmatch of '+str(len(ra))+' positions with '+str(options['events'])+\
+              ' events within '+str(options['radius'])+' arcsec, '+\
+              str(len([ m for m in matches if len(m) > 0 ]))+' matched:')
+        print(benchmark_utilities.format_result('  Cone search per position', loop_time, loop_queries))
+        print(benchmark_utilities.format_result('  Batch crossmatch', batch_time, batch_queries,
+                                                baseline=loop_time))
+
+    def handle(self,*args, **options):
+        self._benchmark_crossmatch(*args,**options)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:52:17 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from scripts import benchmark_utilities, dashboard_snapshot, fake_lco_api
+from os import path
+import tempfile
+import time
+import numpy as np
+
+class Command(BaseCommand):
+    help = 'Compare the latency of fetching the dashboard LCO data live with reading the snapshot, against a local fake LCO API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delay', type=float, default=0.5,
+                            help='Response time of the fake LCO API in seconds (default: 0.5)')
+        parser.add_argument('--repeats', type=int, default=10,
+                            help='Number of simulated page loads (default: 10)')
+
+    def _live(self, api_url):
+        """Fetch the dashboard data as the dashboard did before the snapshot"""
+
+        dashboard_snapshot.fetch_proposal_allocation('token', api_url)
+        dashboard_snapshot.fetch_telescope_states('token', api_url)
+        dashboard_snapshot.fetch_moon_separation()
+
+    def _percentiles(self, label, times, baseline=None):
+
+        times = np.array(times)*1000.0
+        line = label.ljust(30)+' p50 '+('%.1f' % np.percentile(times,50)).rjust(8)+'ms'+\
+                '  max '+('%.1f' % times.max()).rjust(8)+'ms'
+        if baseline != None:
+            line += '  x'+('%.0f' % (baseline/np.percentile(times,50)))
+        print(line)
+
+        return np.percentile(times,50)
+
+    def _benchmark_dashboard_snapshot(self,*args, **options):
+
+        snapshot_path = path.join(tempfile.mkdtemp(), 'dashboard_snapshot.json')
+
+        with fake_lco_api.FakeLCOAPI(delay=options['delay']) as api:
+            dashboard_snapshot.refresh_dashboard_snapshot('token', snapshot_path=snapshot_path,
+                                                          api_url=api.url)
+
+            live = []
+            cached = []
+            for i in range(options['repeats']):
+                (t, n) = benchmark_utilities.time_function(self._live, api.url)
+                live.append(t)
+                (t, n) = benchmark_utilities.time_function(
+                                dashboard_snapshot.read_dashboard_snapshot,
+                                snapshot_path=snapshot_path)
+                cached.append(t)
+
+        print('Dashboard LCO data, with an API response time of '+\
+              str(options['delay'])+'s, over '+str(options['repeats'])+' page loads:')
+        baseline = self._percentiles('  live API requests', live)
+        self._percentiles('  snapshot read', cached, baseline=baseline)
+
+    def handle(self,*args, **options):
+        self._benchmark_dashboard_snapshot(*args,**options)
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:20:48 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.utils import timezone
+from scripts import benchmark_utilities, query_db, update_db_2
+from events.models import Event, EventName
+from os import path
+import tempfile
+import threading
+import time
+import numpy as np
+
+# SQLite settings compared by the benchmark.  'rollback' is SQLite's
+# default rollback journal, as used before the WAL profile was introduced
+PROFILES = {
+    'rollback': {'journal_mode': 'DELETE', 'synchronous': 'FULL', 'busy_timeout': 5000},
+    'wal': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'busy_timeout': 30000,
+            'mmap_size': 268435456, 'cache_size': -65536},
+    }
+
+class Command(BaseCommand):
+    help = 'Run concurrent update_db_2 writers against page readers on a synthetic SQLite database and report the latency percentiles for each SQLite profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4,
+                            help='Number of concurrent writer threads (default: 4)')
+        parser.add_argument('--readers', type=int, default=8,
+                            help='Number of concurrent reader threads (default: 8)')
+        parser.add_argument('--duration', type=float, default=10.0,
+                            help='Duration of each run in seconds (default: 10)')
+        parser.add_argument('--events', type=int, default=1000,
+                            help='Number of synthetic events (default: 1000)')
+        parser.add_argument('--profile', action='append', default=None,
+                            choices=list(PROFILES.keys()),
+                            help='SQLite profile to benchmark; may be repeated (default: all)')
+        parser.add_argument('--seed', type=int, default=1,
+                            help='Seed for the synthetic data and the writers (default: 1)')
+
+    def _writer(self, event_names, seed, stop, results):
+        """Add TAP entries and single-lens models for random events until
+        stopped, recording the duration and outcome of each call"""
+
+        rng = np.random.RandomState(seed)
+        try:
+            while not stop.is_set():
+                name = event_names[rng.randint(len(event_names))]
+                t0 = time.perf_counter()
+                if rng.rand() < 0.5:
+                    status = update_db_2.add_tap(name, timestamp=timezone.now(),
+                                                 priority='L', omega=round(rng.rand()*10.0,2))
+                else:
+                    (status, message) = update_db_2.add_single_lens(name,
+                                                 2458000.0+rng.rand(), 10.0, 0.1,
+                                                 timezone.now(), modeler='ARTEMiS')
+                results.append( (time.perf_counter()-t0, status) )
+        finally:
+            connections.close_all()
+
+    def _reader(self, stop, results):
+        """Read the data behind the TAP and event list pages until stopped"""
+
+        try:
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                try:
+                    query_db.get_tap_list()
+                    event_ids = list(Event.objects.filter(status='MO').values_list('pk', flat=True))
+                    query_db.get_names_for_events(event_ids)
+                    query_db.get_latest_models_for_events(event_ids)
+                    status = True
+                except Exception:
+                    status = False
+                results.append( (time.perf_counter()-t0, status) )
+        finally:
+            connections.close_all()
+
+    def _report(self, label, results, duration):
+
+        if len(results) == 0:
+            print('  '+label+': no operations completed')
+            return
+
+        times = np.array([ r[0] for r in results ])*1000.0
+        nfailed = len([ r for r in results if r[1] == False ])
+        print('  '+label.ljust(8)+' '+str(len(results)).rjust(7)+' ops '+\
+              ('%.1f' % (len(results)/duration)).rjust(8)+' ops/s  failed '+str(nfailed).rjust(5)+\
+              '  p50 '+('%.1f' % np.percentile(times,50)).rjust(7)+'ms'+\
+              '  p90 '+('%.1f' % np.percentile(times,90)).rjust(7)+'ms'+\
+              '  p99 '+('%.1f' % np.percentile(times,99)).rjust(7)+'ms'+\
+              '  max '+('%.1f' % times.max()).rjust(7)+'ms')
+
+    def _run_profile(self, profile_name, **options):
+
+        db_path = path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+        connection.settings_dict['OPTIONS'] = dict(connection.settings_dict['OPTIONS'],
+                                                   pragmas=PROFILES[profile_name],
+                                                   timeout=PROFILES[profile_name]['busy_timeout']/1000.0)
+
+        with benchmark_utilities.synthetic_database(test_name=db_path):
+            connection.close()
+            event_ids = benchmark_utilities.populate_events(options['events'],
+                                                            seed=options['seed'])
+            Event.objects.filter(pk__in=event_ids[::10]).update(status='MO')
+            update_db_2.refresh_latest_entries()
+            event_names = list(EventName.objects.values_list('name', flat=True))
+            query_db.event_name_resolver.load()
+
+            stop = threading.Event()
+            writer_results = []
+            reader_results = []
+            threads = []
+            for i in range(options['writers']):
+                threads.append(threading.Thread(target=self._writer,
+                                args=(event_names, options['seed']+i, stop, writer_results)))
+            for i in range(options['readers']):
+                threads.append(threading.Thread(target=self._reader,
+                                args=(stop, reader_results)))
+
+            for t in threads:
+                t.start()
+            time.sleep(options['duration'])
+            stop.set()
+            for t in threads:
+                t.join()
+
+            print('\nProfile '+profile_name+' '+str(PROFILES[profile_name])+':')
+            self._report('writers', writer_results, options['duration'])
+            self._report('readers', reader_results, options['duration'])
+
+    def _benchmark_db_concurrency(self,*args, **options):
+
+        if connection.vendor != 'sqlite':
+            print('This benchmark applies to SQLite databases only')
+            return
+
+        profiles = options['profile']
+        if profiles == None:
+            profiles = list(PROFILES.keys())
+
+        print('Running '+str(options['writers'])+' writers against '+\
+              str(options['readers'])+' readers for '+str(options['duration'])+\
+              's on '+str(options['events'])+' synthetic events')
+
+        old_options = connection.settings_dict['OPTIONS']
+        try:
+            for profile in profiles:
+                self._run_profile(profile, **options)
+        finally:
+            connection.settings_dict['OPTIONS'] = old_options
+
+    def handle(self,*args, **options):
+        self._benchmark_db_concurrency(*args,**options)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:05:31 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from scripts import benchmark_utilities, field_check, query_db, rome_fields_dict
+from events.models import Field
+from decimal import Decimal
+import numpy as np
+
+class Command(BaseCommand):
+    help = 'Compare per-position and vectorised classification of positions into the ROME fields, with and without the Field table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--coords', type=int, default=100000,
+                            help='Number of random positions to classify (default: 100000)')
+        parser.add_argument('--seed', type=int, default=1,
+                            help='Seed for the random positions (default: 1)')
+
+    def _romecheck_loop(self, ras, decs):
+        """Classify each position in turn against the ROME fields in pure
+        Python, as field_check.romecheck did before it was vectorised"""
+
+        lhalf = field_check.LHALF
+        results = []
+        for (ra, dec) in zip(ras, decs):
+            result = -1
+            for idx, f in enumerate(field_check.ROME_FIELDS):
+                if ra < f[0] + lhalf and ra > f[0] - lhalf and\
+                   dec < f[1] + lhalf and dec > f[1] - lhalf:
+                    result = idx
+                    break
+            results.append(result)
+
+        return results
+
+    def _field_table_loop(self, ras, decs):
+        """Classify each position in turn against the Field table, querying
+        the table for each, as get_field_containing_coordinates did before
+        the footprints were cached"""
+
+        lhalf = field_check.LHALF
+        results = []
+        for (ra, dec) in zip(ras, decs):
+            result = 'Outside ROME footprint'
+            for f in Field.objects.all():
+                if f.field_ra_decimal != None and f.field_dec_decimal != None:
+                    if abs(ra - float(f.field_ra_decimal)) < lhalf and \
+                       abs(dec - float(f.field_dec_decimal)) < lhalf:
+                        result = f.name
+                        break
+            results.append(result)
+
+        return results
+
+    def _benchmark_field_classifier(self,*args, **options):
+
+        rng = np.random.RandomState(options['seed'])
+        n = options['coords']
+        # Positions across the Bulge, where about a third fall in a field
+        ras = rng.uniform(267.0, 271.5, n)
+        decs = rng.uniform(-30.5, -27.5, n)
+
+        print('\nClassifying '+str(n)+' positions against the ROME fields:')
+        (t_loop, n_loop) = benchmark_utilities.time_function(self._romecheck_loop,
+                                                             ras, decs)
+        (t_scalar, n_scalar) = benchmark_utilities.time_function(
+                lambda: [ field_check.romecheck(ra,dec)[0] for (ra,dec) in zip(ras,decs) ])
+        (t_array, n_array) = benchmark_utilities.time_function(field_check.romecheck_array,
+                                                               ras, decs)
+
+        (idx, rates) = field_check.romecheck_array(ras, decs)
+        assert list(idx) == self._romecheck_loop(ras, decs)
+
+        print(benchmark_utilities.format_result('  pure Python loop', t_loop, n_loop))
+        print(benchmark_utilities.format_result('  romecheck per position', t_scalar, n_scalar,
+                                                baseline=t_loop))
+        print(benchmark_utilities.format_result('  romecheck_array', t_array, n_array,
+                                                baseline=t_loop))
+        print('  '+str((idx >= 0).sum())+' positions lie within a field')
+
+        with benchmark_utilities.synthetic_database():
+            for name, entry in sorted(rome_fields_dict.field_dict.items()):
+                Field.objects.create(name=name, field_ra=entry[2], field_dec=entry[3],
+                                     field_ra_decimal=Decimal(str(entry[0])),
+                                     field_dec_decimal=Decimal(str(entry[1])))
+            query_db.clear_field_footprints(Field)
+
+            # Querying the Field table per position is slow, so it is timed
+            # on a sample and scaled
+            nsample = min(n, 1000)
+            (t_table, n_table) = benchmark_utilities.time_function(self._field_table_loop,
+                                                                   ras[:nsample], decs[:nsample])
+            (t_batch, n_batch) = benchmark_utilities.time_function(
+                                        query_db.get_fields_containing_coordinates, ras, decs)
+
+            names = query_db.get_fields_containing_coordinates(ras, decs)
+            assert names[:nsample] == self._field_table_loop(ras[:nsample], decs[:nsample])
+
+            scale = float(n)/float(nsample)
+            print('\nClassifying '+str(n)+' positions against the Field table:')
+            print(benchmark_utilities.format_result('  per-position queries (scaled)',
+                                                    t_table*scale, int(n_table*scale)))
+            print(benchmark_utilities.format_result('  cached vectorised footprints',
+                                                    t_batch, n_batch, baseline=t_table*scale))
+
+            query_db.clear_field_footprints(Field)
+
+    def handle(self,*args, **options):
+        self._benchmark_field_classifier(*args,**options)
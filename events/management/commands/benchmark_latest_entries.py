@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:22:40 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from scripts import benchmark_utilities, query_db
+from events.models import Event
+
+class Command(BaseCommand):
+    help = 'Compare the per-event and set-based queries for the latest model, datafile and TAP entry of events, on a synthetic test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=10000,
+                            help='Number of synthetic events (default: 10000)')
+        parser.add_argument('--entries', type=int, default=3,
+                            help='Number of models, datafiles and TAP entries per event (default: 3)')
+
+    def _benchmark_latest_entries(self,*args, **options):
+
+        with benchmark_utilities.synthetic_database():
+            print('Creating '+str(options['events'])+' synthetic events...')
+            event_ids = benchmark_utilities.populate_events(options['events'],
+                                                            n_entries=options['entries'])
+            # Load the events up front, with their latest_* pointers unset
+            # so that the per-event functions query the entry tables
+            events = list(Event.objects.all())
+
+            per_event = [ ('models', query_db.get_last_single_model,
+                                     query_db.get_latest_models_for_events),
+                          ('datafiles', query_db.get_last_datafile,
+                                        query_db.get_latest_datafiles_for_events),
+                          ('TAP entries', query_db.get_latest_tap_entry,
+                                          query_db.get_latest_taps_for_events) ]
+
+            for (label, get_one, get_set) in per_event:
+                def loop():
+                    return { e.pk: get_one(e) for e in events }
+
+                (t_loop, n_loop) = benchmark_utilities.time_function(loop)
+                (t_set, n_set) = benchmark_utilities.time_function(get_set, event_ids)
+
+                assert { k: v.pk for k,v in loop().items() if v != None } == \
+                        { k: v.pk for k,v in get_set(event_ids).items() }
+
+                print('\nLatest '+label+' for '+str(len(events))+' events:')
+                print(benchmark_utilities.format_result('  per-event queries', t_loop, n_loop))
+                print(benchmark_utilities.format_result('  set-based query', t_set, n_set,
+                                                        baseline=t_loop))
+
+    def handle(self,*args, **options):
+        self._benchmark_latest_entries(*args,**options)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 07:21:40 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from scripts import fake_lco_api, obs_control, observation_classes, outbound
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import requests
+import threading
+import time
+import numpy as np
+
+SITES = ['lsc', 'cpt', 'coj']
+
+class Command(BaseCommand):
+    help = 'Measure the throughput of web server workers submitting REA-HI observation requests, against a local fake LCO API with a given latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--latency', type=float, default=0.5,
+                            help='Response time of the fake LCO API in seconds (default: 0.5)')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Number of simulated web server workers (default: 4)')
+        parser.add_argument('--pages', type=int, default=24,
+                            help='Number of page requests served (default: 24)')
+
+    def _obs_requests(self):
+
+        obs_requests = []
+        for site in SITES:
+            obs = observation_classes.ObsRequest()
+            obs.name = 'ROME-FIELD-01'
+            obs.ra = '17:51:20.6149'
+            obs.dec = '-30:03:38.9442'
+            obs.site = site
+            obs.observatory = 'doma'
+            obs.tel = '1m0'
+            obs.instrument = 'fl16'
+            obs.instrument_class = '1M0-SCICAM-SINISTRO'
+            obs.filters = [ 'SDSS-i' ]
+            obs.exposure_times = [ 300.0 ]
+            obs.exposure_counts = [ 1 ]
+            obs.cadence = 1.0
+            obs.jitter = 1.0
+            obs.ttl = 1.0
+            obs.request_type = 'A'
+            obs.proposal_id = 'KEY2017AB-004'
+            obs.token = 'token'
+            obs_requests.append(obs)
+
+        return obs_requests
+
+    def _serial_page(self, api_url):
+        """Submit the requests as the page did before the outbound layer:
+        one site after another, each call on a new connection"""
+
+        for obs in self._obs_requests():
+            ur = obs.build_cadence_request_aeon()
+            ur = requests.post(api_url+'/requestgroups/cadence/', json=ur).json()
+            requests.post(api_url+'/requestgroups/', json=ur).json()
+
+    def _fan_out_page(self, api_url):
+
+        outcomes = outbound.run_all([ partial(obs_control.submit_obs_request, obs,
+                                              {'simulate': 'false'})
+                                      for obs in self._obs_requests() ])
+        for (status, error) in outcomes:
+            if error != None:
+                raise error
+
+    def _serve(self, page, api_url, n_workers, n_pages):
+        """Serve n_pages page requests with n_workers workers, returning
+        the time taken and the latency of each page"""
+
+        latencies = []
+        lock = threading.Lock()
+
+        def serve_page(i):
+            t0 = time.perf_counter()
+            page(api_url)
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=n_workers) as workers:
+            list(workers.map(serve_page, range(n_pages)))
+
+        return time.perf_counter() - t0, latencies
+
+    def _report(self, label, elapsed, latencies, n_pages, baseline=None):
+
+        throughput = n_pages/elapsed
+        line = label.ljust(30)+('%.2f' % throughput).rjust(7)+' pages/s'+\
+               '  p50 '+('%.0f' % (np.percentile(latencies,50)*1000.0)).rjust(6)+'ms'
+        if baseline != None:
+            line += '  x'+('%.1f' % (throughput/baseline))
+        print(line)
+
+        return throughput
+
+    def _benchmark_outbound(self,*args, **options):
+
+        with fake_lco_api.FakeLCOAPI(delay=options['latency']) as api:
+            with override_settings(LCO_API_URL=api.url):
+                (serial_time, serial) = self._serve(self._serial_page, api.url,
+                                                    options['workers'], options['pages'])
+                (fan_out_time, fan_out) = self._serve(self._fan_out_page, api.url,
+                                                      options['workers'], options['pages'])
+
+        print('REA-HI submission of '+str(len(SITES))+' sites, '+str(options['pages'])+\
+              ' pages served by '+str(options['workers'])+' workers, LCO latency '+\
+              str(options['latency'])+'s:')
+        baseline = self._report('  One site after another', serial_time, serial,
+                                options['pages'])
+        self._report('  Sites at once, pooled', fan_out_time, fan_out,
+                     options['pages'], baseline=baseline)
+
+    def handle(self,*args, **options):
+        self._benchmark_outbound(*args,**options)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 00:31:26 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from django.template import Context, Engine
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework.authtoken.models import Token
+from scripts import benchmark_utilities, api_tools
+from events.models import Field, ObsRequest
+from datetime import datetime, timedelta
+from os import path
+import json
+import time
+
+class HTMLResponse():
+    """Response holding the text of an HTML page, as parsed by api_tools"""
+
+    def __init__(self, text):
+        self.text = text
+
+class Command(BaseCommand):
+    help = 'Compare the payload size and client parse time of the observation query through the HTML endpoint and the JSON API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Number of observation requests returned (default: 2000)')
+
+    def _populate(self, n_requests):
+
+        field = Field.objects.create(name='ROME-FIELD-01')
+        now = timezone.now()
+        ObsRequest.objects.bulk_create([ ObsRequest(field=field, grp_id='REQ'+str(i),
+                                                    track_id=str(100000+i),
+                                                    timestamp=now-timedelta(minutes=i),
+                                                    time_expire=now+timedelta(hours=24),
+                                                    request_status='AC',
+                                                    t_sample=15.0, exptime=300)
+                                         for i in range(n_requests) ])
+
+    def _html_page(self, obs_list):
+        """Render the content of the query_obs_by_date page, as returned by
+        the HTML endpoint less the page frame common to all pages"""
+
+        template_path = path.join(path.dirname(__file__), '..', '..', 'templates',
+                                  'events', 'query_obs_by_date.html')
+        source = open(template_path).read()
+        source = source.replace('{% extends "base_page.html" %}','')
+
+        return Engine().from_string(source).render(Context({'observations': obs_list,
+                                                   'message': 'DBREPLY: Got observations list'}))
+
+    def _html_query(self):
+        """Query as the query_obs_by_date endpoint does"""
+
+        obs_list = []
+        for q in ObsRequest.objects.filter(request_status='AC'):
+            obs_list.append({ 'pk': q.pk, 'grp_id':q.grp_id, 'track_id': q.track_id,
+                              'submit_date':q.timestamp.strftime("%Y-%m-%dT%H:%M:%S"),
+                              'expire_date':q.time_expire.strftime("%Y-%m-%dT%H:%M:%S"),
+                              'request_status': q.request_status })
+
+        return self._html_page(obs_list)
+
+    def _html_parse(self, text):
+
+        response = HTMLResponse(text)
+        message = api_tools.parse_db_message(response)
+        if 'Got observations list' in message:
+            return api_tools.extract_table_data(response.text)
+
+    def _json_parse(self, text):
+
+        payload = json.loads(text)
+        obs_list = []
+        for r in payload['results']:
+            obs_list.append({'pk': r['pk'], 'grp_id': r['grp_id'],
+                             'track_id': r['track_id'],
+                             'timestamp': datetime.fromisoformat(r['timestamp'][0:19]),
+                             'time_expire': datetime.fromisoformat(r['time_expire'][0:19]),
+                             'status': r['request_status']})
+        return obs_list
+
+    def _benchmark_query_api(self,*args, **options):
+
+        n_requests = min(options['requests'], 5000)
+
+        with benchmark_utilities.synthetic_database():
+            self._populate(n_requests)
+            user = User.objects.create(username='benchmark')
+            token = Token.objects.get_or_create(user=user)[0].key
+            client = APIClient(SERVER_NAME='127.0.0.1')
+
+            with benchmark_utilities.count_queries() as html_queries:
+                t0 = time.perf_counter()
+                html = self._html_query()
+                html_server = time.perf_counter() - t0
+
+            with benchmark_utilities.count_queries() as json_queries:
+                t0 = time.perf_counter()
+                response = client.get('/db/api/v1/obs_requests/',
+                                      {'request_status': 'AC', 'limit': n_requests,
+                                       'fields': 'pk,grp_id,track_id,timestamp,time_expire,request_status'},
+                                      HTTP_AUTHORIZATION='Token '+token)
+                json_server = time.perf_counter() - t0
+            text = response.content.decode('utf-8')
+
+            (html_parse, n) = benchmark_utilities.time_function(self._html_parse, html)
+            (json_parse, n) = benchmark_utilities.time_function(self._json_parse, text)
+
+            assert len(self._html_parse(html)) == len(self._json_parse(text)) == n_requests
+
+        print('Query returning '+str(n_requests)+' observation requests:')
+        print('  HTML payload '+str(len(html.encode('utf-8'))).rjust(10)+' bytes (excluding page frame)')
+        print('  JSON payload '+str(len(text.encode('utf-8'))).rjust(10)+' bytes')
+        print(benchmark_utilities.format_result('  HTML server (query and render)',
+                                                html_server, len(html_queries)))
+        print(benchmark_utilities.format_result('  JSON server (full request)',
+                                                json_server, len(json_queries),
+                                                baseline=html_server))
+        print(benchmark_utilities.format_result('  HTML client parse', html_parse, 0))
+        print(benchmark_utilities.format_result('  JSON client parse', json_parse, 0,
+                                                baseline=html_parse))
+
+    def handle(self,*args, **options):
+        self._benchmark_query_api(*args,**options)
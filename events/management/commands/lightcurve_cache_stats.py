@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:40:55 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from scripts import plotter
+
+class Command(BaseCommand):
+    help = 'Report the numbers of lightcurve plots served from the cache and rendered'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true',
+                            help='Reset the counters after reporting them')
+
+    def _lightcurve_cache_stats(self,*args, **options):
+
+        stats = plotter.get_lightcurve_cache_stats()
+        total = stats['hits'] + stats['misses']
+
+        print('Lightcurve plots served: '+str(total))
+        print('  from cache: '+str(stats['hits']))
+        print('  rendered:   '+str(stats['misses']))
+        if total > 0:
+            print('  hit rate:   '+('%.1f' % (100.0*stats['hits']/total))+'%')
+
+        if options['reset']:
+            plotter.reset_lightcurve_cache_stats()
+
+    def handle(self,*args, **options):
+        self._lightcurve_cache_stats(*args,**options)
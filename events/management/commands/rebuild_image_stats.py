@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:37:52 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from scripts import update_db_2
+
+class Command(BaseCommand):
+    help = 'Recompute the daily counts of images accepted and rejected from the Image table'
+
+    def _rebuild_image_stats(self,*args, **options):
+
+        nentries = update_db_2.rebuild_image_stats()
+
+        print('Created '+str(nentries)+' daily image statistics entries')
+
+    def handle(self,*args, **options):
+        self._rebuild_image_stats(*args,**options)
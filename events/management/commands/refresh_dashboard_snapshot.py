@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:44:02 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from scripts import config_parser, dashboard_snapshot
+import time
+
+class Command(BaseCommand):
+    help = 'Refresh the snapshot of the LCO proposal and telescope states displayed on the dashboard, once or periodically'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=None,
+                            help='Refresh every interval seconds until stopped (default: refresh once)')
+        parser.add_argument('--snapshot', type=str, default=settings.DASHBOARD_SNAPSHOT_PATH,
+                            help='Path to the snapshot file')
+        parser.add_argument('--api-url', type=str, default=settings.LCO_API_URL,
+                            help='Root URL of the LCO API')
+        parser.add_argument('--timeout', type=float, default=20.0,
+                            help='Timeout for each API request in seconds (default: 20)')
+
+    def _refresh(self, token, **options):
+
+        snapshot = dashboard_snapshot.refresh_dashboard_snapshot(token,
+                                        snapshot_path=options['snapshot'],
+                                        api_url=options['api_url'],
+                                        timeout=options['timeout'])
+
+        for section in dashboard_snapshot.SECTIONS:
+            if snapshot[section]['error'] == None:
+                print(section+': updated '+snapshot[section]['updated'])
+            else:
+                print(section+': refresh failed, '+snapshot[section]['error']+\
+                      '; last updated '+str(snapshot[section]['updated']))
+
+    def _refresh_dashboard_snapshot(self,*args, **options):
+
+        config = config_parser.read_config_for_code('setup')
+        token = config['token']
+
+        self._refresh(token, **options)
+
+        while options['interval'] != None:
+            time.sleep(options['interval'])
+            self._refresh(token, **options)
+
+    def handle(self,*args, **options):
+        self._refresh_dashboard_snapshot(*args,**options)
@@ -24,6 +24,6 @@ class Command(BaseCommand):
             e.ra = ra
             e.dec = dec
             
-            print ' -> Setting coordinates of event '+str(e.ra)+', '+str(e.dec)
+            print(' -> Setting coordinates of event '+str(e.ra)+', '+str(e.dec))
             e.save()
         
\ No newline at end of file
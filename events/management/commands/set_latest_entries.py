@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:02:37 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from events.models import Event
+from scripts import update_db_2
+
+class Command(BaseCommand):
+    help = 'Recompute the latest model, datafile, TAP and status pointers of events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=str, default=None,
+                            help='Only update events discovered in this year')
+        parser.add_argument('--pointer', action='append', default=None,
+                            choices=list(update_db_2.LATEST_ENTRY_POINTERS.keys()),
+                            help='Pointer to recompute; may be repeated (default: all)')
+
+    def _set_latest_entries(self,*args, **options):
+        events = Event.objects.all()
+        if options['year'] != None:
+            events = events.filter(year=options['year'])
+
+        nupdated = update_db_2.refresh_latest_entries(events=events,
+                                                     pointers=options['pointer'])
+
+        print('Updated latest entry pointers for '+str(nupdated)+' events')
+
+    def handle(self,*args, **options):
+        self._set_latest_entries(*args,**options)
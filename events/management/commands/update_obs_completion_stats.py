@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 02:47:19 2026
+
+@author: rstreet
+"""
+
+from django.core.management.base import BaseCommand
+from scripts import obs_monitor
+
+class Command(BaseCommand):
+    help = 'Update the daily completion statistics of the subrequests shown on the obs monitor, for the nights with subrequests changed since the last update'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Recompute the statistics of all nights')
+
+    def _update_obs_completion_stats(self,*args, **options):
+
+        nnights = obs_monitor.update_obs_completion_stats(rebuild=options['rebuild'])
+
+        print('Recomputed the completion statistics of '+str(nnights)+' nights')
+
+    def handle(self,*args, **options):
+        self._update_obs_completion_stats(*args,**options)
@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+from contextlib import ExitStack, contextmanager
+from scripts import performance_log
+import time
+
+class PerformanceMiddleware():
+    """
+    Records the wall time of each request, with the number and time of the
+    database queries and outbound HTTP requests made to serve it, in the
+    performance log.  The queries of a streamed response are made as it is
+    sent, so it is recorded once its content is exhausted or closed.
+    Set PERFORMANCE_MONITORING to True to enable.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PERFORMANCE_MONITORING:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        performance_log.install_http_accounting()
+
+    @contextmanager
+    def recording(self, record):
+        """Account the queries and outbound requests made within the block
+        to the record"""
+
+        token = performance_log.start_request_record(record)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(record))
+                yield
+        finally:
+            performance_log.end_request_record(token)
+
+    def stream_recorded(self, content, record, finish):
+        """Generator passing on the streamed content of a response, while
+        recording the work done to produce each part of it"""
+
+        iterator = iter(content)
+        try:
+            while True:
+                with self.recording(record):
+                    try:
+                        part = next(iterator)
+                    except StopIteration:
+                        break
+                yield part
+        finally:
+            if hasattr(iterator, 'close'):
+                with self.recording(record):
+                    iterator.close()
+            finish()
+
+    def __call__(self, request):
+        record = performance_log.RequestRecord()
+        t0 = time.perf_counter()
+        with self.recording(record):
+            response = self.get_response(request)
+
+        def finish():
+            elapsed = time.perf_counter() - t0
+
+            if request.resolver_match != None:
+                url_name = request.resolver_match.view_name
+            else:
+                url_name = 'unresolved'
+
+            entry = record.as_dict(time=timezone.now().isoformat(),
+                                   url_name=url_name,
+                                   method=request.method,
+                                   path=request.path,
+                                   status=response.status_code,
+                                   duration_ms=round(elapsed*1000.0, 3))
+            try:
+                performance_log.write_performance_record(entry)
+            except (IOError, OSError):
+                pass
+
+        if response.streaming:
+            response.streaming_content = self.stream_recorded(response.streaming_content,
+                                                              record, finish)
+        else:
+            finish()
+
+        return response
@@ -0,0 +1,661 @@
+# Generated by Django 4.0.3 on 2026-10-18 07:09
+"""
+Records model changes which were made to the database without a migration:
+the decimal coordinates, ibase and override of Event, the decimal
+coordinates of Field, and TapLima.
+
+A database which already has these columns and tables must mark this
+migration as applied without running it, before migrating further:
+    python manage.py migrate events 0006 --fake
+"""
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_merge_20180423_2159'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='dec',
+            field=models.DecimalField(blank=True, decimal_places=8, max_digits=12, null=True, verbose_name='Dec_deg'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='ibase',
+            field=models.DecimalField(blank=True, decimal_places=3, max_digits=6, null=True, verbose_name='i_base'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='override',
+            field=models.BooleanField(blank=True, default=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='ra',
+            field=models.DecimalField(blank=True, decimal_places=9, max_digits=12, null=True, verbose_name='RA_deg'),
+        ),
+        migrations.AddField(
+            model_name='field',
+            name='field_dec_decimal',
+            field=models.DecimalField(blank=True, decimal_places=8, max_digits=12, null=True, verbose_name='Dec_deg'),
+        ),
+        migrations.AddField(
+            model_name='field',
+            name='field_ra_decimal',
+            field=models.DecimalField(blank=True, decimal_places=9, max_digits=12, null=True, verbose_name='RA_deg'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='Tmax',
+            field=models.DecimalField(decimal_places=4, max_digits=12, verbose_name='Tmax'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='angle_a',
+            field=models.DecimalField(decimal_places=4, max_digits=12, verbose_name='alpha'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='chi_sq',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='Chi sq'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='dadt',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='Orbital motion da/dt'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='dsdt',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='Orbital motion ds/dt'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='e_Tmax',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(Tmax)'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='e_angle_a',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(alpha)'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='e_dadt',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(Orbital motion da/dt)'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='e_dsdt',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(Orbital motion ds/dt)'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='e_mass_ratio',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='q'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='e_pi_e_e',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(Parallax EE)'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='e_pi_e_n',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(Parallax EN)'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='e_rho',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(rho)'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='e_separation',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='s'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='e_tau',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(T_E)'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='e_umin',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='u_min'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='events.event'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='last_updated',
+            field=models.DateTimeField(verbose_name='date last updated'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='mass_ratio',
+            field=models.DecimalField(decimal_places=4, max_digits=12, verbose_name='q'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='modeler',
+            field=models.CharField(blank=True, default='', max_length=25, verbose_name='Modeler'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='pi_e_e',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='Parallax EE'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='pi_e_n',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='Parallax EN'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='rho',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='rho'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='separation',
+            field=models.DecimalField(decimal_places=4, max_digits=12, verbose_name='s'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='tau',
+            field=models.DecimalField(decimal_places=4, max_digits=12, verbose_name='T_E'),
+        ),
+        migrations.AlterField(
+            model_name='binarymodel',
+            name='umin',
+            field=models.DecimalField(decimal_places=4, max_digits=12, verbose_name='u_min'),
+        ),
+        migrations.AlterField(
+            model_name='datafile',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='events.event'),
+        ),
+        migrations.AlterField(
+            model_name='datafile',
+            name='filt',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='datafile',
+            name='g',
+            field=models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=8),
+        ),
+        migrations.AlterField(
+            model_name='datafile',
+            name='inst',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='datafile',
+            name='last_upd',
+            field=models.DateTimeField(verbose_name='date last updated'),
+        ),
+        migrations.AlterField(
+            model_name='datafile',
+            name='tel',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='anomaly_rank',
+            field=models.DecimalField(decimal_places=4, default=Decimal('-1.0'), max_digits=12, verbose_name='Anomaly Rank'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='ev_dec',
+            field=models.CharField(max_length=50, verbose_name='Dec'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='ev_ra',
+            field=models.CharField(max_length=50, verbose_name='RA'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='field',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ev_field_id', to='events.field'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='operator',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ev_operator_id', to='events.operator'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='status',
+            field=models.CharField(choices=[('NF', 'Not in footprint'), ('AC', 'active'), ('MO', 'monitor'), ('AN', 'anomaly'), ('EX', 'expired')], default='NF', max_length=30, verbose_name='Event status'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='year',
+            field=models.CharField(blank=True, default='', max_length=10, verbose_name='Year of discovery'),
+        ),
+        migrations.AlterField(
+            model_name='eventname',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='event_id', to='events.event'),
+        ),
+        migrations.AlterField(
+            model_name='eventname',
+            name='name',
+            field=models.CharField(max_length=50, verbose_name='Survey Event Name'),
+        ),
+        migrations.AlterField(
+            model_name='eventname',
+            name='operator',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='operator_id', to='events.operator'),
+        ),
+        migrations.AlterField(
+            model_name='eventreduction',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='events.event'),
+        ),
+        migrations.AlterField(
+            model_name='eventreduction',
+            name='timestamp',
+            field=models.DateTimeField(verbose_name='date created'),
+        ),
+        migrations.AlterField(
+            model_name='eventreduction',
+            name='trans_type',
+            field=models.CharField(choices=[('S', 'shift'), ('R', 'rot_shift'), ('M', 'rot_mag_shift'), ('L', 'linear'), ('P', 'polynomial')], default='P', max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='eventstatus',
+            name='comment',
+            field=models.CharField(default='--', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='eventstatus',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='events.event'),
+        ),
+        migrations.AlterField(
+            model_name='eventstatus',
+            name='rec_cad',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True, verbose_name='Recommended cadence (hr)'),
+        ),
+        migrations.AlterField(
+            model_name='eventstatus',
+            name='rec_nexp',
+            field=models.IntegerField(blank=True, null=True, verbose_name='Recommended n_exp'),
+        ),
+        migrations.AlterField(
+            model_name='eventstatus',
+            name='rec_telclass',
+            field=models.CharField(blank=True, default='1m', max_length=12, verbose_name='Recommended telescope class'),
+        ),
+        migrations.AlterField(
+            model_name='eventstatus',
+            name='rec_texp',
+            field=models.IntegerField(blank=True, null=True, verbose_name='Recommended t_exp (sec)'),
+        ),
+        migrations.AlterField(
+            model_name='eventstatus',
+            name='status',
+            field=models.CharField(choices=[('NF', 'Not in footprint'), ('AC', 'active'), ('MO', 'monitor'), ('AN', 'anomaly'), ('EX', 'expired')], default='NF', max_length=12),
+        ),
+        migrations.AlterField(
+            model_name='eventstatus',
+            name='timestamp',
+            field=models.DateTimeField(verbose_name='date last updated'),
+        ),
+        migrations.AlterField(
+            model_name='eventstatus',
+            name='updated_by',
+            field=models.CharField(default='--', max_length=25),
+        ),
+        migrations.AlterField(
+            model_name='field',
+            name='field_dec',
+            field=models.CharField(default='', max_length=50, verbose_name='Dec'),
+        ),
+        migrations.AlterField(
+            model_name='field',
+            name='field_ra',
+            field=models.CharField(default='', max_length=50, verbose_name='RA'),
+        ),
+        migrations.AlterField(
+            model_name='field',
+            name='name',
+            field=models.CharField(default='Outside ROMEREA footprint', max_length=50, verbose_name='Field name'),
+        ),
+        migrations.AlterField(
+            model_name='filter',
+            name='instrument',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='events.instrument'),
+        ),
+        migrations.AlterField(
+            model_name='filter',
+            name='name',
+            field=models.CharField(blank=True, max_length=50, verbose_name='Filter name'),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='date_obs',
+            field=models.DateTimeField(verbose_name='Date of observation'),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='field',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='events.field'),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='filt',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='grp_id',
+            field=models.CharField(blank=True, default='', max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='inst',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='quality',
+            field=models.CharField(blank=True, default='', max_length=400),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='req_id',
+            field=models.CharField(blank=True, default='', max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='tel',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='timestamp',
+            field=models.DateTimeField(verbose_name='Date received'),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='track_id',
+            field=models.CharField(blank=True, default='', max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='instrument',
+            name='name',
+            field=models.CharField(max_length=50, verbose_name='Instrument name'),
+        ),
+        migrations.AlterField(
+            model_name='instrument',
+            name='pixscale',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='Pixel scale (arcsec/pix)'),
+        ),
+        migrations.AlterField(
+            model_name='instrument',
+            name='telescope',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='events.telescope'),
+        ),
+        migrations.AlterField(
+            model_name='obsrequest',
+            name='field',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='events.field'),
+        ),
+        migrations.AlterField(
+            model_name='obsrequest',
+            name='grp_id',
+            field=models.CharField(blank=True, default='', max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='obsrequest',
+            name='req_id',
+            field=models.CharField(blank=True, default='', max_length=300),
+        ),
+        migrations.AlterField(
+            model_name='obsrequest',
+            name='request_status',
+            field=models.CharField(choices=[('AC', 'ACTIVE'), ('EX', 'EXPIRED'), ('CN', 'CANCELLED')], default='AC', max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='obsrequest',
+            name='request_type',
+            field=models.CharField(choices=[('A', 'REA High - 20 min cadence'), ('M', 'REA Low - 60 min cadence'), ('L', 'ROME Standard - every 7 hours'), ('I', 'Manual request')], default='L', max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='obsrequest',
+            name='time_expire',
+            field=models.DateTimeField(blank=True, verbose_name='request expiry date'),
+        ),
+        migrations.AlterField(
+            model_name='obsrequest',
+            name='timestamp',
+            field=models.DateTimeField(blank=True, verbose_name='request submit date'),
+        ),
+        migrations.AlterField(
+            model_name='obsrequest',
+            name='track_id',
+            field=models.CharField(blank=True, default='', max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='obsrequest',
+            name='which_filter',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='obsrequest',
+            name='which_inst',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='obsrequest',
+            name='which_site',
+            field=models.CharField(blank=True, default='', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='operator',
+            name='name',
+            field=models.CharField(default='OTHER', max_length=50, verbose_name='Operator Name'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='Tmax',
+            field=models.DecimalField(decimal_places=4, max_digits=12, verbose_name='Tmax'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='chi_sq',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='Chi sq'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='e_Tmax',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(Tmax)'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='e_pi_e_e',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(Parallax EE)'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='e_pi_e_n',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(Parallax EN)'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='e_rho',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(rho)'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='e_tau',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(T_E)'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='e_umin',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='sig(u_min)'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='events.event'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='last_updated',
+            field=models.DateTimeField(verbose_name='date last updated'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='modeler',
+            field=models.CharField(blank=True, default='', max_length=25, verbose_name='Modeler'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='pi_e_e',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='Parallax EE'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='pi_e_n',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='Parallax EN'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='rho',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='rho'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='tap_omega',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='TAP Omega'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='tau',
+            field=models.DecimalField(decimal_places=4, max_digits=12, verbose_name='T_E'),
+        ),
+        migrations.AlterField(
+            model_name='singlemodel',
+            name='umin',
+            field=models.DecimalField(decimal_places=4, max_digits=12, verbose_name='u_min'),
+        ),
+        migrations.AlterField(
+            model_name='subobsrequest',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'PENDING'), ('COMPLETED', 'COMPLETED'), ('CANCELED', 'CANCELED'), ('WINDOW_EXPIRED', 'WINDOW_EXPIRED')], default='PENDING', max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='subobsrequest',
+            name='time_executed',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='subrequest executed time'),
+        ),
+        migrations.AlterField(
+            model_name='subobsrequest',
+            name='window_end',
+            field=models.DateTimeField(blank=True, verbose_name='subrequest end time'),
+        ),
+        migrations.AlterField(
+            model_name='subobsrequest',
+            name='window_start',
+            field=models.DateTimeField(blank=True, verbose_name='subrequest start time'),
+        ),
+        migrations.AlterField(
+            model_name='tap',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='events.event'),
+        ),
+        migrations.AlterField(
+            model_name='tap',
+            name='passband',
+            field=models.CharField(blank=True, default='SDSS-i', max_length=12),
+        ),
+        migrations.AlterField(
+            model_name='tap',
+            name='priority',
+            field=models.CharField(choices=[('A', 'REA High'), ('L', 'REA Low'), ('B', 'REA Post-High'), ('N', 'None')], default='N', max_length=12),
+        ),
+        migrations.AlterField(
+            model_name='tap',
+            name='telclass',
+            field=models.CharField(blank=True, default='1m', max_length=12),
+        ),
+        migrations.AlterField(
+            model_name='tap',
+            name='timestamp',
+            field=models.DateTimeField(verbose_name='Date generated'),
+        ),
+        migrations.AlterField(
+            model_name='telescope',
+            name='altitude',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=8, null=True, verbose_name='Altitude (m)'),
+        ),
+        migrations.AlterField(
+            model_name='telescope',
+            name='aperture',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True, verbose_name='Telescope Aperture (m)'),
+        ),
+        migrations.AlterField(
+            model_name='telescope',
+            name='latitude',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=8, null=True, verbose_name='Latitude (N) in decimal degrees'),
+        ),
+        migrations.AlterField(
+            model_name='telescope',
+            name='longitude',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=8, null=True, verbose_name='Longitude (E) in decimal degrees'),
+        ),
+        migrations.AlterField(
+            model_name='telescope',
+            name='name',
+            field=models.CharField(max_length=100, verbose_name='Telescope name'),
+        ),
+        migrations.AlterField(
+            model_name='telescope',
+            name='operator',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='events.operator'),
+        ),
+        migrations.AlterField(
+            model_name='telescope',
+            name='site',
+            field=models.CharField(blank=True, default='', max_length=100, verbose_name='Site name'),
+        ),
+        migrations.CreateModel(
+            name='TapLima',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField(verbose_name='Date generated')),
+                ('priority', models.CharField(choices=[('A', 'REA High'), ('L', 'REA Low'), ('B', 'REA Post-High'), ('N', 'None')], default='N', max_length=12)),
+                ('tsamp', models.DecimalField(blank=True, decimal_places=2, default=0, max_digits=6)),
+                ('texp', models.IntegerField(blank=True, default=0)),
+                ('nexp', models.IntegerField(blank=True, default=1)),
+                ('telclass', models.CharField(blank=True, default='1m', max_length=12)),
+                ('imag', models.DecimalField(blank=True, decimal_places=2, default=22.0, max_digits=6)),
+                ('omega', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('err_omega', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('peak_omega', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('blended', models.BooleanField(default=False)),
+                ('visibility', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('cost1m', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('passband', models.CharField(blank=True, default='SDSS-i', max_length=12)),
+                ('ipp', models.DecimalField(blank=True, decimal_places=3, default=1.0, max_digits=10)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='events.event')),
+            ],
+        ),
+    ]
@@ -0,0 +1,128 @@
+# Generated by Django 4.0.3 on 2026-10-18 07:09
+"""
+Makes EventName.name unique, and adds the indexes of the lookups made by
+query_db, update_db_2 and the views.
+
+A name given more than once for the same event is reduced to one entry
+before the name is made unique.  If a name is given to different events
+the migration stops and lists them; those events must be merged, or the
+wrong names removed, by hand before migrating again.
+
+Databases created before 0006 must first run
+    python manage.py migrate events 0006 --fake
+as described in 0006_sync_model_state.
+"""
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def remove_duplicate_event_names(apps, schema_editor):
+    """Remove repeated entries of a name for the same event, keeping the
+    first, and refuse to continue if a name is given to several events"""
+
+    EventName = apps.get_model('events', 'EventName')
+    duplicates = EventName.objects.values('name').annotate(n=Count('id')).filter(n__gt=1)
+    names = [ d['name'] for d in duplicates ]
+
+    conflicts = []
+    for name in names:
+        entries = list(EventName.objects.filter(name=name).order_by('pk'))
+        if len(set([ e.event_id for e in entries ])) > 1:
+            conflicts.append(name+' (events '+\
+                             ', '.join([ str(e.event_id) for e in entries ])+')')
+        else:
+            EventName.objects.filter(pk__in=[ e.pk for e in entries[1:] ]).delete()
+
+    if len(conflicts) > 0:
+        raise RuntimeError('Event names given to more than one event must be '+\
+                           'resolved before they can be made unique: '+\
+                           '; '.join(conflicts))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_sync_model_state'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_event_names, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='eventname',
+            name='name',
+            field=models.CharField(max_length=50, unique=True, verbose_name='Survey Event Name'),
+        ),
+        migrations.AddIndex(
+            model_name='datafile',
+            index=models.Index(fields=['event', 'last_upd'], name='datafile_event_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='datafile',
+            index=models.Index(fields=['event', 'last_hjd'], name='datafile_event_hjd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='datafile',
+            index=models.Index(fields=['datafile'], name='datafile_path_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status'], name='event_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['year'], name='event_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventstatus',
+            index=models.Index(fields=['event', 'timestamp'], name='evstatus_event_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='image',
+            index=models.Index(fields=['image_name'], name='image_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='image',
+            index=models.Index(fields=['date_obs'], name='image_date_obs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='obsrequest',
+            index=models.Index(fields=['grp_id'], name='obsreq_grp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='obsrequest',
+            index=models.Index(fields=['request_status', 'time_expire'], name='obsreq_status_expire_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='obsrequest',
+            index=models.Index(fields=['timestamp'], name='obsreq_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='singlemodel',
+            index=models.Index(fields=['event', 'last_updated'], name='model_event_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='singlemodel',
+            index=models.Index(fields=['event', 'modeler', 'last_updated'], name='model_event_modeler_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subobsrequest',
+            index=models.Index(fields=['grp_id'], name='subreq_grp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subobsrequest',
+            index=models.Index(fields=['sr_id'], name='subreq_sr_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tap',
+            index=models.Index(fields=['event', 'timestamp'], name='tap_event_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tap',
+            index=models.Index(fields=['timestamp'], name='tap_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taplima',
+            index=models.Index(fields=['event', 'timestamp'], name='taplima_event_ts_idx'),
+        ),
+    ]
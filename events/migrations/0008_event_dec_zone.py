@@ -0,0 +1,74 @@
+# Generated by Django 4.0.3 on 2026-10-18 07:11
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+# Height in degrees of the declination zones, and the conversion of the
+# RA, Dec strings, as in events.models and scripts.utilities when this
+# migration was written.  They are copied here so that later changes to
+# either do not alter this migration.
+DEC_ZONE_HEIGHT = 0.05
+
+
+def get_dec_zone(dec):
+    """Return the index of the declination zone containing dec (decimal deg)"""
+    return int((float(dec) + 90.0) // DEC_ZONE_HEIGHT)
+
+
+def sexig_to_decimal(coord):
+    """Convert a sexigesimal coordinate string to a decimal float in the
+    same units, raising ValueError if it cannot be read"""
+    coord = coord.strip().replace(' ',':')
+    sign = 1.0
+    if coord[0:1] == '-':
+        sign = -1.0
+    fields = coord.lstrip('+-').split(':')
+    if len(fields) != 3:
+        raise ValueError('Unrecognised sexigesimal coordinate '+coord)
+    return sign * (float(fields[0]) + float(fields[1])/60.0 + float(fields[2])/3600.0)
+
+
+def coords_to_degrees(ra, dec):
+    """Convert an RA and Dec given in sexigesimal format or in decimal
+    degrees to decimal degrees"""
+    if ':' not in str(ra):
+        return float(ra), float(dec)
+    return sexig_to_decimal(str(ra))*15.0, sexig_to_decimal(str(dec))
+
+
+def set_event_sky_positions(apps, schema_editor):
+    """Populate the decimal coordinates and declination zone of existing
+    events from their RA, Dec strings"""
+    Event = apps.get_model('events', 'Event')
+    events = []
+    for event in Event.objects.all().iterator():
+        try:
+            (ra, dec) = coords_to_degrees(event.ev_ra, event.ev_dec)
+        except (ValueError, TypeError):
+            continue
+        event.ra = Decimal(str(round(ra, 9)))
+        event.dec = Decimal(str(round(dec, 8)))
+        event.dec_zone = get_dec_zone(dec)
+        events.append(event)
+    Event.objects.bulk_update(events, ['ra', 'dec', 'dec_zone'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='dec_zone',
+            field=models.IntegerField(blank=True, null=True, verbose_name='Dec zone'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['dec_zone', 'ra'], name='event_zone_ra_idx'),
+        ),
+        migrations.RunPython(set_event_sky_positions, migrations.RunPython.noop),
+    ]
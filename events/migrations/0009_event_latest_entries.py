@@ -0,0 +1,59 @@
+# Generated by Django 4.0.3 on 2026-10-18 07:14
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+# Model and ordering field of the entry each pointer refers to, as in
+# update_db_2.LATEST_ENTRY_POINTERS when this migration was written
+LATEST_ENTRY_POINTERS = {
+    'latest_model': ('SingleModel', 'last_updated'),
+    'latest_datafile': ('DataFile', 'last_upd'),
+    'latest_tap': ('Tap', 'timestamp'),
+    'latest_status': ('EventStatus', 'timestamp'),
+    }
+
+
+def set_latest_entries(apps, schema_editor):
+    """Point the latest_* pointers of existing events at their most recent
+    entries, with one UPDATE per pointer, as refresh_latest_entries does"""
+
+    Event = apps.get_model('events', 'Event')
+    updates = {}
+    for (pointer, (model_name, order_field)) in LATEST_ENTRY_POINTERS.items():
+        model = apps.get_model('events', model_name)
+        qs = model.objects.filter(event=OuterRef('pk')).order_by('-'+order_field, '-pk')
+        updates[pointer] = Subquery(qs.values('pk')[:1])
+    Event.objects.all().update(**updates)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_event_dec_zone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='latest_datafile',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='events.datafile'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='latest_model',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='events.singlemodel'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='latest_status',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='events.eventstatus'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='latest_tap',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='events.tap'),
+        ),
+        migrations.RunPython(set_latest_entries, migrations.RunPython.noop),
+    ]
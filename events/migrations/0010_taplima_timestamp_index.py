@@ -0,0 +1,17 @@
+# Generated by Django 4.0.3 on 2026-10-18 07:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_latest_entries'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taplima',
+            index=models.Index(fields=['timestamp'], name='taplima_timestamp_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.0.3 on 2026-10-18 07:27
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import TruncDate
+import pytz
+
+
+def count_existing_images(apps, schema_editor):
+    """Fill in the daily ImageStats counts from the images already in the
+    database, counting the latest entry of each image name, as
+    update_db_2.rebuild_image_stats does"""
+
+    Image = apps.get_model('events', 'Image')
+    ImageStats = apps.get_model('events', 'ImageStats')
+
+    latest = Image.objects.filter(image_name=OuterRef('image_name')
+                                  ).order_by('-timestamp','-pk').values('pk')[:1]
+    qs = Image.objects.filter(pk=Subquery(latest)).annotate(
+                night=TruncDate('date_obs', tzinfo=pytz.UTC)
+                ).values('night','tel','quality').annotate(n=Count('pk')).order_by()
+
+    entries = [ ImageStats(night=row['night'], tel=row['tel'], quality=row['quality'],
+                           n_images=row['n']) for row in qs ]
+    ImageStats.objects.bulk_create(entries, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_taplima_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('night', models.DateField(verbose_name='Night (UTC)')),
+                ('tel', models.CharField(blank=True, default='', max_length=50)),
+                ('quality', models.CharField(blank=True, default='', max_length=400)),
+                ('n_images', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('night', 'tel', 'quality')},
+            },
+        ),
+        migrations.RunPython(count_existing_images, migrations.RunPython.noop),
+    ]
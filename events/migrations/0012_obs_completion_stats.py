@@ -0,0 +1,39 @@
+# Generated by Django 4.0.3 on 2026-10-18 07:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0011_image_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ObsCompletionStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('night', models.DateField(verbose_name='Night (UTC)')),
+                ('field', models.CharField(blank=True, default='', max_length=50)),
+                ('inst', models.CharField(blank=True, default='', max_length=20)),
+                ('n_requested', models.IntegerField(default=0)),
+                ('n_executed', models.IntegerField(default=0)),
+                ('n_canceled', models.IntegerField(default=0)),
+                ('computed_at', models.DateTimeField(verbose_name='Computed at')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='subobsrequest',
+            name='last_modified',
+            field=models.DateTimeField(auto_now=True, null=True, verbose_name='last modified'),
+        ),
+        migrations.AddIndex(
+            model_name='subobsrequest',
+            index=models.Index(fields=['last_modified'], name='subreq_modified_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='obscompletionstats',
+            unique_together={('night', 'field', 'inst')},
+        ),
+    ]
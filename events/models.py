@@ -4,9 +4,10 @@ from django.db import models
 from django.utils import timezone
 from decimal import Decimal
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from rest_framework.authtoken.models import Token
+from scripts.utilities import coords_to_degrees
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_auth_token(sender, instance=None, created=False, **kwargs):
@@ -139,6 +140,10 @@ class Event(models.Model):
    ev_dec -- Event DEC. (string, required)
    ra -- Event RA (float, decimal, optional)
    dec -- Event Dec (float, decimal, optional)
+          ra and dec are set from ev_ra, ev_dec on save if not given
+   dec_zone -- Declination zone of width DEC_ZONE_HEIGHT deg containing
+               the event, used to index positional searches
+               (integer, set on save)
    ibase -- Event baseline magnitude (float, decimal, optional)
    
    status -- Events status (string, optional, default='NF')
@@ -152,6 +157,16 @@ class Event(models.Model):
                                                        a positive decimal number. 
 		                                 (float, optional, default=-1.0)
    year -- Year of discovery. (string, optional, default='')
+   latest_model -- Most recent SingleModel for this event, by last_updated
+           (object, optional) -- ForeignKey object
+   latest_datafile -- Most recent DataFile for this event, by last_upd
+           (object, optional) -- ForeignKey object
+   latest_tap -- Most recent Tap entry for this event, by timestamp
+           (object, optional) -- ForeignKey object
+   latest_status -- Most recent EventStatus for this event, by timestamp
+           (object, optional) -- ForeignKey object
+           The latest_* pointers are maintained by the update_db_2 add_*
+           functions; see update_db_2.update_latest_entry
    """
    def __str__(self):
       return "RA: "+str(self.ev_ra)+" Dec: "+str(self.ev_dec)+" ID: "+str(self.pk)
@@ -163,6 +178,7 @@ class Event(models.Model):
    ra = models.DecimalField("RA_deg", max_digits=12, decimal_places=9, null=True, blank=True)
    dec = models.DecimalField("Dec_deg", max_digits=12, decimal_places=8, null=True, blank=True)
    ibase = models.DecimalField("i_base", max_digits=6, decimal_places=3, null=True, blank=True)
+   dec_zone = models.IntegerField("Dec zone", null=True, blank=True)
    
    # Event status (not in ROME footprint, active (in ROME footprint), monitor (60m REA cadence), 
    #               anomaly (20m REA cadence), expired)
@@ -183,6 +199,53 @@ class Event(models.Model):
    
    # Manual override flag
    override = models.BooleanField(default=False,blank=True)
+
+   # Pointers to the most recent entries for this event in other tables
+   latest_model = models.ForeignKey('SingleModel', related_name='+', null=True, blank=True,
+                                    on_delete=models.SET_NULL)
+   latest_datafile = models.ForeignKey('DataFile', related_name='+', null=True, blank=True,
+                                       on_delete=models.SET_NULL)
+   latest_tap = models.ForeignKey('Tap', related_name='+', null=True, blank=True,
+                                  on_delete=models.SET_NULL)
+   latest_status = models.ForeignKey('EventStatus', related_name='+', null=True, blank=True,
+                                     on_delete=models.SET_NULL)
+
+   class Meta:
+      indexes = [
+         models.Index(fields=['status'], name='event_status_idx'),
+         models.Index(fields=['year'], name='event_year_idx'),
+         models.Index(fields=['dec_zone', 'ra'], name='event_zone_ra_idx'),
+      ]
+
+# Height in degrees of the declination zones used to index Event positions
+DEC_ZONE_HEIGHT = 0.05
+
+def get_dec_zone(dec):
+   """Return the index of the declination zone containing dec (decimal deg)"""
+   return int((float(dec) + 90.0) // DEC_ZONE_HEIGHT)
+
+@receiver(pre_save, sender=Event)
+def set_event_sky_position(sender, instance=None, **kwargs):
+   """Set the decimal coordinates of an Event from its RA, Dec strings,
+   unless given explicitly, and the declination zone from its Dec.
+   Coordinates read from the database are derived again if the RA, Dec
+   strings have been changed since."""
+   explicit = instance.ra != None and instance.dec != None
+   if explicit and instance.pk != None and not kwargs.get('raw', False):
+      stored = Event.objects.filter(pk=instance.pk).values_list('ev_ra', 'ev_dec',
+                                                                'ra', 'dec').first()
+      if stored != None and (instance.ev_ra, instance.ev_dec) != stored[0:2] \
+            and (instance.ra, instance.dec) == stored[2:4]:
+         explicit = False
+   if not explicit:
+      try:
+         (ra, dec) = coords_to_degrees(instance.ev_ra, instance.ev_dec)
+         instance.ra = Decimal(str(round(ra, 9)))
+         instance.dec = Decimal(str(round(dec, 8)))
+      except (ValueError, TypeError):
+         pass
+   if instance.dec != None:
+      instance.dec_zone = get_dec_zone(instance.dec)
    
 # Generic Events Name class
 # EventName uses two foreign keys so related_name needs to be set
@@ -203,7 +266,7 @@ class EventName(models.Model):
       return "Name:"+str(self.name)+" ID: "+str(self.event_id)
    event = models.ForeignKey(Event, related_name="event_id", on_delete=models.PROTECT)
    operator = models.ForeignKey(Operator, related_name="operator_id", on_delete=models.PROTECT)
-   name = models.CharField("Survey Event Name", max_length=50)
+   name = models.CharField("Survey Event Name", max_length=50, unique=True)
 
 # Single lens parameters
 class SingleModel(models.Model):
@@ -277,6 +340,13 @@ class SingleModel(models.Model):
                                     null=True, blank=True)
    chi_sq = models.DecimalField("Chi sq", max_digits=12,decimal_places=4,
                                     null=True, blank=True)
+
+   class Meta:
+      indexes = [
+         models.Index(fields=['event', 'last_updated'], name='model_event_upd_idx'),
+         models.Index(fields=['event', 'modeler', 'last_updated'],
+                      name='model_event_modeler_upd_idx'),
+      ]
    
 # Binary Lens parameters
 class BinaryModel(models.Model):
@@ -697,6 +767,14 @@ class ObsRequest(models.Model):
    # Number of exposures requested
    n_exp = models.IntegerField(default=1)
    request_status = models.CharField(max_length=40, choices=status_choice, default='AC')
+
+   class Meta:
+      indexes = [
+         models.Index(fields=['grp_id'], name='obsreq_grp_id_idx'),
+         models.Index(fields=['request_status', 'time_expire'],
+                      name='obsreq_status_expire_idx'),
+         models.Index(fields=['timestamp'], name='obsreq_timestamp_idx'),
+      ]
    
 class SubObsRequest(models.Model):
     """Individual subrequest blocks as generated by the LCO scheduler 
@@ -714,6 +792,8 @@ class SubObsRequest(models.Model):
                  ('PENDING', 'COMPLETED', 'CANCELED', 'WINDOW_EXPIRED')
     time_executed -- The timestamp of when the subrequest was executed
                  (object, optional, DateTime)
+    last_modified -- When the entry was last saved, set automatically
+                 (object, optional, DateTime)
     """
     
     def __str__(self):
@@ -734,6 +814,14 @@ class SubObsRequest(models.Model):
     window_end = models.DateTimeField('subrequest end time',blank=True)
     status = models.CharField(max_length=40, choices=status_choice, default='PENDING')
     time_executed = models.DateTimeField('subrequest executed time', null=True, blank=True)
+    last_modified = models.DateTimeField('last modified', auto_now=True, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['grp_id'], name='subreq_grp_id_idx'),
+            models.Index(fields=['sr_id'], name='subreq_sr_id_idx'),
+            models.Index(fields=['last_modified'], name='subreq_modified_idx'),
+        ]
     
 # Event status parameters
 class EventStatus(models.Model):
@@ -790,6 +878,11 @@ class EventStatus(models.Model):
    rec_telclass = models.CharField("Recommended telescope class", max_length=12, default='1m',
                                    blank=True)
 
+   class Meta:
+      indexes = [
+         models.Index(fields=['event', 'timestamp'], name='evstatus_event_ts_idx'),
+      ]
+
 # ARTEMiS data files (.dat)
 class DataFile(models.Model):
    """
@@ -841,6 +934,13 @@ class DataFile(models.Model):
    # Number of data points in file
    ndata =models.IntegerField()
 
+   class Meta:
+      indexes = [
+         models.Index(fields=['event', 'last_upd'], name='datafile_event_upd_idx'),
+         models.Index(fields=['event', 'last_hjd'], name='datafile_event_hjd_idx'),
+         models.Index(fields=['datafile'], name='datafile_path_idx'),
+      ]
+
 # TAP parameters
 class Tap(models.Model):
    """
@@ -923,6 +1023,12 @@ class Tap(models.Model):
    passband = models.CharField(max_length=12, default='SDSS-i', blank=True)
    # Inter Proposal Priority value
    ipp = models.DecimalField(max_digits=10,decimal_places=3, blank=True, default=1.0)
+
+   class Meta:
+      indexes = [
+         models.Index(fields=['event', 'timestamp'], name='tap_event_ts_idx'),
+         models.Index(fields=['timestamp'], name='tap_timestamp_idx'),
+      ]
    
 # TAPLIMA parameters
 class TapLima(models.Model):
@@ -1006,6 +1112,12 @@ class TapLima(models.Model):
    passband = models.CharField(max_length=12, default='SDSS-i', blank=True)
    # Inter Proposal Priority value
    ipp = models.DecimalField(max_digits=10,decimal_places=3, blank=True, default=1.0)
+
+   class Meta:
+      indexes = [
+         models.Index(fields=['event', 'timestamp'], name='taplima_event_ts_idx'),
+         models.Index(fields=['timestamp'], name='taplima_timestamp_idx'),
+      ]
    
 # Image parameters
 class Image(models.Model):
@@ -1097,3 +1209,81 @@ class Image(models.Model):
    shift_x = models.IntegerField(blank=True, null=True)
    shift_y = models.IntegerField(blank=True, null=True)
    quality = models.CharField(max_length=400, blank=True, default='')
+
+   class Meta:
+      indexes = [
+         models.Index(fields=['image_name'], name='image_name_idx'),
+         models.Index(fields=['date_obs'], name='image_date_obs_idx'),
+      ]
+
+# Daily image quality counts
+class ImageStats(models.Model):
+   """
+   Number of images of each quality taken per night and telescope,
+   counting only the most recent entry for each image name.  Maintained
+   incrementally as images are added or updated, so that the data
+   quality statistics do not need to scan the Image table.
+
+   Attributes:
+   night -- The UTC date of observation.
+                (date, required)
+   tel -- Telescope where the images were taken.
+         (string, optional, default='')
+   quality -- Image quality description, empty for accepted images.
+                 (string, optional, default='')
+   n_images -- Number of images.
+                 (integer, optional, default=0)
+   """
+   def __str__(self):
+      return str(self.night)+' '+str(self.tel)+' '+str(self.quality)+': '+str(self.n_images)
+   night = models.DateField('Night (UTC)')
+   tel = models.CharField(max_length=50, blank=True, default='')
+   quality = models.CharField(max_length=400, blank=True, default='')
+   n_images = models.IntegerField(default=0)
+
+   class Meta:
+      unique_together = ('night', 'tel', 'quality')
+
+class ObsCompletionStats(models.Model):
+   """
+   Number of subrequests of each field and instrument whose windows opened
+   on each night, and how many of them were executed.  Maintained by the
+   update_obs_completion_stats command, which recomputes only the nights
+   with subrequests saved since its last run, so that the obs monitor
+   does not need to scan the subrequests of the season.
+
+   Attributes:
+   night -- The UTC date on which the subrequest windows opened.
+                (date, required)
+   field -- Name of the field observed.
+         (string, optional, default='')
+   inst -- Instrument identifier string.
+         (string, optional, default='')
+   n_requested -- Number of subrequests.
+                 (integer, optional, default=0)
+   n_executed -- Number of subrequests executed.
+                 (integer, optional, default=0)
+   n_canceled -- Number of subrequests canceled.
+                 (integer, optional, default=0)
+   computed_at -- When the counts were computed.
+                 (datetime, required)
+   """
+   def __str__(self):
+      return str(self.night)+' '+str(self.field)+' '+str(self.inst)+': '+\
+             str(self.n_executed)+'/'+str(self.n_requested)
+   night = models.DateField('Night (UTC)')
+   field = models.CharField(max_length=50, blank=True, default='')
+   inst = models.CharField(max_length=20, blank=True, default='')
+   n_requested = models.IntegerField(default=0)
+   n_executed = models.IntegerField(default=0)
+   n_canceled = models.IntegerField(default=0)
+   computed_at = models.DateTimeField('Computed at')
+
+   def completion(self):
+      """Fraction of the subrequests executed"""
+      if self.n_requested > 0:
+         return float(self.n_executed)/float(self.n_requested)
+      return 0.0
+
+   class Meta:
+      unique_together = ('night', 'field', 'inst')
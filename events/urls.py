@@ -15,15 +15,26 @@ urlpatterns = [
     re_path('download_lc/(?P<event_name>[\w-]+)', views.download_lc, name='download_lc'),
     re_path('event_by_id/(?P<event_id>[0-9]+)', views.show_event_by_id, name='show_event_by_id'),
     re_path('download_lc_by_id/(?P<event_id>[0-9]+)', views.download_lc_by_id, name='download_lc_by_id'),
+    re_path('obs_log_export/(?P<date>[0-9]+)/(?P<export_format>csv|jsonl)', views.obs_log_export, name='obs_log_export'),
     re_path('obs_log/(?P<date>[0-9]+)', views.obs_log, name='obs_log'),
     path('obs_requests24/', views.obs_requests24, name='obs_requests24'),
     path('active_obs_requests/', views.active_obs_requests, name='active_obs_requests'),
     path('obs_monitor/', views.display_obs_monitor, name='obs_monitor'),
+    path('performance/', views.performance_summary, name='performance_summary'),
+    re_path('obs_chart_data/(?P<event_name>[\w-]+)', views.event_obs_chart_data, name='event_obs_chart_data'),
     re_path('obs_details/(?P<event_name>[\w-]+)', views.event_obs_details, name='event_obs_details'),
     re_path('image_search/image_name=(?P<image_name>[a-z0-9-_]+.[a-z]+)/', views.image_search, name='image_search'),
     path('query_obs_requests/', views.query_obs_requests, name='query_obs_requests'),
     re_path('query_obs_by_date/timestamp=(?P<timestamp>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})&time_expire=(?P<time_expire>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})&request_status=(?P<request_status>[A-Z][A-Z])/', views.query_obs_by_date, name='query_obs_by_date'),
     path('query_event_in_survey/', views.query_event_in_survey, name='query_event_in_survey'),
+    path('api/v1/obs_requests/', views.api_v1_obs_requests, name='api_v1_obs_requests'),
+    path('api/v1/active_obs_requests/', views.api_v1_active_obs_requests, name='api_v1_active_obs_requests'),
+    path('api/v1/subrequests/', views.api_v1_subrequests, name='api_v1_subrequests'),
+    re_path('api/v1/image_search/(?P<image_name>[a-z0-9-_]+.[a-z]+)/', views.api_v1_image_search, name='api_v1_image_search'),
+    path('api/v1/event_in_survey/', views.api_v1_event_in_survey, name='api_v1_event_in_survey'),
+    path('api/v1/ingest/images/', views.api_v1_ingest_images, name='api_v1_ingest_images'),
+    path('api/v1/ingest/subrequests/', views.api_v1_ingest_subrequests, name='api_v1_ingest_subrequests'),
+    path('api/v1/crossmatch/', views.api_v1_crossmatch, name='api_v1_crossmatch'),
     re_path('query_event_in_survey/ra=(?P<ra>[0-9.]+)&dec=(?P<dec>[-0-9.]+)/', views.query_event_in_survey, name='query_event_in_survey'),
     path('record_obs_request/', views.record_obs_request, name='record_obs_requests'),
     re_path('record_sub_obs_request/sr_id=(?P<sr_id>[0-9]+)&grp_id=(?P<grp_id>[A-Za-z0-9]+.[0-9]+)&track_id=(?P<track_id>[0-9]+)&window_start=(?P<window_start>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})&window_end=(?P<window_end>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})&status=(?P<status>[A-Z_]+)/', views.record_sub_obs_request, name='record_sub_obs_request'),
@@ -55,6 +66,8 @@ urlpatterns = [
     path('search_events/search_event_name/', views.search_events, {'search_type':'name'}, name='search_event_name'),
     path('search_events/search_event_position/', views.search_events, {'search_type':'position'}, name='search_event_position'),
     path('search_events/search_event_params/', views.search_events, {'search_type':'params'}, name='search_event_params'),
+    path('search_events/search_event_cone/', views.search_events, {'search_type':'cone'}, name='search_event_cone'),
+    path('search_events/crossmatch_events/', views.search_events, {'search_type':'crossmatch'}, name='crossmatch_events'),
     path('trigger_rea_hi_obs/', views.trigger_rea_hi_obs, name='trigger_rea_hi_obs'),
     path('', views.dashboard, name='dashboard'),
     path('quality_control/', views.data_quality_control, name='data_quality_control'),
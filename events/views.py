@@ -2,12 +2,17 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.conf import settings
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
-from django.contrib.auth.decorators import login_required
+from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.forms import PasswordChangeForm, AuthenticationForm
-from django.db.models import Max
+from django.db.models import Max, Prefetch, F, OuterRef, Subquery, Q
+from django.db.models.query import QuerySet
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.http import HttpResponse, Http404, HttpResponseRedirect
+from django.http import FileResponse, StreamingHttpResponse, JsonResponse
 from django.views.decorators.csrf import ensure_csrf_cookie, csrf_protect
 from django import forms
 from .forms import QueryObsRequestForm, RecordObsRequestForm, OperatorForm, TelescopeForm, EventForm, EventNameForm, SingleModelForm
@@ -16,15 +21,19 @@ from .forms import RecordSubObsRequestForm, QueryObsRequestDateForm
 from .forms import TapStatusForm, EventAnomalyStatusForm, EventNameForm
 from .forms import ObsExposureForm, FieldNameForm, ImageNameForm
 from .forms import EventPositionForm, EventSearchForm
+from .forms import EventConeSearchForm, EventCrossmatchForm
 from .forms import EventOverrideForm, ObsRequestForm
 from events.models import Field, Operator, Telescope, Instrument, Filter, Event, EventName, SingleModel, BinaryModel
 from events.models import EventReduction, ObsRequest, EventStatus, DataFile, Tap, Image, DataFile
-from rest_framework.authentication import TokenAuthentication, BasicAuthentication
+from events.models import SubObsRequest
+from rest_framework.authentication import TokenAuthentication, BasicAuthentication, SessionAuthentication
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view,authentication_classes,permission_classes
+from rest_framework.pagination import CursorPagination
 from itertools import chain
+from collections import OrderedDict
 from astropy.time import Time
 from datetime import datetime, timedelta
 from bokeh.plotting import figure
@@ -34,7 +43,7 @@ import sys, os
 from scripts.plotter import *
 from scripts.local_conf import get_conf
 from scripts.blgvis_ephem import *
-from scripts.utilities import short_to_long_name
+from scripts.utilities import short_to_long_name, coords_to_degrees
 from scripts import config_parser
 from scripts.get_errors import *
 from scripts import update_db_2
@@ -51,10 +60,21 @@ from scripts import log_utilities
 from scripts import utilities
 from scripts import observing_tools
 from scripts import survey_data_utilities
+from scripts import dashboard_snapshot
+from scripts import survey_links
+from scripts import lightcurve_archives
+from scripts import performance_log
+from scripts import page_validators
 from scripts import manual_obs
 from scripts import log_utilities
 import requests
 import pytz
+import numpy as np
+import hashlib
+import csv
+import io
+import json
+from urllib.parse import urlencode
 
 # Path to ARTEMiS files
 artemis_col = get_conf('artemis_cols')
@@ -193,137 +213,67 @@ def dashboard(request):
     Will display the database front view (dashboard).
     """
     if request.user.is_authenticated():
-        try:
-            config2 = config_parser.read_config_for_code('setup')
-            api_token = config2['token']
-            # Retrieve time usage information
-            response = requests.get(
-                'https://observe.lco.global/api/proposals/?id=KEY2017AB-004',
-                headers={'Authorization': 'Token '+str(api_token)}
-                )
-            # Make sure this api call was successful
-            try:
-                response.raise_for_status()
-            except requests.exceptions.HTTPError as exc:
-                print('Request failed: {}'.format(response.content))
-                raise exc
-            # Report the time allocation only for the 1m network
-            proposals_dict = response.json()  # api returns a json dictionary containing proposal information
-            for alloc in proposals_dict['results'][0]['timeallocation_set']:
-                if ( (alloc['instrument_type'] == '1M0-SCICAM-SINISTRO') and (alloc['semester'] == '2019B') ):
-                        time_available = alloc['std_allocation']
-                        time_used = alloc['std_time_used']
-                        ipp_time_available = alloc['ipp_time_available']
-                        ipp_limit = alloc['ipp_limit']
-        except:
-            raise Http404("Encountered a problem while trying to access the LCO observe api. Please contact the site administrator.")
+        # The LCO proposal and telescope states and the Moon separation are
+        # read from the snapshot kept by refresh_dashboard_snapshot, rather
+        # than from the LCO API, so that a slow API never stalls the page
+        snapshot = dashboard_snapshot.read_dashboard_snapshot()
+
+        proposal = snapshot['proposal']['data'] or {}
+        allocation = {}
+        for key in ['time_used', 'time_available', 'ipp_time_available', 'ipp_limit']:
+            if key in proposal:
+                allocation[key] = str.format('{0:.1f}', proposal[key])
+            else:
+                allocation[key] = 'Unknown'
+
+        telescopes = snapshot['telescopes']['data'] or {}
+        moon = snapshot['moon']['data'] or {}
+
         errors = read_err()
-        try:
-            # Get telescope status information
-            response3 = requests.get(
-                'https://observe.lco.global/api/telescope_states/',
-                headers={'Authorization': 'Token '+str(api_token)}
-                )
-            # Make sure this api call was successful
-            try:
-                response3.raise_for_status()
-            except requests.exceptions.HTTPError as exc:
-                print('Request failed: {}'.format(response3.content))
-                raise exc
-            telstate_dict = response3.json()
-            try:
-                coj_doma = telstate_dict['coj.doma.1m0a'][0]['event_type']
-            except:
-                coj_doma = 'Unknown'
-            try:
-                coj_domb = telstate_dict['coj.domb.1m0a'][0]['event_type']
-            except:
-                coj_domb = 'Unknown'
-            try:
-                cpt_doma = telstate_dict['cpt.doma.1m0a'][0]['event_type']
-            except:
-                cpt_doma = 'Unknown'
-            try:
-                cpt_domb = telstate_dict['cpt.domb.1m0a'][0]['event_type']
-            except:
-                cpt_domb = 'Unknown'
-            try:
-                cpt_domc = telstate_dict['cpt.domc.1m0a'][0]['event_type']
-            except:
-                cpt_domc = 'Unknown'
-            try:
-                lsc_doma = telstate_dict['lsc.doma.1m0a'][0]['event_type']
-            except:
-                lsc_doma = 'Unknown'
-            try:
-                lsc_domb = telstate_dict['lsc.domb.1m0a'][0]['event_type']
-            except:
-                lsc_domb = 'Unknown'
-            try:
-                lsc_domc = telstate_dict['lsc.domc.1m0a'][0]['event_type']
-            except:
-                lsc_domc = 'Unknown'
-        except:
-            raise Http404("Encountered a problem while trying to access the LCO observe api to read the telescope states. Please contact the site administrator.")
         # Get current time (UTC now)
         status_time = datetime.now()
         date_today = str(status_time.year)+str(status_time.month).zfill(2)+str(status_time.day).zfill(2)
         status_time_jd = Time(status_time).jd
-        lunar_separation = observing_tools.estimate_moon_separation_from_bulge()
 
         context = {'status_time':status_time, 'status_time_jd':status_time_jd,
                    'date_today':date_today, 'errors': errors,
-		   'coj_doma':coj_doma, 'coj_domb':coj_domb,
-		   'cpt_doma':cpt_doma, 'cpt_domb':cpt_domb, 'cpt_domc':cpt_domc,
-		   'lsc_doma':lsc_doma, 'lsc_domb':lsc_domb, 'lsc_domc':lsc_domc,
-		   'time_used':str.format('{0:.1f}', time_used),'time_available':str.format('{0:.1f}', time_available),
-		   'ipp_limit':str.format('{0:.1f}', ipp_limit),'ipp_time_available':str.format('{0:.1f}', ipp_time_available),
-                'moon_sep':lunar_separation
+                   'moon_sep':moon.get('moon_sep', 'Unknown'),
+                   'snapshot': snapshot,
+                   'db_pragmas':query_db.get_db_pragmas()
                     }
+        context.update(allocation)
+        for key in dashboard_snapshot.TELESCOPES.keys():
+            context[key] = telescopes.get(key, 'Unknown')
+
         return render(request, 'events/dashboard.html', context)
     else:
         return HttpResponseRedirect('login')
 
+##############################################################################################################
+@user_passes_test(lambda user: user.is_staff, login_url='/db/login/')
+def performance_summary(request):
+    """
+    Will display the percentiles of the time taken to serve each URL name,
+    with the database queries and outbound requests made, from the most
+    recent records of the performance log.
+    """
+    records = performance_log.read_performance_records()
+    summary = performance_log.summarise_performance_records(records)
+    context = {'summary': summary, 'n_records': len(records)}
+    if len(records) > 0:
+        context['since'] = records[0]['time']
+    return render(request, 'events/performance_summary.html', context)
+
 ##############################################################################################################
 @login_required(login_url='/db/login/')
+@page_validators.conditional_page(page_validators.get_lightcurve_archive_validators)
 def download_lc_by_id(request, event_id):
    """
    Will serve a tar file of the ARTEMiS lightcurves for this event for download.
    """
-   def tar_lc(lightcurves):
-      import tarfile
-      import os
-      filename = settings.MEDIA_ROOT+str(event_id)+".tgz"
-      if (os.path.exists(filename) ):
-         os.remove(filename)
-      # Serve lightcurves at tgz
-      tar = tarfile.open(filename,"w:gz")
-      for lc in lightcurves:
-         # Ignore directory paths when tarring the files
-         tar.addfile(tarfile.TarInfo(lc.split('/')[-1]), file(lc))
-      tar.close()
-      return filename
-
    if request.user.is_authenticated():
       event = Event.objects.get(id=event_id)
-      lightcurves = []
-      lightcurves_dictionary = DataFile.objects.select_related().filter(event=event).values('datafile')
-      for i in lightcurves_dictionary:
-         lightcurves.append(i['datafile'])
-      try:
-         filename = tar_lc(lightcurves)
-      except:
-         raise Http404("Encountered a problem while generating the tar file.")
-      try:
-         download = open(filename,'rb')
-      except:
-         raise Http404("Encountered a problem while reading the tar file.")
-      try:
-         response = HttpResponse(download.read(),content_type='application/x-tar')
-         response['Content-Disposition'] = 'attachment; filename="%s"' % filename.split('/')[-1]
-      except:
-         raise Http404("Encountered a problem while generating the HttpResponse.")
-      return response
+      return serve_lightcurve_archive(event, str(event_id)+".tgz")
    else:
       return HttpResponseRedirect('login')
 
@@ -338,88 +288,221 @@ def download_lc(request, event_name):
       event_name = short_to_long_name(event_name)
       # Get the ID for this event
       event_id = EventName.objects.get(name=event_name).event_id
-      def tar_lc(lightcurves):
-         import tarfile
-         import os
-         filename = settings.MEDIA_ROOT+str(event_name)+".tgz"
-         if (os.path.exists(filename) ):
-            os.remove(filename)
-         # Serve lightcurves at tgz
-         tar = tarfile.open(filename,"w:gz")
-         for lc in lightcurves:
-            # Ignore directory paths when tarring the files
-            tar.addfile(tarfile.TarInfo(lc.split('/')[-1]), file(lc))
-         tar.close()
-         return filename
       event = Event.objects.get(id=event_id)
-      lightcurves = []
-      lightcurves_dictionary = DataFile.objects.select_related().filter(event=event).values('datafile')
-      for i in lightcurves_dictionary:
-         lightcurves.append(i['datafile'])
-      try:
-         filename = tar_lc(lightcurves)
-      except:
-         raise Http404("Encountered a problem while generating the tar file.")
-      try:
-         download = open(filename,'rb')
-      except:
-         raise Http404("Encountered a problem while reading the tar file.")
-      try:
-         response = HttpResponse(download.read(),content_type='application/x-tar')
-         response['Content-Disposition'] = 'attachment; filename="%s"' % filename.split('/')[-1]
-      except:
-         raise Http404("Encountered a problem while generating the HttpResponse.")
-      return response
+      return serve_lightcurve_archive(event, str(event_name)+".tgz")
    else:
       return HttpResponseRedirect('login')
 
+def serve_lightcurve_archive(event, filename):
+   """
+   Function to return a response serving a tgz archive of the lightcurve
+   datafiles of an event.  An archive of the same files built for an
+   earlier download is served from the cache, with its Content-Length;
+   otherwise the archive is streamed as it is built, and cached.
+   """
+   datafiles = DataFile.objects.filter(event=event).values_list('datafile', flat=True)
+   members = lightcurve_archives.get_archive_members(datafiles)
+   fingerprint = lightcurve_archives.get_archive_fingerprint(members)
+
+   archive_path = lightcurve_archives.get_cached_archive(fingerprint)
+   if archive_path != None:
+      try:
+         response = FileResponse(open(archive_path,'rb'), as_attachment=True,
+                                 filename=filename, content_type='application/x-tar')
+         return response
+      except IOError:
+         # Evicted since it was found; build it again
+         pass
+
+   response = StreamingHttpResponse(
+                  lightcurve_archives.generate_and_cache_archive(members, fingerprint),
+                  content_type='application/x-tar')
+   response['Content-Disposition'] = 'attachment; filename="%s"' % filename
+   return response
+
 ##############################################################################################################
 @login_required(login_url='/db/login/')
 def obs_log(request, date):
-   from django.utils import timezone
    """
    Will display the observation log for the given date.
    Date must be provided in the format: YYYYMMDD
+   The log is shown a page at a time, following the after or before
+   parameters of the request, which give the last or first image of the
+   previous page.
    """
    if request.user.is_authenticated():
+      (date_min, date_max) = get_obs_log_date_range(date)
       try:
-         date_min = datetime(int(date[0:4]), int(date[4:6]), int(date[6:8]))
-         date_min = timezone.make_aware(date_min, timezone.get_current_timezone())
-         date_max = date_min + timedelta(hours=24)
-      except:
-         raise Http404("Encountered an error: Date must be provided in the format: YYYYMMDD")
-      try:
-         images = Image.objects.filter(date_obs__range=(date_min, date_max))
-         filenames = [k.image_name for k in images]
-         times = [k.date_obs for k in images]
-         fields = [k.field_id for k in images]
-         ras = [k.field.field_ra for k in images]
-         decs = [k.field.field_dec for k in images]
-         filts = [k.filt for k in images]
-         tels = [k.tel for k in images]
-         insts = [k.inst for k in images]
-         grp_ids = [k.grp_id for k in images]
-         track_ids = [k.track_id for k in images]
-         req_ids = [k.req_id for k in images]
-         airmasses = [k.airmass for k in images]
-         avg_fwhms = [k.avg_fwhm for k in images]
-         avg_skys = [k.avg_sky for k in images]
-         avg_sigskys = [k.avg_sigsky for k in images]
-         moon_seps = [k.moon_sep for k in images]
-         elongations = [k.elongation for k in images]
-         nstars = [k.nstars for k in images]
-         qualitys = [k.quality for k in images]
-         rows = zip(filenames, times, fields, ras, decs, filts, tels, insts, grp_ids, track_ids,
-        	    req_ids, airmasses, avg_fwhms, avg_skys, avg_sigskys, moon_seps, elongations,
-        	    nstars, qualitys)
-         rows = sorted(rows, key=lambda row: row[1])
+         images = select_obs_log_images(date_min, date_max)
+         (images, page_links) = paginate_obs_log(images,
+                                                 after=request.GET.get('after'),
+                                                 before=request.GET.get('before'))
+         rows = render_obs_log_rows(images)
+      except ValueError:
+         raise Http404("Encountered an error: Invalid page of the observation log")
       except:
          raise Http404("Encountered a problem while loading. Please contact the site administrator.")
-      context = {'rows': rows, 'date': date[0:4]+'-'+date[4:6]+'-'+date[6:8]}
+      context = {'rows': rows, 'date': date[0:4]+'-'+date[4:6]+'-'+date[6:8],
+                 'date_id': date[0:8], 'page_links': page_links}
       return render(request, 'events/obs_log.html', context)
    else:
       return HttpResponseRedirect('login')
 
+# Images shown per page of the observation log
+OBS_LOG_PAGE_SIZE = 500
+
+# Columns of the observation log and its exports, with the Image attribute
+# giving each
+OBS_LOG_COLUMNS = [ ('image_name', 'image_name'), ('date_obs', 'date_obs'),
+                    ('field_id', 'field_id'), ('field_ra', 'field.field_ra'),
+                    ('field_dec', 'field.field_dec'), ('filt', 'filt'),
+                    ('tel', 'tel'), ('inst', 'inst'), ('grp_id', 'grp_id'),
+                    ('track_id', 'track_id'), ('req_id', 'req_id'),
+                    ('airmass', 'airmass'), ('avg_fwhm', 'avg_fwhm'),
+                    ('avg_sky', 'avg_sky'), ('avg_sigsky', 'avg_sigsky'),
+                    ('moon_sep', 'moon_sep'), ('elongation', 'elongation'),
+                    ('nstars', 'nstars'), ('quality', 'quality') ]
+
+def get_obs_log_date_range(date):
+   """
+   Function to return the range of observation times covered by the log of
+   the given date, in the format YYYYMMDD
+   """
+   from django.utils import timezone
+   try:
+      date_min = datetime(int(date[0:4]), int(date[4:6]), int(date[6:8]))
+      date_min = timezone.make_aware(date_min, timezone.get_current_timezone())
+      date_max = date_min + timedelta(hours=24)
+   except:
+      raise Http404("Encountered an error: Date must be provided in the format: YYYYMMDD")
+   return date_min, date_max
+
+def select_obs_log_images(date_min, date_max):
+   """
+   Function to return the images observed in the given time range with
+   their fields, in order of observation
+   """
+   return Image.objects.filter(date_obs__range=(date_min, date_max)).select_related('field').order_by('date_obs', 'pk')
+
+def encode_obs_log_cursor(image):
+   return image.date_obs.isoformat()+'_'+str(image.pk)
+
+def decode_obs_log_cursor(cursor):
+   """
+   Function to return the observation time and primary key of the image
+   given by a cursor.  Raises ValueError for an invalid cursor.
+   """
+   (date_obs, pk) = cursor.rsplit('_', 1)
+   return datetime.fromisoformat(date_obs), int(pk)
+
+def paginate_obs_log(images, after=None, before=None, per_page=OBS_LOG_PAGE_SIZE):
+   """
+   Function to select a page of the images of the observation log, from
+   those observed after the image given by the cursor after, or the page
+   ending before the image given by the cursor before, or else the first
+   page.  The images must be in order of observation time and primary key;
+   pages are selected by these values rather than by offset, so the cost
+   of showing a page does not grow with its position in the log.
+   Returns the images of the page and the query strings of the links to
+   the next and previous pages where they exist.
+   """
+   page_links = {}
+
+   if before != None:
+      (date_obs, pk) = decode_obs_log_cursor(before)
+      page = list(images.filter(Q(date_obs__lt=date_obs) |
+                                Q(date_obs=date_obs, pk__lt=pk)).reverse()[:per_page+1])
+      has_previous = (len(page) > per_page)
+      page = page[:per_page][::-1]
+      has_next = True
+   else:
+      if after != None:
+         (date_obs, pk) = decode_obs_log_cursor(after)
+         images = images.filter(Q(date_obs__gt=date_obs) |
+                                Q(date_obs=date_obs, pk__gt=pk))
+      page = list(images[:per_page+1])
+      has_next = (len(page) > per_page)
+      page = page[:per_page]
+      has_previous = (after != None)
+
+   if len(page) > 0:
+      if has_next:
+         page_links['next'] = urlencode({'after': encode_obs_log_cursor(page[-1])})
+      if has_previous:
+         page_links['previous'] = urlencode({'before': encode_obs_log_cursor(page[0])})
+
+   return page, page_links
+
+def get_attribute_value(entry, attribute):
+   """
+   Function to return the value of an attribute of a database entry, which
+   may be an attribute of a related entry, e.g. field.name
+   """
+   value = entry
+   for name in attribute.split('.'):
+      value = getattr(value, name)
+   return value
+
+def render_obs_log_rows(images):
+   """
+   Function to return the rows of the observation log table for the given
+   images, with the entries of OBS_LOG_COLUMNS
+   """
+   rows = []
+   for image in images:
+      rows.append([ get_attribute_value(image, attribute) for (name, attribute) in OBS_LOG_COLUMNS ])
+   return rows
+
+def generate_obs_log_export(images, export_format):
+   """
+   Generator yielding the observation log for the given images as CSV or
+   as JSON Lines, one image per line.  Images are read from the database
+   in chunks, so that the memory used does not grow with the number of
+   images in the log.
+   """
+   names = [ name for (name, attribute) in OBS_LOG_COLUMNS ]
+   buffer = io.StringIO()
+   writer = csv.writer(buffer)
+
+   if export_format == 'csv':
+      writer.writerow(names)
+      yield buffer.getvalue()
+      buffer.seek(0)
+      buffer.truncate(0)
+
+   for image in images.iterator(chunk_size=2000):
+      values = [ get_attribute_value(image, attribute) for (name, attribute) in OBS_LOG_COLUMNS ]
+      if export_format == 'csv':
+         writer.writerow(values)
+      else:
+         buffer.write(json.dumps(dict(zip(names, values)), cls=DjangoJSONEncoder)+'\n')
+      yield buffer.getvalue()
+      buffer.seek(0)
+      buffer.truncate(0)
+
+##############################################################################################################
+@api_view(['GET'])
+@authentication_classes((SessionAuthentication, TokenAuthentication, BasicAuthentication))
+@permission_classes((IsAuthenticated,))
+def obs_log_export(request, date, export_format):
+   """
+   Function to provide an API endpoint to download the observation log of
+   the given date, in the format YYYYMMDD, in full as CSV or JSON Lines.
+   The log is streamed as it is read from the database.
+   """
+   (date_min, date_max) = get_obs_log_date_range(date)
+   images = select_obs_log_images(date_min, date_max)
+
+   if export_format == 'csv':
+      content_type = 'text/csv'
+   else:
+      content_type = 'application/x-ndjson'
+
+   response = StreamingHttpResponse(generate_obs_log_export(images, export_format),
+                                    content_type=content_type)
+   response['Content-Disposition'] = 'attachment; filename="obs_log_%s.%s"' % (date[0:8], export_format)
+   return response
+
 ##############################################################################################################
 @login_required(login_url='/db/login/')
 def obs_requests24(request):
@@ -499,99 +582,20 @@ def active_obs_requests(request):
 
 ##############################################################################################################
 @login_required(login_url='/db/login/')
+@page_validators.conditional_page(lambda request: page_validators.get_tap_validators(request, select_tap_events()))
 def tap(request):
     """Function to load the TAP page of targets recommended for observation"""
 
     if request.user.is_authenticated():
 #        try:
-            list_ev = Event.objects.select_related().filter(status__in=['MO']).annotate(latest_tap=Max('tap__timestamp'))
-            latest_ev_tap = Tap.objects.filter(timestamp__in=[e.latest_tap for e in list_ev])
-
             time_now = datetime.now()
             time_now_jd = Time(time_now).jd
 
             ##### TAP query goes here ###
-            selection_tap = latest_ev_tap.order_by('omega').reverse()
+            selection_tap = select_tap_events()
             #####
 
-            ev_id = []
-            timestamp = []
-            check_list = []
-            for f in selection_tap:
-                if f.event_id not in check_list:
-                    ev_id.append(f.event_id)
-                    timestamp.append(f.timestamp)
-                    check_list.append(f.event_id)
-
-            if len(selection_tap) > 0:
-                ra = []
-                dec = []
-                names_list = []
-                cadence = []
-                nexp = []
-                texp = []
-                priority = []
-                imag = []
-                tsamp = []
-                omega_s = []
-                sig_omega_s = []
-                omega_peak = []
-                colors = []
-                visibility = []
-                field_names = []
-                override = []
-
-                count = 0
-                for i in ev_id:
-                    evnm = EventName.objects.filter(event=i)
-                    names = [k.name for k in evnm]
-
-                    ev_ra = Event.objects.all().get(pk=i).ev_ra
-                    ev_dec = Event.objects.all().get(pk=i).ev_dec
-                    field_name = (Event.objects.get(id=i)).field.name
-                    override_status = Event.objects.all().get(pk=i).override
-
-                    sampling_time = Tap.objects.all().get(event=i, timestamp=timestamp[count]).tsamp
-                    time_exp = Tap.objects.all().get(event=i, timestamp=timestamp[count]).texp
-                    prior = Tap.objects.all().get(event=i, timestamp=timestamp[count]).priority
-
-                    if prior == 'A':
-                        colors.append('#FE2E2E')
-                    elif prior == 'H':
-                        colors.append('#FA8258')
-                    elif prior == 'M':
-                        colors.append('#F4FA58')
-                    elif prior == 'L':
-                        colors.append('#A9F5A9')
-                    else:
-                        colors.append('#808080')
-
-                    baseline = Tap.objects.all().get(event=i, timestamp=timestamp[count]).imag
-                    oms = Tap.objects.all().get(event=i, timestamp=timestamp[count]).omega
-                    omsp = Tap.objects.all().get(event=i, timestamp=timestamp[count]).peak_omega
-                    vis = Tap.objects.all().get(event=i, timestamp=timestamp[count]).visibility
-
-                    texp.append(time_exp)
-                    tsamp.append(sampling_time)
-                    priority.append(prior)
-                    imag.append(baseline)
-                    omega_s.append(oms)
-                    omega_peak.append(omsp)
-                    names_list.append(names)
-                    visibility.append(vis)
-                    ra.append(ev_ra)
-                    dec.append(ev_dec)
-                    field_names.append(field_name)
-                    override.append(override_status)
-                    count = count + 1
-
-                    #### TAP rows need to be defined here ####
-                    rows = zip(colors, ev_id, names_list, ra, dec, texp, priority,
-                               tsamp, imag, omega_s, omega_peak,
-                               visibility, field_names, override)
-            else:
-
-                rows = []
+            rows = render_tap_queryset_as_table_rows(selection_tap)
 
             rowsrej = ''
             time1 = 'Unknown' # This should be an estimate of when the target list will be uploaded next (in minutes)
@@ -615,6 +619,38 @@ def tap(request):
 
         return HttpResponseRedirect('login')
 
+def select_tap_events():
+    """Function to return a QuerySet of the events TAP currently recommends
+    for observation, in order of decreasing priority, with their field,
+    latest TAP entry and names fetched in two queries"""
+
+    names_qs = EventName.objects.order_by('pk')
+
+    return Event.objects.filter(status__in=['MO'], latest_tap__isnull=False).\
+                    select_related('field','latest_tap').\
+                    prefetch_related(Prefetch('event_id', queryset=names_qs,
+                                              to_attr='names')).\
+                    order_by('-latest_tap__omega')
+
+def render_tap_queryset_as_table_rows(events):
+    """Function to return the rows of the TAP table for a QuerySet of
+    events from select_tap_events"""
+
+    colours = {'A': '#FE2E2E', 'H': '#FA8258', 'M': '#F4FA58', 'L': '#A9F5A9'}
+
+    rows = []
+    for event in events:
+        tap_entry = event.latest_tap
+        names = [k.name for k in event.names]
+
+        rows.append( (colours.get(tap_entry.priority, '#808080'), event.pk,
+                      names, event.ev_ra, event.ev_dec, tap_entry.texp,
+                      tap_entry.priority, tap_entry.tsamp, tap_entry.imag,
+                      tap_entry.omega, tap_entry.peak_omega,
+                      tap_entry.visibility, event.field.name, event.override) )
+
+    return rows
+
 ##############################################################################################################
 @login_required(login_url='/db/login/')
 def set_tap_status(request):
@@ -1126,6 +1162,7 @@ def trigger_rea_hi_obs(request):
 
 ##############################################################################################################
 @login_required(login_url='/db/login/')
+@page_validators.conditional_page(page_validators.get_event_list_validators)
 def list_year(request, year):
    """
    Will list all events in database for a given year.
@@ -1133,12 +1170,15 @@ def list_year(request, year):
    if request.user.is_authenticated():
       events = Event.objects.filter(year=str(year))
 
-      rows = render_event_queryset_as_table_rows(events)
+      (page, context) = paginate_event_queryset(request, events)
+
+      rows = render_event_queryset_as_table_rows(page.object_list, ordered=True)
 
       time_now = Time.now()
 
-      return render(request, 'events/list_events.html',
-                    {'rows': rows, 'JD_now': time_now.jd})
+      context.update({'rows': rows, 'JD_now': time_now.jd})
+
+      return render(request, 'events/list_events.html', context)
 
    else:
 
@@ -1156,16 +1196,14 @@ def list_anomalies(request):
         #events = Event.objects.filter(year=str(current_date.year), status='AN')
         events = Event.objects.filter(status='AN')
 
-        event_names = []
-        for e in events:
-            qs = EventName.objects.filter(event=e)
-            event_names.append(utilities.long_to_short_name(qs[0].name))
+        (page, context) = paginate_event_queryset(request, events)
 
-        rows = render_event_queryset_as_enhanced_table_rows(events)
+        rows = render_event_queryset_as_enhanced_table_rows(page.object_list,
+                                                            ordered=True)
 
-        return render(request, 'events/list_anomalies.html',
-                              {'rows': rows,
-                              'JD_now': time_now.jd})
+        context.update({'rows': rows, 'JD_now': time_now.jd})
+
+        return render(request, 'events/list_anomalies.html', context)
 
     else:
 
@@ -1194,8 +1232,11 @@ def list_all(request, display_year=None):
         else:
             events = Event.objects.filter(year=display_year)
 
-        rows = render_event_queryset_as_table_rows(events)
-        context = {'rows': rows, 'JD_now': time_now.jd}
+        (page, context) = paginate_event_queryset(request, events)
+
+        rows = render_event_queryset_as_table_rows(page.object_list, ordered=True)
+
+        context.update({'rows': rows, 'JD_now': time_now.jd})
 
         return render(request, 'events/list_events.html', context)
 
@@ -1203,8 +1244,100 @@ def list_all(request, display_year=None):
 
         return HttpResponseRedirect('login')
 
-def render_event_queryset_as_table_rows(events,separations=None):
-    """Function to return a neat table of event parameters"""
+# Columns by which the event tables may be sorted, and the Event fields
+# they are sorted on.  The model parameters, magnitude and TAP priority
+# shown are those of the latest entries, which the latest_* pointers track.
+EVENT_TABLE_SORT_FIELDS = {'id': 'pk',
+                           'name': 'first_name',
+                           'field': 'field__name',
+                           'ra': 'ra',
+                           'dec': 'dec',
+                           'status': 'status',
+                           'year': 'year',
+                           't0': 'latest_model__Tmax',
+                           'te': 'latest_model__tau',
+                           'u0': 'latest_model__umin',
+                           'ibase': 'ibase',
+                           'imag': 'latest_datafile__last_mag',
+                           'tap': 'latest_tap__priority'}
+
+EVENT_TABLE_PAGE_SIZE = 100
+EVENT_TABLE_MAX_PAGE_SIZE = 1000
+
+def sort_event_queryset(events, sort='-name'):
+    """Function to order a QuerySet of events by one of the
+    EVENT_TABLE_SORT_FIELDS, prefixed by '-' for descending order.
+    Events with no value for the column are placed last, and ties are
+    broken by primary key so that the order is stable between pages.
+    Returns the ordered QuerySet and the sort applied."""
+
+    key = sort.lstrip('-')
+    if key not in EVENT_TABLE_SORT_FIELDS:
+        sort = '-name'
+        key = 'name'
+    descending = sort.startswith('-')
+
+    if key == 'name':
+        first_name = EventName.objects.filter(event=OuterRef('pk')).order_by('pk')
+        events = events.annotate(first_name=Subquery(first_name.values('name')[:1]))
+
+    field = F(EVENT_TABLE_SORT_FIELDS[key])
+    if descending:
+        events = events.order_by(field.desc(nulls_last=True), '-pk')
+    else:
+        events = events.order_by(field.asc(nulls_last=True), 'pk')
+
+    return events, sort
+
+def paginate_event_queryset(request, events, default_sort='-name'):
+    """Function to select the page of a QuerySet of events to display in a
+    table, following the sort, page and per_page parameters of the request.
+    Returns the Page of events and the context needed by the templates to
+    link to other pages and orderings."""
+
+    (events, sort) = sort_event_queryset(events, request.GET.get('sort', default_sort))
+
+    try:
+        per_page = int(request.GET.get('per_page', EVENT_TABLE_PAGE_SIZE))
+    except ValueError:
+        per_page = EVENT_TABLE_PAGE_SIZE
+    per_page = min(max(per_page, 1), EVENT_TABLE_MAX_PAGE_SIZE)
+
+    paginator = Paginator(events.select_related('field'), per_page)
+    page = paginator.get_page(request.GET.get('page'))
+
+    # Clicking a column heading sorts by it, reversing the order if the
+    # table is already sorted by it
+    sort_links = {}
+    for key in EVENT_TABLE_SORT_FIELDS.keys():
+        new_sort = '-'+key if sort == key else key
+        sort_links[key] = urlencode({'sort': new_sort, 'per_page': per_page})
+
+    page_links = {}
+    if page.has_previous():
+        page_links['previous'] = urlencode({'sort': sort, 'per_page': per_page,
+                                            'page': page.previous_page_number()})
+        page_links['first'] = urlencode({'sort': sort, 'per_page': per_page,
+                                         'page': 1})
+    if page.has_next():
+        page_links['next'] = urlencode({'sort': sort, 'per_page': per_page,
+                                        'page': page.next_page_number()})
+        page_links['last'] = urlencode({'sort': sort, 'per_page': per_page,
+                                        'page': paginator.num_pages})
+
+    context = {'page': page, 'sort': sort,
+               'sort_links': sort_links, 'page_links': page_links}
+
+    return page, context
+
+def render_event_queryset_as_table_rows(events,separations=None,ordered=False):
+    """Function to return a neat table of event parameters.
+    Rows are sorted by event name, or by separation if separations are
+    given, unless ordered is True, in which case they are returned in the
+    order of the events given."""
+
+    if isinstance(events, QuerySet):
+        events = list(events.select_related('field'))
 
     ev_id = [k.pk for k in events]
     field = [k.field.name.replace(' footprint','') for k in events]
@@ -1218,12 +1351,13 @@ def render_event_queryset_as_table_rows(events,separations=None):
     tE_list = []
     u0_list = []
     imag_list = []
+    event_names = query_db.get_names_for_events(ev_id)
+    last_models = query_db.get_latest_models_for_events(ev_id)
     for i in range(len(events)):
 
-        evnm = EventName.objects.filter(event=events[i])
-        last_model = query_db.get_last_single_model(events[i])
+        last_model = last_models.get(events[i].pk)
 
-        names = [k.name for k in evnm]
+        names = event_names.get(events[i].pk, [])
         names_list.append(names)
         if last_model != None:
             t0_list.append(last_model.Tmax)
@@ -1236,25 +1370,32 @@ def render_event_queryset_as_table_rows(events,separations=None):
         imag_list.append(events[i].ibase)
 
     if separations == None:
-        rows = zip(ev_id, names_list, field, ra, dec, status, year_disc,
-               t0_list, tE_list, u0_list, imag_list)
-        rows = sorted(rows, key=lambda row: row[1], reverse=True)
+        rows = list(zip(ev_id, names_list, field, ra, dec, status, year_disc,
+               t0_list, tE_list, u0_list, imag_list))
+        if not ordered:
+            rows = sorted(rows, key=lambda row: row[1], reverse=True)
     else:
-        rows = zip(ev_id, names_list, field, ra, dec, status, year_disc,
-               t0_list, tE_list, u0_list, imag_list, separations)
-        rows = sorted(rows, key=lambda row: row[10], reverse=True)
+        rows = list(zip(ev_id, names_list, field, ra, dec, status, year_disc,
+               t0_list, tE_list, u0_list, imag_list,
+               [ round(sep, 2) for sep in separations ]))
+        if not ordered:
+            rows = sorted(rows, key=lambda row: row[11])
 
     return rows
 
-def render_event_queryset_as_enhanced_table_rows(events):
+def render_event_queryset_as_enhanced_table_rows(events,ordered=False):
     """Function to return a neat table of event parameters, with additional
-    data for DayOps purposes"""
+    data for DayOps purposes.  Rows are sorted by event name unless ordered
+    is True."""
 
     priorities = {'A': 'REA High',
                   'L': 'REA Low',
                   'B': 'REA Post-High',
                   'N': 'Not selected'}
 
+    if isinstance(events, QuerySet):
+        events = list(events.select_related('field'))
+
     ev_id = [k.pk for k in events]
     field = [k.field.name.replace(' footprint','') for k in events]
     ra = [k.ev_ra for k in events]
@@ -1269,14 +1410,18 @@ def render_event_queryset_as_enhanced_table_rows(events):
     texp100_list = []
     tap_list = []
 
+    event_names = query_db.get_names_for_events(ev_id)
+    last_models = query_db.get_latest_models_for_events(ev_id)
+    last_datafiles = query_db.get_latest_datafiles_for_events(ev_id)
+    last_taps = query_db.get_latest_taps_for_events(ev_id)
+
     for i in range(len(events)):
 
-        evnm = EventName.objects.filter(event=events[i])
-        last_model = query_db.get_last_single_model(events[i])
-        last_data = query_db.get_last_datafile(events[i])
-        last_tap = query_db.get_latest_tap_entry(events[i])
+        last_model = last_models.get(events[i].pk)
+        last_data = last_datafiles.get(events[i].pk)
+        last_tap = last_taps.get(events[i].pk)
 
-        names = [k.name for k in evnm]
+        names = event_names.get(events[i].pk, [])
         names_list.append(names)
 
         if last_model != None:
@@ -1307,10 +1452,11 @@ def render_event_queryset_as_enhanced_table_rows(events):
             texp25_list.append('NONE')
             texp100_list.append('NONE')
 
-    rows = zip(ev_id, names_list, field, ra, dec,
+    rows = list(zip(ev_id, names_list, field, ra, dec,
                t0_list, tE_list, u0_list, imag_list,
-               texp25_list, texp100_list, tap_list)
-    rows = sorted(rows, key=lambda row: row[1], reverse=True)
+               texp25_list, texp100_list, tap_list))
+    if not ordered:
+        rows = sorted(rows, key=lambda row: row[1], reverse=True)
 
     return rows
 
@@ -1319,11 +1465,12 @@ def gather_survey_links(short_name):
 
     current_date = datetime.now()
 
-    rtmodel = survey_data_utilities.scrape_rtmodel(current_date.year, short_name)
-    mismap = survey_data_utilities.scrape_mismap(current_date.year, short_name)
-    moa = survey_data_utilities.scrape_moa(current_date.year, short_name)
-    kmt = survey_data_utilities.scrape_kmt(current_date.year, short_name)
-    ogle = survey_data_utilities.fetch_ogle_fchart(current_date.year, short_name)
+    links = survey_links.gather_survey_links(current_date.year, short_name)
+    rtmodel = links['rtmodel']
+    mismap = links['mismap']
+    moa = links['moa']
+    kmt = links['kmt']
+    ogle = links['ogle']
 
     event_data = [ ]
 
@@ -1371,17 +1518,25 @@ def search_events(request,search_type=None):
 
     if request.user.is_authenticated():
 
+        separations = None
+        crossmatch_rows = []
+        message = ''
+
         if request.method == "POST":
 
             eform = EventSearchForm(request.POST)
             pform = EventPositionForm(request.POST)
             nform = EventNameForm(request.POST)
+            cform = EventConeSearchForm(request.POST)
+            xform = EventCrossmatchForm(request.POST, request.FILES)
+
+            events = None
 
             if search_type == 'name' and nform.is_valid():
 
                 npost = nform.save(commit=False)
 
-                (e,message) = query_db.get_event_by_name(npost.name)
+                (e,db_message) = query_db.get_event_by_name(npost.name)
 
                 if e != None:
                     events = [e]
@@ -1396,6 +1551,17 @@ def search_events(request,search_type=None):
 
                 events = query_db.get_events_box_search(search_params)
 
+            elif search_type == 'cone' and cform.is_valid():
+
+                try:
+                    (ra, dec) = coords_to_degrees(cform.cleaned_data['ra'],
+                                                  cform.cleaned_data['dec'])
+                    (events, separations) = query_db.cone_search(ra, dec,
+                                                    cform.cleaned_data['radius'])
+                except ValueError:
+                    events = []
+                    message = 'Error - unrecognised coordinates'
+
             elif search_type == 'params' and eform.is_valid():
 
                 search_params = {}
@@ -1404,64 +1570,140 @@ def search_events(request,search_type=None):
 
                 events = query_db.get_event_by_params(search_params)
 
-            if nform.is_valid() or pform.is_valid() or eform.is_valid():
+            elif search_type == 'crossmatch' and xform.is_valid():
 
-                rows = render_event_queryset_as_table_rows(events)
+                text = xform.cleaned_data['positions']
+                if xform.cleaned_data['position_file'] != None:
+                    text += '\n'+xform.cleaned_data['position_file'].read().decode('utf-8', 'replace')
 
-                if len(rows) == 0:
-                    message = 'Search returned no matching entries'
+                (labels, ra, dec, errors) = parse_crossmatch_positions(text)
+
+                if len(labels) > CROSSMATCH_MAX_POSITIONS:
+                    message = 'Error - at most '+str(CROSSMATCH_MAX_POSITIONS)+\
+                                ' positions can be crossmatched at once'
                 else:
-                    message = ''
+                    matches = query_db.crossmatch_positions(ra, dec, xform.cleaned_data['radius'])
+                    crossmatch_rows = render_crossmatch_rows(labels, ra, dec, matches)
+                    nmatched = len([ m for m in matches if len(m) > 0 ])
+                    message = str(nmatched)+' of '+str(len(labels))+' positions matched known events'
+                    if len(errors) > 0:
+                        message += '; unrecognised positions on lines '+\
+                                    ', '.join([ str(n) for n in errors ])
+
+            if events != None:
+
+                if separations != None:
+                    rows = render_event_queryset_as_table_rows(events, separations=separations,
+                                                               ordered=True)
+                else:
+                    rows = render_event_queryset_as_table_rows(events)
+
+                if len(rows) == 0 and len(message) == 0:
+                    message = 'Search returned no matching entries'
 
-                return render(request, 'events/search_events.html',
-                              {'eform':eform, 'pform':pform, 'nform':nform,
-                               'search_type':search_type,
-                               'fields': eform.fields['field'].choices,
-                               'operators': eform.fields['operator'].choices,
-                               'status_options': eform.fields['status'].choices,
-                               'rows': rows, 'message': message})
+            elif search_type == 'crossmatch' and xform.is_valid():
+
+                rows = ()
 
             else:
 
                 eform = EventSearchForm()
                 pform = EventPositionForm()
                 nform = EventNameForm()
+                cform = EventConeSearchForm()
+                xform = EventCrossmatchForm()
 
                 rows = ()
 
                 message = 'Error - invalid form input'
 
-                return render(request, 'events/search_events.html', \
-                              {'eform':eform, 'pform':pform, 'nform':nform,
-                                   'search_type':search_type,
-                                   'fields': eform.fields['field'].choices,
-                                   'operators': eform.fields['operator'].choices,
-                                   'status_options': eform.fields['status'].choices,
-                                   'rows': rows, 'message': message})
-
         else:
 
             eform = EventSearchForm()
             pform = EventPositionForm()
             nform = EventNameForm()
+            cform = EventConeSearchForm()
+            xform = EventCrossmatchForm()
 
             rows = ()
 
-            return render(request, 'events/search_events.html', \
-                          {'eform':eform, 'pform':pform, 'nform':nform,
-                               'search_type':search_type,
-                               'fields': eform.fields['field'].choices,
-                               'operators': eform.fields['operator'].choices,
-                               'status_options': eform.fields['status'].choices,
-                               'rows': rows, 'message': ''})
+        return render(request, 'events/search_events.html', \
+                      {'eform':eform, 'pform':pform, 'nform':nform,
+                       'cform':cform, 'xform':xform,
+                       'search_type':search_type,
+                       'fields': eform.fields['field'].choices,
+                       'operators': eform.fields['operator'].choices,
+                       'status_options': eform.fields['status'].choices,
+                       'rows': rows, 'show_separations': (separations != None),
+                       'crossmatch_rows': crossmatch_rows,
+                       'message': message})
 
     else:
 
         return HttpResponseRedirect('login')
 
+# Largest number of positions crossmatched in one request
+CROSSMATCH_MAX_POSITIONS = 5000
+
+def parse_crossmatch_positions(text):
+    """
+    Function to read a list of positions to crossmatch, one per line, each
+    given as RA and Dec in decimal degrees or sexigesimal format, optionally
+    preceded by a label, separated by spaces or commas.  Lines starting with
+    # are ignored.
+    Returns the labels, the RAs and Decs in decimal degrees, and the numbers
+    of the lines which could not be read.
+    """
+    labels = []
+    ra_list = []
+    dec_list = []
+    errors = []
+
+    for (n, line) in enumerate(text.splitlines()):
+        line = line.strip()
+        if len(line) == 0 or line.startswith('#'):
+            continue
+
+        entries = line.replace(',', ' ').split()
+        try:
+            (ra, dec) = coords_to_degrees(entries[-2], entries[-1])
+            if not (np.isfinite(ra) and np.isfinite(dec)) or \
+                ra < 0.0 or ra >= 360.0 or abs(dec) > 90.0:
+                raise ValueError('Position outside the sky')
+        except (ValueError, IndexError):
+            errors.append(n+1)
+            continue
+
+        if len(entries) > 2:
+            labels.append(' '.join(entries[0:-2]))
+        else:
+            labels.append(str(len(labels)+1))
+        ra_list.append(ra)
+        dec_list.append(dec)
+
+    return labels, ra_list, dec_list, errors
+
+def render_crossmatch_rows(labels, ra, dec, matches):
+    """
+    Function to return a row for each position crossmatched, giving the
+    events matched to it as (event ID, name, separation) tuples, nearest
+    first.
+    """
+    event_ids = set([ event_id for m in matches for (event_id, sep) in m ])
+    event_names = query_db.get_names_for_events(list(event_ids))
+
+    rows = []
+    for i in range(len(labels)):
+        events = [ (event_id, event_names.get(event_id, [''])[0], round(sep, 2))
+                   for (event_id, sep) in matches[i] ]
+        rows.append( (labels[i], round(ra[i], 6), round(dec[i], 6), events) )
+
+    return rows
+
 
 ##############################################################################################################
 @login_required(login_url='/db/login/')
+@page_validators.conditional_page(page_validators.get_event_page_validators)
 def show_event_by_id(request, event_id):
     """
     Will set up a single event page and display the lightcurve.
@@ -1564,7 +1806,7 @@ def show_event_by_id(request, event_id):
             else:
                 artemis_name = 'UNKNOWN EVENT'
             try:
-                script, div = plot_it(artemis_name)
+                script, div = get_lightcurve_plot(artemis_name)
             except:
                 script, div = '', 'Detected empty or corrupt datafile in list of lightcurve files.<br>Plotting disabled.'
 
@@ -1693,7 +1935,7 @@ def show_event(request, event_name):
             artemis_name = utilities.long_to_artemis_name(ev_name)
 
             try:
-                script, div = plot_it(artemis_name)
+                script, div = get_lightcurve_plot(artemis_name)
             except:
                 script, div = '', 'Detected empty or corrupt datafile in list of lightcurve files.<br>Plotting disabled.'
 
@@ -1737,8 +1979,11 @@ def display_obs_monitor(request):
     if request.user.is_authenticated():
 
         (script1,div1,start_date1,end_date1) = obs_monitor.analyze_requested_vs_observed(monitor_period_days=5.0)
-        (script2,div2,start_date2,end_date2) = obs_monitor.analyze_percentage_completed(start_date=rome_start,
-                                                                                        end_date=now)
+        # The completion is read from the daily statistics kept by the
+        # update_obs_completion_stats command
+        (script2,div2,start_date2,end_date2) = obs_monitor.analyze_completion_stats(start_date=rome_start,
+                                                                                    end_date=now)
+        field_completion = obs_monitor.get_field_completion(start_date2, end_date2)
         if script1 == None and div1 == None:
 
             script1 = ''
@@ -1762,7 +2007,8 @@ def display_obs_monitor(request):
                    'req_vs_obs_start_date': start_date1.strftime('%Y-%m-%dT%H:%M:%S'),
                    'req_vs_obs_end_date':end_date1.strftime('%Y-%m-%dT%H:%M:%S'),
                    'completion_start_date': start_date2.strftime('%Y-%m-%dT%H:%M:%S'),
-                   'completion_end_date':end_date2.strftime('%Y-%m-%dT%H:%M:%S')}
+                   'completion_end_date':end_date2.strftime('%Y-%m-%dT%H:%M:%S'),
+                   'field_completion': field_completion}
 
         return render(request, 'events/obs_monitor_display.html', context)
 
@@ -1770,6 +2016,66 @@ def display_obs_monitor(request):
 
         return HttpResponseRedirect('login')
 
+##############################################################################################################
+def get_event_obs_chart_data(event_id):
+    """
+    Function to return the numbers shown in the observations pie chart of an
+    event: the number of datapoints in each LCOGT datafile, taking the most
+    recent entry for each file, with the telescope and colour of each.
+    """
+    # Make sure duplicate entries are avoided. Start adding by most recent files
+    data_all = DataFile.objects.filter(event_id=event_id).order_by('last_hjd').reverse()
+    data = []
+    check_list = []
+    for f in data_all:
+        if f.datafile not in check_list:
+            data.append(f)
+            check_list.append(f.datafile)
+
+    labels = []
+    values = []
+    colors = []
+    for i in data:
+        if 'LCOGT' in i.tel:
+            labels.append(i.tel)
+            values.append(i.ndata)
+            try:
+                colors.append('#'+col_dict[site_dict[i.datafile.split('/')[-1][0]][1]])
+            except:
+                # Derive the colour from the file name so that it, and the
+                # cached chart, stay the same between requests
+                colors.append('#'+hashlib.md5(i.datafile.encode('utf-8')).hexdigest()[0:6].upper())
+
+    return {'labels': labels, 'colors': colors, 'values': values, 'ndata': sum(values)}
+
+def get_obs_chart_url(chart_file):
+
+    return settings.MEDIA_URL+os.path.basename(settings.OBS_CHART_DIR.rstrip('/'))+'/'+chart_file
+
+##############################################################################################################
+@login_required(login_url='/db/login/')
+def event_obs_chart_data(request, event_name):
+    """
+    Will return the numbers shown in the observations pie chart of an event
+    as JSON, for rendering by the client.
+    """
+
+    if request.user.is_authenticated():
+        event_name = short_to_long_name(event_name)
+        try:
+            event_id = EventName.objects.get(name=event_name).event_id
+        except EventName.DoesNotExist:
+            raise Http404("Event does not exist.")
+
+        chart_data = get_event_obs_chart_data(event_id)
+        chart_data['event_id'] = event_id
+
+        return JsonResponse(chart_data)
+
+    else:
+
+        return HttpResponseRedirect('login')
+
 ##############################################################################################################
 @login_required(login_url='/db/login/')
 def event_obs_details(request, event_name):
@@ -1782,35 +2088,6 @@ def event_obs_details(request, event_name):
         event_name = short_to_long_name(event_name)
         # Get the ID for this event
         event_id = EventName.objects.get(name=event_name).event_id
-        # Define pie chart plotting
-        # arguments are [telescopes], [colors], [number_observations], ndata, event_id
-        def pie_chart(tels, cols, num_obs, ndata, event_id):
-            from pylab import figure, rcParams, title, legend, savefig, close, axes, pie
-            from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
-            import os
-            fig = figure(num=11, figsize=[10, 10])
-            ax = fig.add_subplot(111)
-            rcParams['axes.titlesize'] = 10.0
-            rcParams['xtick.labelsize'] = 14.0
-            rcParams['legend.fontsize'] = 22.0
-            rcParams['font.size'] = 22.0
-            colors=cols
-            fracs=num_obs
-            patches = ax.pie(fracs, colors=cols, labels=tels, labeldistance=0.95, explode=None, autopct='%1.f%%', shadow=False)
-            for pie_wedge in patches[0]:
-                pie_wedge.set_edgecolor('white')
-
-            title = "Observations: "+str(ndata)
-            legend([k[0]+': '+str(k[1]) for k in zip(tels, num_obs)],loc=(-.12,-.12), framealpha=0.4)
-            canvas = FigureCanvas(fig)
-            filename = settings.MEDIA_ROOT+str(event_id)+".png"
-            if (os.path.exists(filename) ):
-                os.remove(filename)
-            # save the new file
-            canvas.print_figure(filename)
-            # close the figure
-            close(11)
-
         time_now = datetime.now()
         time_now_jd = Time(time_now).jd
         possible_status = {
@@ -1856,53 +2133,33 @@ def event_obs_details(request, event_name):
                     obs_recent = DataFile.objects.select_related().filter(event=event).values().latest('last_hjd')
                     status_recent = Event.objects.get(pk=event_id).status
                     #status_recent = RobonetStatus.objects.select_related().filter(event=event).values().latest('timestamp')
-                    # Make sure duplicate entries are avoided. Start adding by most recent files
-                    data_all = DataFile.objects.filter(event_id=event_id).order_by('last_hjd').reverse()
-                    data = []
-                    check_list = []
-                    for f in data_all:
-                        if f.datafile not in check_list:
-                            data.append(f)
-                            check_list.append(f.datafile)
-                            labels = []
-                            values = []
-                            colors = []
-                            for i in data:
-                                if 'LCOGT' in i.tel:
-                                    labels.append(i.tel)
-                                    values.append(i.ndata)
-                                    try:
-                                        colors.append('#'+col_dict[site_dict[i.datafile.split('/')[-1][0]][1]])
-                                    except:
-                                        import random
-                                        r = lambda: random.randint(0,255)
-                                        rand_col = '#%02X%02X%02X' % (r(),r(),r())
-                                        colors.append(rand_col)
-                            #ndata = sum([(i.ndata) for i in data]) # Contains ALL data from ALL telescopes
-                            ndata = sum(values) # Contains only LCOGT data
-                            pie_chart(labels, colors, values, ndata, event_id)
-                            if labels == []:
-                                my_pie = 'No RoboNet data'
-                            else:
-                                my_pie = '<img src="/media/%s.png" height="300" width="300">' % str(event_id)
-                            try:
-                                cadence = Tap.objects.filter(event_id=event_id)[0].tsamp
-                            except:
-                                cadence = -1
-                            last_obs_hjd = obs_recent['last_hjd']
-                            last_obs = Time(float(last_obs_hjd), format='jd', scale='utc').iso
-                            last_updated = single_recent['last_updated']
-                            last_updated_hjd =  Time(last_updated).jd
-                            tel_id = obs_recent['datafile'].split('/')[-1].split('_')
-                            if len(tel_id) == 2:
-                                tel_id = tel_id[0]+'_'
-                            else:
-                                tel_id = obs_recent['datafile'].split('/')[-1][0]
-                                last_obs_tel = site_dict[tel_id][-1]
-                                status = status_recent
-                                ogle_url = ''
-                            if "OGLE" in ev_name:
-                                ogle_url = 'http://ogle.astrouw.edu.pl/ogle4/ews/%s/%s.html' % (ev_name.split('-')[1], 'blg-'+ev_name.split('-')[-1])
+                    chart_data = get_event_obs_chart_data(event_id)
+                    ndata = chart_data['ndata'] # Contains only LCOGT data
+                    if chart_data['labels'] == []:
+                        my_pie = 'No RoboNet data'
+                    else:
+                        chart_file = db_plotting_utilities.get_event_obs_pie_chart(event_id,
+                                                     chart_data['labels'], chart_data['colors'],
+                                                     chart_data['values'], ndata)
+                        my_pie = '<img src="%s" height="300" width="300">' % get_obs_chart_url(chart_file)
+                    try:
+                        cadence = Tap.objects.filter(event_id=event_id)[0].tsamp
+                    except:
+                        cadence = -1
+                    last_obs_hjd = obs_recent['last_hjd']
+                    last_obs = Time(float(last_obs_hjd), format='jd', scale='utc').iso
+                    last_updated = single_recent['last_updated']
+                    last_updated_hjd =  Time(last_updated).jd
+                    tel_id = obs_recent['datafile'].split('/')[-1].split('_')
+                    if len(tel_id) == 2:
+                        tel_id = tel_id[0]+'_'
+                    else:
+                        tel_id = obs_recent['datafile'].split('/')[-1][0]
+                        last_obs_tel = site_dict[tel_id][-1]
+                        status = status_recent
+                        ogle_url = ''
+                    if "OGLE" in ev_name:
+                        ogle_url = 'http://ogle.astrouw.edu.pl/ogle4/ews/%s/%s.html' % (ev_name.split('-')[1], 'blg-'+ev_name.split('-')[-1])
 
                 except:
                     #pie_url = ''
@@ -1999,6 +2256,7 @@ def query_obs_requests(request):
 @api_view(['GET'])
 @authentication_classes((TokenAuthentication, BasicAuthentication))
 @permission_classes((IsAuthenticated,))
+@page_validators.conditional_page(page_validators.get_obs_request_validators)
 def query_obs_by_date(request, timestamp, time_expire, request_status):
     """Function to provide an endpoint for users to query what observation
     requests have been made within a specified date range"""
@@ -2077,6 +2335,287 @@ def query_event_in_survey(request, ra=None, dec=None):
 
         return render(request, 'events/404.html', {})
 
+##############################################################################################################
+# VERSIONED JSON APIs
+# Return the information of the query endpoints above as JSON, for
+# programmatic clients.  Lists are paginated by cursor, following the next
+# link of each page, and the fields parameter selects the fields returned.
+
+API_VERSION = 1
+
+# Fields available from each list endpoint, with the attribute giving each
+API_OBS_REQUEST_FIELDS = OrderedDict([ ('pk', 'pk'), ('field', 'field.name'),
+                    ('grp_id', 'grp_id'), ('track_id', 'track_id'),
+                    ('req_id', 'req_id'), ('timestamp', 'timestamp'),
+                    ('time_expire', 'time_expire'),
+                    ('request_status', 'request_status'),
+                    ('request_type', 'request_type'), ('t_sample', 't_sample'),
+                    ('exptime', 'exptime'), ('n_exp', 'n_exp'),
+                    ('which_site', 'which_site'), ('which_inst', 'which_inst'),
+                    ('which_filter', 'which_filter') ])
+
+API_SUBREQUEST_FIELDS = OrderedDict([ ('pk', 'pk'), ('sr_id', 'sr_id'),
+                    ('grp_id', 'grp_id'), ('track_id', 'track_id'),
+                    ('window_start', 'window_start'),
+                    ('window_end', 'window_end'), ('status', 'status'),
+                    ('time_executed', 'time_executed') ])
+
+class APICursorPagination(CursorPagination):
+    """Pagination of the JSON API lists in order of primary key, so that
+    entries added while a client pages through a list are not skipped or
+    repeated"""
+
+    ordering = 'pk'
+    page_size = 500
+    page_size_query_param = 'limit'
+    max_page_size = 5000
+
+def select_api_fields(request, available_fields):
+    """Function to return the names of the fields requested by the
+    comma-separated fields parameter of the request, or all those
+    available.  Raises ValueError for an unknown field."""
+
+    fields = request.GET.get('fields')
+    if fields == None or len(fields.strip()) == 0:
+        return list(available_fields.keys())
+
+    fields = [ f.strip() for f in fields.split(',') if len(f.strip()) > 0 ]
+    for f in fields:
+        if f not in available_fields:
+            raise ValueError('Unknown field '+f+', available fields are '+\
+                             ', '.join(available_fields.keys()))
+
+    return fields
+
+def get_api_datetime(request, key):
+    """Function to return the datetime given by a parameter of the request
+    in ISO format, taken as UTC if no timezone is given, or None if the
+    parameter is not given.  Raises ValueError for an invalid datetime."""
+
+    value = request.GET.get(key)
+    if value == None:
+        return None
+
+    dt = parse_datetime(value)
+    if dt == None:
+        raise ValueError('Invalid datetime for '+key+': '+value)
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt, pytz.utc)
+
+    return dt
+
+def api_error_response(message, status=400):
+
+    return Response({'version': API_VERSION, 'error': message}, status=status)
+
+def api_list_response(request, qs, available_fields):
+    """Function to return a page of the entries of a QuerySet, with the
+    fields selected by the request"""
+
+    fields = select_api_fields(request, available_fields)
+
+    paginator = APICursorPagination()
+    page = paginator.paginate_queryset(qs, request)
+
+    results = []
+    for entry in page:
+        results.append({ f: get_attribute_value(entry, available_fields[f]) for f in fields })
+
+    response = paginator.get_paginated_response(results)
+    response.data['version'] = API_VERSION
+
+    return response
+
+@api_view(['GET'])
+@authentication_classes((TokenAuthentication, BasicAuthentication))
+@permission_classes((IsAuthenticated,))
+@page_validators.conditional_page(page_validators.get_obs_request_validators)
+def api_v1_obs_requests(request):
+    """Function to provide a JSON API endpoint listing the observation
+    requests submitted after the time given by the submitted_after parameter
+    and expiring by the time given by expires_before, optionally with the
+    status given by request_status, or one of a comma-separated list of
+    statuses"""
+
+    try:
+        qs = ObsRequest.objects.select_related('field')
+
+        submitted_after = get_api_datetime(request, 'submitted_after')
+        if submitted_after != None:
+            qs = qs.filter(timestamp__gt=submitted_after)
+
+        expires_before = get_api_datetime(request, 'expires_before')
+        if expires_before != None:
+            qs = qs.filter(time_expire__lte=expires_before)
+
+        request_status = request.GET.get('request_status')
+        if request_status != None and request_status != 'ALL':
+            qs = qs.filter(request_status__in=request_status.split(','))
+
+        return api_list_response(request, qs, API_OBS_REQUEST_FIELDS)
+
+    except ValueError as e:
+        return api_error_response(str(e))
+
+@api_view(['GET'])
+@authentication_classes((TokenAuthentication, BasicAuthentication))
+@permission_classes((IsAuthenticated,))
+@page_validators.conditional_page(page_validators.get_active_obs_validators)
+def api_v1_active_obs_requests(request):
+    """Function to provide a JSON API endpoint listing the currently-active
+    observation requests"""
+
+    try:
+        qs = query_db.get_active_obs().select_related('field')
+
+        return api_list_response(request, qs, API_OBS_REQUEST_FIELDS)
+
+    except ValueError as e:
+        return api_error_response(str(e))
+
+@api_view(['GET'])
+@authentication_classes((TokenAuthentication, BasicAuthentication))
+@permission_classes((IsAuthenticated,))
+@page_validators.conditional_page(page_validators.get_subrequest_validators)
+def api_v1_subrequests(request):
+    """Function to provide a JSON API endpoint listing the subrequests of
+    the observation request with the Group ID given by the grp_id parameter,
+    or all subrequests, optionally with the status given by status"""
+
+    try:
+        grp_id = request.GET.get('grp_id')
+        if grp_id != None:
+            qs = query_db.get_subrequests_for_obsrequest(grp_id)
+        else:
+            qs = SubObsRequest.objects.all()
+
+        status = request.GET.get('status')
+        if status != None:
+            qs = qs.filter(status__in=status.split(','))
+
+        return api_list_response(request, qs, API_SUBREQUEST_FIELDS)
+
+    except ValueError as e:
+        return api_error_response(str(e))
+
+@api_view(['GET'])
+@authentication_classes((TokenAuthentication, BasicAuthentication))
+@permission_classes((IsAuthenticated,))
+def api_v1_image_search(request, image_name):
+    """Function to provide a JSON API endpoint to check whether an image is
+    known to the DB or not"""
+
+    return Response({'version': API_VERSION, 'image_name': image_name,
+                     'in_db': query_db.check_image_in_db(image_name)})
+
+@api_view(['GET'])
+@permission_classes((AllowAny,))
+def api_v1_event_in_survey(request):
+    """Function to provide a PUBLIC JSON API endpoint to query whether the
+    coordinates given by the ra and dec parameters, in decimal degrees,
+    lie within the ROME/REA survey fields"""
+
+    try:
+        ra = float(request.GET['ra'])
+        dec = float(request.GET['dec'])
+    except (KeyError, ValueError):
+        return api_error_response('ra and dec must be given in decimal degrees')
+
+    result = query_db.get_field_containing_coordinates({'ra':ra, 'dec':dec})
+    in_survey = ('ROME-FIELD' in result)
+
+    return Response({'version': API_VERSION, 'ra': ra, 'dec': dec,
+                     'in_survey': in_survey,
+                     'field': result if in_survey else None})
+
+# Largest number of records accepted by an ingestion request
+API_INGEST_MAX_RECORDS = 1000
+
+def api_ingest_response(request, upsert_bulk):
+    """Function to write the records posted to an ingestion endpoint with
+    the given bulk writer, returning the outcome for each record.  Records
+    may be posted as a JSON list or as the records entry of an object."""
+
+    records = request.data
+    if isinstance(records, dict):
+        records = records.get('records')
+    if not isinstance(records, list) or \
+        not all([ isinstance(r, dict) for r in records ]):
+        return api_error_response('Records must be posted as a JSON list of objects')
+    if len(records) > API_INGEST_MAX_RECORDS:
+        return api_error_response('At most '+str(API_INGEST_MAX_RECORDS)+\
+                                  ' records may be posted at once')
+
+    outcomes = upsert_bulk(records)
+
+    results = [ {'ok': ok, 'message': message} for (ok, message) in outcomes ]
+
+    return Response({'version': API_VERSION,
+                     'n_ok': len([ r for r in results if r['ok'] ]),
+                     'results': results})
+
+@api_view(['POST'])
+@authentication_classes((TokenAuthentication, BasicAuthentication))
+@permission_classes((IsAuthenticated,))
+def api_v1_ingest_images(request):
+    """Function to provide a JSON API endpoint to add a list of images to
+    the database, or update those already known, in one transaction.
+    Each record has the parameters of record_image."""
+
+    return api_ingest_response(request, update_db_2.upsert_images_bulk)
+
+@api_view(['POST'])
+@authentication_classes((TokenAuthentication, BasicAuthentication))
+@permission_classes((IsAuthenticated,))
+def api_v1_ingest_subrequests(request):
+    """Function to provide a JSON API endpoint to add a list of subrequests
+    to the database, or update those already known, in one transaction.
+    Each record has the parameters of record_sub_obs_request."""
+
+    return api_ingest_response(request, update_db_2.upsert_sub_requests_bulk)
+
+@api_view(['POST'])
+@authentication_classes((TokenAuthentication, BasicAuthentication))
+@permission_classes((IsAuthenticated,))
+def api_v1_crossmatch(request):
+    """Function to provide a JSON API endpoint to find the events within a
+    radius (arcsec, default 2.5) of each of a list of positions, posted as
+    [ra, dec] pairs in decimal degrees.  The matches of each position are
+    returned nearest first."""
+
+    if not isinstance(request.data, dict):
+        return api_error_response('The request must be a JSON object with a list of positions and an optional radius')
+
+    positions = request.data.get('positions')
+    try:
+        radius = float(request.data.get('radius', 2.5))
+        positions = np.array(positions, dtype=float)
+        if positions.ndim != 2 or positions.shape[1] != 2 or \
+            not (0.0 < radius <= 3600.0):
+            raise ValueError
+    except (TypeError, ValueError):
+        return api_error_response('Positions must be posted as a list of [ra, dec] pairs in decimal degrees, with a radius of up to 3600 arcsec')
+    if len(positions) > CROSSMATCH_MAX_POSITIONS:
+        return api_error_response('At most '+str(CROSSMATCH_MAX_POSITIONS)+\
+                                  ' positions can be crossmatched per request')
+    if not np.isfinite(positions).all() or (positions[:,0] < 0.0).any() or \
+        (positions[:,0] >= 360.0).any() or (np.abs(positions[:,1]) > 90.0).any():
+        return api_error_response('Positions must lie on the sky, with 0 <= ra < 360 and -90 <= dec <= 90 degrees')
+
+    matches = query_db.crossmatch_positions(positions[:,0], positions[:,1], radius)
+    event_names = query_db.get_names_for_events(list(set([ event_id for m in matches
+                                                           for (event_id, sep) in m ])))
+
+    results = []
+    for i in range(len(matches)):
+        results.append({'ra': float(positions[i,0]), 'dec': float(positions[i,1]),
+                        'matches': [ {'pk': event_id,
+                                      'names': event_names.get(event_id, []),
+                                      'separation': sep}
+                                     for (event_id, sep) in matches[i] ]})
+
+    return Response({'version': API_VERSION, 'radius': radius, 'results': results})
+
 ##############################################################################################################
 @login_required(login_url='/db/login/')
 def record_obs_request(request):
@@ -56,6 +56,7 @@ REST_FRAMEWORK = {
 }
 
 MIDDLEWARE = [
+    'events.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -93,12 +94,28 @@ TEMPLATES = [
 # Database
 # https://docs.djangoproject.com/en/1.10/ref/settings/#databases
 
+# The SQLite database is shared by the cron writers and the web readers.
+# WAL mode lets readers continue while a write is in progress, and the busy
+# timeout makes a writer wait for the lock rather than failing with
+# "database is locked".  Each setting can be overridden from the environment.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 268435456)),
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -65536)),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 30000)),
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'robonet_site.sqlite_backend',
         #'NAME': '/var/www/robonetsite/db.sqlite3',
         # FOR LOCAL TESTING ONLY:
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'OPTIONS': {
+            'timeout': SQLITE_PRAGMAS['busy_timeout']/1000.0,
+            'pragmas': SQLITE_PRAGMAS,
+        },
     }
 }
 
@@ -148,6 +165,13 @@ STATICFILES_DIRS = [
        os.path.join(BASE_DIR, "project_website/static/project_website/"),
 ]
 
+# Cache of the lightcurve archives built for download, and its size limit
+LIGHTCURVE_ARCHIVE_DIR = os.path.join(MEDIA_ROOT, 'lightcurve_archives')
+LIGHTCURVE_ARCHIVE_CACHE_BYTES = int(os.environ.get('LIGHTCURVE_ARCHIVE_CACHE_BYTES', 512*1024*1024))
+
+# Cached observation pie charts of the event_obs_details pages
+OBS_CHART_DIR = os.path.join(MEDIA_ROOT, 'obs_charts')
+
 LOGIN_REDIRECT_URL = 'dashboard'
 MESSAGE_LEVEL = 1
 
@@ -155,3 +179,56 @@ CSRF_USE_SESSIONS = True
 
 # Necessary migration post Django 3.2
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
+
+# Snapshot of the LCO proposal and telescope states shown on the dashboard,
+# refreshed by the refresh_dashboard_snapshot command.  Sections older than
+# DASHBOARD_SNAPSHOT_MAX_AGE seconds are flagged as stale.
+LCO_API_URL = os.environ.get('LCO_API_URL', 'https://observe.lco.global/api')
+DASHBOARD_SNAPSHOT_PATH = os.environ.get('DASHBOARD_SNAPSHOT_PATH',
+                                         os.path.join(BASE_DIR, 'data', 'dashboard_snapshot.json'))
+DASHBOARD_SNAPSHOT_MAX_AGE = int(os.environ.get('DASHBOARD_SNAPSHOT_MAX_AGE', 900))
+
+# Cache for data fetched from other services, such as the survey links on
+# the event pages.  Each web server process keeps its own cache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'robonet_site',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    # Rendered lightcurve plots, on disk so that they are shared between
+    # processes and can be invalidated by artemis_subscriber
+    'lightcurves': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('LIGHTCURVE_CACHE_DIR',
+                                   os.path.join(BASE_DIR, 'data', 'cache', 'lightcurves')),
+        'TIMEOUT': 7*86400,
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+}
+
+# Timeout in seconds for each survey site scraped for the event pages, and
+# how long links found, or not found, are cached
+SURVEY_LINKS_TIMEOUT = float(os.environ.get('SURVEY_LINKS_TIMEOUT', 5.0))
+SURVEY_LINKS_CACHE_TTL = int(os.environ.get('SURVEY_LINKS_CACHE_TTL', 21600))
+SURVEY_LINKS_NEGATIVE_TTL = int(os.environ.get('SURVEY_LINKS_NEGATIVE_TTL', 1800))
+
+# Outbound requests to the LCO API and survey sites: the hosts and
+# connections per host kept open, the threads requests are fanned out
+# over, and the default timeout of each request in seconds
+OUTBOUND_POOL_HOSTS = int(os.environ.get('OUTBOUND_POOL_HOSTS', 10))
+OUTBOUND_POOL_SIZE = int(os.environ.get('OUTBOUND_POOL_SIZE', 10))
+OUTBOUND_MAX_WORKERS = int(os.environ.get('OUTBOUND_MAX_WORKERS', 20))
+OUTBOUND_TIMEOUT = float(os.environ.get('OUTBOUND_TIMEOUT', 20.0))
+
+# Log of the time, database queries and outbound requests of each request
+# served, summarised on the performance page from its most recent records.
+# Monitoring is off unless enabled, as it times every outbound request made
+# through the requests package.  The log is shared by the web server
+# processes and must be rotated by logrotate, keeping PERFORMANCE_LOG_BACKUPS
+# uncompressed files, as in docker/etc/logrotate.d/robonet_performance
+PERFORMANCE_MONITORING = os.environ.get('PERFORMANCE_MONITORING', '0') == '1'
+PERFORMANCE_LOG_PATH = os.environ.get('PERFORMANCE_LOG_PATH',
+                                      os.path.join(BASE_DIR, 'data', 'logs', 'performance.log'))
+PERFORMANCE_LOG_BACKUPS = int(os.environ.get('PERFORMANCE_LOG_BACKUPS', 5))
+PERFORMANCE_SUMMARY_RECORDS = int(os.environ.get('PERFORMANCE_SUMMARY_RECORDS', 50000))
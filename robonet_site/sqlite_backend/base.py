@@ -0,0 +1,53 @@
+"""
+SQLite database backend which applies a set of PRAGMA settings to every
+new connection, so that the cron writers and the web readers sharing the
+database file can run concurrently.
+
+The pragmas are given as a dictionary in the 'pragmas' entry of the
+database OPTIONS, e.g.
+
+    'OPTIONS': {'timeout': 30,
+                'pragmas': {'journal_mode': 'WAL', 'synchronous': 'NORMAL'}}
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+# Pragmas which may be configured, in the order they are applied.
+# busy_timeout is set first so that changing the journal mode waits for
+# other connections rather than failing.
+SUPPORTED_PRAGMAS = ['busy_timeout', 'journal_mode', 'synchronous',
+                     'mmap_size', 'cache_size', 'temp_store', 'wal_autocheckpoint']
+
+def format_pragma_value(name, value):
+    """Return the value of a pragma as a string safe to include in the
+    PRAGMA statement, which does not accept query parameters"""
+
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ImproperlyConfigured('Invalid value for SQLite pragma '+name+': '+repr(value))
+    if isinstance(value, str) and not value.isalnum():
+        raise ImproperlyConfigured('Invalid value for SQLite pragma '+name+': '+repr(value))
+
+    return str(value)
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pragmas = params.pop('pragmas', {})
+
+        for name in self.pragmas.keys():
+            if name not in SUPPORTED_PRAGMAS:
+                raise ImproperlyConfigured('Unsupported SQLite pragma: '+str(name))
+
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+
+        for name in SUPPORTED_PRAGMAS:
+            if name in self.pragmas:
+                value = format_pragma_value(name, self.pragmas[name])
+                conn.execute('PRAGMA '+name+' = '+value).fetchall()
+
+        return conn
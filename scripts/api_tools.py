@@ -681,3 +681,251 @@ def parse_db_message(response):
         message = response.text
 
     return message
+
+################################################################################
+# Clients of the versioned JSON API
+
+def get_api_url(end_point,testing=False):
+    """Function to return the URL of an endpoint of the JSON API"""
+
+    if testing == True:
+        host_url = 'http://127.0.0.1:8000/db'
+    else:
+        host_url = 'https://robonet.lco.global/db'
+
+    return host_url + '/api/v1/' + end_point + '/'
+
+def ask_db_json(url,token,params={},verbose=False):
+    """Method to query an endpoint of the JSON API of the ROME/REA database.
+
+    Required arguments are:
+        url         string   URL of the API endpoint
+        token       string   User token login for database, or None for
+                             the public endpoints
+
+    Optional arguments:
+        params      dict               Query parameters
+        verbose     boolean            Switch for additional debugging output
+
+    Returns:
+        message     string   'OK' or the error reported
+        payload     dict     Decoded JSON response
+    """
+
+    if verbose==True:
+        print('End point URL:',url,params)
+
+    headers = {'Accept': 'application/json'}
+    if token != None and len(token) > 0:
+        headers['Authorization'] = 'Token ' + token
+
+    response = requests.get(url, params=params, headers=headers)
+
+    try:
+        payload = response.json()
+    except ValueError:
+        return response.text, {}
+
+    if 'error' in payload:
+        message = payload['error']
+    elif response.status_code != 200:
+        message = payload.get('detail', 'HTTP status '+str(response.status_code))
+    else:
+        message = 'OK'
+
+    return message, payload
+
+def ask_db_json_list(end_point,token,params={},testing=False,verbose=False):
+    """Method to retrieve all the entries of a list endpoint of the JSON API,
+    following the cursor of each page to the next.
+
+    Returns:
+        message     string   'OK' or the error reported
+        results     list     Entries of the list, as dictionaries
+    """
+
+    url = get_api_url(end_point,testing=testing)
+
+    results = []
+
+    while url != None:
+
+        (message, payload) = ask_db_json(url,token,params=params,
+                                         verbose=verbose)
+
+        if message != 'OK':
+            return message, results
+
+        results = results + payload['results']
+
+        # The next link repeats the query parameters
+        url = payload['next']
+        params = {}
+
+    return message, results
+
+def get_obs_list_json(config,params,testing=False,verbose=False):
+    """Function to retrieve from the JSON API a list of observations
+    matching the parameters given, as returned by get_obs_list.
+
+    Inputs:
+        :param dict config: script configuration parameters
+        :param dict params: timestamp, time_expire and request_status, as
+                            for get_obs_list
+    """
+
+    qparams = {'submitted_after': params['timestamp'].strftime("%Y-%m-%dT%H:%M:%S"),
+               'expires_before': params['time_expire'].strftime("%Y-%m-%dT%H:%M:%S"),
+               'request_status': params['request_status'],
+               'fields': 'pk,grp_id,track_id,timestamp,time_expire,request_status'}
+
+    (message, results) = ask_db_json_list('obs_requests',config['db_token'],
+                                          params=qparams,
+                                          testing=testing,verbose=verbose)
+
+    obs_list = []
+
+    for r in results:
+
+        entry = {}
+        entry['pk'] = r['pk']
+        entry['grp_id'] = r['grp_id']
+        entry['track_id'] = r['track_id']
+        entry['timestamp'] = datetime.fromisoformat(r['timestamp'][0:19])
+        entry['time_expire'] = datetime.fromisoformat(r['time_expire'][0:19])
+        entry['status'] = r['request_status']
+
+        obs_list.append( entry )
+
+    return message, obs_list
+
+def get_active_obs_json(config,fields=None,testing=False,verbose=False):
+    """Function to retrieve from the JSON API the currently-active
+    observation requests, optionally with only the fields listed"""
+
+    params = {}
+    if fields != None:
+        params['fields'] = ','.join(fields)
+
+    return ask_db_json_list('active_obs_requests',config['db_token'],
+                            params=params,testing=testing,verbose=verbose)
+
+def get_subrequests_json(config,grp_id,testing=False,verbose=False):
+    """Function to retrieve from the JSON API the subrequests of the
+    observation request with the given Group ID"""
+
+    return ask_db_json_list('subrequests',config['db_token'],
+                            params={'grp_id': grp_id},
+                            testing=testing,verbose=verbose)
+
+def check_image_in_db_json(config,params,testing=False,verbose=False):
+    """Function to check through the JSON API whether an image is present
+
+    Inputs:
+        :params dict config: script configuration parameters
+        :param dict params: containing image_name as a parameter.
+    Returns:
+        message, and True if the image is in the database
+    """
+
+    url = get_api_url('image_search/'+params['image_name'],testing=testing)
+
+    (message, payload) = ask_db_json(url,config['db_token'],verbose=verbose)
+
+    return message, payload.get('in_db', False)
+
+def query_event_in_survey_json(config,ra,dec,testing=False,verbose=False):
+    """Function to query through the JSON API whether the coordinates, in
+    decimal degrees, lie within the ROME/REA survey fields.
+
+    Returns:
+        message, and True if they do
+    """
+
+    url = get_api_url('event_in_survey',testing=testing)
+
+    (message, payload) = ask_db_json(url,config.get('db_token'),
+                                     params={'ra': ra, 'dec': dec},
+                                     verbose=verbose)
+
+    return message, payload.get('in_survey', False)
+
+def submit_records_batch(config,end_point,records,batch_size=None,
+                         testing=False,verbose=False):
+    """Function to submit a list of records to an ingestion endpoint of the
+    JSON API, in batches of batch_size records, each written by the
+    database in one transaction.
+
+    Inputs:
+        config      dict    script configuration parameters; db_batch_size
+                            sets the default batch size
+        end_point   str     ingestion endpoint, e.g. 'ingest/images'
+        records     list    dictionaries of record parameters
+
+    Returns:
+        results     list    (successful, message) tuple for each record
+    """
+
+    if batch_size == None:
+        batch_size = int(config.get('db_batch_size', 100))
+    batch_size = max(1, min(batch_size, 1000))
+
+    url = get_api_url(end_point,testing=testing)
+    headers = {'Authorization': 'Token ' + config['db_token'],
+               'Accept': 'application/json'}
+
+    results = []
+
+    for i in range(0,len(records),batch_size):
+
+        batch = records[i:i+batch_size]
+
+        if verbose==True:
+            print('End point URL:',url,'records',i,'to',i+len(batch)-1)
+
+        try:
+            response = requests.post(url, json=batch, headers=headers)
+        except requests.RequestException as err:
+            results = results + [ (False, 'No response from the database: '+str(err)) ] * len(batch)
+            continue
+
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = {'error': response.text}
+
+        if 'results' in payload:
+            results = results + [ (r['ok'], r['message']) for r in payload['results'] ]
+        else:
+            message = payload.get('error', payload.get('detail',
+                                  'HTTP status '+str(response.status_code)))
+            results = results + [ (False, message) ] * len(batch)
+
+    return results
+
+def submit_image_records(config,records,batch_size=None,testing=False,verbose=False):
+    """Function to submit a list of image records to the database, adding
+    new images and updating those already known, as submit_image_record
+    does for one image.  Each record has the parameters of
+    submit_image_record.
+
+    Returns the (successful, message) tuple for each record
+    """
+
+    return submit_records_batch(config,'ingest/images',records,
+                                batch_size=batch_size,
+                                testing=testing,verbose=verbose)
+
+def submit_sub_obs_request_records(config,records,batch_size=None,
+                                   testing=False,verbose=False):
+    """Function to submit a list of subrequest records to the database,
+    adding new subrequests and updating those already known, as
+    submit_sub_obs_request_record does for one.  Each record has the
+    parameters of submit_sub_obs_request_record.
+
+    Returns the (successful, message) tuple for each record
+    """
+
+    return submit_records_batch(config,'ingest/subrequests',records,
+                                batch_size=batch_size,
+                                testing=testing,verbose=verbose)
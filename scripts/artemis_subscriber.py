@@ -22,6 +22,7 @@ from numpy import array
 import event_classes
 import update_db_2
 import query_db
+import plotter
 import socket
 import mmap
 import pytz
@@ -49,6 +50,8 @@ def sync_artemis():
     status = check_rsync_config(config,log=log)
     
     if status == True:
+        query_db.event_name_resolver.load()
+        
         sync_artemis_data_db(config,'model',log)
         
         sync_artemis_data_db(config,'pubpars',log)
@@ -205,6 +208,7 @@ def sync_artemis_data_db(config,data_type,log):
         if config['verbose'] == True:
             log.info('Syncing contents of ARTEMiS model files with DB:')
         for f in event_files:
+            plotter.invalidate_lightcurve_plot(path.basename(f).split('.')[0])
             sync_model_file_with_db(config,f,log)
 
     # Loop over all updated data files and update the database:
@@ -216,6 +220,7 @@ def sync_artemis_data_db(config,data_type,log):
             a = path.basename(f).split('.')[0][1:-1]+'.align'
             a = path.join(config['models_local_location'],a)
             check = event_data_check(config,data_file=f,log=log)
+            plotter.invalidate_lightcurve_plot(short_name)
             if check == True:
                 sync_data_align_files_with_db(config,f,a,log)
             else:
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:05:12 2026
+
+@author: rstreet
+
+Tools for benchmarking database queries against a throw-away database
+filled with synthetic events, so that benchmarks never touch the
+operational database.
+"""
+import os
+import sys
+from . import local_conf
+robonet_site = local_conf.get_conf('robonet_site')
+sys.path.append(robonet_site)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.db import connection
+from django.utils import timezone
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+import time
+import numpy as np
+setup()
+
+from events.models import Field, Operator, Event, EventName, SingleModel
+from events.models import DataFile, Tap, get_dec_zone
+from . import utilities
+
+@contextmanager
+def synthetic_database(test_name=None):
+    """Context manager which creates an empty test database with the
+    current schema for the duration of a benchmark, and destroys it
+    afterwards.  SQLite test databases are held in memory unless a
+    test_name (file path) is given, which is needed to benchmark access
+    to the database from several connections."""
+
+    old_name = connection.settings_dict['NAME']
+    if test_name != None:
+        connection.settings_dict['TEST']['NAME'] = test_name
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+def populate_events(n_events, n_entries=3, seed=1):
+    """Function to fill the database with synthetic events in the Bulge,
+    each with n_entries single-lens models, datafiles and TAP entries.
+    Returns the list of Event primary keys."""
+
+    rng = np.random.RandomState(seed)
+    now = timezone.now()
+
+    field = Field.objects.create(name='Outside ROMEREA footprint')
+    operator = Operator.objects.create(name='OGLE')
+
+    ras = rng.uniform(260.0, 275.0, n_events)
+    decs = rng.uniform(-35.0, -20.0, n_events)
+    events = []
+    for i in range(n_events):
+        (ev_ra, ev_dec) = utilities.decdeg2sex(ras[i], decs[i])
+        events.append(Event(field=field, operator=operator,
+                            ev_ra=ev_ra, ev_dec=ev_dec,
+                            ra=Decimal(str(round(ras[i],9))),
+                            dec=Decimal(str(round(decs[i],8))),
+                            dec_zone=get_dec_zone(decs[i]),
+                            status='AC', year='2018'))
+    Event.objects.bulk_create(events, batch_size=500)
+    event_ids = list(Event.objects.order_by('pk').values_list('pk', flat=True))
+
+    names = []
+    models = []
+    datafiles = []
+    taps = []
+    for i, event_id in enumerate(event_ids):
+        name = 'OGLE-2018-BLG-'+str(i+1).zfill(4)
+        names.append(EventName(event_id=event_id, operator=operator, name=name))
+        for j in range(n_entries):
+            ts = now - timedelta(days=int(rng.randint(0,365)), seconds=j)
+            models.append(SingleModel(event_id=event_id, Tmax=2458000.0+j,
+                                      tau=rng.uniform(5.0,100.0),
+                                      umin=rng.uniform(0.001,1.0),
+                                      modeler=['OGLE','ARTEMiS'][j%2],
+                                      last_updated=ts))
+            datafiles.append(DataFile(event_id=event_id, datafile=name+'_'+str(j)+'.dat',
+                                      last_upd=ts, last_hjd=2458000.0+j,
+                                      last_mag=rng.uniform(14.0,21.0),
+                                      tel='1m0', ndata=100))
+            taps.append(Tap(event_id=event_id, timestamp=ts,
+                            omega=round(rng.uniform(0.0,10.0),4),
+                            priority=['A','L','N'][j%3]))
+
+    for (model, entries) in [ (EventName, names), (SingleModel, models),
+                              (DataFile, datafiles), (Tap, taps) ]:
+        model.objects.bulk_create(entries, batch_size=500)
+
+    return event_ids
+
+@contextmanager
+def count_queries():
+    """Context manager which records the SQL of every query made through
+    the default database connection within it, in the list it yields"""
+
+    queries = []
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_query):
+        yield queries
+
+@contextmanager
+def assert_query_budget(max_queries):
+    """Context manager for tests which fails if the code within it makes
+    more than max_queries queries.  Used to check that the number of
+    queries made by a page does not grow with the number of rows in it."""
+
+    with count_queries() as queries:
+        yield queries
+
+    if len(queries) > max_queries:
+        raise AssertionError(str(len(queries))+' queries made, exceeding the budget of '+\
+                             str(max_queries)+':\n'+'\n'.join(queries))
+
+def time_function(function, *args, **kwargs):
+    """Function to time a call to the given function, returning the
+    elapsed time in seconds and the number of queries it made"""
+
+    with count_queries() as queries:
+        t0 = time.perf_counter()
+        function(*args, **kwargs)
+        elapsed = time.perf_counter() - t0
+
+    return elapsed, len(queries)
+
+def format_result(label, elapsed, nqueries, baseline=None):
+    """Function to format one line of a benchmark report"""
+
+    line = label.ljust(40)+' '+('%.4f' % elapsed).rjust(9)+'s '+\
+            str(nqueries).rjust(7)+' queries'
+    if baseline != None and elapsed > 0:
+        line += '  x'+('%.1f' % (baseline/elapsed))
+
+    return line
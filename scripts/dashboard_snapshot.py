@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:12:36 2026
+
+@author: rstreet
+
+Snapshot of the LCO proposal allocation, telescope states and Moon-Bulge
+separation displayed on the dashboard.  The snapshot is refreshed
+periodically by the refresh_dashboard_snapshot command, so that the
+dashboard only reads a local file and is never held up by the LCO API.
+Each section of the snapshot keeps the last good values together with the
+time they were fetched, and the error from the latest attempt if it failed.
+"""
+import os
+import sys
+from . import local_conf
+robonet_site = local_conf.get_conf('robonet_site')
+sys.path.append(robonet_site)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.conf import settings
+from datetime import datetime
+import json
+import tempfile
+import pytz
+setup()
+
+from . import observing_tools, outbound
+
+PROPOSAL_ID = 'KEY2017AB-004'
+SEMESTER = '2019B'
+INSTRUMENT_TYPE = '1M0-SCICAM-SINISTRO'
+
+# Telescopes shown on the dashboard map, keyed by their dashboard names
+TELESCOPES = {'coj_doma': 'coj.doma.1m0a',
+              'coj_domb': 'coj.domb.1m0a',
+              'cpt_doma': 'cpt.doma.1m0a',
+              'cpt_domb': 'cpt.domb.1m0a',
+              'cpt_domc': 'cpt.domc.1m0a',
+              'lsc_doma': 'lsc.doma.1m0a',
+              'lsc_domb': 'lsc.domb.1m0a',
+              'lsc_domc': 'lsc.domc.1m0a'}
+
+SECTIONS = ['proposal', 'telescopes', 'moon']
+
+def fetch_proposal_allocation(token, api_url=None, timeout=20):
+    """Function to query the LCO API for the time used and allocated to the
+    project on the 1m network this semester"""
+
+    if api_url == None:
+        api_url = settings.LCO_API_URL
+
+    response = outbound.get(api_url+'/proposals/?id='+PROPOSAL_ID,
+                            headers={'Authorization': 'Token '+str(token)},
+                            timeout=timeout)
+    response.raise_for_status()
+
+    allocation = None
+    for alloc in response.json()['results'][0]['timeallocation_set']:
+        if alloc['instrument_type'] == INSTRUMENT_TYPE and alloc['semester'] == SEMESTER:
+            allocation = {'time_available': alloc['std_allocation'],
+                          'time_used': alloc['std_time_used'],
+                          'ipp_time_available': alloc['ipp_time_available'],
+                          'ipp_limit': alloc['ipp_limit']}
+
+    if allocation == None:
+        raise ValueError('No '+INSTRUMENT_TYPE+' allocation for '+SEMESTER)
+
+    return allocation
+
+def fetch_telescope_states(token, api_url=None, timeout=20):
+    """Function to query the LCO API for the current state of each
+    telescope shown on the dashboard"""
+
+    if api_url == None:
+        api_url = settings.LCO_API_URL
+
+    response = outbound.get(api_url+'/telescope_states/',
+                            headers={'Authorization': 'Token '+str(token)},
+                            timeout=timeout)
+    response.raise_for_status()
+    telstate_dict = response.json()
+
+    states = {}
+    for key, telescope in TELESCOPES.items():
+        try:
+            states[key] = telstate_dict[telescope][0]['event_type']
+        except (KeyError, IndexError, TypeError):
+            states[key] = 'Unknown'
+
+    return states
+
+def fetch_moon_separation():
+
+    return {'moon_sep': observing_tools.estimate_moon_separation_from_bulge()}
+
+def read_snapshot_file(snapshot_path=None):
+    """Function to return the snapshot as stored, or an empty snapshot if
+    none has been written or it cannot be read"""
+
+    if snapshot_path == None:
+        snapshot_path = settings.DASHBOARD_SNAPSHOT_PATH
+
+    try:
+        with open(snapshot_path, 'r') as f:
+            snapshot = json.load(f)
+    except (IOError, ValueError):
+        snapshot = {}
+
+    for section in SECTIONS:
+        snapshot.setdefault(section, {'data': None, 'updated': None,
+                                      'last_attempt': None, 'error': None})
+
+    return snapshot
+
+def write_snapshot_file(snapshot, snapshot_path=None):
+    """Function to replace the snapshot file, via a temporary file so that
+    readers never see a partly-written snapshot.  The file is made readable
+    by all, as the web server may run as another user than the cron job
+    writing it."""
+
+    if snapshot_path == None:
+        snapshot_path = settings.DASHBOARD_SNAPSHOT_PATH
+
+    snapshot_dir = os.path.dirname(os.path.abspath(snapshot_path))
+    if not os.path.isdir(snapshot_dir):
+        os.makedirs(snapshot_dir)
+
+    (fd, tmp_path) = tempfile.mkstemp(dir=snapshot_dir, suffix='.tmp')
+    os.fchmod(fd, 0o644)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(snapshot, f, indent=1)
+    os.replace(tmp_path, snapshot_path)
+
+def refresh_dashboard_snapshot(token, snapshot_path=None, api_url=None,
+                               timeout=20, log=None):
+    """Function to fetch the sections of the dashboard snapshot at once and
+    store the results.  A section which cannot be fetched within the
+    timeout keeps its last good values, and records the error.
+
+    Inputs:
+        token         str    LCO API token
+        snapshot_path str    Path to the snapshot file
+        api_url       str    Root URL of the LCO API
+        timeout       float  Timeout for each API request in seconds
+        log           Logger object
+    Outputs:
+        snapshot      dict   Updated snapshot
+    """
+
+    fetchers = {'proposal': lambda: fetch_proposal_allocation(token, api_url, timeout),
+                'telescopes': lambda: fetch_telescope_states(token, api_url, timeout),
+                'moon': fetch_moon_separation}
+
+    snapshot = read_snapshot_file(snapshot_path)
+
+    now = datetime.utcnow().replace(tzinfo=pytz.UTC).isoformat()
+    outcomes = outbound.fan_out([ fetchers[section] for section in SECTIONS ],
+                                deadline=outbound.Deadline(timeout))
+
+    for section, (data, error) in zip(SECTIONS, outcomes):
+        snapshot[section]['last_attempt'] = now
+        if error == None:
+            snapshot[section]['data'] = data
+            snapshot[section]['updated'] = now
+            snapshot[section]['error'] = None
+        else:
+            snapshot[section]['error'] = repr(error)
+            if log != None:
+                log.warning('Could not refresh dashboard '+section+': '+repr(error))
+
+    write_snapshot_file(snapshot, snapshot_path)
+
+    return snapshot
+
+def read_dashboard_snapshot(snapshot_path=None, max_age=None):
+    """Function to return the dashboard snapshot, with the age in seconds
+    of each section and whether it is stale: older than max_age, or never
+    fetched"""
+
+    if max_age == None:
+        max_age = settings.DASHBOARD_SNAPSHOT_MAX_AGE
+
+    snapshot = read_snapshot_file(snapshot_path)
+    now = datetime.utcnow().replace(tzinfo=pytz.UTC)
+
+    for section in SECTIONS:
+        entry = snapshot[section]
+        if entry['updated'] != None and entry['data'] != None:
+            updated = datetime.fromisoformat(entry['updated'])
+            entry['age'] = (now - updated).total_seconds()
+            entry['stale'] = entry['age'] > max_age
+        else:
+            entry['age'] = None
+            entry['stale'] = True
+
+    return snapshot
@@ -21,7 +21,13 @@ setup()
 from . import query_db
 import matplotlib.pyplot as plt
 from . import config_parser
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import socket
+import glob
+import hashlib
+import json
+import tempfile
 
 def read_config():
     """Function to read the configuration for the plotting functions"""
@@ -44,10 +50,9 @@ def plot_image_rejection_statistics():
     config = read_config()
     plot_path = os.path.join(config['media_directory'],'image_rejection_stats.png')
 
-    image_stats = query_db.get_image_rejection_statistics()
+    image_stats = query_db.get_image_statistics_rollup()
 
-    keys = image_stats.keys()
-    keys.sort()
+    keys = sorted(image_stats.keys())
     image_totals = []
     legend_text = []
     for k in keys:
@@ -65,5 +70,79 @@ def plot_image_rejection_statistics():
 
     return os.path.basename(plot_path)
 
+def get_obs_chart_fingerprint(labels, colors, values):
+    """Function to return a digest of the numbers and colours shown in an
+    observations pie chart, which names the chart file"""
+
+    content = json.dumps([list(labels), list(colors), list(values)])
+
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()[0:16]
+
+def plot_obs_pie_chart(file_path, labels, colors, values, ndata):
+    """Function to plot a piechart of the number of datapoints from each
+    telescope for an event.  Uses its own figure rather than pyplot's
+    figure state, so that requests can plot charts concurrently."""
+
+    fig = Figure(figsize=[10, 10])
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    patches = ax.pie(values, colors=colors, labels=labels, labeldistance=0.95,
+                     explode=None, autopct='%1.f%%', shadow=False,
+                     textprops={'fontsize': 22.0})
+    for pie_wedge in patches[0]:
+        pie_wedge.set_edgecolor('white')
+    ax.set_title("Observations: "+str(ndata), fontsize=10.0)
+    ax.legend([k[0]+': '+str(k[1]) for k in zip(labels, values)],
+              loc=(-.12,-.12), framealpha=0.4, fontsize=22.0)
+    canvas.print_figure(file_path, format='png')
+
+def get_event_obs_pie_chart(event_id, labels, colors, values, ndata, chart_dir=None):
+    """Function to return the file name of the observations pie chart of
+    an event, plotting it only if the numbers shown have changed since it
+    was last plotted.  Charts are named by event and by the fingerprint of
+    their contents, written atomically, and superseded charts of the event
+    are removed.
+
+    Inputs:
+        event_id   int    Event primary key
+        labels     list   Telescope of each datafile
+        colors     list   Colour of each datafile's wedge
+        values     list   Number of datapoints in each datafile
+        ndata      int    Total number of datapoints
+        chart_dir  str    Directory of the charts, default OBS_CHART_DIR
+    Outputs:
+        file_name  str    Name of the chart file within chart_dir
+    """
+
+    if chart_dir == None:
+        chart_dir = settings.OBS_CHART_DIR
+    if not os.path.isdir(chart_dir):
+        os.makedirs(chart_dir)
+
+    prefix = 'obs_pie_'+str(event_id)+'_'
+    file_name = prefix+get_obs_chart_fingerprint(labels, colors, values)+'.png'
+    file_path = os.path.join(chart_dir, file_name)
+
+    if os.path.isfile(file_path):
+        return file_name
+
+    (fd, tmp_path) = tempfile.mkstemp(dir=chart_dir, prefix=prefix, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            plot_obs_pie_chart(f, labels, colors, values, ndata)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.isfile(tmp_path):
+            os.remove(tmp_path)
+
+    for old_path in glob.glob(os.path.join(chart_dir, prefix+'*.png')):
+        if old_path != file_path:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+    return file_name
+
 if __name__ == '__main__':
     plot_image_rejection_statistics()
@@ -107,7 +107,7 @@ class Lens():
         if debug==True and log!=None:
                 log.info(' -> Checking event name in DB:')
         if event_status == True and 'OK' in response:
-            event = Event.objects.filter(ev_ra=ev_ra).filter(ev_dec=ev_dec)[0]
+            event = query_db.get_event_by_position(ev_ra,ev_dec)
             operator = Operator.objects.filter(name=self.origin)[0]
             (status, response) = update_db_2.add_event_name(event=event,\
                                                             operator=operator,\
@@ -118,9 +118,9 @@ class Lens():
         elif event_status == False and 'exists' in response:
             event = query_db.get_event_by_position(ev_ra,ev_dec)
             if event != None:
-                name_list = query_db.get_event_name_list(event.pk)
-                name_str = utilities.combined_survey_name(name_list)
                 if debug==True and log!=None:
+                    name_list = query_db.get_event_name_list(event.pk)
+                    name_str = utilities.combined_survey_name(name_list)
                     log.info(' -> Current names for this event: '+name_str)
                     log.info(' -> Looking for name: '+str(self.name))
             else:
@@ -128,9 +128,8 @@ class Lens():
                 get_errors.update_err('artemis_subscriber', message)
                 if log!=None:
                     log.info(message)
-                name_list = []
 
-            if event != None and self.name not in name_list:
+            if event != None and query_db.resolve_event_id(self.name) != event.pk:
                 operator = Operator.objects.filter(name=self.origin)[0]
                 (status, response) = update_db_2.add_event_name(event=event,\
                                                             operator=operator,\
@@ -149,9 +148,9 @@ class Lens():
         # Confirm that both Event and EventName are properly registered:
         if log!=None:
             log.info(' -> Verifying event and names registered with DB:')
-        event = Event.objects.filter(ev_ra=ev_ra).filter(ev_dec=ev_dec)[0]
-        eventnames = EventName.objects.filter(event=event.id)
+        event = query_db.get_event_by_position(ev_ra,ev_dec)
         if debug==True and log!=None:
+            eventnames = EventName.objects.filter(event=event.id)
             log.info(' -> Searched for event, found: '+str(event))
             eventname = ''
             for n in eventnames:
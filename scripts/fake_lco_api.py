@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:31:50 2026
+
+@author: rstreet
+
+Local stand-in for the LCO API endpoints read by the dashboard and used to
+submit observation requests, for tests and benchmarks which must not
+depend on, or load, the real service.
+Responses can be delayed or made to fail, to imitate a slow or broken
+upstream service.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+PROPOSALS = {'results': [ {'id': 'KEY2017AB-004',
+                           'timeallocation_set': [
+                                {'instrument_type': '1M0-SCICAM-SINISTRO',
+                                 'semester': '2019B',
+                                 'std_allocation': 1200.0,
+                                 'std_time_used': 412.3,
+                                 'ipp_time_available': 35.5,
+                                 'ipp_limit': 120.0},
+                                {'instrument_type': '2M0-FLOYDS-SCICAM',
+                                 'semester': '2019B',
+                                 'std_allocation': 10.0,
+                                 'std_time_used': 1.0,
+                                 'ipp_time_available': 0.0,
+                                 'ipp_limit': 1.0} ] } ] }
+
+TELESCOPE_STATES = {'coj.doma.1m0a': [ {'event_type': 'AVAILABLE'} ],
+                    'coj.domb.1m0a': [ {'event_type': 'NOT_OK_TO_OPEN'} ],
+                    'cpt.doma.1m0a': [ {'event_type': 'AVAILABLE'} ],
+                    'cpt.domb.1m0a': [ {'event_type': 'AVAILABLE'} ],
+                    'cpt.domc.1m0a': [ {'event_type': 'SEQUENCER_DISABLED'} ],
+                    'lsc.doma.1m0a': [ {'event_type': 'AVAILABLE'} ],
+                    'lsc.domb.1m0a': [ {'event_type': 'AVAILABLE'} ],
+                    'lsc.domc.1m0a': [ ] }
+
+class FakeLCOAPI():
+    """Local HTTP server answering the LCO API proposals and
+    telescope_states endpoints, and accepting request groups, run in a
+    background thread.  Cadence requests are returned as submitted.
+
+    Attributes:
+    delay -- Seconds to wait before each response (float, default=0.0)
+    fail -- Answer every request with HTTP 503 (bool, default=False)
+    submit_delay -- Further seconds to wait before answering a request group
+                    once it is accepted (float, default=0.0)
+    nrequests -- Number of requests received (int)
+    submitted -- Request groups submitted (list)
+    url -- Root URL of the fake API, once started (string)
+    """
+
+    def __init__(self, delay=0.0, fail=False, submit_delay=0.0):
+        self.delay = delay
+        self.fail = fail
+        self.submit_delay = submit_delay
+        self.nrequests = 0
+        self.submitted = []
+        self.url = None
+        self.server = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self):
+
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            # Keep connections open, as the LCO API does
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with api.lock:
+                    api.nrequests += 1
+                time.sleep(api.delay)
+
+                if api.fail:
+                    self.send_error(503)
+                    return
+
+                if self.path.startswith('/api/proposals/'):
+                    body = PROPOSALS
+                elif self.path.startswith('/api/telescope_states/'):
+                    body = TELESCOPE_STATES
+                else:
+                    self.send_error(404)
+                    return
+
+                self.send_json(body)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                posted = json.loads(self.rfile.read(length) or 'null')
+                with api.lock:
+                    api.nrequests += 1
+                time.sleep(api.delay)
+
+                if api.fail:
+                    self.send_error(503)
+                    return
+
+                if self.path == '/api/requestgroups/cadence/':
+                    body = posted
+                elif self.path == '/api/requestgroups/':
+                    with api.lock:
+                        api.submitted.append(posted)
+                        body = {'id': len(api.submitted), 'state': 'PENDING'}
+                    time.sleep(api.submit_delay)
+                else:
+                    self.send_error(404)
+                    return
+
+                self.send_json(body)
+
+            def send_json(self, body):
+                content = json.dumps(body).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:'+str(self.server.server_address[1])+'/api'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        return self
+
+    def stop(self):
+
+        if self.server != None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:47:13 2026
+
+@author: rstreet
+
+Local stand-in for the survey sites scraped for the event pages, serving
+canned pages with a configurable delay for each site, for tests and
+benchmarks which must not depend on, or load, the real sites.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+
+def canned_survey_pages(year, event):
+    """Function to return pages for the given event, by path, in the forms
+    the survey_data_utilities scraping functions read from each site.
+    The event is given by its short name in the MOA form, e.g. MB180123."""
+
+    year = str(year)
+    moa_name = 'MOA-'+year+'-BLG-'+event[5:]
+    kmt_name = event[0:4]+event[5:] if event[4:5] == '0' else event
+    ogle_id = event.replace(event[0:4],'blg-')
+
+    mismap = '<html><body>'+'<div></div>'*5+\
+             '<div><select><option value="none">-</option>'+\
+             '<option value="maps/'+event+'_map.png">map</option></select></div>'+\
+             '</body></html>'
+
+    moa = '\n'.join([ '<!-- header -->' ]*19 +
+                    [ '<tr><td>'+moa_name+'</td><td><a href="gb1-'+event[5:]+'.html">'+moa_name+'</a>' ] +
+                    [ '<!-- footer -->' ]*5)
+
+    kmt = '<html><body><table>'+\
+          '<tr><td>KMT-'+year+'-BLG-0001</td><td>OB'+year[2:]+'0001</td></tr>'+\
+          '<tr><td>KMT-'+year+'-BLG-0123</td><td>'+kmt_name+'</td></tr>'+\
+          '</table></body></html>'
+
+    return {'/mismap/'+event+'.html': mismap,
+            '/moa/'+year+'/index.html': moa,
+            '/kmt/'+year: kmt,
+            '/ogle/data/'+year+'/'+ogle_id+'/fchart.jpg': 'JPEG'}
+
+class FakeSurveySites():
+    """Local HTTP server answering requests for canned survey pages, run
+    in a background thread.  Each site is served under /<site>/.
+
+    Attributes:
+    pages -- Page content by path (dict)
+    delays -- Seconds to wait before answering requests to each site (dict)
+    nrequests -- Number of requests received for each site (dict)
+    """
+
+    def __init__(self, pages, delays={}):
+        self.pages = pages
+        self.delays = dict(delays)
+        self.nrequests = {}
+        self.server = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def root_urls(self):
+        """Method to return the root URL of each site, as used by the
+        scraping functions"""
+
+        root = 'http://127.0.0.1:'+str(self.server.server_address[1])+'/'
+
+        return { site: root+site+'/' for site in ['rtmodel', 'mismap', 'moa', 'kmt', 'ogle'] }
+
+    def start(self):
+
+        sites = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                site = self.path.split('/')[1]
+                with sites.lock:
+                    sites.nrequests[site] = sites.nrequests.get(site, 0) + 1
+                time.sleep(sites.delays.get(site, 0.0))
+
+                if self.path not in sites.pages:
+                    self.send_error(404)
+                    return
+
+                content = sites.pages[self.path].encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        return self
+
+    def stop(self):
+
+        if self.server != None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
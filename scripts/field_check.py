@@ -2,38 +2,136 @@ import numpy as np
 from sys import argv
 from . import utilities
 
+# Half-width of the square ROME field footprints in degrees
+LHALF = 0.220833333333  # 26.5/(120.)
+
+# RA, Dec (decimal degrees) and rate of each ROME field, in order of field name
+ROME_FIELDS = [[267.835895375, -30.0608178195, 64.0],
+               [269.636745458, -27.9782661111, 49.0],
+               [268.000049542, -28.8195573333, 46.0],
+               [268.180171708, -29.27851275, 58.0],
+               [268.35435, -30.2578356389, 64.0],
+               [268.356124833, -29.7729819283, 90.0],
+               [268.529571333, -28.6937071111, 72.0],
+               [268.709737083, -29.1867251944, 83.0],
+               [268.881108542, -29.7704673333, 83.0],
+               [269.048498333, -28.6440675, 75.0],
+               [269.23883225, -29.2716684211, 70.0],
+               [269.39478875, -30.0992361667, 42.0],
+               [269.563719375, -28.4422328996, 49.0],
+               [269.758843, -29.1796030365, 67.0],
+               [269.78359875, -29.63940425, 61.0],
+               [270.074981708, -28.5375585833, 61.0],
+               [270.81, -28.0978333333, -99.0],
+               [270.290886667, -27.9986032778, 52.0],
+               [270.312763708, -29.0084241944, 48.0],
+               [270.83674125, -28.8431573889, 49.0]]
+
+class FieldFootprints():
+    """Square footprints of a set of survey fields, held as numpy arrays so
+    that whole arrays of coordinates can be classified in one pass.
+
+    Attributes:
+    field_ra -- Field centre RAs in decimal degrees (array)
+    field_dec -- Field centre Decs in decimal degrees (array)
+    half_width -- Half-width of each footprint in degrees (float, default=LHALF)
+    rates -- Value associated with each field (array, default=None)
+    """
+
+    def __init__(self, field_ra, field_dec, half_width=LHALF, rates=None):
+        self.field_ra = np.array(field_ra, dtype=float)
+        self.field_dec = np.array(field_dec, dtype=float)
+        self.half_width = half_width
+        # Plain floats, which are faster than numpy scalars for one position
+        self.centres = list(zip(self.field_ra.tolist(), self.field_dec.tolist()))
+        if rates is None:
+            rates = np.zeros(len(self.field_ra))
+        # The final entry is returned for coordinates outside all fields
+        self.rates = np.append(np.array(rates, dtype=float), -1.0)
+
+    def __len__(self):
+        return len(self.field_ra)
+
+    def classify(self, ra, dec, chunk_size=2048):
+        """Method to return the index of the first field containing each of
+        an array of coordinates, or -1 for coordinates outside all fields.
+        RA offsets are wrapped, so that fields straddling RA=0 are handled.
+
+        Inputs:
+            ra, dec    array   Coordinates in decimal degrees
+        Outputs:
+            idx        array   Field index for each coordinate
+        """
+
+        ra = np.atleast_1d(np.asarray(ra, dtype=float))
+        dec = np.atleast_1d(np.asarray(dec, dtype=float))
+        idx = np.full(len(ra), -1, dtype=int)
+
+        if len(self) == 0:
+            return idx
+
+        # Coordinates are classified in chunks which keep the
+        # (coordinates x fields) arrays small enough to stay in cache
+        for i in range(0, len(ra), chunk_size):
+            dra = ra[i:i+chunk_size,np.newaxis] - self.field_ra
+            dra = np.where(dra >= 180.0, dra - 360.0, dra)
+            dra = np.where(dra < -180.0, dra + 360.0, dra)
+            ddec = dec[i:i+chunk_size,np.newaxis] - self.field_dec
+
+            inside = (np.abs(dra) < self.half_width) & \
+                     (np.abs(ddec) < self.half_width)
+            idx[i:i+chunk_size] = np.where(inside.any(axis=1),
+                                           inside.argmax(axis=1), -1)
+
+        return idx
+
+    def locate(self, ra, dec):
+        """Method to return the index of the first field containing a single
+        position, or -1.  This is equivalent to classify, without the
+        overhead of numpy for a single position."""
+
+        for idx, (field_ra, field_dec) in enumerate(self.centres):
+            dra = ra - field_ra
+            if dra >= 180.0:
+                dra -= 360.0
+            elif dra < -180.0:
+                dra += 360.0
+            if abs(dra) < self.half_width and \
+               abs(dec - field_dec) < self.half_width:
+                return idx
+
+        return -1
+
+    def classify_with_rates(self, ra, dec):
+        """Method to return the field index and rate for each of an array
+        of coordinates, with -1 for both outside all fields"""
+
+        idx = self.classify(ra, dec)
+
+        return idx, self.rates[idx]
+
+rome_footprints = FieldFootprints([ f[0] for f in ROME_FIELDS ],
+                                  [ f[1] for f in ROME_FIELDS ],
+                                  half_width=LHALF,
+                                  rates=[ f[2] for f in ROME_FIELDS ])
+
+def romecheck_array(ra_array, dec_array):
+    """Function to identify the ROME field containing each of an array of
+    coordinates in decimal degrees.  Returns arrays of the field index and
+    rate, both -1 for coordinates outside the survey footprint."""
+
+    return rome_footprints.classify_with_rates(ra_array, dec_array)
+
 def romecheck(radeg, decdeg):
-    lhalf = 0.220833333333  # 26.5/(120.)
-    field, rate = -1, -1
-    fields = [[267.835895375, -30.0608178195, 64.0],
-              [269.636745458, -27.9782661111, 49.0],
-              [268.000049542, -28.8195573333, 46.0],
-              [268.180171708, -29.27851275, 58.0],
-              [268.35435, -30.2578356389, 64.0],
-              [268.356124833, -29.7729819283, 90.0],
-              [268.529571333, -28.6937071111, 72.0],
-              [268.709737083, -29.1867251944, 83.0],
-              [268.881108542, -29.7704673333, 83.0],
-              [269.048498333, -28.6440675, 75.0],
-              [269.23883225, -29.2716684211, 70.0],
-              [269.39478875, -30.0992361667, 42.0],
-              [269.563719375, -28.4422328996, 49.0],
-              [269.758843, -29.1796030365, 67.0],
-              [269.78359875, -29.63940425, 61.0],
-              [270.074981708, -28.5375585833, 61.0],
-              [270.81, -28.0978333333, -99.0],
-              [270.290886667, -27.9986032778, 52.0],
-              [270.312763708, -29.0084241944, 48.0],
-              [270.83674125, -28.8431573889, 49.0]]
-
-    for idx in range(len(fields)):
-        if radeg < fields[idx][0] + lhalf and\
-           radeg > fields[idx][0] - lhalf and\
-           decdeg < fields[idx][1] + lhalf and\
-           decdeg > fields[idx][1] - lhalf:
-            return idx, fields[idx][2]
-
-    return field, rate
+    """Function to identify the ROME field containing a single position
+    in decimal degrees.  Returns the field index and rate, or -1, -1"""
+
+    idx = rome_footprints.locate(radeg, decdeg)
+
+    if idx == -1:
+        return -1, -1
+
+    return idx, float(rome_footprints.rates[idx])
 
 if __name__ == '__main__':
 
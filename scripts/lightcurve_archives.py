@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:10:04 2026
+
+@author: rstreet
+
+Gzipped tar archives of the lightcurve datafiles of an event, for
+download.  Archives are generated on the fly as they are sent, so that
+memory use does not grow with the size of the archive, and are kept in a
+content-addressed cache, keyed on the fingerprint of the files they
+contain, so that repeat downloads are served from disk.  The cache is
+bounded in size, the least recently used archives being removed first.
+"""
+import os
+import sys
+from . import local_conf
+robonet_site = local_conf.get_conf('robonet_site')
+sys.path.append(robonet_site)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.conf import settings
+import hashlib
+import tarfile
+import tempfile
+import zlib
+setup()
+
+CHUNK_SIZE = 65536
+
+def get_archive_members(datafiles):
+    """Function to return the datafiles which exist, as (path, size, mtime)
+    tuples, in a fixed order.  Files are archived without their paths."""
+
+    members = []
+    for file_path in sorted(set(datafiles)):
+        try:
+            members.append( (file_path, os.path.getsize(file_path),
+                             os.path.getmtime(file_path)) )
+        except OSError:
+            continue
+
+    return members
+
+def get_archive_fingerprint(members):
+    """Function to return a digest identifying the contents of the archive
+    of the given members, from their paths, sizes and modification times"""
+
+    digest = hashlib.sha1()
+    for (file_path, size, mtime) in members:
+        digest.update((file_path+' '+str(size)+' '+repr(mtime)+'\n').encode('utf-8'))
+
+    return digest.hexdigest()
+
+def get_cached_archive_path(fingerprint, archive_dir=None):
+
+    if archive_dir == None:
+        archive_dir = settings.LIGHTCURVE_ARCHIVE_DIR
+
+    return os.path.join(archive_dir, fingerprint+'.tgz')
+
+def generate_archive(members, chunk_size=CHUNK_SIZE):
+    """Generator yielding a gzipped tar archive of the members in chunks.
+    Each file is archived with the size it had when listed, being padded
+    or truncated if it has changed since."""
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16+zlib.MAX_WBITS)
+
+    for (file_path, size, mtime) in members:
+        info = tarfile.TarInfo(os.path.basename(file_path))
+        info.size = size
+        info.mtime = int(mtime)
+        info.mode = 0o644
+
+        with open(file_path, 'rb') as f:
+            yield compressor.compress(info.tobuf(format=tarfile.GNU_FORMAT))
+
+            remaining = size
+            while remaining > 0:
+                data = f.read(min(chunk_size, remaining))
+                if len(data) == 0:
+                    data = b'\0' * min(chunk_size, remaining)
+                remaining -= len(data)
+                yield compressor.compress(data)
+
+        if size % tarfile.BLOCKSIZE != 0:
+            yield compressor.compress(b'\0' * (tarfile.BLOCKSIZE - size % tarfile.BLOCKSIZE))
+
+    # End-of-archive marker
+    yield compressor.compress(b'\0' * 2 * tarfile.BLOCKSIZE)
+    yield compressor.flush()
+
+def generate_and_cache_archive(members, fingerprint, archive_dir=None,
+                               max_bytes=None, chunk_size=CHUNK_SIZE):
+    """Generator yielding the archive of the members, as generate_archive,
+    while writing it to the cache.  The archive is only added to the cache
+    once it is complete, so an interrupted download leaves nothing behind."""
+
+    if archive_dir == None:
+        archive_dir = settings.LIGHTCURVE_ARCHIVE_DIR
+    if not os.path.isdir(archive_dir):
+        os.makedirs(archive_dir)
+
+    (fd, tmp_path) = tempfile.mkstemp(dir=archive_dir, suffix='.part')
+    complete = False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in generate_archive(members, chunk_size=chunk_size):
+                f.write(chunk)
+                yield chunk
+        os.replace(tmp_path, get_cached_archive_path(fingerprint, archive_dir))
+        complete = True
+        evict_archives(archive_dir, max_bytes=max_bytes)
+    finally:
+        if not complete and os.path.isfile(tmp_path):
+            os.remove(tmp_path)
+
+def get_cached_archive(fingerprint, archive_dir=None):
+    """Function to return the path to the cached archive with the given
+    fingerprint, marking it as recently used, or None if not cached"""
+
+    archive_path = get_cached_archive_path(fingerprint, archive_dir)
+
+    try:
+        os.utime(archive_path, None)
+    except OSError:
+        return None
+
+    return archive_path
+
+def evict_archives(archive_dir=None, max_bytes=None):
+    """Function to remove the least recently used archives from the cache
+    until its total size is within max_bytes.  Returns the number removed."""
+
+    if archive_dir == None:
+        archive_dir = settings.LIGHTCURVE_ARCHIVE_DIR
+    if max_bytes == None:
+        max_bytes = settings.LIGHTCURVE_ARCHIVE_CACHE_BYTES
+
+    archives = []
+    for file_name in os.listdir(archive_dir):
+        if file_name.endswith('.tgz'):
+            file_path = os.path.join(archive_dir, file_name)
+            try:
+                archives.append( (os.path.getmtime(file_path),
+                                  os.path.getsize(file_path), file_path) )
+            except OSError:
+                continue
+
+    total = sum([ a[1] for a in archives ])
+    nremoved = 0
+    for (mtime, size, file_path) in sorted(archives):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(file_path)
+        except OSError:
+            continue
+        total -= size
+        nremoved += 1
+
+    return nremoved
@@ -15,6 +15,9 @@ from . import update_db_2
 from . import log_utilities
 from . import observation_classes
 from . import validation
+from . import outbound
+from functools import partial
+import requests
 import socket
 from . import get_errors
 from . import system_utils
@@ -42,7 +45,7 @@ def obs_control():
 
     set_lock( script_config, log )
 
-    update_db_2.expire_old_obs(log=log)
+    update_db_2.expire_old_obs_bulk(log=log)
 
     active_obs = query_db.get_active_obs(log=log)
 
@@ -163,8 +166,41 @@ def rm_duplicate_obs(obs_request_list, active_obs,log=None,debug=False):
 
     return obs_requests_final
 
+def submit_obs_request(obs, script_config, log=None):
+    """Function to build an observation request and submit it to LCO.
+    Makes no use of the database, so that requests can be submitted at
+    once from the outbound thread pool.
+    If LCO does not answer the submission in time, it may still have
+    accepted the request, so its status is set to UNKNOWN rather than
+    failed."""
+
+    if log != None:
+        log.info('Building '+str(obs.group_id))
+
+    ur = obs.build_cadence_request_aeon( log=log, debug=True )
+    #ur = obs.build_cadence_request( log=log, debug=True )
+
+    if log != None:
+        log.info(obs.group_id + ': Built json request')
+
+    try:
+        return obs.submit_request(ur, script_config, log=log)
+    except requests.ReadTimeout as error:
+        obs.submit_response = 'ERROR: no answer from LCO to the submission, '+repr(error)
+        obs.submit_status = 'UNKNOWN'
+        obs.track_id = '9999999999'
+        obs.req_id = '9999999999'
+        if log != None:
+            log.info(str(obs.group_id)+': submission not answered, outcome unknown')
+
+    return obs.submit_status
+
 def submit_obs_requests(script_config,obs_requests,log=None):
-    """Function to submit a list of observations requests"""
+    """Function to submit a list of observations requests.  The requests
+    are submitted to LCO at once, each bounded by the OUTBOUND_TIMEOUT of
+    its calls, and are recorded in turn once all have finished.
+    Requests whose submission was not answered are recorded as active, as
+    LCO may have accepted them, so that they are not submitted again."""
 
     if log != None:
         log.info('Submitting observation requests')
@@ -172,20 +208,24 @@ def submit_obs_requests(script_config,obs_requests,log=None):
     submit_status = []
     obsrecord = log_utilities.start_obs_record( script_config )
 
+    outcomes = outbound.run_all([ partial(submit_obs_request, obs, script_config, log=log)
+                                  for obs in obs_requests ])
+
     if log != None:
         log.info('Starting loop over observations:')
 
-    for obs in obs_requests:
-        if log != None:
-            log.info('Building '+obs.group_id)
-
-        ur = obs.build_cadence_request_aeon( log=log, debug=True )
-        #ur = obs.build_cadence_request( log=log, debug=True )
-
-        if log != None:
-            log.info(obs.group_id + ': Built json request')
-
-        stat = obs.submit_request(ur, script_config, log=log)
+    for obs, (stat, error) in zip(obs_requests, outcomes):
+        if error != None:
+            obs.submit_response = 'ERROR: '+repr(error)
+            obs.submit_status = 'WARNING'
+            obs.track_id = '9999999999'
+            obs.req_id = '9999999999'
+            stat = obs.submit_status
+            if log != None:
+                log.info(str(obs.group_id)+': submission failed, '+repr(error))
+        elif stat == 'UNKNOWN' and log != None:
+            log.info('WARNING: '+str(obs.group_id)+\
+                     ' may have been accepted by LCO, recording it as active')
         submit_status.append(stat)
 
         if log != None:
@@ -212,7 +252,7 @@ def submit_obs_requests(script_config,obs_requests,log=None):
                 if log!=None:
                     log.info(repr(params))
 
-                if obs.submit_status == 'add_OK':
+                if obs.submit_status in ['add_OK', 'UNKNOWN']:
                     req_status = 'AC'
                 else:
                     req_status = 'CN'
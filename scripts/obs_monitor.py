@@ -16,11 +16,14 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
 from django.core import management
 from django.conf import settings
 from django.utils import timezone
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.db.models.functions import TruncDate
 from django import setup
 from datetime import datetime, timedelta
 setup()
 
-from events.models import ObsRequest
+from events.models import ObsRequest, SubObsRequest, ObsCompletionStats
 
 from . import lco_api_tools
 from . import config_parser
@@ -37,6 +40,11 @@ from bokeh.models import Legend
 from bokeh.embed import components
 from bokeh.resources import CDN
 
+# Colour used for each camera in the completion plots
+CAMERA_COLOURS = {'fl12': '#23E6E9', 'fl06': '#134dd6', 'fl15': '#BD44F5',
+                  'fl03': '#cc8616', 'fl16': '#22D11F', 'fl11': '#137c6d',
+                  'fl14': '#d8d511'}
+
 def analyze_requested_vs_observed(monitor_period_days=2.5,dbg=False):
     """Function to analyze the observations requested within a given period,
     checked whether or not observations were actually obtained,
@@ -115,10 +123,7 @@ def fetch_obs_list(start_date, end_date, status='AC',dbg=False):
 
             obs[q.field.name+'_'+q.grp_id] = q
 
-    keys = obs.keys()
-    keys.sort()
-
-    for k in keys:
+    for k in sorted(obs.keys()):
 
         obs_list.append(obs[k])
 
@@ -139,9 +144,15 @@ def fetch_subrequest_status(obs_list,dbg=False):
 
     active_obs = {}
 
+    # The subrequests of all of the observations are read at once
+    subrequests = {}
+    qs = SubObsRequest.objects.filter(grp_id__in=[ obs.grp_id for obs in obs_list ])
+    for q in qs.order_by('pk'):
+        subrequests.setdefault(q.grp_id, []).append(q)
+
     for obs in obs_list:
 
-        qs = query_db.get_subrequests_for_obsrequest(obs.grp_id)
+        qs = subrequests.get(obs.grp_id, [])
 
         sr_list = []
 
@@ -292,8 +303,7 @@ def plot_req_vs_obs(active_obs, dbg=False):
 
     fields = get_fields_dict(active_obs)
 
-    fields_sorted = fields.keys()
-    fields_sorted.sort(reverse=True)
+    fields_sorted = sorted(fields.keys(), reverse=True)
 
     date_range = get_date_range(active_obs)
     deltax = date_range[1] - date_range[0]
@@ -526,6 +536,191 @@ def get_completion_date_period(start_date=None,end_date=None):
 
     return start_date, end_date
 
+# Nights of the completion statistics recomputed per query
+NIGHTS_PER_QUERY = 200
+
+def get_changed_nights(since=None):
+    """Function to return the UTC nights on which the windows opened of the
+    subrequests saved since the datetime given, or of all subrequests"""
+
+    qs = SubObsRequest.objects.all()
+    if since != None:
+        qs = qs.filter(last_modified__gte=since)
+
+    qs = qs.annotate(night=TruncDate('window_start', tzinfo=pytz.UTC)
+                     ).values_list('night', flat=True).order_by().distinct()
+
+    return sorted(qs)
+
+def count_night_completion(nights):
+    """Function to count the subrequests of each field and instrument whose
+    windows opened on the nights given, and the numbers executed and
+    canceled.  Repeat entries of a subrequest are counted once, from its
+    most recent entry.
+    Returns a dictionary of [n_requested, n_executed, n_canceled] keyed by
+    (night, field, inst)."""
+
+    counts = {}
+
+    for i in range(0,len(nights),NIGHTS_PER_QUERY):
+
+        qs = SubObsRequest.objects.annotate(night=TruncDate('window_start', tzinfo=pytz.UTC)
+                                ).filter(night__in=nights[i:i+NIGHTS_PER_QUERY]
+                                ).values_list('sr_id', 'grp_id', 'status',
+                                              'time_executed', 'night').order_by('pk')
+
+        subrequests = {}
+        for (sr_id, grp_id, status, time_executed, night) in qs:
+            subrequests[sr_id] = (grp_id, status, time_executed, night)
+
+        grp_ids = set([ sr[0] for sr in subrequests.values() ])
+        requests = {}
+        for (grp_id, field, inst) in ObsRequest.objects.filter(grp_id__in=grp_ids
+                                    ).values_list('grp_id', 'field__name', 'which_inst'
+                                    ).order_by('-pk'):
+            requests[grp_id] = (field, inst)
+
+        for (grp_id, status, time_executed, night) in subrequests.values():
+
+            (field, inst) = requests.get(grp_id, ('Unknown', ''))
+
+            entry = counts.setdefault((night, field, inst), [0, 0, 0])
+            entry[0] += 1
+            if status == 'COMPLETED' or time_executed != None:
+                entry[1] += 1
+            elif status == 'CANCELED':
+                entry[2] += 1
+
+    return counts
+
+def update_obs_completion_stats(rebuild=False):
+    """Function to update the daily completion statistics of the
+    subrequests, recomputing only the nights with subrequests saved since
+    the statistics were last computed, or all nights if rebuild is True.
+    Returns the number of nights recomputed."""
+
+    computed_at = timezone.now()
+
+    since = None
+    if not rebuild:
+        since = ObsCompletionStats.objects.aggregate(Max('computed_at'))['computed_at__max']
+
+    nights = get_changed_nights(since)
+    counts = count_night_completion(nights)
+
+    entries = [ ObsCompletionStats(night=night, field=field, inst=inst,
+                                   n_requested=n[0], n_executed=n[1], n_canceled=n[2],
+                                   computed_at=computed_at)
+                for ((night, field, inst), n) in counts.items() ]
+
+    with transaction.atomic():
+        if since == None:
+            ObsCompletionStats.objects.all().delete()
+        else:
+            for i in range(0,len(nights),NIGHTS_PER_QUERY):
+                ObsCompletionStats.objects.filter(night__in=nights[i:i+NIGHTS_PER_QUERY]).delete()
+        ObsCompletionStats.objects.bulk_create(entries, batch_size=500)
+
+    return len(nights)
+
+def get_instrument_completion(start_date, end_date):
+    """Function to return the percentage of the subrequests completed per
+    night for each instrument, from the daily completion statistics.
+    Returns a dictionary of (nights, percentages) keyed by instrument."""
+
+    qs = ObsCompletionStats.objects.filter(night__gte=start_date.date(),
+                                           night__lte=end_date.date()
+                            ).values('inst', 'night').annotate(n_requested=Sum('n_requested'),
+                                                               n_executed=Sum('n_executed')
+                            ).order_by('inst', 'night')
+
+    completion = {}
+    for row in qs:
+        if row['inst'] == '':
+            continue
+        (xdata, ydata) = completion.setdefault(row['inst'], ([], []))
+        xdata.append(datetime.combine(row['night'], datetime.min.time()) + timedelta(hours=12))
+        if row['n_requested'] > 0:
+            ydata.append( (float(row['n_executed'])/float(row['n_requested']))*100.0 )
+        else:
+            ydata.append( 0.0 )
+
+    return completion
+
+def get_field_completion(start_date, end_date):
+    """Function to return the numbers of subrequests requested and executed
+    for each field within the dates given, from the daily completion
+    statistics, as a list of dictionaries sorted by field name"""
+
+    qs = ObsCompletionStats.objects.filter(night__gte=start_date.date(),
+                                           night__lte=end_date.date()
+                            ).values('field').annotate(n_requested=Sum('n_requested'),
+                                                       n_executed=Sum('n_executed'),
+                                                       n_canceled=Sum('n_canceled')
+                            ).order_by('field')
+
+    fields = []
+    for row in qs:
+        row['percent_completed'] = 0.0
+        if row['n_requested'] > 0:
+            row['percent_completed'] = round((float(row['n_executed'])/float(row['n_requested']))*100.0, 1)
+        fields.append(row)
+
+    return fields
+
+def analyze_completion_stats(start_date=None, end_date=None):
+    """Function to plot the percentage of subrequests completed per night
+    for each instrument, as analyze_percentage_completed does, from the
+    daily completion statistics.  Falls back to analyze_percentage_completed
+    if the statistics have not yet been built."""
+
+    if not ObsCompletionStats.objects.exists():
+        return analyze_percentage_completed(start_date=start_date, end_date=end_date)
+
+    (start_date, end_date) = get_completion_date_period(start_date=start_date,
+                                                        end_date=end_date)
+
+    completion = get_instrument_completion(start_date, end_date)
+
+    if len(completion) == 0:
+        script = ''
+        div = '<br><h4>No observations in the DB within the period '+\
+                start_date.strftime("%Y-%m-%d")+' to '+end_date.strftime("%Y-%m-%d")
+        return script, div, start_date, end_date
+
+    title = 'Subrequests available between '+start_date.strftime("%Y-%m-%d")+' to '+\
+                                        end_date.strftime("%Y-%m-%d")
+
+    fig = figure(plot_width=600, plot_height=400,
+                 title=title,
+                 x_axis_label='Time [UTC]',
+                 x_axis_type="datetime",
+                 y_axis_label='Percentage completed',
+                 toolbar_location="below")
+
+    legend_items = []
+    for camera in sorted(completion.keys()):
+
+        (xdata, ydata) = completion[camera]
+        colour = CAMERA_COLOURS.get(camera, '#808080')
+
+        fig.scatter(xdata, ydata, color=colour)
+        r = fig.line(xdata, ydata, color=colour, line_width=2)
+
+        legend_items.append( (camera, [r]) )
+
+    fig.xaxis.formatter = DatetimeTickFormatter(days=["%Y-%m-%d"])
+
+    fig.xaxis.major_label_orientation = math.pi/4
+
+    legend = Legend(items=legend_items, location=(0, -30))
+
+    fig.add_layout(legend, 'right')
+
+    (script, div) = components(fig)
+
+    return script, div, start_date, end_date
+
 if __name__ == '__main__':
 
     rome_start = datetime.strptime('2017-04-01','%Y-%m-%d')
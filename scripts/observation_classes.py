@@ -21,13 +21,19 @@ setup()
 
 import urllib
 from . import utilities
-import requests
+from . import outbound
 from . import instrument_overheads
 import json
+import threading
 #import httplib
 from sys import exit
 #from exceptions import ValueError
 
+# Group IDs are taken from the time, so that requests built at once in
+# different threads must be given distinct times
+_group_time = {'last': None}
+_group_time_lock = threading.Lock()
+
 class ObsRequest:
 
     def __init__(self):
@@ -72,8 +78,13 @@ class ObsRequest:
         time = float(dateobj.hour) + (float(dateobj.minute)/60.0) + \
         (float(dateobj.second)/3600.0) + (float(dateobj.microsecond)/3600e6)
         time = round(time,8)
-        ctime = str(time)
         date = dateobj.strftime('%Y%m%d')
+        with _group_time_lock:
+            last = _group_time['last']
+            if last != None and last[0] == date and time <= last[1]:
+                time = round(last[1] + 1e-8,8)
+            _group_time['last'] = (date, time)
+        ctime = str(time)
         TS = date+'T'+ctime
         req_type = get_request_desc(self.request_type)
         self.group_id = str(req_type).upper().replace('-','')+TS
@@ -225,7 +236,7 @@ class ObsRequest:
 
         return ur
 
-    def build_cadence_request_aeon(self, log=None, debug=False):
+    def build_cadence_request_aeon(self, log=None, debug=False, deadline=None):
 
         if debug == True and log != None:
             log.info('Building Valhalla-AEON observation request')
@@ -288,7 +299,7 @@ class ObsRequest:
                                        'location': location}]
                          }
 
-        ur = self.get_cadence_requests(request_group,log=log)
+        ur = self.get_cadence_requests(request_group,log=log,deadline=deadline)
 
         return ur
 
@@ -441,11 +452,11 @@ class ObsRequest:
 
         return molecule_list
 
-    def get_cadence_requests(self,ur,log=None):
+    def get_cadence_requests(self,ur,log=None,deadline=None):
 
         #end_point = "userrequests/cadence"
         end_point = "requestgroups/cadence"
-        ur = self.talk_to_lco(ur,end_point,'POST')
+        ur = self.talk_to_lco(ur,end_point,'POST',deadline=deadline)
 
         if log !=None:
             log.info('Generated cadences, userrequest now: '+repr(ur))
@@ -461,7 +472,7 @@ class ObsRequest:
 
         return ur
 
-    def submit_request(self, ur, config, log=None):
+    def submit_request(self, ur, config, log=None, deadline=None):
 
         if self.submit_status == 'No_obs_submitted':
             self.submit_response = 'No_obs_submitted'
@@ -481,7 +492,7 @@ class ObsRequest:
         else:
             #end_point = 'userrequests'
             end_point = 'requestgroups'
-            response = self.talk_to_lco(ur,end_point,'POST')
+            response = self.talk_to_lco(ur,end_point,'POST',deadline=deadline)
             self.parse_submit_response( response, log=log )
 
         if log != None:
@@ -503,7 +514,7 @@ class ObsRequest:
 
         return self.submit_status
 
-    def talk_to_lco(self,ur,end_point,method):
+    def talk_to_lco(self,ur,end_point,method,deadline=None):
         """Method to communicate with various APIs of the LCO network.
         ur should be a user request while end_point is the URL string which
         should be concatenated to the observe portal path to complete the URL.
@@ -513,6 +524,8 @@ class ObsRequest:
             "userrequests/<id>/cancel"
         Accepted methods are:
             POST GET
+        Requests are made through the shared outbound connection pool, and
+        must be answered by the deadline, if one is given.
         """
 
         jur = json.dumps(ur)
@@ -523,15 +536,15 @@ class ObsRequest:
             end_point = end_point[1:]
         if end_point[-1:] != '/':
             end_point = end_point+'/'
-        url = path.join('https://observe.lco.global/api',end_point)
+        url = path.join(settings.LCO_API_URL,end_point)
 
         if method == 'POST':
             if ur != None:
-                response = requests.post(url, headers=headers, json=ur).json()
+                response = outbound.post(url, headers=headers, json=ur, deadline=deadline).json()
             else:
-                response = requests.post(url, headers=headers).json()
+                response = outbound.post(url, headers=headers, deadline=deadline).json()
         elif method == 'GET':
-            response = requests.get(url, headers=headers, json=ur).json()
+            response = outbound.get(url, headers=headers, json=ur, deadline=deadline).json()
 
         return response
 
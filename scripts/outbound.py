@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 06:20:31 2026
+
+@author: rstreet
+
+Outbound HTTP requests to the LCO API and the survey websites, made on
+behalf of page views.  Requests share one pool of kept-alive connections,
+so that each does not pay for a new connection, and every request is
+bounded by a deadline, so that a slow upstream service cannot hold a web
+server worker for longer than the page allows.  Independent requests are
+fanned out over a shared thread pool, so that a page waits for the
+slowest of them rather than their sum.
+
+Calls made from the pool must not use the database, whose connections
+belong to the thread serving the page.
+"""
+import os
+import sys
+from . import local_conf
+robonet_site = local_conf.get_conf('robonet_site')
+sys.path.append(robonet_site)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.conf import settings
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+import contextvars
+import threading
+import requests
+import time
+setup()
+
+_session = None
+_executor = None
+_lock = threading.Lock()
+
+class DeadlineExceeded(requests.Timeout):
+    """Raised for a request made, or a call not finished, by its deadline"""
+    pass
+
+class Deadline():
+    """Time by which a set of outbound requests must be answered
+
+    Attributes:
+    expires -- Expiry time, on the time.monotonic clock (float)
+    """
+
+    def __init__(self, seconds):
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(self.expires - time.monotonic(), 0.0)
+
+    def expired(self):
+        return time.monotonic() >= self.expires
+
+def get_session():
+    """Function to return the requests Session shared by all outbound
+    requests, keeping up to OUTBOUND_POOL_SIZE connections open to each
+    host"""
+
+    global _session
+
+    with _lock:
+        if _session == None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=settings.OUTBOUND_POOL_HOSTS,
+                                  pool_maxsize=settings.OUTBOUND_POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+
+    return _session
+
+def get_executor():
+
+    global _executor
+
+    with _lock:
+        if _executor == None:
+            _executor = ThreadPoolExecutor(max_workers=settings.OUTBOUND_MAX_WORKERS,
+                                           thread_name_prefix='outbound')
+
+    return _executor
+
+def request(method, url, timeout=None, deadline=None, **kwargs):
+    """Function to make an HTTP request through the shared connection pool.
+    The timeout, for connecting and for each read, is cut to the time left
+    before the deadline, if one is given.
+
+    Inputs:
+        method    str       HTTP method
+        url       str       URL requested
+        timeout   float     Timeout in seconds, default OUTBOUND_TIMEOUT
+        deadline  Deadline  Time by which the request must be answered
+        kwargs              Passed to requests.Session.request
+    Outputs:
+        response  requests.Response
+    """
+
+    if timeout == None:
+        timeout = settings.OUTBOUND_TIMEOUT
+
+    if deadline != None:
+        if deadline.expired():
+            raise DeadlineExceeded('Deadline passed before requesting '+url)
+        timeout = min(timeout, deadline.remaining())
+
+    return get_session().request(method, url, timeout=timeout, **kwargs)
+
+def get(url, **kwargs):
+
+    return request('GET', url, **kwargs)
+
+def post(url, **kwargs):
+
+    return request('POST', url, **kwargs)
+
+def submit(function, *args, **kwargs):
+    """Function to run a call on the shared thread pool, in the context of
+    the caller, so that its requests are accounted to the page being
+    served in the performance log.  Returns a Future."""
+
+    context = contextvars.copy_context()
+
+    return get_executor().submit(context.run, function, *args, **kwargs)
+
+def get_outcomes(futures):
+    """Function to return (result, exception) for each of a list of
+    Futures, with a DeadlineExceeded exception for those not finished"""
+
+    outcomes = []
+    for future in futures:
+        if not future.done():
+            outcomes.append( (None, DeadlineExceeded('Call not finished by its deadline')) )
+        elif future.exception() != None:
+            outcomes.append( (None, future.exception()) )
+        else:
+            outcomes.append( (future.result(), None) )
+
+    return outcomes
+
+def fan_out(calls, deadline=None):
+    """Function to make a list of calls at once on the shared thread pool,
+    and wait for them until the deadline.  A call which fails, or which has
+    not finished by the deadline, has its exception in place of a result.
+    Calls left running finish in the background, so this is only for calls
+    whose results can be dropped, such as reads.
+
+    Inputs:
+        calls     list      Callables taking no arguments
+        deadline  Deadline  Time by which the calls must be answered
+    Outputs:
+        outcomes  list      (result, exception) for each call, in order
+    """
+
+    if deadline == None:
+        deadline = Deadline(settings.OUTBOUND_TIMEOUT)
+
+    futures = [ submit(call) for call in calls ]
+    if len(futures) > 0:
+        wait(futures, timeout=deadline.remaining())
+
+    return get_outcomes(futures)
+
+def run_all(calls):
+    """Function to make a list of calls at once on the shared thread pool,
+    and wait for every one of them to finish.  This is for calls which must
+    not be left running, such as submissions whose outcome is recorded,
+    and which are bounded instead by the timeout of each of their requests.
+
+    Inputs:
+        calls     list      Callables taking no arguments
+    Outputs:
+        outcomes  list      (result, exception) for each call, in order
+    """
+
+    futures = [ submit(call) for call in calls ]
+    if len(futures) > 0:
+        wait(futures)
+
+    return get_outcomes(futures)
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 05:12:47 2026
+
+@author: rstreet
+
+Validators for conditional GETs of the pages and API lists polled by
+monitoring scripts.  Each page's ETag is a digest of a few cheap queries
+over the entries it displays, and of the ARTEMiS files it is built from,
+so that a client holding the current version is answered with 304 Not
+Modified without the page being built.  Last-Modified is only given where
+every input to a page carries a timestamp; elsewhere clients should
+revalidate with If-None-Match.
+"""
+import os
+import sys
+from . import local_conf
+robonet_site = local_conf.get_conf('robonet_site')
+sys.path.append(robonet_site)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from functools import wraps
+import hashlib
+setup()
+from events.models import Event, EventName, SingleModel, DataFile, ObsRequest, SubObsRequest
+from . import lightcurve_archives, plotter, query_db, utilities
+
+def conditional_page(get_validators):
+    """Decorator for a view answering conditional GETs.  get_validators is
+    called with the arguments of the view and returns the (etag,
+    last_modified) of the page, either of which may be None, last_modified
+    being a POSIX timestamp.  If the client's copy is current, a 304 is
+    returned without calling the view.  Apply it below login_required, or
+    the DRF decorators, so that users are authenticated first."""
+
+    def decorator(view):
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            (etag, last_modified) = get_validators(request, *args, **kwargs)
+            if etag != None:
+                etag = quote_etag(etag)
+            if last_modified != None:
+                last_modified = int(last_modified)
+
+            response = get_conditional_response(request, etag=etag,
+                                                last_modified=last_modified)
+            if response == None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            if etag != None and not response.has_header('ETag'):
+                response['ETag'] = etag
+            if last_modified != None and not response.has_header('Last-Modified'):
+                response['Last-Modified'] = http_date(last_modified)
+            # Browsers must revalidate rather than show a page they guess is fresh
+            patch_cache_control(response, private=True, no_cache=True)
+
+            return response
+
+        return inner
+
+    return decorator
+
+def make_etag(request, *parts):
+    """Function to return a digest of the parts of a page, with the user and
+    the query parameters of the request"""
+
+    digest = hashlib.sha1()
+    digest.update(repr( (request.user.pk, sorted(request.GET.lists()),
+                         request.META.get('HTTP_ACCEPT')) ).encode('utf-8'))
+    for part in parts:
+        digest.update(repr(part).encode('utf-8'))
+
+    return digest.hexdigest()
+
+def get_timestamp(*values):
+    """Function to return the latest of a set of datetimes and POSIX
+    timestamps, as a POSIX timestamp, or None if there are none"""
+
+    timestamps = []
+    for value in values:
+        if value == None:
+            continue
+        if hasattr(value, 'timestamp'):
+            value = value.timestamp()
+        timestamps.append(value)
+
+    if len(timestamps) == 0:
+        return None
+
+    return max(timestamps)
+
+def get_event_page_validators(request, event_id):
+    """Function to return the validators of show_event_by_id, from the
+    event, its names, the latest of its models and datafiles, and the
+    ARTEMiS files of its lightcurve plot"""
+
+    event = Event.objects.filter(pk=event_id).values_list('status', 'ev_ra', 'ev_dec',
+                                                          'field__name').first()
+    if event == None:
+        return None, None
+
+    names = list(EventName.objects.filter(event_id=event_id).order_by('pk').\
+                                   values_list('name', flat=True))
+    models = SingleModel.objects.filter(event_id=event_id).\
+                    aggregate(n=Count('pk'), max_pk=Max('pk'), last=Max('last_updated'))
+    datafiles = DataFile.objects.filter(event_id=event_id).\
+                    aggregate(n=Count('pk'), max_pk=Max('pk'), last=Max('last_upd'))
+
+    # The page plots the lightcurve under the event's OGLE name
+    ev_name = ''
+    for name in names:
+        if 'OGLE' in name:
+            ev_name = name
+            break
+    inputs = plotter.get_lightcurve_inputs(utilities.long_to_artemis_name(ev_name))
+    members = lightcurve_archives.get_archive_members(inputs)
+
+    etag = make_etag(request, event, names, sorted(models.items()),
+                     sorted(datafiles.items()),
+                     lightcurve_archives.get_archive_fingerprint(members))
+    last_modified = get_timestamp(models['last'], datafiles['last'],
+                                  *[ m[2] for m in members ])
+
+    return etag, last_modified
+
+def get_lightcurve_archive_validators(request, event_id):
+    """Function to return the validators of the lightcurve archive of an
+    event, from the datafiles it contains"""
+
+    datafiles = DataFile.objects.filter(event_id=event_id).values_list('datafile', flat=True)
+    members = lightcurve_archives.get_archive_members(datafiles)
+
+    etag = make_etag(request, event_id, lightcurve_archives.get_archive_fingerprint(members))
+    last_modified = get_timestamp(*[ m[2] for m in members ])
+
+    return etag, last_modified
+
+def get_event_list_validators(request, year):
+    """Function to return the validators of the list of events from a year.
+    Event statuses change without a timestamp, so only an ETag is given."""
+
+    events = list(Event.objects.filter(year=str(year)).order_by('pk').\
+                        values_list('pk', 'status', 'ev_ra', 'ev_dec', 'field_id',
+                                    'ibase', 'latest_model_id'))
+    names = list(EventName.objects.filter(event__year=str(year)).order_by('pk').\
+                        values_list('event_id', 'name'))
+
+    return make_etag(request, events, names), None
+
+def get_tap_validators(request, events):
+    """Function to return the validators of the TAP page, listing the
+    events selected by select_tap_events.  TAP priorities are changed in
+    place, so only an ETag is given."""
+
+    events = list(events.prefetch_related(None).values_list('pk', 'ev_ra', 'ev_dec', 'field_id', 'override',
+                                     'latest_tap_id', 'latest_tap__priority',
+                                     'latest_tap__tsamp'))
+    names = list(EventName.objects.filter(event_id__in=[ e[0] for e in events ]).\
+                        order_by('pk').values_list('event_id', 'name'))
+
+    return make_etag(request, events, names), None
+
+def get_obs_request_statuses():
+    """Function to return the number and latest entry of the observation
+    requests of each status, with their latest expiry time"""
+
+    return list(ObsRequest.objects.order_by('request_status').values('request_status').\
+                        annotate(n=Count('pk'), max_pk=Max('pk'),
+                                 last_expire=Max('time_expire')).\
+                        values_list('request_status', 'n', 'max_pk', 'last_expire'))
+
+def get_obs_request_validators(request, *args, **kwargs):
+    """Function to return the validators of lists of observation requests
+    selected by the arguments of a view.  Statuses change without a
+    timestamp, so only an ETag is given."""
+
+    return make_etag(request, args, sorted(kwargs.items()), get_obs_request_statuses()), None
+
+def get_active_obs_validators(request):
+    """Function to return the validators of the list of currently-active
+    observation requests, which changes as requests start and expire as
+    well as with the table"""
+
+    active = list(query_db.get_active_obs().order_by('pk').values_list('pk', flat=True))
+
+    return make_etag(request, active, get_obs_request_statuses()), None
+
+def get_subrequest_validators(request):
+    """Function to return the validators of lists of subrequests, from the
+    latest modification of any subrequest"""
+
+    subrequests = SubObsRequest.objects.aggregate(n=Count('pk'), max_pk=Max('pk'),
+                                                  last=Max('last_modified'))
+
+    etag = make_etag(request, sorted(subrequests.items()))
+
+    return etag, get_timestamp(subrequests['last'])
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 01:48:03 2026
+
+@author: rstreet
+
+Records the performance of each request served by the site: its wall time,
+the database queries it made and the requests it made to other services.
+Repeats of the same query shape within a request, the usual sign of a query
+made per row of a table, are counted under a fingerprint of the SQL with
+its values removed.  The records are written as JSON lines to a log shared
+by the web server processes, which is summarised per URL name on the
+performance page.  The log is rotated by logrotate, not by the processes
+writing to it.
+"""
+import os
+import sys
+from . import local_conf
+robonet_site = local_conf.get_conf('robonet_site')
+sys.path.append(robonet_site)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.conf import settings
+from logging.handlers import WatchedFileHandler
+from collections import OrderedDict
+from urllib.parse import urlsplit
+import contextvars
+import threading
+import logging
+import json
+import time
+import re
+import numpy as np
+import requests
+setup()
+
+# Number of repeated query shapes kept in each record
+N_DUPLICATE_FINGERPRINTS = 5
+
+# Length at which the SQL of a fingerprint is cut in the records
+FINGERPRINT_LENGTH = 300
+
+# Record of the request being served by the current thread or task
+_current_record = contextvars.ContextVar('performance_record', default=None)
+
+# Loggers writing to each performance log
+_loggers = {}
+_loggers_lock = threading.Lock()
+
+# Send method of requests, before accounting was added to it
+_requests_send = None
+
+SQL_NORMALISATIONS = [ (re.compile(r"'(?:[^']|'')*'"), '?'),
+                       (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+                       (re.compile(r'%s'), '?'),
+                       (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+                       (re.compile(r'\s+'), ' ') ]
+
+def get_sql_fingerprint(sql):
+    """Function to reduce an SQL statement to its shape, replacing the
+    literal values and parameters, and lists of them, by placeholders"""
+
+    for (pattern, placeholder) in SQL_NORMALISATIONS:
+        sql = pattern.sub(placeholder, sql)
+
+    return sql.strip()[0:FINGERPRINT_LENGTH]
+
+class RequestRecord():
+    """Accounts for the database queries and outbound HTTP requests made
+    while serving one request.  The record is used as the execute wrapper
+    of the database connections."""
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.fingerprints = {}
+        self.http_calls = []
+        # Outbound requests may be made from the threads of a pool
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add_query(sql, time.perf_counter() - t0)
+
+    def add_query(self, sql, elapsed):
+
+        fingerprint = get_sql_fingerprint(sql)
+        with self.lock:
+            self.sql_count += 1
+            self.sql_time += elapsed
+            self.fingerprints[fingerprint] = self.fingerprints.get(fingerprint, 0) + 1
+
+    def add_http_call(self, method, url, status, elapsed):
+
+        parts = urlsplit(url)
+        with self.lock:
+            self.http_calls.append({'method': method,
+                                    'url': parts.scheme+'://'+parts.netloc+parts.path,
+                                    'status': status,
+                                    'ms': round(elapsed*1000.0, 3)})
+
+    def get_duplicates(self):
+        """Method to return the query shapes made more than once, most
+        repeated first"""
+
+        duplicates = [ (count, sql) for (sql, count) in self.fingerprints.items() if count > 1 ]
+        duplicates.sort(key=lambda d: d[0], reverse=True)
+
+        return [ {'sql': sql, 'count': count} for (count, sql) in duplicates ]
+
+    def as_dict(self, **kwargs):
+
+        duplicates = self.get_duplicates()
+        entry = OrderedDict(kwargs)
+        entry['sql_count'] = self.sql_count
+        entry['sql_ms'] = round(self.sql_time*1000.0, 3)
+        entry['sql_duplicates'] = sum([ d['count']-1 for d in duplicates ])
+        entry['duplicate_fingerprints'] = duplicates[0:N_DUPLICATE_FINGERPRINTS]
+        entry['http_count'] = len(self.http_calls)
+        entry['http_ms'] = round(sum([ c['ms'] for c in self.http_calls ]), 3)
+        entry['http_calls'] = self.http_calls
+
+        return entry
+
+def start_request_record(record):
+    """Function to make record that of the request being served, returning
+    the token to end it with"""
+
+    return _current_record.set(record)
+
+def end_request_record(token):
+
+    _current_record.reset(token)
+
+def get_request_record():
+
+    return _current_record.get()
+
+def _accounted_send(session, request, **kwargs):
+    """Send method of requests sessions, timing each request made while a
+    request to the site is being recorded"""
+
+    record = _current_record.get()
+    if record == None:
+        return _requests_send(session, request, **kwargs)
+
+    status = 'error'
+    t0 = time.perf_counter()
+    try:
+        response = _requests_send(session, request, **kwargs)
+        status = response.status_code
+        return response
+    finally:
+        record.add_http_call(request.method, request.url, status,
+                             time.perf_counter() - t0)
+
+def install_http_accounting():
+    """Function to add the timing of outbound requests to the requests
+    package, once per process"""
+
+    global _requests_send
+
+    with _loggers_lock:
+        if _requests_send == None:
+            _requests_send = requests.Session.send
+            requests.Session.send = _accounted_send
+
+def get_performance_logger(log_path=None):
+    """Function to return the logger writing to the performance log.  The
+    log is reopened once it has been rotated, so that every process
+    writing to it follows the rotation made by logrotate."""
+
+    if log_path == None:
+        log_path = settings.PERFORMANCE_LOG_PATH
+
+    with _loggers_lock:
+        if log_path not in _loggers:
+            log_dir = os.path.dirname(log_path)
+            if len(log_dir) > 0 and not os.path.isdir(log_dir):
+                os.makedirs(log_dir)
+
+            handler = WatchedFileHandler(log_path)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+
+            log = logging.getLogger('performance:'+log_path)
+            log.setLevel(logging.INFO)
+            log.propagate = False
+            log.addHandler(handler)
+            _loggers[log_path] = log
+
+    return _loggers[log_path]
+
+def write_performance_record(entry, log_path=None):
+
+    log = get_performance_logger(log_path)
+    log.info(json.dumps(entry))
+
+def read_performance_records(log_path=None, max_records=None):
+    """Function to read the most recent records of the performance log,
+    including up to PERFORMANCE_LOG_BACKUPS files rotated by logrotate, as
+    log_path.1, log_path.2...  Records are returned oldest first."""
+
+    if log_path == None:
+        log_path = settings.PERFORMANCE_LOG_PATH
+    if max_records == None:
+        max_records = settings.PERFORMANCE_SUMMARY_RECORDS
+
+    file_list = [ log_path ]
+    for i in range(1,settings.PERFORMANCE_LOG_BACKUPS+1,1):
+        file_list.append(log_path+'.'+str(i))
+
+    records = []
+    for file_path in file_list:
+        if len(records) >= max_records:
+            break
+        if not os.path.isfile(file_path):
+            continue
+
+        with open(file_path, 'r') as f:
+            lines = f.readlines()
+
+        for line in reversed(lines):
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+            if len(records) >= max_records:
+                break
+
+    records.reverse()
+
+    return records
+
+def summarise_performance_records(records):
+    """Function to summarise the performance records per URL name, giving
+    the percentiles of the time taken, and the queries and outbound
+    requests made.  URL names are returned slowest first, by their 95th
+    percentile."""
+
+    groups = OrderedDict()
+    for entry in records:
+        groups.setdefault(entry.get('url_name', 'unknown'), []).append(entry)
+
+    summary = []
+    for (url_name, entries) in groups.items():
+        durations = np.array([ e['duration_ms'] for e in entries ])
+        sql_counts = np.array([ e['sql_count'] for e in entries ])
+        http_times = np.array([ e['http_ms'] for e in entries ])
+
+        repeats = {}
+        for e in entries:
+            for d in e['duplicate_fingerprints']:
+                repeats[d['sql']] = repeats.get(d['sql'], 0) + d['count']
+        if len(repeats) > 0:
+            top_duplicate = max(repeats.items(), key=lambda r: r[1])[0]
+        else:
+            top_duplicate = ''
+
+        (p50, p95, p99) = np.percentile(durations, [50, 95, 99])
+        summary.append(OrderedDict([('url_name', url_name),
+                                    ('count', len(entries)),
+                                    ('p50_ms', round(float(p50), 1)),
+                                    ('p95_ms', round(float(p95), 1)),
+                                    ('p99_ms', round(float(p99), 1)),
+                                    ('max_ms', round(float(durations.max()), 1)),
+                                    ('mean_sql_count', round(float(sql_counts.mean()), 1)),
+                                    ('p95_sql_count', round(float(np.percentile(sql_counts, 95)), 1)),
+                                    ('mean_sql_ms', round(float(np.mean([ e['sql_ms'] for e in entries ])), 1)),
+                                    ('mean_sql_duplicates', round(float(np.mean([ e['sql_duplicates'] for e in entries ])), 1)),
+                                    ('top_duplicate', top_duplicate),
+                                    ('mean_http_count', round(float(np.mean([ e['http_count'] for e in entries ])), 1)),
+                                    ('p95_http_ms', round(float(np.percentile(http_times, 95)), 1))]))
+
+    summary.sort(key=lambda s: s['p95_ms'], reverse=True)
+
+    return summary
@@ -1,7 +1,17 @@
 from . import MLPlots
 from . import local_conf
-def plot_it(event):
-    artemis = local_conf.get_conf('artemis')
+from django.core.cache import caches
+from os import path
+import glob
+import hashlib
+
+# Cache alias holding the rendered lightcurve plots, shared between the web
+# server processes and artemis_subscriber
+LIGHTCURVE_CACHE = 'lightcurves'
+
+def plot_it(event, artemis=None):
+    if artemis == None:
+        artemis = local_conf.get_conf('artemis')
     Plot=MLPlots.MLplots(event)
     Plot.path_lightcurves(artemis+'data/')
     Plot.path_models(artemis+'model/')
@@ -14,3 +24,90 @@ def plot_it(event):
     Plot.get_colors()
     script, div = Plot.plot_data()
     return script, div
+
+def get_lightcurve_inputs(event, artemis=None):
+    """Function to return the paths to the ARTEMiS files from which the
+    lightcurve plot of an event is made: its .dat files and its .model
+    and .align files"""
+
+    if artemis == None:
+        artemis = local_conf.get_conf('artemis')
+
+    inputs = glob.glob(artemis+'data/*'+event+'*.dat')
+    inputs += glob.glob(artemis+'model/'+event+'.model')
+    inputs += glob.glob(artemis+'model/'+event+'.align')
+
+    return sorted(inputs)
+
+def get_lightcurve_fingerprint(event, artemis=None):
+    """Function to return a digest of the path, size and modification time
+    of each of the input files for an event's lightcurve plot, which changes
+    whenever ARTEMiS updates any of them"""
+
+    digest = hashlib.sha1()
+    for file_path in get_lightcurve_inputs(event, artemis=artemis):
+        try:
+            stat = path.getsize(file_path), path.getmtime(file_path)
+        except OSError:
+            continue
+        digest.update((file_path+' '+str(stat[0])+' '+repr(stat[1])+'\n').encode('utf-8'))
+
+    return digest.hexdigest()
+
+def get_cache_key(event):
+
+    return 'lightcurve_plot:'+event
+
+def count_lightcurve_cache(outcome):
+
+    cache = caches[LIGHTCURVE_CACHE]
+    key = 'lightcurve_plot_stats:'+outcome
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+def get_lightcurve_plot(event, artemis=None):
+    """Function to return the bokeh script and div of an event's lightcurve
+    plot, from the cache if its ARTEMiS input files have not changed since
+    it was rendered, otherwise rendered by plot_it and cached.  One plot is
+    kept per event, with the fingerprint of the inputs it was made from."""
+
+    cache = caches[LIGHTCURVE_CACHE]
+    key = get_cache_key(event)
+    fingerprint = get_lightcurve_fingerprint(event, artemis=artemis)
+
+    entry = cache.get(key)
+    if entry != None and entry['fingerprint'] == fingerprint:
+        count_lightcurve_cache('hits')
+        return entry['script'], entry['div']
+
+    count_lightcurve_cache('misses')
+    (script, div) = plot_it(event, artemis=artemis)
+    cache.set(key, {'fingerprint': fingerprint, 'script': script, 'div': div})
+
+    return script, div
+
+def invalidate_lightcurve_plot(event):
+    """Function to remove the cached lightcurve plot of an event, when its
+    ARTEMiS data are updated"""
+
+    caches[LIGHTCURVE_CACHE].delete(get_cache_key(event))
+
+def get_lightcurve_cache_stats():
+    """Function to return the numbers of lightcurve plots served from the
+    cache and rendered since the counters were last reset"""
+
+    cache = caches[LIGHTCURVE_CACHE]
+    stats = {}
+    for outcome in ['hits', 'misses']:
+        stats[outcome] = cache.get('lightcurve_plot_stats:'+outcome, 0)
+
+    return stats
+
+def reset_lightcurve_cache_stats():
+
+    cache = caches[LIGHTCURVE_CACHE]
+    for outcome in ['hits', 'misses']:
+        cache.set('lightcurve_plot_stats:'+outcome, 0, None)
@@ -15,13 +15,21 @@ from django.conf import settings
 from django.utils import timezone
 from django import setup
 from datetime import datetime, timedelta
+from django.db import connection, transaction
+from django.db.models import Q, OuterRef, Subquery, QuerySet, Count, Sum
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+import numpy as np
+import pytz
 setup()
 
 from . import rome_fields_dict
 from . import field_check
 from . import utilities
 from events.models import ObsRequest, Tap, Event, SingleModel, SubObsRequest
-from events.models import EventName, Image, Field, Operator, DataFile
+from events.models import EventName, Image, Field, Operator, DataFile, ImageStats
+from events.models import get_dec_zone
 from . import observation_classes
 
 class TapEvent():
@@ -52,6 +60,136 @@ class TapEvent():
             str(self.tsamp) + ' ' + str(self.texp) + ' ' +\
             str(self.nexp) + ' ' + str(self.ipp)
 
+class EventNameResolver():
+    """Class providing a process-wide lookup of Event primary keys by any
+    of their assigned names, so that the ingestion scripts can resolve
+    survey names with a dictionary lookup instead of a query per call.
+
+    The lookup table is warm-loaded from a single query by load(); names
+    not found in the table are looked up in the DB and cached on success.
+    Entries are kept in step with EventName saves and deletions made in
+    this process by the signal receivers below.
+    """
+
+    def __init__(self):
+        self.event_ids = {}
+
+    def load(self):
+        """Method to (re)load the names of all events in the DB"""
+
+        self.event_ids = dict(EventName.objects.values_list('name','event_id'))
+
+    def clear(self):
+        """Method to empty the lookup table, so that names are fetched
+        from the DB afresh"""
+
+        self.event_ids = {}
+
+    def set_name(self, name, event_id):
+        self.event_ids[name] = event_id
+
+    def forget_name(self, name):
+        self.event_ids.pop(name, None)
+
+    def candidate_names(self, event_name):
+        """Method to return the names under which an event may be known
+        to the DB, given a name in long- or short-hand format or the
+        combined name of an event detected by several surveys, e.g.
+        OB180001, OGLE-2018-BLG-0001/MOA-2018-BLG-0001
+        """
+
+        names = []
+        for name in event_name.split('/'):
+            name = name.strip()
+            for alias in [ name, utilities.short_to_long_name(name) ]:
+                if len(alias) > 0 and alias not in names:
+                    names.append(alias)
+
+        return names
+
+    def get_event_id(self, event_name):
+        """Method to return the primary key of the Event with the given
+        name, or None if no event has that name
+        Inputs:
+                event_name  str   Event name, e.g. OGLE-2017-BLG-1234 or OB171234
+        """
+
+        names = self.candidate_names(event_name)
+
+        for name in names:
+            if name in self.event_ids:
+                return self.event_ids[name]
+
+        qs = EventName.objects.filter(name__in=names).values_list('name','event_id')
+        matches = dict(qs)
+        self.event_ids.update(matches)
+
+        for name in names:
+            if name in matches:
+                return matches[name]
+
+        return None
+
+    def get_event_ids(self, event_names):
+        """Method to return a dictionary of Event primary keys keyed by
+        event name, for those of the names given which are known to the DB.
+        Names not already in the lookup table are fetched in one query.
+        """
+
+        names = {}
+        for event_name in set(event_names):
+            names[event_name] = self.candidate_names(event_name)
+
+        missing = []
+        for event_name, aliases in names.items():
+            if not any(alias in self.event_ids for alias in aliases):
+                missing += aliases
+
+        if len(missing) > 0:
+            qs = EventName.objects.filter(name__in=missing).values_list('name','event_id')
+            self.event_ids.update(dict(qs))
+
+        event_ids = {}
+        for event_name, aliases in names.items():
+            for alias in aliases:
+                if alias in self.event_ids:
+                    event_ids[event_name] = self.event_ids[alias]
+                    break
+
+        return event_ids
+
+event_name_resolver = EventNameResolver()
+
+@receiver(post_save, sender=EventName)
+def update_event_name_resolver(sender, instance, created, **kwargs):
+    """Keep the process-wide event name lookup in step with saved names.
+    The entry is only added once the transaction commits, so that names
+    rolled back are not cached.  A renamed entry leaves its old name
+    behind in the table, so the table is cleared instead.
+    """
+
+    if created:
+        name = instance.name
+        event_id = instance.event_id
+        transaction.on_commit(lambda: event_name_resolver.set_name(name, event_id))
+    else:
+        event_name_resolver.clear()
+
+@receiver(post_delete, sender=EventName)
+def forget_event_name(sender, instance, **kwargs):
+    event_name_resolver.forget_name(instance.name)
+
+def resolve_event_id(event_name):
+    """Function to return the primary key of the event with the given name,
+    using the process-wide name lookup
+    Inputs:
+            event_name  str   Event name, e.g. OGLE-2017-BLG-1234 or OB171234
+    Outputs:
+            event_id    int   Primary key of the Event or None if unknown
+    """
+
+    return event_name_resolver.get_event_id(event_name)
+
 def get_active_obs(log=None):
     """Function to extract a list of the currently-active observations
     requests from the database"""
@@ -187,15 +325,10 @@ def get_tap_list(log=None):
     """
 
     tap_list = []
-    qs = Event.objects.filter(status='MO')
+    qs = Event.objects.filter(status='MO').select_related('field','latest_tap')
+    event_names = get_names_for_events(qs)
     for q in qs:
-        names = get_event_names(q.pk)
-        name = ''
-        for n in names:
-            if len(name) == 0:
-                name += n.name
-            else:
-                name += '/' + n.name
+        name = '/'.join(event_names.get(q.pk, []))
         target = TapEvent()
         target.event_id = q.pk
         target.event = q
@@ -205,18 +338,18 @@ def get_tap_list(log=None):
         target.ev_dec = q.ev_dec
         target.tap_status = q.status
 
-        tap_entries = Tap.objects.filter(event=q.pk).order_by('timestamp').reverse()
+        tap_entry = q.latest_tap
 
-        if len(tap_entries) > 0:
-            target.pk = tap_entries[0].pk
-            target.priority = tap_entries[0].priority
-            target.tsamp = float(tap_entries[0].tsamp)
-            target.texp = float(tap_entries[0].texp)
-            target.nexp = int(tap_entries[0].nexp)
-            target.telclass = tap_entries[0].telclass+'0'
-            target.omega = tap_entries[0].omega
-            target.passband = tap_entries[0].passband
-            target.ipp = float(tap_entries[0].ipp)
+        if tap_entry != None:
+            target.pk = tap_entry.pk
+            target.priority = tap_entry.priority
+            target.tsamp = float(tap_entry.tsamp)
+            target.texp = float(tap_entry.texp)
+            target.nexp = int(tap_entry.nexp)
+            target.telclass = tap_entry.telclass+'0'
+            target.omega = tap_entry.omega
+            target.passband = tap_entry.passband
+            target.ipp = float(tap_entry.ipp)
 
             tap_list.append(target)
 
@@ -241,7 +374,9 @@ def get_last_single_model(event,modeler=None,log=None):
         modeler   String       Name of originator of model
     """
 
-    if modeler==None:
+    if modeler==None and event.latest_model_id != None:
+        qs = [ event.latest_model ]
+    elif modeler==None:
         qs = SingleModel.objects.filter(event=event).order_by('last_updated').reverse()
     else:
         qs = SingleModel.objects.filter(
@@ -274,7 +409,10 @@ def get_last_datafile(event,log=None):
         log       Logger object
     """
 
-    qs = DataFile.objects.filter(event=event).order_by('last_upd').reverse()
+    if event.latest_datafile_id != None:
+        qs = [ event.latest_datafile ]
+    else:
+        qs = DataFile.objects.filter(event=event).order_by('last_upd').reverse()
 
     try:
         df = qs[0]
@@ -298,7 +436,10 @@ def get_latest_tap_entry(event,log=None):
         log       Logger object
     """
 
-    qs = Tap.objects.filter(event=event).order_by('timestamp').reverse()
+    if event.latest_tap_id != None:
+        qs = [ event.latest_tap ]
+    else:
+        qs = Tap.objects.filter(event=event).order_by('timestamp').reverse()
 
     if len(qs) == 0:
         entry = None
@@ -314,6 +455,96 @@ def get_latest_tap_entry(event,log=None):
 
     return entry
 
+def chunk_event_ids(event_ids, chunk_size=900):
+    """Function to split a list of event IDs into chunks that stay within
+    the limit on the number of parameters in an SQL query.
+    A QuerySet of Events is passed through as a single subquery."""
+
+    if isinstance(event_ids, QuerySet):
+        return [ event_ids.values('pk') ]
+
+    event_ids = [ getattr(e, 'pk', e) for e in event_ids ]
+
+    return [ event_ids[i:i+chunk_size] for i in range(0,len(event_ids),chunk_size) ]
+
+def get_latest_entries_for_events(model, order_field, event_ids, **filters):
+    """Function to return the most recent entry of the given model for each
+    of a set of events, selecting them all with a correlated subquery rather
+    than one query per event.
+    Inputs:
+        model       Model class with an event ForeignKey
+        order_field str       Field defining the most recent entry
+        event_ids   list      Event primary keys or objects, or a QuerySet of Events
+        filters     kwargs    Further restrictions on the entries considered
+    Outputs:
+        entries     dict      Latest entry keyed by event ID; events without
+                              entries are omitted
+    """
+
+    latest = model.objects.filter(event=OuterRef('event'), **filters
+                                  ).order_by('-'+order_field, '-pk').values('pk')[:1]
+
+    entries = {}
+    for chunk in chunk_event_ids(event_ids):
+        qs = model.objects.filter(event_id__in=chunk, pk=Subquery(latest))
+        for entry in qs:
+            entries[entry.event_id] = entry
+
+    return entries
+
+def get_latest_models_for_events(event_ids,modeler=None):
+    """Function to return the last single-lens model for each of a set of
+    events, optionally restricted to the models from a given modeler
+    Inputs:
+        event_ids   list      Event primary keys or objects, or a QuerySet of Events
+        modeler     str       Name of originator of model
+    Outputs:
+        models      dict      SingleModel objects keyed by event ID
+    """
+
+    if modeler == None:
+        return get_latest_entries_for_events(SingleModel, 'last_updated', event_ids)
+    else:
+        return get_latest_entries_for_events(SingleModel, 'last_updated', event_ids,
+                                             modeler=modeler)
+
+def get_latest_datafiles_for_events(event_ids):
+    """Function to return the last datafile submitted for each of a set
+    of events
+    Inputs:
+        event_ids   list      Event primary keys or objects, or a QuerySet of Events
+    Outputs:
+        datafiles   dict      DataFile objects keyed by event ID
+    """
+
+    return get_latest_entries_for_events(DataFile, 'last_upd', event_ids)
+
+def get_latest_taps_for_events(event_ids):
+    """Function to return the latest TAP entry for each of a set of events
+    Inputs:
+        event_ids   list      Event primary keys or objects, or a QuerySet of Events
+    Outputs:
+        taps        dict      Tap objects keyed by event ID
+    """
+
+    return get_latest_entries_for_events(Tap, 'timestamp', event_ids)
+
+def get_names_for_events(event_ids):
+    """Function to return the names of each of a set of events
+    Inputs:
+        event_ids   list      Event primary keys or objects, or a QuerySet of Events
+    Outputs:
+        names       dict      Lists of name strings keyed by event ID
+    """
+
+    names = {}
+    for chunk in chunk_event_ids(event_ids):
+        qs = EventName.objects.filter(event_id__in=chunk).order_by('pk')
+        for (event_id, name) in qs.values_list('event_id','name'):
+            names.setdefault(event_id, []).append(name)
+
+    return names
+
 def get_event(event_pk):
     """Function to extract an event object from the DB based on its
     primary key)
@@ -330,12 +561,20 @@ def get_event_by_name(event_name):
     Inputs:
             event_name  str   Full-length name e.g. OGLE-2017-BLG-1234
     """
-    qs_name = EventName.objects.filter(name=event_name)
-    if len(qs_name) == 0:
+    event_id = resolve_event_id(event_name)
+    if event_id == None:
         return None, 'Event name not in DB'
-    else:
-        event = Event.objects.get(pk=qs_name[0].event_id)
-        return event, 'OK'
+
+    try:
+        event = Event.objects.get(pk=event_id)
+    except Event.DoesNotExist:
+        # The event was removed by another process since its name was
+        # cached, under whichever of its names the event was resolved
+        for name in event_name_resolver.candidate_names(event_name):
+            event_name_resolver.forget_name(name)
+        return None, 'Event name not in DB'
+
+    return event, 'OK'
 
 def get_event_names(event_id):
     """Function to extract the names of a target, given the event ID number
@@ -408,18 +647,33 @@ def get_event_field_id(ra_str,dec_str):
         id_field = sorted(rome_fields_dict.field_dict.keys())[id_field]
     return id_field, rate
 
-def get_event_by_position(ra_str,dec_str):
+def get_event_field_ids(ra_array, dec_array):
+    """Function to identify which ROMEREA field each of an array of
+    positions lies in
+    Inputs:
+        ra_array, dec_array  array  Coordinates in decimal degrees
+    Outputs:
+        id_fields            list   Field name for each position, or
+                                    'Outside ROMEREA footprint'
+        rates                array  Field rate for each position, or -1
+    """
+
+    (idx, rates) = field_check.romecheck_array(ra_array, dec_array)
+
+    names = sorted(rome_fields_dict.field_dict.keys()) + ['Outside ROMEREA footprint']
+
+    return [ names[i] for i in idx ], rates
+
+def get_event_by_position(ra_str,dec_str,radius=2.5):
     """Function to find an event by its sky coordinates in sexigesimal format.
-    Returns first event from resulting QuerySet.
+    Returns the nearest event within radius (decimal arcsec), or None.
     """
 
-    try:
-        event = Event.objects.filter(
-                            ev_ra__contains=ra_str,
-                            ev_dec__contains=dec_str
-                            )[0]
+    (events_list, separations) = cone_search(ra_str,dec_str,radius)
 
-    except IndexError:
+    if len(events_list) > 0:
+        event = events_list[0]
+    else:
         event = None
 
     return event
@@ -436,65 +690,290 @@ def get_events_within_radius(ra_str, dec_str, radius):
     Events_list is returned sorted, with the nearest match first
     """
 
-    (ra1,dec1) = utilities.sex2decdeg(ra_str,dec_str)
-    radius = radius / 3600.0
+    (events_list, separations) = cone_search(ra_str,dec_str,radius)
+
+    return events_list
+
+def select_events_in_zones(dec_min, dec_max, ra_min=None, ra_max=None):
+    """Function to return a QuerySet of the events lying within a range of
+    declination and, optionally, RA, selected via the indexed declination zones.
+    Inputs:
+        dec_min, dec_max   float  Declination limits, decimal degrees
+        ra_min, ra_max     float  RA limits, decimal degrees.  ra_min may be
+                                  negative or ra_max > 360 to search across
+                                  RA=0.  If None, no RA limit is applied.
+    Outputs:
+        qs  QuerySet  Event objects
+    """
+
+    dec_min = max(dec_min, -90.0)
+    dec_max = min(dec_max, 90.0)
+    (zmin, zmax) = (get_dec_zone(dec_min), get_dec_zone(dec_max))
 
-    events_list = []
-    separations = []
+    if zmax - zmin < 50:
+        qs = Event.objects.filter(dec_zone__in=list(range(zmin,zmax+1)))
+    else:
+        qs = Event.objects.filter(dec_zone__range=(zmin,zmax))
 
-    qs_events = Event.objects.filter(ev_ra__contains=ra_str[0:5]).filter(ev_dec__contains=dec_str[0:5])
-    for event in qs_events:
-        (ra2, dec2) = utilities.sex2decdeg(event.ev_ra,event.ev_dec)
-        sep = utilities.separation_two_points((ra1,dec2),(ra2,dec2))
-        if sep <= radius:
-            events_list.append(event)
-            separations.append(sep)
-    if len(events_list) > 1:
-        (separations, events_list) = zip(*sorted(zip(separations,events_list)))
+    qs = qs.filter(dec__gte=dec_min, dec__lte=dec_max)
 
-    return events_list
+    if ra_min != None and ra_max != None and (ra_max - ra_min) < 360.0:
+        if ra_min < 0.0:
+            qs = qs.filter(Q(ra__gte=ra_min+360.0) | Q(ra__lte=ra_max))
+        elif ra_max > 360.0:
+            qs = qs.filter(Q(ra__gte=ra_min) | Q(ra__lte=ra_max-360.0))
+        else:
+            qs = qs.filter(ra__gte=ra_min, ra__lte=ra_max)
+
+    return qs
+
+def get_separations(ra1, dec1, ra2, dec2):
+    """Function to return the great-circle separations in arcsec between
+    positions in decimal degrees, given as floats or arrays, using the
+    haversine formula, which remains accurate for small separations"""
+
+    (ra1, dec1, ra2, dec2) = (np.radians(ra1), np.radians(dec1),
+                              np.radians(ra2), np.radians(dec2))
+    a = np.sin((dec2 - dec1)/2.0)**2 + \
+        np.cos(dec1) * np.cos(dec2) * np.sin((ra2 - ra1)/2.0)**2
+
+    return np.degrees(2.0 * np.arcsin(np.sqrt(np.clip(a,0.0,1.0)))) * 3600.0
+
+def cone_search(ra, dec, radius):
+    """Function to find all events within a given radius of a sky position.
+    Candidates are selected from the DB by declination zone and a bounding
+    box, and the separations of all candidates are then computed in one pass.
+    Inputs:
+        ra       str or float  RA in sexagesimal format or decimal degrees
+        dec      str or float  Dec in sexagesimal format or decimal degrees
+        radius   float         Search radius in decimal arcsec
+    Outputs:
+        events_list  list  Event objects, sorted with the nearest match first
+        separations  list  Separations of each event from (ra, dec), arcsec
+    """
+
+    (ra_deg, dec_deg) = get_coords_in_degrees(ra, dec)
+    (ra_deg, dec_deg) = (float(ra_deg), float(dec_deg))
+    r_deg = radius / 3600.0
+
+    # Half-width of the box in RA widens with declination, and there is
+    # no useful RA limit for searches which reach a pole:
+    if abs(dec_deg) + r_deg >= 89.9:
+        (ra_min, ra_max) = (None, None)
+    else:
+        delta_ra = r_deg / np.cos(np.radians(abs(dec_deg) + r_deg))
+        (ra_min, ra_max) = (ra_deg - delta_ra, ra_deg + delta_ra)
+
+    candidates = select_events_in_zones(dec_deg - r_deg, dec_deg + r_deg,
+                                        ra_min, ra_max)
+    candidates = list(candidates)
+
+    if len(candidates) == 0:
+        return [], []
+
+    seps = get_separations(ra_deg, dec_deg,
+                           np.array([ e.ra for e in candidates ], dtype=float),
+                           np.array([ e.dec for e in candidates ], dtype=float))
+
+    idx = np.where(seps <= radius)[0]
+    idx = idx[np.argsort(seps[idx])]
+
+    events_list = [ candidates[i] for i in idx ]
+    separations = [ float(seps[i]) for i in idx ]
+
+    return events_list, separations
+
+# Bounding boxes of the positions crossmatched per query
+BOXES_PER_QUERY = 200
+
+def get_zone_ra_ranges(ra_array, dec_array, radius):
+    """Function to return the bounding boxes of cone searches about each of
+    an array of positions, as RA ranges within each declination zone.
+    Overlapping ranges in a zone are merged, and ranges crossing RA=0 are
+    split in two.
+    Inputs:
+        ra_array, dec_array  array  Coordinates in decimal degrees
+        radius               float  Search radius in decimal arcsec
+    Outputs:
+        ranges  list  (dec_zone, ra_min, ra_max) tuples
+    """
+
+    r_deg = radius / 3600.0
+
+    zone_ranges = {}
+    for (ra_deg, dec_deg) in zip(ra_array, dec_array):
+        if abs(dec_deg) + r_deg >= 89.9:
+            intervals = [ (0.0, 360.0) ]
+        else:
+            delta_ra = r_deg / np.cos(np.radians(abs(dec_deg) + r_deg))
+            (ra_min, ra_max) = (ra_deg - delta_ra, ra_deg + delta_ra)
+            if ra_min < 0.0:
+                intervals = [ (ra_min+360.0, 360.0), (0.0, ra_max) ]
+            elif ra_max > 360.0:
+                intervals = [ (ra_min, 360.0), (0.0, ra_max-360.0) ]
+            else:
+                intervals = [ (ra_min, ra_max) ]
+
+        zmin = get_dec_zone(max(dec_deg - r_deg, -90.0))
+        zmax = get_dec_zone(min(dec_deg + r_deg, 90.0))
+        for zone in range(zmin,zmax+1,1):
+            zone_ranges.setdefault(zone, []).extend(intervals)
+
+    ranges = []
+    for zone in sorted(zone_ranges.keys()):
+        intervals = sorted(zone_ranges[zone])
+        (ra_min, ra_max) = intervals[0]
+        for (lower, upper) in intervals[1:]:
+            if lower <= ra_max:
+                ra_max = max(ra_max, upper)
+            else:
+                ranges.append( (zone, ra_min, ra_max) )
+                (ra_min, ra_max) = (lower, upper)
+        ranges.append( (zone, ra_min, ra_max) )
+
+    return ranges
+
+def crossmatch_positions(ra_array, dec_array, radius):
+    """Function to find the events within a given radius of each of a list
+    of sky positions.  The candidates are read from the DB by the indexed
+    declination zone and RA bounding boxes of all of the positions, a few
+    queries in all, and the separations of every position and candidate
+    pair are computed in one pass.
+    Inputs:
+        ra_array, dec_array  array  Coordinates in decimal degrees
+        radius               float  Search radius in decimal arcsec
+    Outputs:
+        matches  list  For each position, a list of (event ID, separation)
+                       tuples, sorted with the nearest match first
+    """
+
+    ra_array = np.asarray(ra_array, dtype=float)
+    dec_array = np.asarray(dec_array, dtype=float)
+    r_deg = radius / 3600.0
+
+    matches = [ [] for i in range(len(ra_array)) ]
+    if len(ra_array) == 0:
+        return matches
+
+    ranges = get_zone_ra_ranges(ra_array, dec_array, radius)
+
+    # The query is written out rather than built from Q objects, whose
+    # compilation takes several times longer than the query for 1000 boxes
+    opts = Event._meta
+    (pk, ra, dec, zone) = [ connection.ops.quote_name(column) for column in
+                            (opts.pk.column, opts.get_field('ra').column,
+                             opts.get_field('dec').column, opts.get_field('dec_zone').column) ]
+    select = 'SELECT '+pk+', '+ra+', '+dec+' FROM '+connection.ops.quote_name(opts.db_table)+' WHERE '
+    box = '('+zone+' = %s AND '+ra+' >= %s AND '+ra+' <= %s)'
+
+    candidates = []
+    with connection.cursor() as cursor:
+        for i in range(0,len(ranges),BOXES_PER_QUERY):
+            chunk = ranges[i:i+BOXES_PER_QUERY]
+            cursor.execute(select+' OR '.join([box]*len(chunk)),
+                           [ value for r in chunk for value in r ])
+            candidates += cursor.fetchall()
+
+    if len(candidates) == 0:
+        return matches
+
+    # Pair each position with the candidates within its range of declination,
+    # found from the candidates sorted by declination:
+    candidates = np.array(candidates, dtype=float)
+    candidates = candidates[np.argsort(candidates[:,2])]
+    lower = np.searchsorted(candidates[:,2], dec_array - r_deg, side='left')
+    upper = np.searchsorted(candidates[:,2], dec_array + r_deg, side='right')
+    counts = upper - lower
+
+    idx_pos = np.repeat(np.arange(len(ra_array)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    idx_cand = np.repeat(lower, counts) + offsets
+
+    seps = get_separations(ra_array[idx_pos], dec_array[idx_pos],
+                           candidates[idx_cand,1], candidates[idx_cand,2])
+
+    keep = np.where(seps <= radius)[0]
+    keep = keep[np.lexsort((seps[keep], idx_pos[keep]))]
+
+    for k in keep:
+        matches[idx_pos[k]].append( (int(candidates[idx_cand[k],0]), float(seps[k])) )
+
+    return matches
 
 def get_events_box_search(params):
-    """Function to find a list of all events within a specified radius less than
-    1 arcmin.  Related to update_db_2's check_coords function.
+    """Function to find a list of all events within a box on the sky.
     Inputs in params dictionary:
-        ra_centre   float    RA of cone centre
-        dec_centre  float    Dec of cone centre
-        delta_ra   float  Search height in RA, decimal arcsec < 60 arcsec
-        delta_dec   float  Search height in Dec, decimal arcsec < 60 arcsec
+        ra_min, ra_max     float  RA limits of box, decimal degrees
+        dec_min, dec_max   float  Dec limits of box, decimal degrees
     Outputs:
-        events_list list  Event objects
-    Events_list is returned sorted, with the nearest match first
+        events  QuerySet  Event objects
     """
 
-    events_list = []
-    separations = []
-
-    events = Event.objects.filter(ra__gte=params['ra_min'],
-                                     ra__lte=params['ra_max'],
-                                     dec__gte=params['dec_min'],
-                                     dec__lte=params['dec_max'])
+    events = select_events_in_zones(params['dec_min'], params['dec_max'],
+                                    params['ra_min'], params['ra_max'])
 
     return events
 
+# Footprints of the fields in the Field table, loaded on first use
+_field_footprints = None
+
+def get_field_footprints():
+    """Function to return the footprints of the fields in the Field table
+    which have decimal coordinates, loading them from the DB on first use.
+    Outputs:
+        (names, footprints)  list of field names, field_check.FieldFootprints
+    """
+
+    global _field_footprints
+
+    if _field_footprints == None:
+        qs = Field.objects.filter(field_ra_decimal__isnull=False,
+                                  field_dec_decimal__isnull=False).order_by('pk')
+        fields = list(qs.values_list('name', 'field_ra_decimal', 'field_dec_decimal'))
+
+        footprints = field_check.FieldFootprints([ float(f[1]) for f in fields ],
+                                                 [ float(f[2]) for f in fields ],
+                                                 half_width=field_check.LHALF)
+        _field_footprints = ([ f[0] for f in fields ], footprints)
+
+    return _field_footprints
+
+@receiver(post_save, sender=Field)
+@receiver(post_delete, sender=Field)
+def clear_field_footprints(sender, **kwargs):
+    global _field_footprints
+    _field_footprints = None
+
+def get_fields_containing_coordinates(ra_array, dec_array):
+    """Function to identify the ROME survey field, from the Field table,
+    containing each of an array of coordinates
+    Inputs:
+        ra_array, dec_array  array  Coordinates in decimal degrees
+    Outputs:
+        field_names          list   Field name for each coordinate, or
+                                    'Outside ROME footprint'
+    """
+
+    (names, footprints) = get_field_footprints()
+
+    idx = footprints.classify(ra_array, dec_array)
+
+    names = names + ['Outside ROME footprint']
+
+    return [ names[i] for i in idx ]
+
 def get_field_containing_coordinates(params):
     """DB-enabled equivalent to field_check.romecheck; function to check whether
     a given set of coordinates lies within the ROME survey fields"""
 
-    field_list = Field.objects.all()
-
-    lhalf = 0.220833333333
+    (names, footprints) = get_field_footprints()
 
-    for f in field_list:
-        if f.field_ra_decimal != None and f.field_dec_decimal != None:
-            if params['ra'] < float(f.field_ra_decimal) + lhalf and\
-               params['ra'] > float(f.field_ra_decimal) - lhalf and\
-               params['dec'] < float(f.field_dec_decimal) + lhalf and\
-               params['dec'] > float(f.field_dec_decimal) - lhalf:
+    idx = footprints.locate(params['ra'], params['dec'])
 
-                   return f.name
+    if idx == -1:
+        return 'Outside ROME footprint'
 
-    return 'Outside ROME footprint'
+    return names[idx]
 
 def combine_event_names(qs_event_names):
     """Function to return the combined name of an event discovered by multiple
@@ -511,44 +990,108 @@ def combine_event_names(qs_event_names):
     combined_name = utilities.combined_survey_name(name_list)
     return combined_name
 
-def get_image_rejection_statistics(date_start=None,date_end=None):
+def tally_image_qualities(quality_counts, stats=None):
+    """Function to convert the numbers of images with each quality
+    description into the numbers of images accepted and rejected for each
+    reason.  An image may be rejected for several reasons, separated by ' ; '
+    in its quality description.
+    Inputs:
+        quality_counts  iterable  (quality, number of images) pairs
+        stats           dict      Statistics to add to (optional)
+    Outputs:
+        stats           dict      Numbers of images keyed by reason, with the
+                                  keys 'Accepted' and 'Total number of images'
+    """
+
+    if stats == None:
+        stats = {'Accepted': 0, 'Total number of images': 0}
+
+    for (quality, n) in quality_counts:
+        stats['Total number of images'] += n
+        if len(quality) == 0:
+            stats['Accepted'] += n
+        else:
+            for k in quality.split(' ; '):
+                stats[k] = stats.get(k, 0) + n
+
+    return stats
+
+def select_latest_images(date_start=None,date_end=None):
+    """Function to return a QuerySet of the most recent entry for each image
+    name, optionally restricted to a range of dates of observation.
+    Images ingested more than once have several entries in the DB."""
+
+    latest = Image.objects.filter(image_name=OuterRef('image_name')
+                                  ).order_by('-timestamp','-pk').values('pk')[:1]
+
+    qs = Image.objects.filter(pk=Subquery(latest))
+    if date_start != None:
+        qs = qs.filter(date_obs__gte=date_start)
+    if date_end != None:
+        qs = qs.filter(date_obs__lte=date_end)
+
+    return qs
+
+def get_image_rejection_statistics(date_start=None,date_end=None,breakdown=False):
     """Function to query the DB for the reasons why images were accepted or
     rejected by reception.
     All images will be returned unless start and end date ranges are given.
+    Only the most recent entry for images ingested more than once is counted.
 
-    Currently has a workaround for the multiply ingested images.
+    Inputs:
+        date_start  datetime  Earliest date of observation (optional)
+        date_end    datetime  Latest date of observation (optional)
+        breakdown   bool      Return the statistics per night and telescope
+    Outputs:
+        stats       dict      Numbers of images keyed by reason, or if
+                              breakdown is set, a dictionary of these keyed
+                              by (UTC date of observation, telescope)
     """
 
-    if date_start == None and date_end == None:
-        image_list = Image.objects.all()
-    elif date_start !=None and date_end == None:
-        image_list = Image.objects.filter(date_obs__gte=date_start)
-    elif date_start == None and date_end !=None:
-        image_list = Image.objects.filter(date_obs__lte=date_end)
-    else:
-        image_list = Image.objects.filter(date_obs__gte=date_start,
-                                   date_obs__lte=date_end)
-    checked_images = []
-
-    stats = {'Accepted': 0, 'Total number of images': len(image_list)}
-    for image in image_list:
-        if image.image_name not in checked_images:
-            qs = Image.objects.filter(image_name=image.image_name).order_by('timestamp').reverse()
-            recent_entry = qs[0]
-            if len(recent_entry.quality) == 0:
-                stats['Accepted'] = stats['Accepted'] + 1
-            else:
-                keys = recent_entry.quality.split(' ; ')
-                for k in keys:
-                    if k in stats.keys():
-                        stats[k] = stats[k] + 1
-                    else:
-                        stats[k] = 1
-            checked_images.append(image.image_name)
-    stats['Total number of images'] = len(checked_images)
+    qs = select_latest_images(date_start=date_start,date_end=date_end)
+
+    if breakdown == False:
+        qs = qs.values('quality').annotate(n_images=Count('pk')).order_by()
+        return tally_image_qualities(qs.values_list('quality','n_images'))
+
+    qs = qs.annotate(night=TruncDate('date_obs', tzinfo=pytz.UTC)
+                     ).values('night','tel','quality').annotate(n_images=Count('pk')
+                     ).order_by()
+
+    stats = {}
+    for row in qs:
+        key = (row['night'], row['tel'])
+        stats[key] = tally_image_qualities([ (row['quality'], row['n_images']) ],
+                                           stats=stats.get(key))
 
     return stats
 
+def get_image_statistics_rollup(date_start=None,date_end=None):
+    """Function to return the reasons why images were accepted or rejected
+    by reception, from the daily ImageStats counts rather than the Image
+    table.  Falls back to querying the Image table if the daily counts
+    have not yet been built.
+    Inputs:
+        date_start  date      Earliest night of observation (optional)
+        date_end    date      Latest night of observation (optional)
+    Outputs:
+        stats       dict      Numbers of images keyed by reason
+    """
+
+    if not ImageStats.objects.exists():
+        return get_image_rejection_statistics(date_start=date_start,
+                                              date_end=date_end)
+
+    qs = ImageStats.objects.all()
+    if date_start != None:
+        qs = qs.filter(night__gte=date_start)
+    if date_end != None:
+        qs = qs.filter(night__lte=date_end)
+
+    qs = qs.values('quality').annotate(n=Sum('n_images')).order_by()
+
+    return tally_image_qualities(qs.values_list('quality','n'))
+
 def check_image_in_db(image_name):
     """Function to check whether an image has been ingested into the database.
     Input:
@@ -572,6 +1115,23 @@ def get_subrequests_for_obsrequest(obs_grp_id):
 
     return qs
 
+def get_db_pragmas():
+    """Function to return the effective settings of the SQLite pragmas which
+    govern concurrent access to the database, as a list of (name, value)
+    tuples.  An empty list is returned for other database backends."""
+
+    if connection.vendor != 'sqlite':
+        return []
+
+    pragmas = []
+    with connection.cursor() as cursor:
+        for name in ['journal_mode', 'synchronous', 'busy_timeout',
+                     'mmap_size', 'cache_size']:
+            cursor.execute('PRAGMA '+name)
+            pragmas.append( (name, cursor.fetchone()[0]) )
+
+    return pragmas
+
 if __name__ == '__main__':
     stats = get_image_rejection_statistics()
     print(stats)
@@ -509,7 +509,9 @@ class Image(object):
                 
         return None
 
-    def ingest_the_image_in_the_database(self,config):
+    def get_database_record(self):
+        """Return the parameters of the image's entry in the database, as
+        submitted to the record_image and ingest/images endpoints"""
 
         quality_flag = ' ; '.join(self.quality_flags)
         
@@ -564,6 +566,12 @@ class Image(object):
                   'shift_y': int(self.y_shift),
                   'quality': quality_flag}
 
+        return params
+
+    def ingest_the_image_in_the_database(self,config):
+
+        params = self.get_database_record()
+
         try :
             message = api_tools.check_image_in_db(config,params,
                                                       testing=config['testing'],
@@ -726,6 +734,9 @@ def process_new_images():
 
     if NewFrames :
         
+        batch_size = int(config.get('db_batch_size', 100))
+        pending = []
+
         for newframe in NewFrames :
 
             start = time.time()
@@ -743,29 +754,19 @@ def process_new_images():
             image.assess_image_quality()
             image.determine_the_output_directory()
             image.find_or_construct_the_output_directory()
-            success = image.ingest_the_image_in_the_database(config)
-
-            if success == True:
-
-                image.class_the_catalog_in_the_directory()
-                sorting_success = image.class_the_image_in_the_directory()
 
-                if sorting_success == True:
+            # Frames are ingested in batches of db_batch_size, each written
+            # by the database in one transaction
+            pending.append( (newframe, image) )
 
-                    src = os.path.join(config['new_frames_directory'],newframe)
-                    dest = os.path.join(config['new_frames_directory'],'Processed',newframe)
+            if len(pending) >= batch_size:
 
-                    shutil.move(src,dest)
-                    logger.info('Successfully moved the frame in the Processed directory!')
-                
-                else:
-                    logger.info('NOT successfully moved the frame in the Processed directory!')
-                    pass
-
-            if success == False:
+                ingest_frames_in_the_database(config, pending, logger)
+                pending = []
 
-                logger.warning('The image cannot be update/ingest in the DB, aborting this frame! ')
+        if len(pending) > 0:
 
+            ingest_frames_in_the_database(config, pending, logger)
 
         log_utilities.end_day_log(logger)
     else :
@@ -774,6 +775,48 @@ def process_new_images():
         logger.info('No frames to treat, halting!')
         log_utilities.end_day_log(logger)
 
+def ingest_frames_in_the_database(config, frames, logger):
+    """Function to add or update the database entries of a batch of processed
+    frames in one request, then file each frame ingested successfully
+
+    Inputs:
+        config  dict    script configuration parameters
+        frames  list    (frame name, Image) tuples
+        logger  logger  open log
+    """
+
+    records = [ image.get_database_record() for (newframe, image) in frames ]
+
+    results = api_tools.submit_image_records(config, records,
+                                             batch_size=len(records),
+                                             testing=config['testing'],
+                                             verbose=config['verbose'])
+
+    for (newframe, image), (success, response) in zip(frames, results):
+
+        logger.info(newframe+': '+str(response))
+
+        if success == True:
+
+            image.class_the_catalog_in_the_directory()
+            sorting_success = image.class_the_image_in_the_directory()
+
+            if sorting_success == True:
+
+                src = os.path.join(config['new_frames_directory'],newframe)
+                dest = os.path.join(config['new_frames_directory'],'Processed',newframe)
+
+                shutil.move(src,dest)
+                logger.info('Successfully moved the frame in the Processed directory!')
+
+            else:
+                logger.info('NOT successfully moved the frame in the Processed directory!')
+                pass
+
+        if success == False:
+
+            logger.warning('The image cannot be update/ingest in the DB, aborting this frame! ')
+
 def convolve(image, psf, ft_psf=None, ft_image=None, no_ft=None, correlate=None, auto_correlation=None):
     """
     NAME:
@@ -137,6 +137,8 @@ def assign_tap_priorities(logger):
                 str(len(active_events_list)) + ' active events.')
 
     nmissing = 0
+    # TAP entries are collected and written to the DB in one transaction
+    tap_records = []
     for event in active_events_list:
         event_id = event.pk
         event_name = EventName.objects.select_related().filter(event=event)[
@@ -190,15 +192,15 @@ def assign_tap_priorities(logger):
 
             # CRITERIA FOR PERMITTING A NON-ZERO PRIORITY
             if ibase_pspl > 0. and omega_now > 0.01:
-                add_tap(event_name=event_name, timestamp=timestamp, tsamp=tsamp,
+                tap_records.append(dict(event_name=event_name, timestamp=timestamp, tsamp=tsamp,
                         texp=texp, nexp=1., imag=imag, omega=omega_now,
                         err_omega=err_omega, peak_omega=omega_peak,
-                        visibility=full_visibility, cost1m=cost1m)
+                        visibility=full_visibility, cost1m=cost1m))
             else:
-                add_tap(event_name=event_name, timestamp=timestamp, tsamp=tsamp,
+                tap_records.append(dict(event_name=event_name, timestamp=timestamp, tsamp=tsamp,
                         texp=texp, nexp=1., imag=imag, omega=0.0,
                         err_omega=err_omega, peak_omega=omega_peak,
-                        visibility=full_visibility, cost1m=cost1m)
+                        visibility=full_visibility, cost1m=cost1m))
 
             # expire events -> deactivated
             # if t_current > te_pspl+t0_pspl:
@@ -270,16 +272,21 @@ def assign_tap_priorities(logger):
             #            err_omega=err_omega, peak_omega=omega_peak,
             #            visibility=full_visibility, cost1m=cost1m)
             #else:
-            add_tap(event_name=event_name, timestamp=timestamp, tsamp=tsamp,
+            tap_records.append(dict(event_name=event_name, timestamp=timestamp, tsamp=tsamp,
                         texp=texp, nexp=1., imag=imag, omega=0.0,
                         err_omega=err_omega, peak_omega=omega_peak,
-                        visibility=full_visibility, cost1m=cost1m)
+                        visibility=full_visibility, cost1m=cost1m))
 
             # expire events -> deactivated
             # if t_current > te_pspl+t0_pspl:
             #    Event.objects.filter(event_id=event_id).update(status="EX")
 #        else:
 #            nmissing += 1 #
+    outcomes = add_taps_bulk(tap_records)
+    for record, (status, message) in zip(tap_records, outcomes):
+        if status == False:
+            logger.info('RoboTAP: failed to add TAP entry for ' +
+                        record['event_name'] + ': ' + message)
 #report missing files only for non-anomalous events.
     if nmissing > 0:
         update_err('run_rea_tap', 'Missing DataFile: ' +
@@ -304,12 +311,18 @@ def run_tap_prioritization(logger):
     daily_visibility = 2.8 * full_visibility * time_allocation / 3198.
 
     list_evnt = Event.objects.filter(status__in=['AC', 'MO']).filter(year=str(datetime.now().year))
+    # Latest TAP entry and model for each event, via the Event pointers
+    latest_taps = {}
+    for tap_entry in Tap.objects.filter(pk__in=list_evnt.values('latest_tap')).values():
+        latest_taps[tap_entry['event_id']] = tap_entry
+    latest_models = {}
+    for model in SingleModel.objects.filter(pk__in=list_evnt.values('latest_model')).values():
+        latest_models[model['event_id']] = model
     output = []
     nmissing = 0
     for ev in list_evnt:
         try:
-            latest_ev_tap_val = Tap.objects.filter(
-                event=ev).values().latest('timestamp')
+            latest_ev_tap_val = latest_taps[ev.pk]
             # print 'done', ev.id, ev.status
             if float(latest_ev_tap_val['omega']) >= 0.01:
                 output.append(latest_ev_tap_val)
@@ -354,17 +367,16 @@ def run_tap_prioritization(logger):
     for idx in range(len(sorted_list)):
         # CHECK CURRENT MAGNIFICATION IF >500 SET IT TO ANOMALOUS
         # IF IT NEVER WAS ANOMALOUS BEFORE
-        if psplrea(SingleModel.objects.select_related().filter(event=sorted_list[idx]['event_id']).values().latest('last_updated')['umin']) > 5000.:
+        if psplrea(latest_models[sorted_list[idx]['event_id']]['umin']) > 5000.:
             # Event.objects.filter(event_id=sorted_list[idx]['event_id']).update(status="AN")
             pass
         # Filter events with te>300, t0 in the season and Anow>1.34 (within Einstein radius)
         # ROME provides baseline data beyond that
-        elif SingleModel.objects.select_related().filter(event=sorted_list[idx]['event_id']).values().latest('last_updated')['tau'] < 300. and psplrea(SingleModel.objects.select_related().filter(event=sorted_list[idx]['event_id']).values().latest('last_updated')['umin']) > 1.34 and event_in_season(float(SingleModel.objects.select_related().filter(event=sorted_list[idx]['event_id']).values().latest('last_updated')['Tmax']) - 2450000.):
+        elif latest_models[sorted_list[idx]['event_id']]['tau'] < 300. and psplrea(latest_models[sorted_list[idx]['event_id']]['umin']) > 1.34 and event_in_season(float(latest_models[sorted_list[idx]['event_id']]['Tmax']) - 2450000.):
             tsys = 24. * (float(sorted_list[idx]['texp']) + toverhead) / 3600.
             logger.info('requested tsys vs visibility: '+EventName.objects.select_related().filter(event=sorted_list[idx]['event_id'])[0].name+','+str(tsys)+','+str(daily_visibility))
             if trun + tsys < daily_visibility:
-                logger.info('RoboTAP requests: Amax ' + str(round(psplrea(SingleModel.objects.select_related().filter(event=sorted_list[idx]['event_id']).values(
-                ).latest('last_updated')['umin']), 2)) + ' ' + EventName.objects.select_related().filter(event=sorted_list[idx]['event_id'])[0].name)
+                logger.info('RoboTAP requests: Amax ' + str(round(psplrea(latest_models[sorted_list[idx]['event_id']]['umin']), 2)) + ' ' + EventName.objects.select_related().filter(event=sorted_list[idx]['event_id'])[0].name)
                 # The model requires here to use id
                 Event.objects.filter(
                     id=sorted_list[idx]['event_id']).update(status="MO")
@@ -13,9 +13,15 @@ from . import event_classes
 from . import survey_classes
 import pytz
 import glob
-import requests
+from . import outbound
 from bs4 import BeautifulSoup as bs
 
+# Root URLs of the survey pages scraped for links to each event
+SURVEY_URLS = {'rtmodel': 'http://www.fisica.unisa.it/GravitationAstrophysics/RTModel/',
+               'mismap': 'http://www.iap.fr/miiriads/MiSMap/Events/',
+               'moa': 'http://iral2.ess.sci.osaka-u.ac.jp/~moa/anomaly/',
+               'kmt': 'http://kmtnet.kasi.re.kr/ulens/event/',
+               'ogle': 'http://ogle.astrouw.edu.pl/ogle4/ews/'}
 
 def read_ogle_param_files( config ):
     """Function to read the listing of OGLE data"""
@@ -161,13 +167,14 @@ def read_update_file( file_path ):
 
     return ts
 
-def scrape_rtmodel(year, event):
+def scrape_rtmodel(year, event, root_url=None, timeout=None):
     """Function to scape data on a specific event from RTmodel, if any is available.
 
     Original code by Y. Tsapras
     """
 
-    root_url = 'http://www.fisica.unisa.it/GravitationAstrophysics/RTModel/'
+    if root_url == None:
+        root_url = SURVEY_URLS['rtmodel']
 
     event = str(event)
 
@@ -183,7 +190,7 @@ def scrape_rtmodel(year, event):
         return (rtmodel_html, classif, image_link, page_response, rtmodel)
 
     try:
-        page = requests.get(rtmodel_html)
+        page = outbound.get(rtmodel_html, timeout=timeout)
         if page.status_code == 200:
             soup = bs(page.content,'html.parser')
             # Extract the bits with the event name and classification
@@ -223,17 +230,18 @@ def scrape_rtmodel(year, event):
     return (rtmodel_html, classif, image_link, page_response, rtmodel)
 
 # Look if there is a MiSMap model for these events
-def scrape_mismap(year, event):
+def scrape_mismap(year, event, root_url=None, timeout=None):
     """Function to scape data on a specific event from MiSMAP, if any is available.
 
     Original code by Y. Tsapras
     """
 
-    root_url = 'http://www.iap.fr/miiriads/MiSMap/Events/'
+    if root_url == None:
+        root_url = SURVEY_URLS['mismap']
 
     event = str(event)
     mismap_html = path.join(root_url, event+'.html')
-    page = requests.get(mismap_html)
+    page = outbound.get(mismap_html, timeout=timeout)
     if page.status_code == 200:
         soup = bs(page.content,'html.parser')
         # Extract the bits with the event name
@@ -259,13 +267,14 @@ def scrape_mismap(year, event):
     return (mismap_html, image_link, page_response, mismap)
 
 # Look if there is a MOA model for these events
-def scrape_moa(year, event):
+def scrape_moa(year, event, root_url=None, timeout=None):
     """Function to scape data on a specific event from MOA, if any is available.
 
     Original code by Y. Tsapras
     """
 
-    root_url = 'http://iral2.ess.sci.osaka-u.ac.jp/~moa/anomaly/'
+    if root_url == None:
+        root_url = SURVEY_URLS['moa']
 
     event = str(event)
     moa_html = 'N/A'
@@ -276,7 +285,7 @@ def scrape_moa(year, event):
     event_reformatted = 'MOA-'+str(year)+'-BLG-'+event[5:]
     page_html = path.join(root_url,str(year),'index.html')
     try:
-        page = requests.get(page_html)
+        page = outbound.get(page_html, timeout=timeout)
         lines = page.content.splitlines()[19:-5]
         # Find if the event is in the list
         for oneline in lines:
@@ -296,13 +305,14 @@ def scrape_moa(year, event):
     return (moa_html, image_link, page_response, moa)
 
 # Look if there are KMTNet data for these events
-def scrape_kmt(year, event):
+def scrape_kmt(year, event, root_url=None, timeout=None):
     """Function to scape data on a specific event from KMTNet, if any is available.
 
     Original code by Y. Tsapras
     """
 
-    root_url = 'http://kmtnet.kasi.re.kr/ulens/event/'
+    if root_url == None:
+        root_url = SURVEY_URLS['kmt']
 
     event = str(event)
     if 'KB' in event:
@@ -312,7 +322,7 @@ def scrape_kmt(year, event):
 
     kmt_html = path.join(root_url,str(year))
 
-    page = requests.get(kmt_html)
+    page = outbound.get(kmt_html, timeout=timeout)
     if page.status_code == 200:
         soup = bs(page.content,'html.parser')
         # Extract the table rows
@@ -338,17 +348,18 @@ def scrape_kmt(year, event):
     return (kmt_html, kmt_link, page_response, kmtnet)
 
 # Get OGLE finder chart
-def fetch_ogle_fchart(year, event):
+def fetch_ogle_fchart(year, event, root_url=None, timeout=None):
     """Function to fetch the finder chart from the OGLE website, if any
 
     Original code by Y. Tsapras
     """
 
-    root_url = 'http://ogle.astrouw.edu.pl/ogle4/ews/'
+    if root_url == None:
+        root_url = SURVEY_URLS['ogle']
 
     ogle_id = event.replace(event[0:4],'blg-')
     finder_url = path.join(root_url,'data',str(year),ogle_id,'fchart.jpg')
-    page = requests.get(finder_url)
+    page = outbound.get(finder_url, timeout=timeout)
     if page.status_code == 200:
         ogle_finder = True
     else:
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:24:48 2026
+
+@author: rstreet
+
+Gathers the links to the pages of other surveys for an event, as shown on
+the event pages.  The survey sites are scraped in parallel on the shared
+outbound thread pool, within a deadline, and the results are cached per site and event, so that repeat
+views of an event page make no requests to the survey sites.  Sites with
+nothing on an event are cached for a shorter time, so that new pages are
+picked up.
+"""
+import os
+import sys
+from . import local_conf
+robonet_site = local_conf.get_conf('robonet_site')
+sys.path.append(robonet_site)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.conf import settings
+from django.core.cache import cache
+from concurrent.futures import wait
+import threading
+setup()
+
+from . import outbound, survey_data_utilities
+
+# Scraping function for each survey site, and the index of the flag in its
+# result which indicates whether anything was found for the event
+SURVEY_SOURCES = {'rtmodel': (survey_data_utilities.scrape_rtmodel, 4),
+                  'mismap': (survey_data_utilities.scrape_mismap, 3),
+                  'moa': (survey_data_utilities.scrape_moa, 3),
+                  'kmt': (survey_data_utilities.scrape_kmt, 3),
+                  'ogle': (survey_data_utilities.fetch_ogle_fchart, 1)}
+
+# Results used for a site which fails or does not answer in time
+NOT_FOUND = {'rtmodel': ('N/A', 'N/A', 'N/A', False, False),
+             'mismap': ('N/A', 'N/A', False, False),
+             'moa': ('N/A', 'N/A', False, False),
+             'kmt': ('N/A', 'N/A', False, False),
+             'ogle': ('N/A', False)}
+
+# Fetches in progress, so that simultaneous views of an event share them
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+def get_cache_key(source, year, event):
+
+    return 'survey_links:'+source+':'+str(year)+':'+str(event)
+
+def fetch_survey_source(source, year, event, root_url=None, timeout=None):
+    """Function to scrape one survey site for an event and cache the result.
+    Failures are cached as results with nothing found."""
+
+    (function, found_index) = SURVEY_SOURCES[source]
+
+    try:
+        result = function(year, event, root_url=root_url, timeout=timeout)
+        found = result[found_index]
+    except Exception:
+        result = NOT_FOUND[source]
+        found = False
+
+    if found:
+        ttl = settings.SURVEY_LINKS_CACHE_TTL
+    else:
+        ttl = settings.SURVEY_LINKS_NEGATIVE_TTL
+    cache.set(get_cache_key(source, year, event), result, ttl)
+
+    return result
+
+def _fetch_in_flight(key, source, year, event, root_url, timeout):
+
+    try:
+        return fetch_survey_source(source, year, event,
+                                   root_url=root_url, timeout=timeout)
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
+
+def gather_survey_links(year, event, timeout=None, root_urls={}):
+    """Function to return the results of scraping each survey site for an
+    event, from the cache where available.  The sites not cached are
+    scraped in parallel; those which do not answer within the timeout are
+    reported as having nothing for the event, and cached once they answer.
+
+    Inputs:
+        year       int    Year of the event
+        event      str    Short name of the event, e.g. OB180123
+        timeout    float  Seconds allowed for the sites to answer
+        root_urls  dict   Root URLs overriding those of SURVEY_URLS, by site
+    Outputs:
+        results    dict   Result of the scraping function of each site
+    """
+
+    if timeout == None:
+        timeout = settings.SURVEY_LINKS_TIMEOUT
+    deadline = outbound.Deadline(timeout)
+
+    results = {}
+    futures = {}
+    for source in SURVEY_SOURCES.keys():
+        key = get_cache_key(source, year, event)
+        result = cache.get(key)
+        if result != None:
+            results[source] = result
+            continue
+
+        with _in_flight_lock:
+            if key not in _in_flight:
+                _in_flight[key] = outbound.submit(_fetch_in_flight,
+                                                  key, source, year, event,
+                                                  root_urls.get(source), timeout)
+            futures[source] = _in_flight[key]
+
+    if len(futures) > 0:
+        wait(list(futures.values()), timeout=deadline.remaining())
+
+    for source, future in futures.items():
+        if future.done():
+            results[source] = future.result()
+        else:
+            results[source] = NOT_FOUND[source]
+
+    return results
@@ -22,6 +22,7 @@ import ftplib
 import survey_data_utilities
 import event_classes
 import survey_classes
+import query_db
 import socket
 
 version = 0.9
@@ -39,6 +40,8 @@ def sync_surveys():
     
     log = init_log(config)
 
+    query_db.event_name_resolver.load()
+
     if int(config['subscribe_ogle']) == 1:
         get_ogle_parameters(config, log)
         ogle_data = parse_ogle_data(config, log)
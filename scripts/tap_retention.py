@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:10:27 2026
+
+@author: rstreet
+
+Retention policy for the Tap and TapLima tables, which gain an entry for
+every monitored event each time TAP runs.  Entries within a recent window
+are kept at full resolution; older entries are thinned to the last entry
+per event per day.  The entries removed are appended to gzipped CSV files,
+one per table per season, before they are deleted from the database.
+
+Each day's entries are appended to the archives as new gzip members, with
+the archive sizes before the append recorded in the state file.  If a run
+is interrupted before the day's deletion is committed, the next run reads
+back the members written since, and does not archive those entries again.
+"""
+import os
+import sys
+from . import local_conf
+robonet_site = local_conf.get_conf('robonet_site')
+sys.path.append(robonet_site)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.db import connection, transaction
+from django.db.models import Min
+from django.utils import timezone
+from datetime import datetime, timedelta
+import csv
+import gzip
+import json
+import pytz
+import zlib
+setup()
+
+from events.models import Event, Tap, TapLima
+from . import update_db_2
+
+RETENTION_MODELS = { 'tap': Tap, 'taplima': TapLima }
+
+def get_archive_path(archive_dir, model, season):
+    """Function to return the path to the archive file for the entries of
+    the given model from one observing season"""
+
+    return os.path.join(archive_dir, model._meta.model_name+'_'+str(season)+'.csv.gz')
+
+def get_state_path(archive_dir, model):
+    return os.path.join(archive_dir, model._meta.model_name+'_retention.json')
+
+def read_state_file(archive_dir, model):
+
+    state_path = get_state_path(archive_dir, model)
+    if not os.path.isfile(state_path):
+        return {}
+
+    with open(state_path, 'r') as f:
+        return json.load(f)
+
+def read_retention_state(archive_dir, model):
+    """Function to return the date up to which the given model's table has
+    already been thinned, or None if it has never been thinned"""
+
+    state = read_state_file(archive_dir, model)
+    if state.get('thinned_until') == None:
+        return None
+
+    return datetime.strptime(state['thinned_until'], '%Y-%m-%d').date()
+
+def read_pending_archive(archive_dir, model):
+    """Function to return the day whose entries were being archived when a
+    previous run stopped, and the sizes of the archive files before they
+    were appended to, or None if no day was left pending"""
+
+    pending = read_state_file(archive_dir, model).get('pending')
+    if pending == None:
+        return None
+
+    return datetime.strptime(pending['day'], '%Y-%m-%d').date(), pending['offsets']
+
+def write_retention_state(archive_dir, model, day, pending_day=None, offsets=None):
+    """Function to record the date up to which the given model's table has
+    been thinned and, while a day's entries are being archived, that day and
+    the sizes of the archive files before they were appended to.  The state
+    file is replaced in one step, so that it is never left half-written."""
+
+    state = {'thinned_until': None}
+    if day != None:
+        state['thinned_until'] = day.strftime('%Y-%m-%d')
+    if pending_day != None:
+        state['pending'] = {'day': pending_day.strftime('%Y-%m-%d'), 'offsets': offsets}
+
+    state_path = get_state_path(archive_dir, model)
+    with open(state_path+'.tmp', 'w') as f:
+        json.dump(state, f)
+    os.replace(state_path+'.tmp', state_path)
+
+def get_db_free_bytes():
+    """Function to return the space held free for reuse within the database
+    file, or None if this is not known for the database backend"""
+
+    if connection.vendor != 'sqlite':
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA freelist_count')
+        nfree = cursor.fetchone()[0]
+        cursor.execute('PRAGMA page_size')
+        page_size = cursor.fetchone()[0]
+
+    return nfree * page_size
+
+def select_superseded_entries(model, day_start, day_end):
+    """Function to return the entries of the given model made within a time
+    range which are not the last entry made for their event within it.
+    Entries are returned as dictionaries of field values."""
+
+    qs = model.objects.filter(timestamp__gte=day_start,
+                              timestamp__lt=day_end).order_by('event_id',
+                                                              '-timestamp',
+                                                              '-pk')
+    superseded = []
+    last_event_id = None
+    for entry in qs.values():
+        if entry['event_id'] == last_event_id:
+            superseded.append(entry)
+        last_event_id = entry['event_id']
+
+    return superseded
+
+def get_entry_seasons(entries):
+
+    seasons = {}
+    for entry in entries:
+        seasons.setdefault(entry['timestamp'].year, []).append(entry)
+
+    return seasons
+
+def get_archive_sizes(model, entries, archive_dir):
+    """Function to return the sizes of the archive files the given entries
+    would be appended to, keyed by file name"""
+
+    sizes = {}
+    for season in get_entry_seasons(entries).keys():
+        archive_path = get_archive_path(archive_dir, model, season)
+        if os.path.isfile(archive_path):
+            sizes[os.path.basename(archive_path)] = os.path.getsize(archive_path)
+        else:
+            sizes[os.path.basename(archive_path)] = 0
+
+    return sizes
+
+def read_archived_ids(model, archive_dir, offsets):
+    """Function to return the primary keys of the entries appended to the
+    archive files after the given offsets.  A member left incomplete by an
+    interrupted append is cut from the end of the file, as the entries in
+    it cannot have been deleted."""
+
+    fields = [ f.attname for f in model._meta.concrete_fields ]
+    pk_column = fields.index(model._meta.pk.attname)
+
+    archived_ids = set()
+    for file_name, offset in offsets.items():
+        archive_path = os.path.join(archive_dir, file_name)
+        if not os.path.isfile(archive_path) or os.path.getsize(archive_path) <= offset:
+            continue
+
+        ids = set()
+        try:
+            with open(archive_path, 'rb') as raw:
+                raw.seek(offset)
+                with gzip.open(raw, 'rt', newline='') as f:
+                    for row in csv.reader(f):
+                        if row != fields:
+                            ids.add(int(row[pk_column]))
+        except (EOFError, OSError, ValueError, IndexError, zlib.error):
+            if offset == 0:
+                os.remove(archive_path)
+            else:
+                with open(archive_path, 'r+b') as raw:
+                    raw.truncate(offset)
+            continue
+
+        archived_ids.update(ids)
+
+    return archived_ids
+
+def archive_entries(model, entries, archive_dir):
+    """Function to append entries to the per-season archive files for the
+    given model.  Returns the number of compressed bytes written."""
+
+    fields = [ f.attname for f in model._meta.concrete_fields ]
+
+    nbytes = 0
+    for season, season_entries in get_entry_seasons(entries).items():
+        archive_path = get_archive_path(archive_dir, model, season)
+        new_file = not os.path.isfile(archive_path)
+        size0 = 0 if new_file else os.path.getsize(archive_path)
+
+        with gzip.open(archive_path, 'at', newline='') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(fields)
+            for entry in season_entries:
+                row = []
+                for key in fields:
+                    value = entry[key]
+                    if isinstance(value, datetime):
+                        value = value.strftime('%Y-%m-%dT%H:%M:%S.%f')
+                    row.append(value)
+                writer.writerow(row)
+
+        nbytes += os.path.getsize(archive_path) - size0
+
+    return nbytes
+
+def apply_tap_retention(model, archive_dir, keep_days=30, start_date=None,
+                        max_days=None, dry_run=False, log=None):
+    """Function to thin the entries of a Tap or TapLima table older than
+    keep_days to the last entry per event per day.
+
+    The table is processed one day at a time, starting from the day after
+    the last day thinned by a previous run (or from start_date), and each
+    day is committed separately, so that a run can be interrupted or limited
+    to max_days and resumed later.  The entries removed from each day are
+    archived before they are deleted, and entries archived by a run which
+    stopped before deleting them are not archived again.
+
+    Inputs:
+        model       Tap or TapLima
+        archive_dir str       Directory for the archive and state files
+        keep_days   int       Number of recent days to keep at full resolution
+        start_date  date      First day to process, overriding the saved state
+        max_days    int       Maximum number of days to process in this run
+        dry_run     bool      Count the entries that would be removed only
+        log         Logger object
+    Outputs:
+        report      dict      Numbers of days processed, entries removed and
+                              bytes written to the archive and freed in the DB
+    """
+
+    report = {'table': model._meta.db_table, 'days': 0, 'removed': 0,
+              'archive_bytes': 0, 'db_bytes_freed': None}
+
+    if not dry_run and not os.path.isdir(archive_dir):
+        os.makedirs(archive_dir)
+
+    cutoff = (timezone.now() - timedelta(days=keep_days)).date()
+
+    last_day = read_retention_state(archive_dir, model)
+    pending = read_pending_archive(archive_dir, model)
+
+    day = start_date
+    if day == None:
+        if last_day != None:
+            day = last_day + timedelta(days=1)
+        else:
+            first_entry = model.objects.aggregate(Min('timestamp'))['timestamp__min']
+            if first_entry == None:
+                return report
+            day = first_entry.date()
+
+    if log != None:
+        log.info('Thinning '+report['table']+' entries from '+str(day)+\
+                 ' to '+str(cutoff)+' to one per event per day')
+
+    free_bytes0 = get_db_free_bytes()
+
+    while day < cutoff and (max_days == None or report['days'] < max_days):
+        day_start = datetime(day.year, day.month, day.day, tzinfo=pytz.UTC)
+        day_end = day_start + timedelta(days=1)
+
+        superseded = select_superseded_entries(model, day_start, day_end)
+
+        if not dry_run:
+            if len(superseded) > 0:
+                # Entries archived by a run which stopped before deleting them
+                offsets = {}
+                archived_ids = set()
+                if pending != None and pending[0] == day:
+                    offsets = pending[1]
+                    archived_ids = read_archived_ids(model, archive_dir, offsets)
+                unarchived = [ entry for entry in superseded if entry['id'] not in archived_ids ]
+
+                if len(unarchived) > 0:
+                    sizes = get_archive_sizes(model, unarchived, archive_dir)
+                    sizes.update(offsets)
+                    write_retention_state(archive_dir, model, last_day,
+                                          pending_day=day, offsets=sizes)
+                    report['archive_bytes'] += archive_entries(model, unarchived, archive_dir)
+
+                with transaction.atomic():
+                    pks = [ entry['id'] for entry in superseded ]
+                    for i in range(0,len(pks),500):
+                        model.objects.filter(pk__in=pks[i:i+500]).delete()
+
+                    # Deleting an entry nulls any latest_tap pointer to it
+                    if model == Tap:
+                        event_ids = set([ entry['event_id'] for entry in superseded ])
+                        update_db_2.refresh_latest_entries(
+                                events=Event.objects.filter(pk__in=event_ids),
+                                pointers=['latest_tap'])
+
+            write_retention_state(archive_dir, model, day)
+            (last_day, pending) = (day, None)
+
+        if log != None and len(superseded) > 0:
+            log.info(' -> '+str(day)+': removed '+str(len(superseded))+' entries')
+
+        report['days'] += 1
+        report['removed'] += len(superseded)
+        day += timedelta(days=1)
+
+    free_bytes1 = get_db_free_bytes()
+    if free_bytes0 != None and free_bytes1 != None:
+        report['db_bytes_freed'] = free_bytes1 - free_bytes0
+
+    if log != None:
+        log.info(' -> Removed '+str(report['removed'])+' entries from '+\
+                 str(report['days'])+' days, archived in '+\
+                 str(report['archive_bytes'])+' bytes')
+
+    return report
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 05:48:20 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from datetime import timedelta
+setup()
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from events.models import Event, Field, SingleModel, DataFile, ObsRequest
+from events import views
+from scripts import benchmark_utilities, plotter, update_db_2
+
+def count_calls(monkeypatch, module, name, response):
+    """Function to replace a function building responses with one counting
+    its calls"""
+
+    calls = []
+    def fake(*args, **kwargs):
+        calls.append(args)
+        return response()
+    monkeypatch.setattr(module, name, fake)
+
+    return calls
+
+class LegacyUser():
+    """User calling is_authenticated as the pages expect"""
+
+    pk = 1
+
+    def is_authenticated(self):
+        return True
+
+def get_page(view, *args, params={}, **headers):
+
+    request = RequestFactory().get('/db/', params, **headers)
+    request.user = LegacyUser()
+
+    return view(request, *args)
+
+def test_show_event_conditional_get(tmpdir, monkeypatch):
+
+    artemis = str(tmpdir)+'/'
+    lightcurve = path.join(artemis, 'OB180001_I.dat')
+    with open(lightcurve, 'w') as f:
+        f.write('2458000.0 17.0 0.01\n')
+    monkeypatch.setattr(plotter, 'get_lightcurve_inputs',
+                        lambda event, artemis=None: [ p for p in [lightcurve] if event in p ])
+    monkeypatch.setattr(views, 'get_lightcurve_plot', lambda event: ('', ''))
+    renders = count_calls(monkeypatch, views, 'render', lambda: HttpResponse('page'))
+
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(3)
+        page = lambda **headers: get_page(views.show_event_by_id, event_ids[0], **headers)
+
+        response = page()
+        etag = response['ETag']
+        assert response.status_code == 200
+        assert len(renders) == 1
+
+        response = page(HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert len(renders) == 1
+
+        response = page(HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        assert response.status_code == 304
+        assert len(renders) == 1
+
+        # A new model, or a change to the ARTEMiS lightcurve, changes the page
+        SingleModel.objects.create(event_id=event_ids[0], Tmax=2458001.0, tau=20.0,
+                                   umin=0.1, modeler='ARTEMiS',
+                                   last_updated=timezone.now())
+        response = page(HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(renders) == 2
+
+        etag = response['ETag']
+        with open(lightcurve, 'a') as f:
+            f.write('2458001.0 17.1 0.01\n')
+        response = page(HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(renders) == 3
+
+        # Another event's page is not answered from this one's ETag
+        response = get_page(views.show_event_by_id, event_ids[1],
+                            HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == 200
+
+def test_download_lc_conditional_get(tmpdir, monkeypatch):
+
+    archives = count_calls(monkeypatch, views, 'serve_lightcurve_archive',
+                           lambda: HttpResponse('archive'))
+
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(1, n_entries=2)
+        for datafile in DataFile.objects.filter(event_id=event_ids[0]):
+            datafile.datafile = path.join(str(tmpdir), datafile.datafile)
+            datafile.save()
+            with open(datafile.datafile, 'w') as f:
+                f.write('2458000.0 17.0 0.01\n')
+        page = lambda **headers: get_page(views.download_lc_by_id, event_ids[0], **headers)
+
+        etag = page()['ETag']
+        assert page(HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert len(archives) == 1
+
+        with open(datafile.datafile, 'a') as f:
+            f.write('2458001.0 17.1 0.01\n')
+        assert page(HTTP_IF_NONE_MATCH=etag).status_code == 200
+        assert len(archives) == 2
+
+def test_event_lists_conditional_get(monkeypatch):
+
+    renders = count_calls(monkeypatch, views, 'render', lambda: HttpResponse('page'))
+
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(10)
+        update_db_2.refresh_latest_entries()
+        Event.objects.filter(pk__in=event_ids[0:5]).update(status='MO')
+
+        for (view, args) in [ (views.list_year, [2018]), (views.tap, []) ]:
+            etag = get_page(view, *args)['ETag']
+            assert get_page(view, *args, HTTP_IF_NONE_MATCH=etag).status_code == 304
+            # Each page of a list has its own ETag
+            assert get_page(view, *args, params={'page': 2},
+                            HTTP_IF_NONE_MATCH=etag).status_code == 200
+        assert len(renders) == 4
+
+        # A change of TAP priority, or of status, changes the lists
+        event = Event.objects.get(pk=event_ids[0])
+        update_db_2.update_tap_status(event, 'N')
+        etag = get_page(views.tap)['ETag']
+        update_db_2.update_tap_status(event, 'L')
+        assert get_page(views.tap, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+        etag = get_page(views.list_year, 2018)['ETag']
+        Event.objects.filter(pk=event_ids[9]).update(status='EX')
+        assert get_page(views.list_year, 2018, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+def test_api_conditional_get(monkeypatch):
+
+    with benchmark_utilities.synthetic_database():
+        user = User.objects.create(username='pipeline')
+        token = Token.objects.get_or_create(user=user)[0].key
+        client = APIClient(SERVER_NAME='127.0.0.1')
+        client.credentials(HTTP_AUTHORIZATION='Token '+token)
+        now = timezone.now()
+        ObsRequest.objects.create(field=Field.objects.create(name='ROME-FIELD-01'),
+                                  grp_id='REQ1', timestamp=now, time_expire=now+timedelta(days=1),
+                                  t_sample=15.0, exptime=300)
+        update_db_2.upsert_sub_requests_bulk([ {'sr_id': str(i), 'grp_id': 'REQ1',
+                                                'track_id': '1', 'window_start': now,
+                                                'window_end': now+timedelta(hours=1),
+                                                'status': 'PENDING'} for i in range(3) ])
+
+        response = client.get('/db/api/v1/subrequests/', {'limit': 2})
+        etag = response['ETag']
+        assert len(response.json()['results']) == 2
+
+        # The list is not built again for a client with the current copy
+        lists = count_calls(monkeypatch, views, 'api_list_response', lambda: HttpResponse('list'))
+        response = client.get('/db/api/v1/subrequests/', {'limit': 2}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert len(lists) == 0
+        assert client.get('/db/api/v1/subrequests/', {'limit': 3},
+                          HTTP_IF_NONE_MATCH=etag).status_code == 200
+        assert client.get('/db/api/v1/obs_requests/').status_code == 200
+        assert len(lists) == 2
+
+        # Nor by an unauthenticated client
+        response = APIClient(SERVER_NAME='127.0.0.1').get('/db/api/v1/subrequests/',
+                                                          {'limit': 2}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 401
+
+        update_db_2.upsert_sub_requests_bulk([ {'sr_id': '1', 'grp_id': 'REQ1',
+                                                'track_id': '1', 'window_start': now,
+                                                'window_end': now+timedelta(hours=1),
+                                                'status': 'COMPLETED'} ])
+        response = client.get('/db/api/v1/subrequests/', {'limit': 2}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(lists) == 3
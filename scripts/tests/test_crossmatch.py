@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 03:41:08 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from decimal import Decimal
+import numpy as np
+setup()
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from events.models import Event, Field, Operator
+from events import views
+from scripts import benchmark_utilities, query_db
+
+def add_event(field, operator, ra, dec):
+
+    return Event.objects.create(field=field, operator=operator,
+                                ev_ra=str(ra), ev_dec=str(dec),
+                                ra=Decimal(str(ra)), dec=Decimal(str(dec)))
+
+def test_crossmatch_positions():
+
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(500, n_entries=0)
+        coords = np.array(list(Event.objects.order_by('pk').values_list('ra','dec')), dtype=float)
+
+        rng = np.random.RandomState(2)
+        ra = np.concatenate([ coords[0:100,0] + rng.normal(0.0,0.0002,100),
+                              rng.uniform(260.0,275.0,100) ])
+        dec = np.concatenate([ coords[0:100,1] + rng.normal(0.0,0.0002,100),
+                               rng.uniform(-35.0,-20.0,100) ])
+
+        # The positions are matched in a query per BOXES_PER_QUERY boxes
+        nboxes = len(query_db.get_zone_ra_ranges(ra, dec, 300.0))
+        with benchmark_utilities.assert_query_budget(int(np.ceil(nboxes/query_db.BOXES_PER_QUERY))):
+            matches = query_db.crossmatch_positions(ra, dec, 300.0)
+
+        assert matches[0][0][0] == event_ids[0]
+        for i in range(0,200,7):
+            (events_list, separations) = query_db.cone_search(ra[i], dec[i], 300.0)
+            assert [ e.pk for e in events_list ] == [ m[0] for m in matches[i] ]
+            assert np.allclose(separations, [ m[1] for m in matches[i] ])
+
+def test_crossmatch_positions_edges():
+
+    with benchmark_utilities.synthetic_database():
+        field = Field.objects.create(name='Outside ROMEREA footprint')
+        operator = Operator.objects.create(name='OGLE')
+        near_zero = add_event(field, operator, 359.9999, 10.0)
+        pole = add_event(field, operator, 120.0, 89.9999)
+
+        matches = query_db.crossmatch_positions([0.0001, 300.0], [10.0, 89.99995], 2.0)
+
+        assert [ m[0] for m in matches[0] ] == [near_zero.pk]
+        assert abs(matches[0][0][1] - 0.72*np.cos(np.radians(10.0))) < 0.001
+        assert [ m[0] for m in matches[1] ] == [pole.pk]
+
+        assert query_db.crossmatch_positions([], [], 2.0) == []
+
+def test_parse_crossmatch_positions():
+
+    text = '''# label ra dec
+    268.5, -29.0
+    target-2 17:54:00.0 -29:30:00.0
+    bad 17:99 -29
+    400.0 -29.0
+    nan nan
+    '''
+    (labels, ra, dec, errors) = views.parse_crossmatch_positions(text)
+
+    assert labels == ['1', 'target-2']
+    assert np.allclose(ra, [268.5, 268.5])
+    assert np.allclose(dec, [-29.0, -29.5])
+    assert errors == [4, 5, 6]
+
+def test_api_crossmatch():
+
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(20, n_entries=0)
+        event = Event.objects.get(pk=event_ids[3])
+        user = User.objects.create(username='pipeline')
+        token = Token.objects.get_or_create(user=user)[0].key
+        client = APIClient(SERVER_NAME='127.0.0.1')
+
+        response = client.post('/db/api/v1/crossmatch/',
+                               {'positions': [[float(event.ra), float(event.dec)], [0.0, 0.0]],
+                                'radius': 1.0},
+                               format='json', HTTP_AUTHORIZATION='Token '+token)
+        results = response.json()['results']
+
+        assert response.status_code == 200
+        assert results[0]['matches'][0]['pk'] == event.pk
+        assert results[0]['matches'][0]['names'] == ['OGLE-2018-BLG-0004']
+        assert results[1]['matches'] == []
+
+        response = client.post('/db/api/v1/crossmatch/', {'positions': [[1.0]]},
+                               format='json', HTTP_AUTHORIZATION='Token '+token)
+        assert response.status_code == 400
+
+        # A bare list of positions, rather than an object, is refused
+        response = client.post('/db/api/v1/crossmatch/',
+                               [[float(event.ra), float(event.dec)]],
+                               format='json', HTTP_AUTHORIZATION='Token '+token)
+        assert response.status_code == 400
+        assert 'JSON object' in response.json()['error']
+
+        # Positions which are not on the sky are refused, not crossmatched
+        for positions in [ [['10', 'nan']], [[-5.0, 10.0]], [[360.0, 10.0]],
+                           [[10.0, 95.0]], [['10', '1e999']] ]:
+            response = client.post('/db/api/v1/crossmatch/', {'positions': positions},
+                                   format='json', HTTP_AUTHORIZATION='Token '+token)
+            assert response.status_code == 400
+            assert 'on the sky' in response.json()['error']
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:03:26 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ, stat
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+import tempfile
+import stat as stat_modes
+setup()
+from scripts import dashboard_snapshot, fake_lco_api
+
+def test_refresh_dashboard_snapshot():
+
+    snapshot_path = path.join(tempfile.mkdtemp(), 'snapshot.json')
+
+    with fake_lco_api.FakeLCOAPI() as api:
+        snapshot = dashboard_snapshot.refresh_dashboard_snapshot('token',
+                                        snapshot_path=snapshot_path, api_url=api.url)
+        assert api.nrequests == 2
+
+    assert snapshot['proposal']['data'] == {'time_available': 1200.0, 'time_used': 412.3,
+                                            'ipp_time_available': 35.5, 'ipp_limit': 120.0}
+    assert snapshot['telescopes']['data']['coj_doma'] == 'AVAILABLE'
+    assert snapshot['telescopes']['data']['coj_domb'] == 'NOT_OK_TO_OPEN'
+    assert snapshot['telescopes']['data']['lsc_domc'] == 'Unknown'
+    assert snapshot['proposal']['error'] == None
+
+    snapshot = dashboard_snapshot.read_dashboard_snapshot(snapshot_path, max_age=900)
+    assert snapshot['proposal']['stale'] == False
+    assert snapshot['telescopes']['age'] < 900
+
+    snapshot = dashboard_snapshot.read_dashboard_snapshot(snapshot_path, max_age=-1)
+    assert snapshot['proposal']['stale'] == True
+
+def test_refresh_keeps_last_good_snapshot():
+
+    snapshot_path = path.join(tempfile.mkdtemp(), 'snapshot.json')
+
+    with fake_lco_api.FakeLCOAPI() as api:
+        dashboard_snapshot.refresh_dashboard_snapshot('token',
+                                        snapshot_path=snapshot_path, api_url=api.url)
+        good = dashboard_snapshot.read_dashboard_snapshot(snapshot_path)
+
+        api.fail = True
+        snapshot = dashboard_snapshot.refresh_dashboard_snapshot('token',
+                                        snapshot_path=snapshot_path, api_url=api.url)
+
+    assert 'HTTPError' in snapshot['proposal']['error']
+    assert snapshot['proposal']['data'] == good['proposal']['data']
+    assert snapshot['proposal']['updated'] == good['proposal']['updated']
+    assert snapshot['telescopes']['data'] == good['telescopes']['data']
+
+def test_read_missing_snapshot():
+
+    snapshot_path = path.join(tempfile.mkdtemp(), 'snapshot.json')
+
+    snapshot = dashboard_snapshot.read_dashboard_snapshot(snapshot_path)
+
+    for section in dashboard_snapshot.SECTIONS:
+        assert snapshot[section]['data'] == None
+        assert snapshot[section]['stale'] == True
+
+def test_snapshot_file_readable():
+
+    snapshot_path = path.join(tempfile.mkdtemp(), 'snapshot.json')
+
+    # The web server may read the snapshot as another user than the writer
+    dashboard_snapshot.write_snapshot_file({'proposal': {}}, snapshot_path)
+
+    assert stat_modes.S_IMODE(stat(snapshot_path).st_mode) == 0o644
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:41:09 2026
+
+@author: rstreet
+
+Checks that the event list tables are built in a fixed number of queries,
+whatever the number of events, and are sorted and paginated correctly.
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.test import RequestFactory
+setup()
+from events.models import Event
+from events import views
+from scripts import benchmark_utilities, update_db_2
+
+# Queries allowed for one page of the event list: the number of events, the
+# page of events and their names and latest models
+LIST_QUERY_BUDGET = 4
+# The DayOps table also shows the latest datafile and TAP entry
+ANOMALY_QUERY_BUDGET = 6
+
+def render_page(params, events, enhanced=False):
+
+    request = RequestFactory().get('/db/list_all/', params)
+    (page, context) = views.paginate_event_queryset(request, events)
+    if enhanced:
+        rows = views.render_event_queryset_as_enhanced_table_rows(page.object_list,
+                                                                  ordered=True)
+    else:
+        rows = views.render_event_queryset_as_table_rows(page.object_list,
+                                                         ordered=True)
+    return rows, context
+
+def test_event_table_query_budget():
+
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(250)
+        update_db_2.refresh_latest_entries()
+
+        for n_events in [ 20, 250 ]:
+            events = Event.objects.filter(pk__in=event_ids[:n_events])
+
+            with benchmark_utilities.assert_query_budget(LIST_QUERY_BUDGET):
+                (rows, context) = render_page({'per_page': 100}, events)
+            assert len(rows) == min(n_events, 100)
+
+            with benchmark_utilities.assert_query_budget(ANOMALY_QUERY_BUDGET):
+                (rows, context) = render_page({'per_page': 100}, events, enhanced=True)
+            assert len(rows) == min(n_events, 100)
+
+def test_event_table_sort_and_pages():
+
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(45)
+        update_db_2.refresh_latest_entries()
+        events = Event.objects.all()
+
+        # The default order matches the order the tables used before
+        # pagination, by decreasing name
+        (rows, context) = render_page({'per_page': 1000}, events)
+        unpaged = views.render_event_queryset_as_table_rows(events)
+        assert [ row[0] for row in rows ] == [ row[0] for row in unpaged ]
+
+        pages = []
+        for page in [ 1, 2, 3 ]:
+            (rows, context) = render_page({'sort': 'te', 'per_page': 20, 'page': page},
+                                          events)
+            pages += rows
+        assert context['sort'] == 'te'
+        assert 'next' not in context['page_links']
+        assert sorted([ row[0] for row in pages ]) == sorted(event_ids)
+        tes = [ row[8] for row in pages ]
+        assert tes == sorted(tes)
+
+        (rows, context) = render_page({'sort': '-ra', 'per_page': 20}, events)
+        ras = [ Event.objects.get(pk=row[0]).ra for row in rows ]
+        assert ras == sorted(ras, reverse=True)
+        assert context['sort_links']['ra'] == 'sort=ra&per_page=20'
+
+        (rows, context) = render_page({'sort': 'bogus', 'per_page': 'x'}, events)
+        assert context['sort'] == '-name'
+        assert len(rows) == 45
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:31:12 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+import numpy as np
+setup()
+from scripts import field_check, query_db
+
+def test_romecheck():
+
+    (idx, rate) = field_check.romecheck(268.1634166666667, -28.900816666666664)
+    assert idx == 2
+    assert rate == 46.0
+
+    (idx, rate) = field_check.romecheck(10.0, -28.9)
+    assert idx == -1
+    assert rate == -1
+
+def test_romecheck_array():
+
+    rng = np.random.RandomState(3)
+    ras = rng.uniform(267.0, 271.5, 2000)
+    decs = rng.uniform(-30.5, -27.5, 2000)
+
+    (idx, rates) = field_check.romecheck_array(ras, decs)
+
+    assert (idx >= 0).sum() > 0
+    for i in range(len(ras)):
+        (idx_i, rate_i) = field_check.romecheck(ras[i], decs[i])
+        assert idx[i] == idx_i
+        assert rates[i] == rate_i
+
+def test_classify_ra_wrap():
+
+    footprints = field_check.FieldFootprints([359.9, 0.3], [10.0, -10.0],
+                                             half_width=0.2, rates=[1.0, 2.0])
+
+    ras = np.array([0.05, 359.8, 0.4, 360.45, 180.0])
+    decs = np.array([10.1, 9.9, -10.0, -10.0, 10.0])
+
+    idx = footprints.classify(ras, decs)
+    assert list(idx) == [0, 0, 1, 1, -1]
+    assert [ footprints.locate(ra,dec) for (ra,dec) in zip(ras,decs) ] == list(idx)
+
+    (idx, rates) = footprints.classify_with_rates(ras, decs)
+    assert list(rates) == [1.0, 1.0, 2.0, 2.0, -1.0]
+
+def test_get_event_field_ids():
+
+    (id_fields, rates) = query_db.get_event_field_ids([268.1634166666667, 10.0],
+                                                      [-28.900816666666664, -28.9])
+
+    assert id_fields == ['ROME-FIELD-03', 'Outside ROMEREA footprint']
+    assert list(rates) == [46.0, -1.0]
+
+def test_get_fields_containing_coordinates():
+
+    rng = np.random.RandomState(5)
+    ras = rng.uniform(267.0, 271.5, 200)
+    decs = rng.uniform(-30.5, -27.5, 200)
+
+    names = query_db.get_fields_containing_coordinates(ras, decs)
+
+    assert len(names) == len(ras)
+    for i in range(len(ras)):
+        assert names[i] == query_db.get_field_containing_coordinates({'ra': ras[i],
+                                                                      'dec': decs[i]})
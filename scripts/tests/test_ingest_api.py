@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 01:12:45 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.utils import timezone
+from datetime import timedelta
+import json
+setup()
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from events.models import Field, ObsRequest, SubObsRequest, Image, ImageStats
+from scripts import api_tools, benchmark_utilities, update_db_2
+
+class ClientResponse():
+    """Response of the test client in the form of a requests response"""
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self.text = response.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+def route_posts_to(client, monkeypatch):
+    """Function to send the requests posted by api_tools to the test client,
+    counting them"""
+
+    posts = []
+    def post(url, json=None, headers={}):
+        posts.append(url)
+        return ClientResponse(client.post(url.split('127.0.0.1:8000')[-1], json, format='json',
+                                          HTTP_AUTHORIZATION=headers['Authorization']))
+    monkeypatch.setattr(api_tools.requests, 'post', post)
+
+    return posts
+
+def image_record(i, **kwargs):
+
+    record = {'field_name': 'ROME-FIELD-01',
+              'image_name': 'lsc1m005-fl15-20180601-%04d-e91.fits' % i,
+              'date_obs': '2018-06-01T0%d:00:00' % (i%10),
+              'timestamp': '2018-06-02T00:00:00',
+              'tel': '1m0-05', 'inst': 'fl15', 'filt': 'ip',
+              'airmass': 1.2, 'moon_up': 'False', 'nstars': 4000,
+              'quality': ''}
+    record.update(kwargs)
+    return record
+
+def get_image_stats():
+
+    return sorted(ImageStats.objects.filter(n_images__gt=0).values_list('night','tel',
+                                                                      'quality','n_images'))
+
+def test_upsert_images_bulk():
+
+    with benchmark_utilities.synthetic_database():
+        Field.objects.create(name='ROME-FIELD-01')
+        update_db_2.add_image('ROME-FIELD-01', image_record(0)['image_name'],
+                              '2018-06-01T00:00:00', tel='1m0-05', airmass=1.5, nstars=10)
+
+        records = [ image_record(0, quality='Bad seeing', nstars=None),
+                    image_record(1),
+                    image_record(2, field_name='ROME-FIELD-99'),
+                    image_record(3, airmass='high'),
+                    image_record(1, quality='Low stars') ]
+
+        outcomes = update_db_2.upsert_images_bulk(records)
+
+        assert [ o[0] for o in outcomes ] == [ True, True, False, False, True ]
+        assert 'updated' in outcomes[0][1] and 'added' in outcomes[1][1]
+        assert 'updated' in outcomes[4][1]
+
+        updated = Image.objects.get(image_name=image_record(0)['image_name'])
+        assert updated.quality == 'Bad seeing'
+        assert updated.nstars == 10
+        assert float(updated.airmass) == 1.2
+        assert Image.objects.filter(image_name=image_record(1)['image_name']).count() == 1
+        assert Image.objects.get(image_name=image_record(1)['image_name']).quality == 'Low stars'
+        assert Image.objects.count() == 2
+
+        # The daily counts match those rebuilt from the Image table
+        stats = get_image_stats()
+        update_db_2.rebuild_image_stats()
+        assert stats == get_image_stats()
+
+def test_upsert_sub_requests_bulk():
+
+    with benchmark_utilities.synthetic_database():
+        field = Field.objects.create(name='ROME-FIELD-01')
+        now = timezone.now()
+        ObsRequest.objects.create(field=field, grp_id='REQ1', timestamp=now,
+                                  time_expire=now+timedelta(days=1),
+                                  t_sample=15.0, exptime=300)
+        SubObsRequest.objects.create(sr_id='1', grp_id='REQ1', track_id='100',
+                                     window_start=now, window_end=now)
+
+        record = {'grp_id': 'REQ1', 'track_id': '100',
+                  'window_start': '2018-06-01T00:00:00', 'window_end': '2018-06-01T06:00:00'}
+        records = [ dict(record, sr_id='1', status='COMPLETED',
+                         time_executed='2018-06-01T01:00:00'),
+                    dict(record, sr_id='2', status='PENDING'),
+                    dict(record, sr_id='3', status='PENDING', grp_id='REQ9'),
+                    dict(record, sr_id='4', status='PENDING', window_end='never') ]
+
+        outcomes = update_db_2.upsert_sub_requests_bulk(records)
+
+        assert outcomes[0] == (True, 'Subrequest updated')
+        assert outcomes[1] == (True, 'Subrequest added')
+        assert outcomes[2] == (False, 'Unrecognised Obsrequest group ID')
+        assert outcomes[3][0] == False
+        assert SubObsRequest.objects.get(sr_id='1').status == 'COMPLETED'
+        assert SubObsRequest.objects.count() == 2
+
+def test_submit_image_records(monkeypatch):
+
+    with benchmark_utilities.synthetic_database():
+        Field.objects.create(name='ROME-FIELD-01')
+        user = User.objects.create(username='reception')
+        config = {'db_token': Token.objects.get_or_create(user=user)[0].key,
+                  'db_batch_size': '4'}
+        client = APIClient(SERVER_NAME='127.0.0.1')
+        posts = route_posts_to(client, monkeypatch)
+
+        records = [ image_record(i) for i in range(0,10,1) ]
+        records[5]['field_name'] = 'ROME-FIELD-99'
+
+        results = api_tools.submit_image_records(config, records, testing=True)
+
+        assert len(posts) == 3
+        assert [ r[0] for r in results ] == [ True ]*5 + [ False ] + [ True ]*4
+        assert Image.objects.count() == 9
+
+        response = client.post('/db/api/v1/ingest/images/', {'records': 'none'}, format='json',
+                               HTTP_AUTHORIZATION='Token '+config['db_token'])
+        assert response.status_code == 400
+        assert client.post('/db/api/v1/ingest/images/', [], format='json').status_code in [401, 403]
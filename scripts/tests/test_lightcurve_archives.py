@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:31:52 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ, listdir, utime
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+import io
+import tarfile
+setup()
+from scripts import lightcurve_archives
+
+def make_datafiles(tmpdir, nfiles=3, size=200000):
+
+    datafiles = []
+    for i in range(0,nfiles,1):
+        file_path = path.join(str(tmpdir), 'KB180123_'+str(i)+'.dat')
+        with open(file_path, 'w') as f:
+            for j in range(0,size//40,1):
+                f.write('%.6f %.4f %.4f\n' % (2458200.0+j*0.01, 17.0+i, 0.01))
+        datafiles.append(file_path)
+
+    return datafiles
+
+def read_archive(chunks):
+
+    tar = tarfile.open(fileobj=io.BytesIO(b''.join(chunks)), mode='r:gz')
+    contents = {}
+    for member in tar.getmembers():
+        contents[member.name] = tar.extractfile(member).read()
+
+    return contents
+
+def test_generate_archive(tmpdir):
+
+    datafiles = make_datafiles(tmpdir)
+    members = lightcurve_archives.get_archive_members(datafiles + [path.join(str(tmpdir), 'missing.dat')])
+    assert len(members) == 3
+
+    chunks = list(lightcurve_archives.generate_archive(members, chunk_size=4096))
+    contents = read_archive(chunks)
+
+    assert sorted(contents.keys()) == sorted([ path.basename(f) for f in datafiles ])
+    for file_path in datafiles:
+        assert contents[path.basename(file_path)] == open(file_path,'rb').read()
+
+    # The archive is sent in parts, none holding more than zlib buffers
+    assert len([ c for c in chunks if len(c) > 0 ]) > 1
+    assert max([ len(c) for c in chunks ]) < 65536
+
+def test_generate_and_cache_archive(tmpdir):
+
+    archive_dir = path.join(str(tmpdir), 'archives')
+    datafiles = make_datafiles(tmpdir)
+    members = lightcurve_archives.get_archive_members(datafiles)
+    fingerprint = lightcurve_archives.get_archive_fingerprint(members)
+
+    assert lightcurve_archives.get_cached_archive(fingerprint, archive_dir) == None
+
+    chunks = list(lightcurve_archives.generate_and_cache_archive(members, fingerprint,
+                                                                 archive_dir=archive_dir,
+                                                                 max_bytes=10**9))
+    archive_path = lightcurve_archives.get_cached_archive(fingerprint, archive_dir)
+    assert open(archive_path,'rb').read() == b''.join(chunks)
+    assert listdir(archive_dir) == [ path.basename(archive_path) ]
+
+    # Changing a file changes the fingerprint
+    with open(datafiles[0], 'a') as f:
+        f.write('2458300.000000 17.0000 0.0100\n')
+    members = lightcurve_archives.get_archive_members(datafiles)
+    assert lightcurve_archives.get_archive_fingerprint(members) != fingerprint
+
+def test_interrupted_download_is_not_cached(tmpdir):
+
+    archive_dir = path.join(str(tmpdir), 'archives')
+    members = lightcurve_archives.get_archive_members(make_datafiles(tmpdir))
+    fingerprint = lightcurve_archives.get_archive_fingerprint(members)
+
+    stream = lightcurve_archives.generate_and_cache_archive(members, fingerprint,
+                                                            archive_dir=archive_dir,
+                                                            chunk_size=4096)
+    next(stream)
+    stream.close()
+
+    assert listdir(archive_dir) == []
+
+def test_evict_archives(tmpdir):
+
+    archive_dir = str(tmpdir)
+    for i in range(0,4,1):
+        file_path = path.join(archive_dir, 'archive'+str(i)+'.tgz')
+        with open(file_path, 'wb') as f:
+            f.write(b'\0'*1000)
+        utime(file_path, (1000000+i, 1000000+i))
+
+    # Using an archive marks it as the most recently used
+    lightcurve_archives.get_cached_archive('archive0', archive_dir)
+
+    nremoved = lightcurve_archives.evict_archives(archive_dir, max_bytes=2500)
+
+    assert nremoved == 2
+    assert sorted(listdir(archive_dir)) == ['archive0.tgz', 'archive3.tgz']
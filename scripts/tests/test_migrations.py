@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 14:02:37 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from datetime import datetime, timedelta
+setup()
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+import pytz
+from events.models import get_dec_zone
+from scripts import benchmark_utilities, utilities
+import pytest
+
+def migrate_to(migration=None):
+    """Function to migrate the events app of the test database to the
+    given migration, or the latest, returning the historical models at
+    that state"""
+
+    executor = MigrationExecutor(connection)
+    if migration == None:
+        migration = executor.loader.graph.leaf_nodes('events')[0][1]
+    executor.migrate([('events', migration)])
+    executor.loader.build_graph()
+
+    return executor.loader.project_state([('events', migration)]).apps
+
+def add_events(apps, n_events):
+
+    Field = apps.get_model('events', 'Field')
+    Operator = apps.get_model('events', 'Operator')
+    Event = apps.get_model('events', 'Event')
+    field = Field.objects.create(name='Outside ROMEREA footprint')
+    operator = Operator.objects.create(name='OGLE')
+
+    return [ Event.objects.create(field=field, operator=operator, ev_ra='17:51:20.61',
+                                  ev_dec='-30:03:38.9', status='AC', year='2018')
+             for i in range(n_events) ]
+
+def test_latest_entries_backfill():
+
+    with benchmark_utilities.synthetic_database():
+        apps = migrate_to('0008_event_dec_zone')
+        Tap = apps.get_model('events', 'Tap')
+        EventStatus = apps.get_model('events', 'EventStatus')
+        events = add_events(apps, 2)
+        now = timezone.now()
+        taps = [ Tap.objects.create(event=events[0], timestamp=now-timedelta(days=i),
+                                    priority='L') for i in range(3) ]
+        status = EventStatus.objects.create(event=events[0], timestamp=now, status='AC')
+
+        apps = migrate_to('0009_event_latest_entries')
+        Event = apps.get_model('events', 'Event')
+
+        event = Event.objects.get(pk=events[0].pk)
+        assert event.latest_tap_id == taps[0].pk
+        assert event.latest_status_id == status.pk
+        assert event.latest_model_id == None
+        assert Event.objects.get(pk=events[1].pk).latest_tap_id == None
+
+        migrate_to()
+
+def test_unique_event_names():
+
+    with benchmark_utilities.synthetic_database():
+        apps = migrate_to('0006_sync_model_state')
+        EventName = apps.get_model('events', 'EventName')
+        events = add_events(apps, 2)
+        operator = events[0].operator
+        for event in [ events[0], events[0], events[0], events[1] ]:
+            EventName.objects.create(event=event, operator=operator, name='OGLE-2018-BLG-0001')
+        EventName.objects.create(event=events[1], operator=operator, name='OGLE-2018-BLG-0002')
+
+        # A name given to two events is not resolved by the migration
+        with pytest.raises(RuntimeError, match='OGLE-2018-BLG-0001 \\(events '):
+            migrate_to('0007_lookup_indexes')
+
+        EventName.objects.filter(event=events[1], name='OGLE-2018-BLG-0001').delete()
+        first = EventName.objects.filter(name='OGLE-2018-BLG-0001').order_by('pk')[0]
+        apps = migrate_to('0007_lookup_indexes')
+        EventName = apps.get_model('events', 'EventName')
+
+        assert list(EventName.objects.filter(name='OGLE-2018-BLG-0001')\
+                    .values_list('pk', flat=True)) == [first.pk]
+        assert EventName.objects.count() == 2
+
+        migrate_to()
+
+def test_image_stats_backfill():
+
+    with benchmark_utilities.synthetic_database():
+        apps = migrate_to('0010_taplima_timestamp_index')
+        Field = apps.get_model('events', 'Field')
+        Image = apps.get_model('events', 'Image')
+        field = Field.objects.create(name='ROME-FIELD-01')
+        night = datetime(2018, 7, 1, 2, 0, 0, tzinfo=pytz.UTC)
+        for (name, quality, ingest) in [ ('im1', 'OK', 0), ('im2', 'OK', 0),
+                                         ('im3', 'Bad seeing', 0),
+                                         ('im3', 'OK', 1) ]:
+            Image.objects.create(field=field, image_name=name, tel='1m0-05',
+                                 date_obs=night, quality=quality,
+                                 timestamp=night+timedelta(hours=1+ingest))
+
+        apps = migrate_to('0011_image_stats')
+        ImageStats = apps.get_model('events', 'ImageStats')
+
+        # Only the latest entry of an image ingested twice is counted
+        assert list(ImageStats.objects.values_list('night', 'tel', 'quality', 'n_images')) == \
+               [ (night.date(), '1m0-05', 'OK', 3) ]
+
+        migrate_to()
+
+def test_event_sky_positions():
+
+    with benchmark_utilities.synthetic_database():
+        apps = migrate_to('0007_lookup_indexes')
+        events = add_events(apps, 3)
+        Event = apps.get_model('events', 'Event')
+        Event.objects.filter(pk=events[1].pk).update(ev_ra='268.5', ev_dec='-29.25')
+        Event.objects.filter(pk=events[2].pk).update(ev_ra='17:51', ev_dec='-30:03')
+
+        apps = migrate_to('0008_event_dec_zone')
+        Event = apps.get_model('events', 'Event')
+
+        # The positions agree with those set as events are saved
+        (ra, dec) = utilities.coords_to_degrees('17:51:20.61', '-30:03:38.9')
+        event = Event.objects.get(pk=events[0].pk)
+        assert abs(float(event.ra) - ra) < 1e-8 and abs(float(event.dec) - dec) < 1e-8
+        assert event.dec_zone == get_dec_zone(dec)
+        event = Event.objects.get(pk=events[1].pk)
+        assert (float(event.ra), float(event.dec)) == (268.5, -29.25)
+        assert event.dec_zone == get_dec_zone(-29.25)
+        assert Event.objects.get(pk=events[2].pk).dec_zone == None
+
+        migrate_to()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:02:17 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ, listdir, stat
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+setup()
+from events.models import DataFile
+from events import views
+from scripts import benchmark_utilities, db_plotting_utilities
+
+LABELS = ['LCOGT CTIO 1m A', 'LCOGT SAAO 1m A']
+COLORS = ['#FF0000', '#0000FF']
+
+def test_get_event_obs_pie_chart(tmpdir, monkeypatch):
+
+    chart_dir = str(tmpdir)
+    nplots = []
+    plot = db_plotting_utilities.plot_obs_pie_chart
+    def counting_plot(*args):
+        nplots.append(1)
+        plot(*args)
+    monkeypatch.setattr(db_plotting_utilities, 'plot_obs_pie_chart', counting_plot)
+
+    chart = db_plotting_utilities.get_event_obs_pie_chart(1, LABELS, COLORS, [100, 50], 150,
+                                                          chart_dir=chart_dir)
+    assert listdir(chart_dir) == [chart]
+    assert open(path.join(chart_dir, chart),'rb').read(8) == b'\x89PNG\r\n\x1a\n'
+
+    # The same numbers are served from the existing chart
+    repeat = db_plotting_utilities.get_event_obs_pie_chart(1, LABELS, COLORS, [100, 50], 150,
+                                                           chart_dir=chart_dir)
+    assert repeat == chart
+    assert len(nplots) == 1
+
+    # New data replace the chart under a new name, leaving other events' charts
+    other = db_plotting_utilities.get_event_obs_pie_chart(2, LABELS, COLORS, [10, 5], 15,
+                                                          chart_dir=chart_dir)
+    updated = db_plotting_utilities.get_event_obs_pie_chart(1, LABELS, COLORS, [120, 50], 170,
+                                                            chart_dir=chart_dir)
+    assert updated != chart
+    assert len(nplots) == 3
+    assert sorted(listdir(chart_dir)) == sorted([updated, other])
+
+def test_get_event_obs_chart_data():
+
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(1, n_entries=3)
+        datafiles = DataFile.objects.filter(event_id=event_ids[0]).order_by('pk')
+        for i,f in enumerate(datafiles):
+            f.tel = LABELS[i%2]
+            f.ndata = 10*(i+1)
+            f.save()
+        # A repeat entry for a file is counted once
+        DataFile.objects.create(event_id=event_ids[0], datafile=datafiles[0].datafile,
+                                last_upd=datafiles[0].last_upd,
+                                last_hjd=float(datafiles[0].last_hjd)-1.0,
+                                last_mag=datafiles[0].last_mag,
+                                tel=LABELS[0], ndata=5)
+
+        chart_data = views.get_event_obs_chart_data(event_ids[0])
+
+        assert sorted(chart_data['values']) == [10, 20, 30]
+        assert chart_data['ndata'] == 60
+        assert len(chart_data['colors']) == 3
+        assert chart_data == views.get_event_obs_chart_data(event_ids[0])
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 03:02:36 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from datetime import datetime, timedelta
+import pytz
+setup()
+from events.models import Field, ObsRequest, SubObsRequest, ObsCompletionStats
+from scripts import benchmark_utilities, obs_monitor, update_db_2
+
+START = datetime(2019, 5, 1, 2, 0, 0, tzinfo=pytz.UTC)
+
+def populate_subrequests(n_nights):
+    """Function to add the subrequests of two fields over n_nights, of which
+    the first field's are all executed and the second's all pending"""
+
+    for (name, inst) in [('ROME-FIELD-01', 'fl15'), ('ROME-FIELD-02', 'fl16')]:
+        field = Field.objects.create(name=name)
+        ObsRequest.objects.create(field=field, grp_id='REQ-'+name, which_inst=inst,
+                                  timestamp=START, time_expire=START+timedelta(days=n_nights),
+                                  t_sample=15.0, exptime=300)
+        for night in range(0,n_nights,1):
+            for i in range(0,3,1):
+                window_start = START + timedelta(days=night, hours=i)
+                SubObsRequest.objects.create(sr_id=name+'-'+str(night)+'-'+str(i),
+                                             grp_id='REQ-'+name, track_id='1',
+                                             window_start=window_start,
+                                             window_end=window_start+timedelta(hours=1),
+                                             status=('COMPLETED' if inst == 'fl15' else 'PENDING'))
+
+def test_update_obs_completion_stats():
+
+    with benchmark_utilities.synthetic_database():
+        populate_subrequests(5)
+
+        assert obs_monitor.update_obs_completion_stats() == 5
+        assert ObsCompletionStats.objects.count() == 10
+        entry = ObsCompletionStats.objects.get(night=START.date(), field='ROME-FIELD-01')
+        assert (entry.inst, entry.n_requested, entry.n_executed) == ('fl15', 3, 3)
+        assert entry.completion() == 1.0
+
+        # Nothing has changed, so nothing is recomputed
+        assert obs_monitor.update_obs_completion_stats() == 0
+
+        # Only the night of the subrequest executed is recomputed
+        window_start = START + timedelta(days=3)
+        update_db_2.upsert_sub_requests_bulk([ {'sr_id': 'ROME-FIELD-02-3-0',
+                                                'grp_id': 'REQ-ROME-FIELD-02', 'track_id': '1',
+                                                'window_start': window_start,
+                                                'window_end': window_start+timedelta(hours=1),
+                                                'status': 'COMPLETED'} ])
+        assert obs_monitor.update_obs_completion_stats() == 1
+        entry = ObsCompletionStats.objects.get(night=window_start.date(), field='ROME-FIELD-02')
+        assert (entry.n_requested, entry.n_executed) == (3, 1)
+
+        end_date = START + timedelta(days=10)
+        fields = obs_monitor.get_field_completion(START, end_date)
+        assert [ (f['field'], f['n_requested'], f['n_executed']) for f in fields ] == \
+               [ ('ROME-FIELD-01', 15, 15), ('ROME-FIELD-02', 15, 1) ]
+
+        completion = obs_monitor.get_instrument_completion(START, end_date)
+        assert completion['fl15'][1] == [100.0]*5
+        assert round(completion['fl16'][1][3], 1) == 33.3
+
+        # The plot reads the statistics in a fixed number of queries
+        with benchmark_utilities.assert_query_budget(2):
+            (script, div, start_date, end_date) = obs_monitor.analyze_completion_stats(START, end_date)
+        assert '<script' in script
+
+        assert obs_monitor.update_obs_completion_stats(rebuild=True) == 5
+        assert ObsCompletionStats.objects.count() == 10
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:28:40 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from urllib.parse import parse_qs
+from datetime import timedelta
+import csv
+import io
+import json
+import pytest
+setup()
+from events.models import Field, Image
+from events import views
+from scripts import benchmark_utilities
+
+DATE = '20180601'
+
+def populate_images(n_images):
+    """Function to add n_images to the log of DATE, with several taken at
+    the same time, and one on the following night"""
+
+    field = Field.objects.create(name='ROME-FIELD-01', field_ra='268.0', field_dec='-29.0')
+    (date_min, date_max) = views.get_obs_log_date_range(DATE)
+
+    images = []
+    for i in range(0,n_images,1):
+        date_obs = date_min + timedelta(minutes=(i//3))
+        images.append(Image(field=field, image_name='image'+str(i)+'.fits',
+                            timestamp=date_obs, date_obs=date_obs,
+                            tel='1m0-05', filt='ip', nstars=i))
+    images.append(Image(field=field, image_name='tomorrow.fits',
+                        timestamp=date_max, date_obs=date_max+timedelta(hours=1)))
+    Image.objects.bulk_create(images)
+
+def get_cursors(page_links, link):
+
+    return parse_qs(page_links[link])
+
+def test_paginate_obs_log():
+
+    with benchmark_utilities.synthetic_database():
+        populate_images(25)
+        (date_min, date_max) = views.get_obs_log_date_range(DATE)
+        images = views.select_obs_log_images(date_min, date_max)
+
+        # Each page, whatever its position, is read in one query
+        pages = []
+        after = None
+        while True:
+            with benchmark_utilities.assert_query_budget(1):
+                (page, page_links) = views.paginate_obs_log(images, after=after, per_page=10)
+                rows = views.render_obs_log_rows(page)
+            pages.append([ row[0] for row in rows ])
+            if 'next' not in page_links:
+                break
+            after = get_cursors(page_links, 'next')['after'][0]
+
+        assert [ len(p) for p in pages ] == [10, 10, 5]
+        names = [ n for p in pages for n in p ]
+        assert sorted(names) == sorted([ 'image'+str(i)+'.fits' for i in range(0,25,1) ])
+        assert rows[-1][3] == '268.0'
+
+        # Stepping back from the last page returns the middle page
+        before = get_cursors(page_links, 'previous')['before'][0]
+        (page, page_links) = views.paginate_obs_log(images, before=before, per_page=10)
+        assert [ i.image_name for i in page ] == pages[1]
+        assert 'previous' in page_links and 'next' in page_links
+
+        with pytest.raises(ValueError):
+            views.paginate_obs_log(images, after='not-a-cursor', per_page=10)
+
+def test_obs_log_export():
+
+    with benchmark_utilities.synthetic_database():
+        populate_images(25)
+        (date_min, date_max) = views.get_obs_log_date_range(DATE)
+        images = views.select_obs_log_images(date_min, date_max)
+
+        content = ''.join(views.generate_obs_log_export(images, 'csv'))
+        rows = list(csv.reader(io.StringIO(content)))
+        assert rows[0] == [ name for (name, attribute) in views.OBS_LOG_COLUMNS ]
+        assert len(rows) == 26
+        assert rows[1][0] == 'image0.fits'
+
+        lines = ''.join(views.generate_obs_log_export(images, 'jsonl')).splitlines()
+        assert len(lines) == 25
+        entry = json.loads(lines[-1])
+        assert entry['nstars'] == 24
+        assert entry['field_dec'] == '-29.0'
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 06:58:14 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+import pytest
+import requests
+import time
+setup()
+from django.conf import settings
+from events.models import Field, ObsRequest
+from scripts import benchmark_utilities, fake_lco_api, log_utilities, obs_control
+from scripts import observation_classes, outbound
+
+def make_obs(site):
+
+    obs = observation_classes.ObsRequest()
+    obs.name = 'ROME-FIELD-01'
+    obs.ra = '17:51:20.6149'
+    obs.dec = '-30:03:38.9442'
+    obs.site = site
+    obs.observatory = 'doma'
+    obs.tel = '1m0'
+    obs.instrument = 'fl16'
+    obs.instrument_class = '1M0-SCICAM-SINISTRO'
+    obs.filters = [ 'SDSS-i' ]
+    obs.exposure_times = [ 300.0 ]
+    obs.exposure_counts = [ 1 ]
+    obs.focus_offset = [ 0.0 ]
+    obs.cadence = 1.0
+    obs.jitter = 1.0
+    obs.ttl = 1.0
+    obs.request_type = 'A'
+    obs.proposal_id = 'KEY2017AB-004'
+    obs.token = 'token'
+    obs.onem = True
+
+    return obs
+
+def test_fan_out():
+
+    with fake_lco_api.FakeLCOAPI(delay=0.3) as api:
+        url = api.url+'/telescope_states/'
+
+        def fail():
+            raise ValueError('bad response')
+
+        calls = [ lambda: outbound.get(url).json() for i in range(5) ] + \
+                [ fail, lambda: time.sleep(2.0) ]
+
+        t0 = time.perf_counter()
+        outcomes = outbound.fan_out(calls, deadline=outbound.Deadline(1.0))
+        elapsed = time.perf_counter() - t0
+
+    # The calls are made at once, and the page waits no longer than the
+    # deadline for the call which has not finished
+    assert elapsed < 1.5
+    assert [ o[0]['coj.doma.1m0a'] for o in outcomes[0:5] ] == [[{'event_type': 'AVAILABLE'}]]*5
+    assert isinstance(outcomes[5][1], ValueError)
+    assert isinstance(outcomes[6][1], outbound.DeadlineExceeded)
+
+def test_request_deadline():
+
+    with fake_lco_api.FakeLCOAPI(delay=1.0) as api:
+        deadline = outbound.Deadline(0.2)
+
+        t0 = time.perf_counter()
+        with pytest.raises(requests.Timeout):
+            outbound.get(api.url+'/proposals/', deadline=deadline)
+        assert time.perf_counter() - t0 < 0.9
+
+        with pytest.raises(outbound.DeadlineExceeded):
+            outbound.get(api.url+'/proposals/', deadline=deadline)
+
+def test_submit_obs_requests(tmpdir, monkeypatch):
+
+    config = {'log_directory': str(tmpdir), 'log_root_name': 'test',
+              'simulate': 'false'}
+
+    with benchmark_utilities.synthetic_database():
+        Field.objects.create(name='ROME-FIELD-01')
+
+        with fake_lco_api.FakeLCOAPI(delay=0.3) as api:
+            monkeypatch.setattr(settings, 'LCO_API_URL', api.url)
+
+            # Each request is built and submitted in two calls to LCO; the
+            # three sites are submitted at once
+            obs_requests = [ make_obs(site) for site in ['lsc', 'cpt', 'coj'] ]
+            t0 = time.perf_counter()
+            submit_status = obs_control.submit_obs_requests(config, obs_requests,
+                                            log=log_utilities.start_day_log(config, 'test'))
+            elapsed = time.perf_counter() - t0
+
+            assert submit_status == ['add_OK']*3
+            assert elapsed < 0.3*len(obs_requests)*2
+            assert len(api.submitted) == 3
+            assert len(set([ obs.group_id for obs in obs_requests ])) == 3
+            assert ObsRequest.objects.filter(request_status='AC').count() == 3
+
+            # A request which could not be built was not submitted, so is
+            # recorded as failed, once its calls have timed out
+            api.delay = 2.0
+            monkeypatch.setattr(settings, 'OUTBOUND_TIMEOUT', 0.5)
+            t0 = time.perf_counter()
+            submit_status = obs_control.submit_obs_requests(config, [ make_obs('lsc') ],
+                                            log=log_utilities.start_day_log(config, 'test'))
+            assert time.perf_counter() - t0 < 1.5
+            assert submit_status == ['WARNING']
+            assert ObsRequest.objects.filter(request_status='CN').count() == 1
+            assert len(api.submitted) == 3
+
+            # A submission LCO accepted but did not answer in time is not
+            # recorded as cancelled, so that it is not submitted again
+            api.delay = 0.0
+            api.submit_delay = 2.0
+            obs = make_obs('cpt')
+            submit_status = obs_control.submit_obs_requests(config, [ obs ],
+                                            log=log_utilities.start_day_log(config, 'test'))
+            assert submit_status == ['UNKNOWN']
+            assert len(api.submitted) == 4
+            assert ObsRequest.objects.get(grp_id=obs.group_id).request_status == 'AC'
+            assert ObsRequest.objects.filter(request_status='CN').count() == 1
+
+def test_run_all():
+
+    with fake_lco_api.FakeLCOAPI(delay=0.3) as api:
+        url = api.url+'/telescope_states/'
+        finished = []
+
+        def slow():
+            time.sleep(1.0)
+            finished.append(True)
+            return 'done'
+
+        outcomes = outbound.run_all([ lambda: outbound.get(url).json(), slow ])
+
+    # Every call has finished, however long it took
+    assert finished == [True]
+    assert outcomes[0][0]['coj.doma.1m0a'] == [{'event_type': 'AVAILABLE'}]
+    assert outcomes[1] == ('done', None)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 02:10:52 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ, rename
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.core.cache import cache
+setup()
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+from events.models import Event
+from events.middleware import PerformanceMiddleware
+from scripts import benchmark_utilities, fake_survey_sites, performance_log, survey_links
+
+def test_get_sql_fingerprint():
+
+    one = performance_log.get_sql_fingerprint("SELECT * FROM events_event WHERE id = 12 AND status = 'AC'")
+    two = performance_log.get_sql_fingerprint("SELECT *  FROM events_event\n WHERE id = 7 AND status = 'NF'")
+    assert one == two
+    assert performance_log.get_sql_fingerprint('SELECT * FROM t1 WHERE id IN (%s, %s, %s)') == \
+           performance_log.get_sql_fingerprint('SELECT * FROM t1 WHERE id IN (%s)')
+
+def test_performance_middleware(tmpdir, monkeypatch):
+
+    log_path = path.join(str(tmpdir), 'performance.log')
+    monkeypatch.setattr(settings, 'PERFORMANCE_LOG_PATH', log_path)
+    monkeypatch.setattr(settings, 'PERFORMANCE_MONITORING', True)
+    cache.clear()
+
+    def view(request):
+        request.resolver_match = resolve('/db/obs_monitor/')
+        # A query per event, as made by a template looking up each row
+        for pk in event_ids:
+            Event.objects.get(pk=pk)
+        survey_links.gather_survey_links(2018, 'MB180123', timeout=5.0,
+                                         root_urls=sites.root_urls())
+        return HttpResponse('OK')
+
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(4)
+        pages = fake_survey_sites.canned_survey_pages(2018, 'MB180123')
+        with fake_survey_sites.FakeSurveySites(pages) as sites:
+            middleware = PerformanceMiddleware(view)
+            middleware(RequestFactory().get('/db/obs_monitor/'))
+            nrequests = sum(sites.nrequests.values())
+
+    records = performance_log.read_performance_records(log_path)
+    assert len(records) == 1
+    entry = records[0]
+    assert entry['url_name'] == 'obs_monitor'
+    assert entry['status'] == 200
+    assert entry['sql_count'] >= 4
+    assert entry['sql_duplicates'] >= 3
+    assert entry['duplicate_fingerprints'][0]['count'] == 4
+    assert 'events_event' in entry['duplicate_fingerprints'][0]['sql']
+    # The survey sites are scraped from the threads of a pool, on behalf of
+    # the request
+    assert nrequests > 0
+    assert entry['http_count'] == nrequests
+    assert entry['http_calls'][0]['url'].startswith('http://127.0.0.1')
+
+def test_performance_middleware_streaming(tmpdir, monkeypatch):
+
+    log_path = path.join(str(tmpdir), 'performance.log')
+    monkeypatch.setattr(settings, 'PERFORMANCE_LOG_PATH', log_path)
+    monkeypatch.setattr(settings, 'PERFORMANCE_MONITORING', True)
+
+    def view(request):
+        request.resolver_match = resolve('/db/obs_monitor/')
+
+        # The rows are read from the database as the response is sent
+        def rows():
+            for pk in event_ids:
+                yield str(Event.objects.get(pk=pk).pk)+'\n'
+        return StreamingHttpResponse(rows())
+
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(4)
+        middleware = PerformanceMiddleware(view)
+        response = middleware(RequestFactory().get('/db/obs_monitor/'))
+        assert performance_log.read_performance_records(log_path) == []
+
+        content = b''.join(response.streaming_content)
+        response.close()
+
+    assert content == ''.join([ str(pk)+'\n' for pk in event_ids ]).encode('utf-8')
+    records = performance_log.read_performance_records(log_path)
+    assert len(records) == 1
+    assert records[0]['sql_count'] >= 4
+    assert records[0]['duplicate_fingerprints'][0]['count'] == 4
+
+    # A response closed before it is sent in full is recorded too
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(4)
+        response = PerformanceMiddleware(view)(RequestFactory().get('/db/obs_monitor/'))
+        next(iter(response.streaming_content))
+        response.close()
+
+    assert len(performance_log.read_performance_records(log_path)) == 2
+
+def rotate_log(log_path, backups):
+    """Function to rotate a log as logrotate does"""
+
+    for i in range(backups-1,0,-1):
+        if path.isfile(log_path+'.'+str(i)):
+            rename(log_path+'.'+str(i), log_path+'.'+str(i+1))
+    rename(log_path, log_path+'.1')
+
+def test_summarise_performance_records(tmpdir, monkeypatch):
+
+    log_path = path.join(str(tmpdir), 'performance.log')
+    monkeypatch.setattr(settings, 'PERFORMANCE_LOG_BACKUPS', 50)
+
+    record = performance_log.RequestRecord()
+    record.add_query('SELECT 1', 0.001)
+    for i in range(0,100,1):
+        for url_name in ['dashboard', 'show_event']:
+            performance_log.write_performance_record(record.as_dict(time=str(i),
+                                                     url_name=url_name,
+                                                     duration_ms=float(i+1)*(1 if url_name == 'dashboard' else 10)),
+                                                     log_path=log_path)
+        if i % 7 == 6:
+            rotate_log(log_path, 50)
+
+    # Records are read across the rotated files of the log, which is
+    # reopened once it has been rotated
+    assert path.isfile(log_path+'.14')
+    records = performance_log.read_performance_records(log_path, max_records=1000)
+    assert len(records) == 200
+    assert records[0]['time'] == '0'
+    assert len(performance_log.read_performance_records(log_path, max_records=30)) == 30
+
+    summary = performance_log.summarise_performance_records(records)
+    assert [ s['url_name'] for s in summary ] == ['show_event', 'dashboard']
+    assert summary[1]['count'] == 100
+    assert summary[1]['p50_ms'] == 50.5
+    assert summary[1]['p99_ms'] == 99.0
+    assert summary[0]['mean_sql_count'] == 1.0
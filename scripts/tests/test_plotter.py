@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:52:19 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ, makedirs, utime
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.core.cache import caches
+import tempfile
+setup()
+from scripts import plotter
+
+def make_artemis_dir(event):
+
+    artemis = tempfile.mkdtemp()+'/'
+    makedirs(path.join(artemis,'data'))
+    makedirs(path.join(artemis,'model'))
+    for file_path in [ 'data/K'+event+'I.dat', 'data/O'+event+'I.dat',
+                       'model/'+event+'.model', 'model/'+event+'.align' ]:
+        with open(path.join(artemis,file_path),'w') as f:
+            f.write('1 2 3\n')
+
+    return artemis
+
+def test_get_lightcurve_plot(monkeypatch):
+
+    event = 'OB180123'
+    artemis = make_artemis_dir(event)
+    caches[plotter.LIGHTCURVE_CACHE].clear()
+    plotter.reset_lightcurve_cache_stats()
+
+    renders = []
+    def fake_plot_it(event, artemis=None):
+        renders.append(event)
+        return 'script'+str(len(renders)), 'div'+str(len(renders))
+    monkeypatch.setattr(plotter, 'plot_it', fake_plot_it)
+
+    assert len(plotter.get_lightcurve_inputs(event, artemis=artemis)) == 4
+
+    assert plotter.get_lightcurve_plot(event, artemis=artemis) == ('script1', 'div1')
+    assert plotter.get_lightcurve_plot(event, artemis=artemis) == ('script1', 'div1')
+    assert len(renders) == 1
+
+    # Updating any input re-renders the plot
+    with open(path.join(artemis,'data','K'+event+'I.dat'),'a') as f:
+        f.write('4 5 6\n')
+    assert plotter.get_lightcurve_plot(event, artemis=artemis) == ('script2', 'div2')
+
+    plotter.invalidate_lightcurve_plot(event)
+    assert plotter.get_lightcurve_plot(event, artemis=artemis) == ('script3', 'div3')
+
+    assert plotter.get_lightcurve_cache_stats() == {'hits': 1, 'misses': 3}
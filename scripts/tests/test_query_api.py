@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 00:04:11 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.utils import timezone
+from urllib.parse import urlsplit, parse_qsl
+from datetime import datetime, timedelta
+import json
+setup()
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from events.models import Field, ObsRequest, SubObsRequest, Image
+from scripts import api_tools, benchmark_utilities
+
+class ClientResponse():
+    """Response of the test client in the form of a requests response"""
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self.text = response.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+def route_requests_to(client, monkeypatch):
+    """Function to send the requests made by api_tools to the test client"""
+
+    def get(url, params={}, headers={}):
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query))
+        query.update(params)
+        extra = {}
+        if 'Authorization' in headers:
+            extra['HTTP_AUTHORIZATION'] = headers['Authorization']
+        return ClientResponse(client.get(parts.path, query, **extra))
+
+    monkeypatch.setattr(api_tools.requests, 'get', get)
+
+def populate_requests(n_requests):
+
+    field = Field.objects.create(name='ROME-FIELD-01')
+    now = timezone.now()
+    for i in range(0,n_requests,1):
+        ObsRequest.objects.create(field=field, grp_id='REQ'+str(i), track_id=str(1000+i),
+                                  timestamp=now-timedelta(hours=i),
+                                  time_expire=now+timedelta(hours=24-i),
+                                  request_status=('AC' if i%2 == 0 else 'EX'),
+                                  t_sample=15.0, exptime=300)
+    for j in range(0,3,1):
+        SubObsRequest.objects.create(sr_id=str(j), grp_id='REQ0', track_id='1000',
+                                     window_start=now, window_end=now+timedelta(hours=1))
+    return now
+
+def test_obs_requests_api(monkeypatch):
+
+    with benchmark_utilities.synthetic_database():
+        now = populate_requests(11)
+        user = User.objects.create(username='pipeline')
+        config = {'db_token': Token.objects.get_or_create(user=user)[0].key}
+        client = APIClient(SERVER_NAME='127.0.0.1')
+        route_requests_to(client, monkeypatch)
+
+        # Lists are returned in pages, each linking to the next
+        response = client.get('/db/api/v1/obs_requests/', {'limit': 4, 'fields': 'pk,grp_id'},
+                              HTTP_AUTHORIZATION='Token '+config['db_token'])
+        payload = response.json()
+        assert payload['version'] == 1
+        assert len(payload['results']) == 4
+        assert list(payload['results'][0].keys()) == ['pk', 'grp_id']
+        assert payload['next'] != None
+
+        response = client.get('/db/api/v1/obs_requests/', {'fields': 'pk,colour'},
+                              HTTP_AUTHORIZATION='Token '+config['db_token'])
+        assert response.status_code == 400
+        assert 'colour' in response.json()['error']
+
+        assert client.get('/db/api/v1/obs_requests/').status_code in [401, 403]
+
+        # The client follows the pages to the end of the list
+        (message, results) = api_tools.ask_db_json_list('obs_requests', config['db_token'],
+                                                        params={'limit': 2, 'request_status': 'AC'},
+                                                        testing=True)
+        assert message == 'OK'
+        assert sorted([ r['grp_id'] for r in results ]) == sorted([ 'REQ'+str(i) for i in range(0,11,2) ])
+        assert results[0]['field'] == 'ROME-FIELD-01'
+
+        params = {'timestamp': (now-timedelta(hours=4.5)).replace(tzinfo=None),
+                  'time_expire': (now+timedelta(hours=48)).replace(tzinfo=None),
+                  'request_status': 'ALL'}
+        (message, obs_list) = api_tools.get_obs_list_json(config, params, testing=True)
+        assert sorted([ o['grp_id'] for o in obs_list ]) == [ 'REQ0', 'REQ1', 'REQ2', 'REQ3', 'REQ4' ]
+        assert isinstance(obs_list[0]['timestamp'], datetime)
+
+        (message, active) = api_tools.get_active_obs_json(config, fields=['grp_id'], testing=True)
+        assert len(active) == 6
+
+        (message, subrequests) = api_tools.get_subrequests_json(config, 'REQ0', testing=True)
+        assert [ s['sr_id'] for s in subrequests ] == ['0', '1', '2']
+
+def test_image_and_survey_api(monkeypatch):
+
+    with benchmark_utilities.synthetic_database():
+        field = Field.objects.create(name='ROME-FIELD-01')
+        Image.objects.create(field=field, image_name='lsc1m005-fl15-20180601-0001-e91.fits',
+                             timestamp=timezone.now(), date_obs=timezone.now())
+        user = User.objects.create(username='pipeline')
+        config = {'db_token': Token.objects.get_or_create(user=user)[0].key}
+        route_requests_to(APIClient(SERVER_NAME='127.0.0.1'), monkeypatch)
+
+        (message, in_db) = api_tools.check_image_in_db_json(config,
+                                {'image_name': 'lsc1m005-fl15-20180601-0001-e91.fits'}, testing=True)
+        assert message == 'OK' and in_db == True
+        (message, in_db) = api_tools.check_image_in_db_json(config,
+                                {'image_name': 'lsc1m005-fl15-20180601-0002-e91.fits'}, testing=True)
+        assert in_db == False
+
+        # The survey query is public
+        (message, in_survey) = api_tools.query_event_in_survey_json({}, 0.0, 0.0, testing=True)
+        assert message == 'OK' and in_survey == False
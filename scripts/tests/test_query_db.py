@@ -21,9 +21,10 @@ from django import setup
 from datetime import datetime, timedelta
 import pytz
 setup()
-from events.models import Event, EventName, SingleModel, Tap
-import query_db
-import utilities
+from events.models import Event, EventName, SingleModel, Tap, get_dec_zone
+from scripts import query_db
+from scripts import utilities, benchmark_utilities
+from decimal import Decimal
 
 def test_get_active_obs():
     
@@ -145,6 +146,52 @@ def test_get_event_by_name():
     assert event.ev_ra == ra
     assert event.ev_dec == dec
     
+def test_resolve_event_id():
+    
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(2)
+        event_name = 'OGLE-2018-BLG-0002'
+        
+        query_db.event_name_resolver.load()
+        assert query_db.resolve_event_id(event_name) == event_ids[1]
+        assert query_db.resolve_event_id('OB180002') == event_ids[1]
+        assert query_db.resolve_event_id('MOA-2018-BLG-9999/'+event_name) == event_ids[1]
+        assert query_db.resolve_event_id('MOA-2018-BLG-9999') == None
+        
+        query_db.event_name_resolver.clear()
+        assert query_db.resolve_event_id(event_name) == event_ids[1]
+        assert event_name in query_db.event_name_resolver.event_ids
+        
+        # A name cached for an event since removed is forgotten, under the
+        # name it was resolved by rather than the one it was requested by
+        query_db.event_name_resolver.set_name(event_name, max(event_ids)+1)
+        (event, message) = query_db.get_event_by_name('OB180002')
+        assert event == None
+        assert event_name not in query_db.event_name_resolver.event_ids
+        (event, message) = query_db.get_event_by_name('OB180002')
+        assert event.pk == event_ids[1]
+        query_db.event_name_resolver.clear()
+    
+def test_get_latest_entries_for_events():
+    
+    events = Event.objects.filter(year='2008')[:20]
+    event_ids = [ e.pk for e in events ]
+    
+    models = query_db.get_latest_models_for_events(event_ids)
+    datafiles = query_db.get_latest_datafiles_for_events(event_ids)
+    taps = query_db.get_latest_taps_for_events(event_ids)
+    names = query_db.get_names_for_events(event_ids)
+    
+    for e in events:
+        model = SingleModel.objects.filter(event=e).order_by('-last_updated', '-pk').first()
+        tap = Tap.objects.filter(event=e).order_by('-timestamp', '-pk').first()
+        
+        assert models.get(e.pk) == model
+        assert taps.get(e.pk) == tap
+        if e.pk in datafiles:
+            assert datafiles[e.pk].event_id == e.pk
+        assert names[e.pk] == query_db.get_event_name_list(e.pk)
+    
 def test_get_events_within_radius():
     
     ra = '17:52:39.22'
@@ -159,6 +206,53 @@ def test_get_events_within_radius():
     events_list = query_db.get_events_within_radius(ra, dec, radius)
     assert len(events_list) == 1
     
+def test_cone_search():
+    
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(50)
+        event = Event.objects.get(pk=event_ids[0])
+        (ra, dec) = (event.ev_ra, event.ev_dec)
+        
+        (events_list, separations) = query_db.cone_search(ra, dec, 2.0)
+        assert len(events_list) == 1
+        assert events_list[0].pk == event.pk
+        assert separations[0] < 2.0
+        
+        (ra_deg, dec_deg) = utilities.sex2decdeg(ra, dec)
+        (events_list2, separations) = query_db.cone_search(ra_deg, dec_deg, 2.0)
+        assert events_list2[0].pk == events_list[0].pk
+        
+        (events_list, separations) = query_db.cone_search(ra, dec, 7200.0)
+        assert len(events_list) > 1
+        assert separations == sorted(separations)
+    
+def test_event_sky_position():
+    """Function to verify that the decimal coordinates and declination zone
+    of an event follow its RA, Dec strings"""
+    
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(1)
+        event = Event.objects.get(pk=event_ids[0])
+        
+        event.ev_ra = '17:52:39.22'
+        event.ev_dec = '-28:54:02.94'
+        event.save()
+        event.refresh_from_db()
+        (ra_deg, dec_deg) = utilities.sex2decdeg('17:52:39.22', '-28:54:02.94')
+        assert abs(float(event.ra) - ra_deg) < 1e-6
+        assert abs(float(event.dec) - dec_deg) < 1e-6
+        assert event.dec_zone == get_dec_zone(dec_deg)
+        (events_list, separations) = query_db.cone_search('17:52:39.22', '-28:54:02.94', 1.0)
+        assert [ e.pk for e in events_list ] == [ event.pk ]
+        
+        # Decimal coordinates set explicitly are kept
+        event.ra = Decimal('268.0')
+        event.dec = Decimal('-29.0')
+        event.save()
+        event.refresh_from_db()
+        assert event.ra == Decimal('268.0')
+        assert event.dec_zone == get_dec_zone(-29.0)
+    
 def test_get_image_rejection_statistics():
     
     stats = query_db.get_image_rejection_statistics()
@@ -167,6 +261,19 @@ def test_get_image_rejection_statistics():
     assert 'Accepted' in stats.keys()
     assert len(stats) > 1
     
+    nightly_stats = query_db.get_image_rejection_statistics(breakdown=True)
+    total = 0
+    for (night, tel), night_stats in nightly_stats.items():
+        total += night_stats['Total number of images']
+    assert total == stats['Total number of images']
+    
+def test_tally_image_qualities():
+    
+    stats = query_db.tally_image_qualities([ ('', 3), ('Bad FWHM', 2),
+                                             ('Bad FWHM ; High sky', 1) ])
+    assert stats == {'Accepted': 3, 'Total number of images': 6,
+                     'Bad FWHM': 3, 'High sky': 1}
+    
 def test_check_image_in_db():
     
     status = query_db.check_image_in_db('cpt1m010-fl16-20170403-0197-e91.fits')
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 09:12:05 2026
+
+@author: rstreet
+
+Regression checks that the hot lookups made by query_db, update_db_2 and
+the views are answered from an index rather than by scanning the table.
+These use SQLite's EXPLAIN QUERY PLAN and are skipped on other backends.
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django.core import management
+from django.conf import settings
+from django.utils import timezone
+from django import setup
+from django.db import connection
+from datetime import datetime, timedelta
+import pytest
+setup()
+from django.http import HttpResponse
+from django.test import RequestFactory
+from events.models import Event
+from events import views
+from scripts import page_validators, query_db, tap_retention, update_db_2
+import pytz
+
+pytestmark = pytest.mark.skipif(connection.vendor != 'sqlite',
+                                reason='EXPLAIN QUERY PLAN checks are SQLite-specific')
+
+class LegacyUser():
+    """User calling is_authenticated as the pages expect"""
+
+    pk = 1
+
+    def is_authenticated(self):
+        return True
+
+def get_request(url):
+
+    request = RequestFactory().get(url)
+    request.user = LegacyUser()
+
+    return request
+
+def check_plan(plan):
+    """Function to verify that every table access in a query plan is made
+    via an index or the primary key"""
+
+    for line in plan.split('\n'):
+        if 'SCAN' in line or 'SEARCH' in line:
+            assert 'USING' in line and ('INDEX' in line or 'PRIMARY KEY' in line), \
+                'Unindexed table access in query plan: '+plan
+
+def assert_uses_index(qs):
+    """Function to verify that every table access in the query plan for
+    a QuerySet returned by one of the lookup functions is made via an index"""
+
+    check_plan(qs.explain())
+
+def assert_queries_use_index(function, *args, **kwargs):
+    """Function to call one of the lookup functions and verify that every
+    table access in the query plan of each query it makes is made via an
+    index.  Returns the number of queries checked."""
+
+    queries = []
+    def record_query(execute, sql, params, many, context):
+        queries.append( (sql, params) )
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record_query):
+        function(*args, **kwargs)
+
+    nchecked = 0
+    with connection.cursor() as cursor:
+        for (sql, params) in queries:
+            if sql.split(' ',1)[0].upper() not in ['SELECT', 'UPDATE', 'DELETE']:
+                continue
+            cursor.execute('EXPLAIN QUERY PLAN '+sql, params)
+            check_plan('\n'.join([ str(row[-1]) for row in cursor.fetchall() ]))
+            nchecked += 1
+
+    assert nchecked > 0, 'No queries made by '+function.__name__
+
+    return nchecked
+
+def test_image_lookups():
+
+    assert_queries_use_index(query_db.check_image_in_db,
+                             'lsc1m005-fl15-20170418-0131-e91.fits')
+    assert_queries_use_index(update_db_2.get_latest_image_stats_keys,
+                             ['lsc1m005-fl15-20170418-0131-e91.fits'])
+
+    tstart = timezone.now() - timedelta(days=1)
+    assert_uses_index(views.select_obs_log_images(tstart, timezone.now()))
+
+def test_obs_request_lookups(monkeypatch):
+
+    now = timezone.now()
+
+    assert_uses_index(query_db.get_active_obs())
+    assert_uses_index(query_db.get_old_active_obs())
+    assert_uses_index(query_db.select_obs_by_date({'timestamp': now-timedelta(days=1),
+                                                   'time_expire': now,
+                                                   'request_status': 'AC'}))
+    assert_uses_index(query_db.get_subrequests_for_obsrequest('REA20180423T10:00:00'))
+
+    assert_queries_use_index(update_db_2.upsert_sub_requests_bulk,
+                             [ {'sr_id': '1234567', 'grp_id': 'REA20180423T10:00:00'} ])
+
+    # The obs requests of the last 24 hours are selected by the page itself
+    monkeypatch.setattr(views, 'render', lambda *args, **kwargs: HttpResponse(''))
+    assert_queries_use_index(views.obs_requests24, get_request('/db/obs_requests24/'))
+
+def test_event_lookups():
+
+    assert_queries_use_index(query_db.get_tap_list)
+    assert_uses_index(views.select_tap_events())
+    assert_queries_use_index(page_validators.get_event_list_validators,
+                             get_request('/db/list_year/2018/'), 2018)
+
+    query_db.event_name_resolver.clear()
+    assert_queries_use_index(query_db.get_event_by_name, 'OGLE-2018-BLG-0001')
+
+def test_event_position_lookups():
+
+    assert_uses_index(query_db.select_events_in_zones(-28.91, -28.89,
+                                                      268.16, 268.18))
+    assert_uses_index(query_db.select_events_in_zones(-28.91, -28.89,
+                                                      -0.01, 0.01))
+    assert_queries_use_index(query_db.cone_search, 268.17, -28.90, 2.5)
+
+def test_latest_entry_lookups():
+
+    event = Event(pk=1)
+
+    assert_queries_use_index(query_db.get_last_single_model, event)
+    assert_queries_use_index(query_db.get_last_single_model, event, modeler='ARTEMiS')
+    assert_queries_use_index(query_db.get_last_datafile, event)
+    assert_queries_use_index(query_db.get_latest_tap_entry, event)
+    assert_queries_use_index(query_db.get_latest_taps_for_events, [1, 2])
+    assert_queries_use_index(views.get_event_obs_chart_data, 1)
+
+    # The pointers to the latest model, datafile, TAP entry and status
+    assert_queries_use_index(update_db_2.refresh_latest_entries,
+                             events=Event.objects.filter(pk=1))
+
+def test_tap_retention_lookups():
+
+    day_start = datetime(2018, 4, 23, tzinfo=pytz.UTC)
+    for model in tap_retention.RETENTION_MODELS.values():
+        assert_queries_use_index(tap_retention.select_superseded_entries, model,
+                                 day_start, day_start+timedelta(days=1))
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:05:38 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+from django.core.cache import cache
+import time
+setup()
+from scripts import fake_survey_sites, survey_links
+
+YEAR = 2018
+EVENT = 'MB180123'
+
+def test_gather_survey_links_in_parallel():
+
+    cache.clear()
+    delays = {'mismap': 0.3, 'moa': 0.3, 'kmt': 0.3, 'ogle': 0.3}
+    pages = fake_survey_sites.canned_survey_pages(YEAR, EVENT)
+
+    with fake_survey_sites.FakeSurveySites(pages, delays=delays) as sites:
+        t0 = time.perf_counter()
+        results = survey_links.gather_survey_links(YEAR, EVENT, timeout=5.0,
+                                                   root_urls=sites.root_urls())
+        elapsed = time.perf_counter() - t0
+
+        # The sites are scraped at once, so the first view waits for the
+        # slowest site only
+        assert elapsed < 0.3*len(delays)
+        assert results['mismap'][3] == True
+        assert results['moa'][3] == True
+        assert results['kmt'][1].endswith('view.php?event=KMT-2018-BLG-0123')
+        assert results['ogle'][1] == True
+
+        # Repeat views are answered from the cache
+        nrequests = dict(sites.nrequests)
+        repeat = survey_links.gather_survey_links(YEAR, EVENT, timeout=5.0,
+                                                  root_urls=sites.root_urls())
+        assert sites.nrequests == nrequests
+        assert repeat == results
+
+def test_gather_survey_links_negative_cache():
+
+    cache.clear()
+
+    with fake_survey_sites.FakeSurveySites({}) as sites:
+        results = survey_links.gather_survey_links(YEAR, EVENT, timeout=5.0,
+                                                   root_urls=sites.root_urls())
+        assert results['mismap'][3] == False
+        assert results['kmt'][3] == False
+        assert results['ogle'][1] == False
+
+        nrequests = dict(sites.nrequests)
+        survey_links.gather_survey_links(YEAR, EVENT, timeout=5.0,
+                                         root_urls=sites.root_urls())
+        assert sites.nrequests == nrequests
+
+def test_gather_survey_links_timeout():
+
+    cache.clear()
+    pages = fake_survey_sites.canned_survey_pages(YEAR, EVENT)
+
+    with fake_survey_sites.FakeSurveySites(pages, delays={'kmt': 1.0}) as sites:
+        t0 = time.perf_counter()
+        results = survey_links.gather_survey_links(YEAR, EVENT, timeout=0.3,
+                                                   root_urls=sites.root_urls())
+        elapsed = time.perf_counter() - t0
+
+        assert elapsed < 1.0
+        assert results['kmt'] == survey_links.NOT_FOUND['kmt']
+        assert results['mismap'][3] == True
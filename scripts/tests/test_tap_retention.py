@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:58:31 2026
+
+@author: rstreet
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django.core import management
+from django.conf import settings
+from django.utils import timezone
+from django import setup
+from datetime import datetime, timedelta
+import gzip
+import csv
+import tempfile
+import pytest
+import pytz
+setup()
+from events.models import Tap, TapLima
+from scripts import benchmark_utilities, tap_retention, update_db_2
+
+def test_archive_entries():
+
+    archive_dir = tempfile.mkdtemp()
+    ts = datetime(2018, 5, 1, 12, 0, 0, tzinfo=pytz.UTC)
+    entries = [ {'id': 1, 'event_id': 10, 'timestamp': ts, 'priority': 'A'},
+                {'id': 2, 'event_id': 10, 'timestamp': ts+timedelta(hours=1), 'priority': 'L'} ]
+    for entry in entries:
+        for f in Tap._meta.concrete_fields:
+            entry.setdefault(f.attname, None)
+
+    nbytes = tap_retention.archive_entries(Tap, entries[:1], archive_dir)
+    nbytes += tap_retention.archive_entries(Tap, entries[1:], archive_dir)
+    assert nbytes > 0
+
+    archive_path = tap_retention.get_archive_path(archive_dir, Tap, 2018)
+    with gzip.open(archive_path, 'rt') as f:
+        rows = list(csv.DictReader(f))
+    assert [ row['id'] for row in rows ] == ['1', '2']
+    assert rows[1]['priority'] == 'L'
+
+def test_apply_tap_retention_dry_run():
+
+    archive_dir = tempfile.mkdtemp()
+    ntaps = Tap.objects.count()
+
+    report = tap_retention.apply_tap_retention(Tap, archive_dir, keep_days=30,
+                                               max_days=10, dry_run=True)
+
+    assert report['days'] <= 10
+    assert Tap.objects.count() == ntaps
+    assert tap_retention.read_retention_state(archive_dir, Tap) == None
+
+def read_archive_ids(archive_dir):
+
+    with gzip.open(tap_retention.get_archive_path(archive_dir, Tap, 2018), 'rt') as f:
+        return [ int(row['id']) for row in csv.DictReader(f) ]
+
+def test_apply_tap_retention_interrupted(monkeypatch):
+    """Function to verify that entries archived by a run interrupted before
+    they were deleted are not archived again when the run is resumed"""
+
+    archive_dir = tempfile.mkdtemp()
+
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(2, n_entries=0)
+        ts = datetime(2018, 5, 1, 12, 0, 0, tzinfo=pytz.UTC)
+        for event_id in event_ids:
+            for day in range(2):
+                Tap.objects.bulk_create([ Tap(event_id=event_id, priority='L',
+                                              timestamp=ts+timedelta(days=day, hours=h))
+                                          for h in range(3) ])
+
+        def fail(*args, **kwargs):
+            raise RuntimeError('Interrupted')
+
+        refresh_latest_entries = update_db_2.refresh_latest_entries
+        monkeypatch.setattr(update_db_2, 'refresh_latest_entries', fail)
+        with pytest.raises(RuntimeError):
+            tap_retention.apply_tap_retention(Tap, archive_dir, start_date=ts.date())
+        assert Tap.objects.count() == 12
+        assert len(read_archive_ids(archive_dir)) == 4
+
+        # An append cut short is removed before the entries are archived again
+        with open(tap_retention.get_archive_path(archive_dir, Tap, 2018), 'ab') as f:
+            f.write(gzip.compress(b'1,2,3\n')[0:12])
+
+        monkeypatch.setattr(update_db_2, 'refresh_latest_entries', refresh_latest_entries)
+        report = tap_retention.apply_tap_retention(Tap, archive_dir, keep_days=30)
+
+        archived_ids = read_archive_ids(archive_dir)
+        assert report['removed'] == 8
+        assert len(archived_ids) == 8
+        assert len(set(archived_ids)) == 8
+        assert Tap.objects.filter(pk__in=archived_ids).count() == 0
+        assert Tap.objects.count() == 4
+        assert tap_retention.read_pending_archive(archive_dir, Tap) == None
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:02:44 2026
+
+@author: rstreet
+
+Checks that the number of queries made to build the TAP page does not grow
+with the number of events listed on it.
+"""
+
+from os import getcwd, path, remove, environ
+from sys import path as systempath
+cwd = getcwd()
+systempath.append(path.join(cwd,'..'))
+from local_conf import get_conf
+robonet_site = get_conf('robonet_site')
+systempath.append(robonet_site)
+environ.setdefault('DJANGO_SETTINGS_MODULE', 'robonet_site.settings')
+from django import setup
+import pytest
+setup()
+from events.models import Event, EventName
+from events import views
+from scripts import benchmark_utilities, update_db_2
+
+# Queries allowed to build the TAP table: the events with their field and
+# latest TAP entry, and their names
+TAP_QUERY_BUDGET = 2
+
+def test_assert_query_budget():
+
+    with benchmark_utilities.assert_query_budget(1) as queries:
+        Event.objects.count()
+    assert len(queries) == 1
+
+    with pytest.raises(AssertionError):
+        with benchmark_utilities.assert_query_budget(1):
+            Event.objects.count()
+            EventName.objects.count()
+
+def test_tap_rows_query_budget():
+
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(60)
+        update_db_2.refresh_latest_entries()
+
+        for n_monitored in [ 5, 60 ]:
+            Event.objects.filter(pk__in=event_ids[:n_monitored]).update(status='MO')
+
+            with benchmark_utilities.assert_query_budget(TAP_QUERY_BUDGET):
+                rows = views.render_tap_queryset_as_table_rows(views.select_tap_events())
+
+            assert len(rows) == n_monitored
+            omegas = [ row[9] for row in rows ]
+            assert omegas == sorted(omegas, reverse=True)
+
+            event = Event.objects.get(pk=rows[0][1])
+            assert rows[0][2] == [ n.name for n in EventName.objects.filter(event=event) ]
+            assert rows[0][6] == event.latest_tap.priority
@@ -19,9 +19,9 @@ from django.utils import timezone
 from django import setup
 from datetime import datetime, timedelta
 setup()
-import update_db_2, query_db
-from events.models import Field, Event, Tap
-import api_tools
+from scripts import update_db_2, query_db
+from events.models import Field, Event, EventName, Tap, Image, ObsRequest
+from scripts import api_tools, benchmark_utilities
 import pytz
 
 def test_add_request():
@@ -87,7 +87,7 @@ def test_add_datafile_via_api():
             }
             
     (status,message) = update_db_2.add_datafile_via_api(params)
-    print status, message
+    print(status, message)
 
 def test_expire_old_obs():
     """Function to test the function that expires observations from the DB
@@ -137,14 +137,14 @@ def test_add_sub_request():
                                             request_grp_id, request_track_id,
                                             window_start, window_end, 
                                             status, time_executed)
-    print message
+    print(message)
     assert submit_ok == False
     
     (submit_ok, message) = update_db_2.add_sub_request(sr_id,
                                             request_grp_id, request_track_id,
                                             window_start, window_end, 
                                             status, time_executed)
-    print message
+    print(message)
     assert submit_ok == False
     assert 'Subrequest already exists' in message
 
@@ -173,7 +173,7 @@ def test_update_sub_request():
                                             request_grp_id, request_track_id,
                                             window_start, window_end, 
                                             status, time_executed)
-    print message
+    print(message)
     assert submit_ok == True
     assert 'Subrequest updated' in message
 
@@ -186,7 +186,7 @@ def test_update_tap_status():
     
     (submit_ok, message) = update_db_2.update_tap_status(event, priority)
 
-    print submit_ok, message
+    print(submit_ok, message)
     assert submit_ok == True
     assert 'TAP status updated' in message
 
@@ -200,7 +200,7 @@ def test_update_event_status():
     
     (submit_ok, message) = update_db_2.update_event_status(event, status)
 
-    print submit_ok, message
+    print(submit_ok, message)
     assert submit_ok == True
     assert 'event status updated' in message
     
@@ -212,9 +212,211 @@ def test_update_event():
     
     (submit_ok, message) = update_db_2.update_event(event_name, new_params)
 
-    print submit_ok, message
+    print(submit_ok, message)
     assert submit_ok == True
     assert 'updated' in message
+
+def test_update_latest_entry():
+    """Function to verify that the Event pointer to the latest TAP entry
+    is kept up to date as new entries are added"""
+    
+    with benchmark_utilities.synthetic_database():
+        benchmark_utilities.populate_events(1)
+        event_name = 'OGLE-2018-BLG-0001'
+        (event,message) = query_db.get_event_by_name(event_name)
+        
+        timestamp = timezone.now()
+        status = update_db_2.add_tap(event_name, timestamp=timestamp, priority='N', 
+                                     omega=0.0)
+        assert status == True
+        
+        event.refresh_from_db()
+        latest_tap = Tap.objects.filter(event=event).latest('timestamp')
+        assert event.latest_tap_id == latest_tap.pk
+        assert query_db.get_latest_tap_entry(event).pk == latest_tap.pk
+        
+        # An entry older than the latest must not move the pointer:
+        status = update_db_2.add_tap(event_name, timestamp=timestamp-timedelta(days=1), 
+                                     priority='N', omega=0.0)
+        event.refresh_from_db()
+        assert event.latest_tap_id == latest_tap.pk
+        
+        nupdated = update_db_2.refresh_latest_entries(events=Event.objects.filter(pk=event.pk))
+        assert nupdated == 1
+        event.refresh_from_db()
+        assert event.latest_tap_id == latest_tap.pk
+    
+def test_add_taps_bulk():
+    """Function to verify that a list of TAP entries can be added in a 
+    single transaction, with the outcome for each record reported"""
+    
+    with benchmark_utilities.synthetic_database():
+        benchmark_utilities.populate_events(1)
+        event_name = 'OGLE-2018-BLG-0001'
+        timestamp = timezone.now()
+        records = [ {'event_name': event_name, 'timestamp': timestamp, 'omega': 0.0},
+                    {'event_name': event_name, 'timestamp': timestamp, 'omega': 'bad'},
+                    {'event_name': 'UNKNOWN-2017-BLG-0001', 'timestamp': timestamp},
+                    {'timestamp': timestamp} ]
+        
+        outcomes = update_db_2.add_taps_bulk(records)
+        
+        assert len(outcomes) == 4
+        assert outcomes[0] == (True, 'OK')
+        assert outcomes[1][0] == False
+        assert outcomes[2] == (False, 'Event does not exist.')
+        assert outcomes[3] == (False, "Invalid Tap record: 'event_name'")
+        
+        (event,message) = query_db.get_event_by_name(event_name)
+        assert event.latest_tap.timestamp == timestamp
+
+def test_add_events_bulk():
+    """Function to verify that a list of events is cross-matched against
+    the database and against itself, and added with their names"""
+    
+    with benchmark_utilities.synthetic_database():
+        event_ids = benchmark_utilities.populate_events(20)
+        known_event = Event.objects.get(pk=event_ids[0])
+        field_name = known_event.field.name
+        records = [ {'field_name': field_name, 'operator_name': 'OGLE',
+                     'ev_ra': '17:52:39.22', 'ev_dec': '-28:54:02.94',
+                     'event_name': 'OGLE-2018-BLG-1001'},
+                    {'field_name': field_name, 'operator_name': 'OGLE',
+                     'ev_ra': known_event.ev_ra, 'ev_dec': known_event.ev_dec,
+                     'event_name': 'OGLE-2018-BLG-1002'},
+                    {'field_name': field_name, 'operator_name': 'OGLE',
+                     'ev_ra': '17:52:39.25', 'ev_dec': '-28:54:03.00',
+                     'event_name': 'OGLE-2018-BLG-1003'},
+                    {'field_name': field_name, 'operator_name': 'OGLE',
+                     'ev_ra': '17:58:27.51', 'ev_dec': '-29:20:30.38',
+                     'event_name': 'OGLE-2018-BLG-0002'},
+                    {'field_name': field_name, 'operator_name': 'OGLE',
+                     'ev_ra': '17:58:27.51', 'ev_dec': '-29:20:30.38'},
+                    {'field_name': 'ROME-FIELD-99', 'operator_name': 'OGLE',
+                     'ev_ra': '17:59:00.00', 'ev_dec': '-29:00:00.00'},
+                    {'operator_name': 'OGLE', 'ev_ra': '17:59:00.00'} ]
+        
+        with benchmark_utilities.assert_query_budget(8):
+            outcomes = update_db_2.add_events_bulk(records)
+        
+        assert outcomes[0] == (True, '17:52:39.22', '-28:54:02.94', 'OK')
+        assert outcomes[1] == (False, known_event.ev_ra, known_event.ev_dec,
+                               'An event already exists with these coordinates.')
+        assert outcomes[2] == (False, '17:52:39.22', '-28:54:02.94',
+                               'An event already exists with these coordinates.')
+        assert outcomes[3] == (False, '17:58:27.51', '-29:20:30.38',
+                               'This name is already associated with an event.')
+        assert outcomes[4] == (True, '17:58:27.51', '-29:20:30.38', 'OK')
+        assert outcomes[5][0] == False
+        assert outcomes[6] == (False, '17:59:00.00', None,
+                               'Invalid Event record: missing field_name, ev_dec')
+        
+        (event, message) = query_db.get_event_by_name('OGLE-2018-BLG-1001')
+        assert event.ev_ra == '17:52:39.22'
+        assert event.dec_zone != None
+        assert not EventName.objects.filter(name='OGLE-2018-BLG-1002').exists()
+        assert Event.objects.count() == 22
+    
+def test_add_single_lenses_bulk():
+    
+    with benchmark_utilities.synthetic_database():
+        benchmark_utilities.populate_events(1)
+        event_name = 'OGLE-2018-BLG-0001'
+        last_updated = timezone.now() + timedelta(days=1)
+        records = [ {'event_name': event_name, 'Tmax': 8300.0, 'tau': 20.0,
+                     'umin': 0.1, 'last_updated': last_updated},
+                    {'event_name': 'UNKNOWN-2017-BLG-0001', 'Tmax': 2458300.0,
+                     'tau': 20.0, 'umin': 0.1, 'last_updated': last_updated},
+                    {'event_name': event_name, 'tau': 20.0, 'umin': 0.1,
+                     'last_updated': last_updated},
+                    {'Tmax': 2458300.0, 'tau': 20.0, 'umin': 0.1,
+                     'last_updated': last_updated} ]
+        
+        outcomes = update_db_2.add_single_lenses_bulk(records)
+        
+        # A record missing a parameter is rejected alone
+        assert outcomes == [ (True, 'OK'), (False, 'Event does not exist.'),
+                             (False, "Invalid SingleModel record: 'Tmax'"),
+                             (False, "Invalid SingleModel record: 'event_name'") ]
+        (event,message) = query_db.get_event_by_name(event_name)
+        assert event.latest_model.last_updated == last_updated
+        assert float(event.latest_model.Tmax) == 2458300.0
+
+def test_add_images_bulk():
+    
+    with benchmark_utilities.synthetic_database():
+        Field.objects.create(name='ROME-FIELD-01')
+        date_obs = datetime(2017, 4, 18, 3, 0, 0, tzinfo=pytz.UTC)
+        records = [ {'field_name': 'ROME-FIELD-01', 'image_name': 'image1.fits',
+                     'date_obs': date_obs, 'tel': 'lsc'},
+                    {'field_name': 'ROME-FIELD-01', 'image_name': 'image1.fits',
+                     'date_obs': date_obs, 'tel': 'lsc'},
+                    {'field_name': 'ROME-FIELD-99', 'image_name': 'image2.fits',
+                     'date_obs': date_obs},
+                    {'field_name': 'ROME-FIELD-01', 'image_name': 'image3.fits',
+                     'date_obs': date_obs, 'airmass': 'bad'},
+                    {'image_name': 'image4.fits', 'date_obs': date_obs},
+                    {'field_name': 'ROME-FIELD-01', 'date_obs': date_obs} ]
+        
+        outcomes = update_db_2.add_images_bulk(records, skip_existing=True)
+        
+        assert outcomes[0:3] == [ (True, 'OK'), (False, 'Image already in database'),
+                                  (False, 'Unknown field ROME-FIELD-99') ]
+        assert outcomes[3][0] == False
+        assert outcomes[4:6] == [ (False, "Invalid Image record: 'field_name'"),
+                                  (False, "Invalid Image record: 'image_name'") ]
+        assert Image.objects.filter(image_name='image1.fits').count() == 1
+        assert Image.objects.count() == 1
+        
+        outcomes = update_db_2.add_images_bulk(records[0:1], skip_existing=True)
+        assert outcomes == [ (False, 'Image already in database') ]
+
+def test_expire_old_obs_bulk():
+    
+    with benchmark_utilities.synthetic_database():
+        field = Field.objects.create(name='ROME-FIELD-01')
+        now = timezone.now()
+        for (grp_id, time_expire) in [ ('OLD1', now-timedelta(days=1)),
+                                       ('OLD2', now-timedelta(hours=1)),
+                                       ('CURRENT', now+timedelta(days=1)) ]:
+            ObsRequest.objects.create(field=field, grp_id=grp_id, timestamp=now,
+                                      time_expire=time_expire, t_sample=15.0,
+                                      exptime=300, request_status='AC')
+        
+        grp_ids = update_db_2.expire_old_obs_bulk()
+        
+        assert sorted(grp_ids) == ['OLD1', 'OLD2']
+        qs = query_db.get_old_active_obs()
+        assert len(qs) == 0
+        assert ObsRequest.objects.get(grp_id='CURRENT').request_status == 'AC'
+    
+def test_image_stats():
+    """Function to verify that the daily image statistics are kept in step
+    with the Image table as images are added and updated"""
+    
+    with benchmark_utilities.synthetic_database():
+        Field.objects.create(name='ROME-FIELD-01')
+        update_db_2.rebuild_image_stats()
+        
+        image_name = 'lsc1m005-fl15-20170418-0131-e91.fits'
+        date_obs = datetime(2017, 4, 18, 3, 0, 0, tzinfo=pytz.UTC)
+        
+        update_db_2.add_image('ROME-FIELD-01', image_name, date_obs, tel='lsc',
+                              quality='Bad FWHM')
+        assert query_db.get_image_statistics_rollup() == \
+                    {'Accepted': 0, 'Total number of images': 1, 'Bad FWHM': 1}
+        
+        update_db_2.update_image(image_name, date_obs, tel='lsc', quality='')
+        update_db_2.add_images_bulk([ {'field_name': 'ROME-FIELD-01',
+                                       'image_name': 'cpt1m010-fl16-20170418-0010-e91.fits',
+                                       'date_obs': date_obs, 'tel': 'cpt',
+                                       'quality': 'Bad FWHM ; High sky'} ])
+        
+        assert query_db.get_image_statistics_rollup() == \
+                    query_db.get_image_rejection_statistics()
+        assert query_db.get_image_statistics_rollup() == \
+                    {'Accepted': 1, 'Total number of images': 2, 'Bad FWHM': 1,
+                     'High sky': 1}
     
 if __name__ == '__main__':
    
@@ -9,7 +9,8 @@ from os import getcwd, path, remove, environ
 from sys import path as systempath
 cwd = getcwd()
 systempath.append(path.join(cwd,'..'))
-import utilities
+from scripts import utilities
+import pytest
 
 def test_coord_convert():
     """Function to test the coordinate utility functions"""
@@ -25,4 +26,25 @@ def test_coord_convert():
     
     (test_ra_str, test_dec_str) = utilities.decdeg2sex(ra_deg,dec_deg)
     assert test_ra_str == ra_str
-    assert test_dec_str == dec_str
\ No newline at end of file
+    assert test_dec_str == dec_str
+def test_short_to_long_name():
+    """Function to test the conversion of ARTEMiS short-hand event names"""
+    
+    assert utilities.short_to_long_name('OB180001') == 'OGLE-2018-BLG-0001'
+    assert utilities.short_to_long_name('KB180123') == 'MOA-2018-BLG-0123'
+    assert utilities.short_to_long_name('KM180045') == 'KMT-2018-BLG-0045'
+    assert utilities.short_to_long_name('KMT-2018-BLG-0045') == 'KMT-2018-BLG-0045'
+
+def test_coords_to_degrees():
+    """Function to test the conversion of coordinates given in either format"""
+    
+    (ra_deg, dec_deg) = utilities.coords_to_degrees('17:23:24.5', '-30:23:24.5')
+    assert (ra_deg, dec_deg) == utilities.sex2decdeg('17:23:24.5', '-30:23:24.5')
+    
+    assert utilities.coords_to_degrees('17:23:24.5', '-00:30:00')[1] == -0.5
+    assert utilities.coords_to_degrees('260.85', '-30.39') == (260.85, -30.39)
+    
+    for (ra, dec) in [ ('17:23', '-30:23:24.5'), ('17:23:24.5', '-30:xx:24.5'),
+                       ('foo', '-30.39') ]:
+        with pytest.raises(ValueError):
+            utilities.coords_to_degrees(ra, dec)
@@ -18,13 +18,21 @@ from django.conf import settings
 from django.utils import timezone
 from django import setup
 from datetime import datetime, timedelta
-from decimal import InvalidOperation
+from decimal import Decimal, InvalidOperation
+from django.db import transaction
+from django.core.exceptions import ValidationError
+from django.db.models import OuterRef, Subquery, F, Count
+from django.db.models.functions import TruncDate
 setup()
 
 from events.models import Field, Operator, Telescope, Instrument, Filter, Event, EventName, SingleModel, BinaryModel
 from events.models import EventReduction, ObsRequest, EventStatus, DataFile, Tap, TapLima, Image, SubObsRequest
+from events.models import ImageStats
+from events.models import set_event_sky_position
 from . import api_tools, query_db, rea_obs
 import pytz
+import numpy as np
+import copy
 
 ##################################################################################
 def add_operator(operator_name):
@@ -295,13 +303,11 @@ def check_exists(event_name):
    event_name -- The event name
                  (string, required)
    """
-   successful = EventName.objects.filter(name=event_name).exists()
+   successful = (query_db.resolve_event_id(event_name) != None)
    return successful
 
 ###################################################################################
 def coords_exist(check_ra, check_dec):
-    from astropy import units as u
-    from astropy.coordinates import SkyCoord
     """
     Cross-survey identification check.
     Check if an event at these coordinates already exists in the database.
@@ -315,44 +321,68 @@ def coords_exist(check_ra, check_dec):
         	   e.g. "-30:31:02.02"
     """
     ra, dec = check_ra, check_dec
-    # Find, if they exist, a sublist of known events in that vicinity
-    # If an exception arises, use all known events
-    try:
-        known_events = Event.objects.filter(ev_ra__contains=check_ra[0:5]).filter(ev_dec__contains=check_dec[0:5])
-    except:
-        known_events = Event.objects.all()
     successful = False
-    # If there are no known events
-    if not known_events:
-        successful = False
-    else:
-        new_coords = SkyCoord(check_ra+' '+check_dec, unit=(u.hourangle, u.deg),
-                            frame='icrs')
-        match_found = False
-        for event in known_events:
-            known_coords = SkyCoord(event.ev_ra+' '+event.ev_dec,
-	                         unit=(u.hourangle, u.deg),frame='icrs')
-            # Calculate separation in arcsec
-            separation = new_coords.separation(known_coords).arcsec
-            if separation < 2.5:
-                match_found = True
-                successful = True
-                #f = open('./matches.txt','a')
-                #f.write('Coordinates '+check_ra+' '+check_dec+' match known object at '+event.ev_ra+' '+event.ev_dec)
-                #print 'Found matching object at: '+event.ev_ra+' '+event.ev_dec
-                matching_event = Event.objects.filter(ev_ra=event.ev_ra).filter(ev_dec=event.ev_dec)[0]
-                known_names = EventName.objects.filter(event=event)
-                #f.write(' with event name(s): ')
-                #print 'with event name(s):'
-                #for n in known_names:
-                #   f.write(n.name)
-                #   print n.name
-                #f.write('\n')
-                #f.close()
-                ra, dec = event.ev_ra, event.ev_dec
-                break
+    # Find, if they exist, known events within 2.5 arcsec, nearest first
+    (known_events, separations) = query_db.cone_search(check_ra, check_dec, 2.5)
+    if len(known_events) > 0:
+        successful = True
+        ra, dec = known_events[0].ev_ra, known_events[0].ev_dec
     return successful, ra, dec
 
+###################################################################################
+# Event pointer fields maintained for the most recent entry in each table,
+# with the model and the field which defines "most recent"
+LATEST_ENTRY_POINTERS = {
+    'latest_model': (SingleModel, 'last_updated'),
+    'latest_datafile': (DataFile, 'last_upd'),
+    'latest_tap': (Tap, 'timestamp'),
+    'latest_status': (EventStatus, 'timestamp'),
+    }
+
+def latest_entry_subquery(pointer):
+    """Return a Subquery selecting the pk of the most recent entry of the
+    type referenced by pointer for the Event in the outer query"""
+    (model, order_field) = LATEST_ENTRY_POINTERS[pointer]
+    qs = model.objects.filter(event=OuterRef('pk')).order_by('-'+order_field, '-pk')
+    return Subquery(qs.values('pk')[:1])
+
+def update_latest_entry(event, pointer):
+    """
+    Point one of an Event's latest_* foreign keys at the most recent entry
+    in the corresponding table.  Should be called within the same
+    transaction as the change to that table.
+
+    Keyword arguments:
+    event -- The Event object (object, required)
+    pointer -- Name of the pointer field, one of 'latest_model',
+               'latest_datafile', 'latest_tap', 'latest_status'
+               (string, required)
+    """
+    Event.objects.filter(pk=event.pk).update(**{pointer: latest_entry_subquery(pointer)})
+    event.refresh_from_db(fields=[pointer])
+
+def refresh_latest_entries(events=None, pointers=None):
+    """
+    Recompute the latest_* pointers for a set of Events, one UPDATE
+    statement per pointer.
+
+    Keyword arguments:
+    events -- Events to update (QuerySet, optional, default=all Events)
+    pointers -- Pointer fields to update (list, optional, default=all)
+
+    Returns the number of Events updated.
+    """
+    if events == None:
+        events = Event.objects.all()
+    if pointers == None:
+        pointers = list(LATEST_ENTRY_POINTERS.keys())
+    updates = {}
+    for pointer in pointers:
+        updates[pointer] = latest_entry_subquery(pointer)
+    with transaction.atomic():
+        nupdated = events.update(**updates)
+    return nupdated
+
 ###################################################################################
 def add_single_lens(event_name, Tmax, tau, umin, last_updated,
             e_Tmax=None, e_tau=None, e_umin=None,
@@ -400,20 +430,20 @@ def add_single_lens(event_name, Tmax, tau, umin, last_updated,
                 (float, optional, default=None)
     """
 
-    if check_exists(event_name)==True:
-        # Get event identifier
-        event_id = EventName.objects.get(name=event_name).event_id
-        event = Event.objects.get(id=event_id)
-    # Ensure that Tmax is given in full, e.g.2457135.422, not 7135.422
-    if Tmax < 2450000.0:
-        Tmax = Tmax + 2450000.0
+    (event, report) = query_db.get_event_by_name(event_name)
+    if event != None:
+        # Ensure that Tmax is given in full, e.g.2457135.422, not 7135.422
+        if Tmax < 2450000.0:
+            Tmax = Tmax + 2450000.0
         # Try adding single lens parameters in the database.
-        add_new = SingleModel(event=event, Tmax=Tmax, e_Tmax=e_Tmax, tau=tau,
+        with transaction.atomic():
+            add_new = SingleModel(event=event, Tmax=Tmax, e_Tmax=e_Tmax, tau=tau,
         		      e_tau=e_tau, umin=umin, e_umin=e_umin, rho=rho,
         		      e_rho=e_rho, pi_e_n=pi_e_n, e_pi_e_n=e_pi_e_n,
         		      pi_e_e=pi_e_e, e_pi_e_e=e_pi_e_e, modeler=modeler,
         		      last_updated=last_updated, tap_omega=tap_omega, chi_sq=chi_sq)
-        add_new.save()
+            add_new.save()
+            update_latest_entry(event, 'latest_model')
         successful = True
         response = 'OK'
     else:
@@ -490,10 +520,8 @@ def add_binary_lens(event_name, Tmax, tau, umin, last_updated, mass_ratio, separ
     """
 
     # Try adding binary lens parameters to database
-    if check_exists(event_name)==True:
-        # Get event identifier
-        event_id = EventName.objects.get(name=event_name).event_id
-        event = Event.objects.get(id=event_id)
+    (event, report) = query_db.get_event_by_name(event_name)
+    if event != None:
         # Ensure that Tmax is given in full, e.g.2457135.422, not 7135.422
         if Tmax < 2450000.0:
             Tmax = Tmax + 2450000.0
@@ -678,10 +706,8 @@ def add_reduction(event_name, lc_file, timestamp, ref_image, target_found=False,
    diffpro -- Switch for the method of difference image creation.
                   (integer, optional, default=0 (No))
    """
-   if check_exists(event_name)==True:
-      # Get event identifier
-      event_id = EventName.objects.get(name=event_name).event_id
-      event = Event.objects.get(id=event_id)
+   (event, report) = query_db.get_event_by_name(event_name)
+   if event != None:
       try:
          add_new = EventReduction(event=event, lc_file=lc_file,
                            timestamp=timestamp, target_found=target_found, ref_image=ref_image,
@@ -880,7 +906,7 @@ def update_sub_request(sr_id,request_grp_id, request_track_id,
 
                 sr.window_start = window_start
                 sr.window_end = window_end
-                sr.state = status
+                sr.status = status
 
                 if time_executed != None:
 
@@ -1035,11 +1061,9 @@ def update_event(event_name, params):
     Only supports the parameters ra, dec and ibase.
     """
 
-    qs = EventName.objects.filter(name=event_name)
-
-    if len(qs) > 0:
+    (event, report) = query_db.get_event_by_name(event_name)
 
-        event = qs[0].event
+    if event != None:
 
         set_keys = ''
 
@@ -1092,16 +1116,16 @@ def add_status(event_name, timestamp=timezone.now(), status='NF', comment='',
     rec_telclass -- Recommended telescope class.
     (string, optional, default='')
     """
-    if check_exists(event_name)==True:
-        # Get event identifier
-        event_id = EventName.objects.get(name=event_name).event_id
-        event = Event.objects.get(id=event_id)
+    (event, report) = query_db.get_event_by_name(event_name)
+    if event != None:
         try:
-            add_new = EventStatus(event=event, timestamp=timestamp, status=status,
-            comment=comment, updated_by=updated_by, rec_cad=rec_cad,
-            rec_texp=rec_texp, rec_nexp=rec_nexp,
-            rec_telclass=rec_telclass)
-            add_new.save()
+            with transaction.atomic():
+                add_new = EventStatus(event=event, timestamp=timestamp, status=status,
+                comment=comment, updated_by=updated_by, rec_cad=rec_cad,
+                rec_texp=rec_texp, rec_nexp=rec_nexp,
+                rec_telclass=rec_telclass)
+                add_new.save()
+                update_latest_entry(event, 'latest_status')
             successful = True
         except:
             successful = False
@@ -1141,16 +1165,16 @@ def add_datafile(event_name, datafile, last_upd, last_hjd, last_mag, tel, ndata,
     """
     # Check if the event already exists in the database.
     message = 'OK'
-    if check_exists(event_name)==True:
-        # Get event identifier
-        event_id = EventName.objects.get(name=event_name).event_id
-        event = Event.objects.get(id=event_id)
+    (event, report) = query_db.get_event_by_name(event_name)
+    if event != None:
         try:
-            add_new = DataFile(event=event, datafile=datafile, last_upd=last_upd,
-                               last_hjd=last_hjd, last_mag=last_mag, tel=tel,
-                               inst=inst, filt=filt, baseline=baseline,
-                               g=g, ndata=ndata)
-            add_new.save()
+            with transaction.atomic():
+                add_new = DataFile(event=event, datafile=datafile, last_upd=last_upd,
+                                   last_hjd=last_hjd, last_mag=last_mag, tel=tel,
+                                   inst=inst, filt=filt, baseline=baseline,
+                                   g=g, ndata=ndata)
+                add_new.save()
+                update_latest_entry(event, 'latest_datafile')
             successful = True
             message = 'OK'
         except:
@@ -1184,9 +1208,8 @@ def add_datafile_via_api(params):
     status = True
     message = 'DBREPLY: OK'
 
-    if check_exists(params['event_name'])==True:
-        event_id = EventName.objects.get(name=params['event_name']).event_id
-        event = Event.objects.get(id=event_id)
+    (event, report) = query_db.get_event_by_name(params['event_name'])
+    if event != None:
 
         if type(params['last_upd']) == type('foo'):
             last_upd = datetime.strptime(params['last_upd'],"%Y-%m-%dT%H:%M:%S")
@@ -1207,15 +1230,17 @@ def add_datafile_via_api(params):
                 message = 'DBREPLY: DB entry for this data file is up to date'
             else:
                 try:
-                    file_entry.last_upd = last_upd
-                    file_entry.last_hjd = float(params['last_hjd'])
-                    file_entry.last_mag = float(params['last_mag'])
-                    file_entry.tel=params['tel']
-                    file_entry.filt=params['filt']
-                    file_entry.baseline=float(params['baseline'])
-                    file_entry.g=float(params['g'])
-                    file_entry.ndata=int(params['ndata'])
-                    file_entry.save()
+                    with transaction.atomic():
+                        file_entry.last_upd = last_upd
+                        file_entry.last_hjd = float(params['last_hjd'])
+                        file_entry.last_mag = float(params['last_mag'])
+                        file_entry.tel=params['tel']
+                        file_entry.filt=params['filt']
+                        file_entry.baseline=float(params['baseline'])
+                        file_entry.g=float(params['g'])
+                        file_entry.ndata=int(params['ndata'])
+                        file_entry.save()
+                        update_latest_entry(file_entry.event, 'latest_datafile')
                     status = True
                     message = 'DBREPLY: Updated database entry'
                 except InvalidOperation:
@@ -1226,7 +1251,8 @@ def add_datafile_via_api(params):
                     status = False
         else:
             try:
-                (new_file,result) = DataFile.objects.get_or_create(event=event,
+                with transaction.atomic():
+                    (new_file,result) = DataFile.objects.get_or_create(event=event,
                             datafile=params['datafile'],
                             last_upd=last_upd,
                             last_hjd=params['last_hjd'],
@@ -1235,6 +1261,7 @@ def add_datafile_via_api(params):
                             filt=params['filt'],
                             baseline=float(params['baseline']),
                             g=float(params['g']), ndata=int(params['ndata']))
+                    update_latest_entry(event, 'latest_datafile')
                 status = True
                 message = 'DBREPLY: Created new database entry'
 
@@ -1298,16 +1325,16 @@ def add_tap(event_name, timestamp=timezone.now(), priority='N', tsamp=0, texp=0,
     (float, optional, default='1.0')
     """
     # Check if the event already exists in the database.
-    if check_exists(event_name)==True:
-        # Get event identifier
-        event_id = EventName.objects.get(name=event_name).event_id
-        event = Event.objects.get(id=event_id)
+    (event, report) = query_db.get_event_by_name(event_name)
+    if event != None:
         try:
-            add_new = Tap(event=event, timestamp=timestamp, priority=priority, tsamp=tsamp,
-            texp=texp, nexp=nexp, telclass=telclass, imag=imag, omega=omega,
-            err_omega=err_omega, peak_omega=peak_omega, blended=blended,
-            visibility=visibility, cost1m=cost1m, passband=passband, ipp=ipp)
-            add_new.save()
+            with transaction.atomic():
+                add_new = Tap(event=event, timestamp=timestamp, priority=priority, tsamp=tsamp,
+                texp=texp, nexp=nexp, telclass=telclass, imag=imag, omega=omega,
+                err_omega=err_omega, peak_omega=peak_omega, blended=blended,
+                visibility=visibility, cost1m=cost1m, passband=passband, ipp=ipp)
+                add_new.save()
+                update_latest_entry(event, 'latest_tap')
             successful = True
         except:
             successful = False
@@ -1363,10 +1390,8 @@ def add_taplima(event_name, timestamp=timezone.now(), priority='N', tsamp=0, tex
     (float, optional, default='1.0')
     """
     # Check if the event already exists in the database.
-    if check_exists(event_name)==True:
-        # Get event identifier
-        event_id = EventName.objects.get(name=event_name).event_id
-        event = Event.objects.get(id=event_id)
+    (event, report) = query_db.get_event_by_name(event_name)
+    if event != None:
         try:
             add_new = TapLima(event=event, timestamp=timestamp, priority=priority, tsamp=tsamp,
             texp=texp, nexp=nexp, telclass=telclass, imag=imag, omega=omega,
@@ -1452,7 +1477,10 @@ def add_image(field_name, image_name, date_obs, timestamp=timezone.now(), tel=''
                         moon_sep=moon_sep, moon_phase=moon_phase, moon_up=moon_up, elongation=elongation,
                         nstars=nstars, ztemp=ztemp, shift_x=shift_x, shift_y=shift_y, quality=quality)
 
-        add_new.save()
+        with transaction.atomic():
+            old_key = get_latest_image_stats_keys([image_name]).get(image_name)
+            add_new.save()
+            update_image_stats(old_key, get_image_stats_key(date_obs, tel, quality))
 
         successful = True
 
@@ -1527,6 +1555,7 @@ def update_image(image_name, date_obs, timestamp=timezone.now(),
     qs = Image.objects.filter(image_name=image_name)
     if len(qs) > 0:
         image = qs[0]
+        old_key = get_latest_image_stats_keys([image_name]).get(image_name)
         image.date_obs = date_obs
         image.timestamp = timestamp
         image.tel = tel
@@ -1562,11 +1591,94 @@ def update_image(image_name, date_obs, timestamp=timezone.now(),
         if quality != None:
             image.quality = quality
 
-        image.save()
+        with transaction.atomic():
+            image.save()
+            update_image_stats(old_key, get_image_stats_key(image.date_obs, image.tel,
+                                                            image.quality))
         return True
     else:
         return False
 
+def get_image_stats_key(date_obs, tel, quality):
+    """
+    Return the (night, tel, quality) key of the ImageStats entry counting
+    an image with the given parameters.
+
+    Keyword arguments:
+    date_obs -- The date of observation (datetime or string, required)
+    tel -- Telescope where the image was taken (string, required)
+    quality -- Image quality description (string, required)
+    """
+    date_obs = Image._meta.get_field('date_obs').to_python(date_obs)
+    if timezone.is_naive(date_obs):
+        date_obs = timezone.make_aware(date_obs, pytz.UTC)
+    return (date_obs.astimezone(pytz.UTC).date(), tel or '', quality or '')
+
+def get_latest_image_stats_keys(image_names):
+    """
+    Return a dictionary of the ImageStats keys of the most recent entries
+    for those of the image names given which are already in the database.
+
+    Keyword arguments:
+    image_names -- Names of images (list, required)
+    """
+    keys = {}
+    qs = Image.objects.filter(image_name__in=image_names).order_by('timestamp','pk')
+    for (image_name, date_obs, tel, quality) in qs.values_list('image_name','date_obs',
+                                                               'tel','quality'):
+        keys[image_name] = get_image_stats_key(date_obs, tel, quality)
+    return keys
+
+def update_image_stats(old_key=None, new_key=None, deltas=None):
+    """
+    Update the daily ImageStats counts for an image that has been added,
+    or whose entry has changed from old_key to new_key.  Several changes
+    can be applied at once as a dictionary of count changes keyed by
+    ImageStats key.  Should be called within the same transaction as the
+    change to the Image table.
+
+    Keyword arguments:
+    old_key -- (night, tel, quality) key the image was counted under
+               (tuple, optional, default=None)
+    new_key -- (night, tel, quality) key the image is now counted under
+               (tuple, optional, default=None)
+    deltas -- Count changes keyed by ImageStats key (dict, optional)
+    """
+    if deltas == None:
+        deltas = {}
+    if old_key != None:
+        deltas[old_key] = deltas.get(old_key, 0) - 1
+    if new_key != None:
+        deltas[new_key] = deltas.get(new_key, 0) + 1
+
+    for (key, delta) in deltas.items():
+        if delta == 0:
+            continue
+        (night, tel, quality) = key
+        nupdated = ImageStats.objects.filter(night=night, tel=tel, quality=quality
+                                             ).update(n_images=F('n_images')+delta)
+        if nupdated == 0:
+            ImageStats.objects.create(night=night, tel=tel, quality=quality,
+                                      n_images=delta)
+
+def rebuild_image_stats():
+    """
+    Recompute all of the daily ImageStats counts from the Image table.
+    Returns the number of ImageStats entries created.
+    """
+    qs = query_db.select_latest_images().annotate(
+                night=TruncDate('date_obs', tzinfo=pytz.UTC)
+                ).values('night','tel','quality').annotate(n=Count('pk')).order_by()
+
+    entries = [ ImageStats(night=row['night'], tel=row['tel'], quality=row['quality'],
+                           n_images=row['n']) for row in qs ]
+
+    with transaction.atomic():
+        ImageStats.objects.all().delete()
+        ImageStats.objects.bulk_create(entries, batch_size=500)
+
+    return len(entries)
+
 
 ###################################################################################
 def expire_old_obs(log=None):
@@ -1587,6 +1699,510 @@ def expire_old_obs(log=None):
             log.info(' -> Expired '+obs.grp_id+' expiry date='+\
                     obs.time_expire.strftime('%Y-%m-%dT%H:%M:%S'))
 
+###################################################################################
+# Bulk writers
+#
+# Each of these accepts a list of records, as dictionaries whose keys match
+# the keyword arguments of the corresponding single-entry function, and
+# returns a list of outcomes in the same order as the records.  Foreign keys
+# are resolved for the whole list at once and the accepted records are
+# written with a single bulk_create inside one transaction.  Note that
+# bulk_create does not send pre_save/post_save signals.
+
+def get_event_ids_by_name(event_names):
+    """
+    Return a dictionary of Event primary keys keyed by event name, for those
+    of the names given which are known to the database.  Missing names,
+    given as None, are ignored.
+
+    Keyword arguments:
+    event_names -- Event names, e.g. "OGLE-2016-BLG-1234" (list, required)
+    """
+    return query_db.event_name_resolver.get_event_ids([ name for name in event_names
+                                                        if name != None ])
+
+def clean_record(entry):
+    """
+    Convert and validate the field values of an unsaved model instance,
+    without querying the database, so that a bad record can be rejected
+    before a bulk write instead of failing the whole batch.
+    Raises ValidationError.
+
+    Keyword arguments:
+    entry -- Unsaved model instance (object, required)
+    """
+    for f in entry._meta.concrete_fields:
+        if f.primary_key or f.is_relation:
+            continue
+        value = getattr(entry, f.attname)
+        if value in f.empty_values:
+            continue
+        value = f.to_python(value)
+        # Decimals are rounded to the field precision on save, as for save()
+        if isinstance(value, Decimal) and hasattr(f, 'decimal_places'):
+            value = value.quantize(Decimal(1).scaleb(-f.decimal_places))
+        f.run_validators(value)
+        setattr(entry, f.attname, value)
+
+def build_bulk_entries(model, records, make_entry):
+    """
+    Build and validate model instances for a list of records.
+
+    Keyword arguments:
+    model -- Model class being written (class, required)
+    records -- Dictionaries of entry parameters (list, required)
+    make_entry -- Function taking a record and returning either a model
+                  instance or a string explaining why the record was
+                  rejected (function, required)
+
+    Returns the list of valid instances and the list of (successful, message)
+    outcomes for every record.
+    """
+    entries = []
+    outcomes = []
+    for record in records:
+        try:
+            entry = make_entry(dict(record))
+            if type(entry) == type('foo'):
+                outcomes.append( (False, entry) )
+                continue
+            clean_record(entry)
+        except (KeyError, TypeError, ValueError, ValidationError) as err:
+            outcomes.append( (False, 'Invalid '+model.__name__+' record: '+str(err)) )
+            continue
+        entries.append(entry)
+        outcomes.append( (True, 'OK') )
+    return entries, outcomes
+
+def add_events_bulk(records):
+    """
+    Add a list of new events to the database, with their names.  The
+    records are cross-matched together against the events already in the
+    database, and each against the preceding records in the list, using the
+    same 2.5 arcsec radius as coords_exist.  The events and their names are
+    written in one transaction.
+
+    Keyword arguments:
+    records -- Dictionaries with the keyword arguments of add_event:
+               field_name, operator_name, ev_ra, ev_dec and optionally
+               status, anomaly_rank, year, ra_deg, dec_deg, ibase, and the
+               event_name given by the operator, which is added as by
+               add_event_name (list, required)
+
+    Returns a list of (successful, ev_ra, ev_dec, response) tuples, as
+    returned by add_event, one per record.
+    """
+    field_names = set([ r.get('field_name') for r in records ])
+    fields = { f.name: f for f in Field.objects.filter(name__in=field_names) }
+    operator_names = set([ r.get('operator_name') for r in records ])
+    operators = { o.name: o for o in Operator.objects.filter(name__in=operator_names) }
+    event_names = [ r['event_name'] for r in records if r.get('event_name') != None ]
+    known_names = set(EventName.objects.filter(name__in=event_names
+                                               ).values_list('name', flat=True))
+
+    outcomes = [ None ] * len(records)
+    candidates = []
+    for (i, record) in enumerate(records):
+        params = {'status': 'NF', 'anomaly_rank': -1.0,
+                  'year': str(datetime.now().year),
+                  'ra_deg': None, 'dec_deg': None, 'ibase': None,
+                  'event_name': None}
+        params.update(record)
+        (ev_ra, ev_dec) = (params.get('ev_ra'), params.get('ev_dec'))
+
+        missing = [ key for key in ['field_name', 'operator_name', 'ev_ra', 'ev_dec']
+                    if key not in params ]
+        if len(missing) > 0:
+            outcomes[i] = (False, ev_ra, ev_dec, 'Invalid Event record: missing '+\
+                           ', '.join(missing))
+            continue
+        if params['field_name'] not in fields:
+            outcomes[i] = (False, ev_ra, ev_dec, 'Unknown Field: '+str(params['field_name']))
+            continue
+        if params['operator_name'] not in operators:
+            outcomes[i] = (False, ev_ra, ev_dec, 'Unknown Operator: '+str(params['operator_name']))
+            continue
+        if params['event_name'] in known_names:
+            outcomes[i] = (False, ev_ra, ev_dec, 'This name is already associated with an event.')
+            continue
+
+        try:
+            event = Event(field=fields[params['field_name']],
+                          operator=operators[params['operator_name']],
+                          ev_ra=ev_ra, ev_dec=ev_dec,
+                          ra=params['ra_deg'], dec=params['dec_deg'],
+                          status=params['status'],
+                          anomaly_rank=params['anomaly_rank'],
+                          year=params['year'], ibase=params['ibase'])
+            set_event_sky_position(Event, instance=event)
+            clean_record(event)
+            if event.ra == None or event.dec == None:
+                raise ValueError('No position for event')
+        except (TypeError, ValueError, ValidationError):
+            outcomes[i] = (False, ev_ra, ev_dec, 'Failed to add new event.')
+            continue
+
+        candidates.append( (i, event, params['event_name']) )
+
+    matches = query_db.crossmatch_positions([ float(c[1].ra) for c in candidates ],
+                                            [ float(c[1].dec) for c in candidates ], 2.5)
+    known_events = Event.objects.in_bulk(set([ m[0][0] for m in matches if len(m) > 0 ]))
+
+    new_events = []
+    new_coords = []
+    new_names = []
+    for ((i, event, event_name), match) in zip(candidates, matches):
+        (ev_ra, ev_dec) = (event.ev_ra, event.ev_dec)
+
+        if len(match) > 0:
+            known_event = known_events[match[0][0]]
+            outcomes[i] = (False, known_event.ev_ra, known_event.ev_dec,
+                           'An event already exists with these coordinates.')
+            continue
+
+        if len(new_events) > 0:
+            (ra, dec) = (np.radians(float(event.ra)), np.radians(float(event.dec)))
+            coords = np.radians(np.array(new_coords))
+            a = np.sin((coords[:,1] - dec)/2.0)**2 + \
+                np.cos(dec) * np.cos(coords[:,1]) * np.sin((coords[:,0] - ra)/2.0)**2
+            seps = np.degrees(2.0 * np.arcsin(np.sqrt(np.clip(a,0.0,1.0)))) * 3600.0
+            if seps.min() < 2.5:
+                match = new_events[int(seps.argmin())]
+                outcomes[i] = (False, match.ev_ra, match.ev_dec,
+                               'An event already exists with these coordinates.')
+                continue
+
+        if event_name != None:
+            if event_name in new_names:
+                outcomes[i] = (False, ev_ra, ev_dec,
+                               'This name is already associated with an event.')
+                continue
+            new_names.append(event_name)
+        else:
+            new_names.append(None)
+
+        new_events.append(event)
+        new_coords.append( (float(event.ra), float(event.dec)) )
+        outcomes[i] = (True, ev_ra, ev_dec, 'OK')
+
+    with transaction.atomic():
+        Event.objects.bulk_create(new_events)
+        EventName.objects.bulk_create([ EventName(event=event, operator=event.operator,
+                                                  name=event_name)
+                                        for (event, event_name) in zip(new_events, new_names)
+                                        if event_name != None ])
+
+    return outcomes
+
+def add_single_lenses_bulk(records):
+    """
+    Add a list of Single Lens models to the database.
+
+    Keyword arguments:
+    records -- Dictionaries with the keyword arguments of add_single_lens,
+               including event_name, Tmax, tau, umin and last_updated
+               (list, required)
+
+    Returns a list of (successful, response) tuples, one per record.
+    """
+    event_ids = get_event_ids_by_name([ r.get('event_name') for r in records ])
+
+    def make_entry(params):
+        event_name = params.pop('event_name')
+        if event_name not in event_ids:
+            return 'Event does not exist.'
+        # Ensure that Tmax is given in full, e.g.2457135.422, not 7135.422
+        if float(params['Tmax']) < 2450000.0:
+            params['Tmax'] = float(params['Tmax']) + 2450000.0
+        return SingleModel(event_id=event_ids[event_name], **params)
+
+    (entries, outcomes) = build_bulk_entries(SingleModel, records, make_entry)
+
+    with transaction.atomic():
+        SingleModel.objects.bulk_create(entries)
+        refresh_latest_entries(events=Event.objects.filter(pk__in=set([ e.event_id for e in entries ])),
+                               pointers=['latest_model'])
+
+    return outcomes
+
+def add_taps_bulk(records):
+    """
+    Add a list of TAP entries to the database.
+
+    Keyword arguments:
+    records -- Dictionaries with the keyword arguments of add_tap,
+               including event_name.  Parameters which are not given take
+               the add_tap defaults, except that timestamp defaults to the
+               time of this call (list, required)
+
+    Returns a list of (successful, response) tuples, one per record.
+    """
+    event_ids = get_event_ids_by_name([ r.get('event_name') for r in records ])
+    now = timezone.now()
+
+    def make_entry(params):
+        event_name = params.pop('event_name')
+        if event_name not in event_ids:
+            return 'Event does not exist.'
+        entry_params = {'timestamp': now, 'priority': 'N', 'tsamp': 0, 'texp': 0,
+                        'nexp': 1, 'telclass': '1m', 'imag': 22.0, 'blended': False,
+                        'passband': 'SDSS-i', 'ipp': 1.0}
+        entry_params.update(params)
+        return Tap(event_id=event_ids[event_name], **entry_params)
+
+    (entries, outcomes) = build_bulk_entries(Tap, records, make_entry)
+
+    with transaction.atomic():
+        Tap.objects.bulk_create(entries)
+        refresh_latest_entries(events=Event.objects.filter(pk__in=set([ e.event_id for e in entries ])),
+                               pointers=['latest_tap'])
+
+    return outcomes
+
+def add_images_bulk(records, skip_existing=False):
+    """
+    Add a list of images to the database.
+
+    Keyword arguments:
+    records -- Dictionaries with the keyword arguments of add_image,
+               including field_name, image_name and date_obs.  timestamp
+               defaults to the time of this call (list, required)
+    skip_existing -- Do not add images whose image_name is already
+               in the database (boolean, optional, default=False)
+
+    Returns a list of (successful, response) tuples, one per record.
+    """
+    field_names = set([ r.get('field_name') for r in records ])
+    field_ids = { f.name: f.pk for f in Field.objects.filter(name__in=field_names) }
+    if skip_existing:
+        known_images = set(Image.objects.filter(image_name__in=[ r.get('image_name') for r in records ]
+                                                ).values_list('image_name', flat=True))
+    else:
+        known_images = set()
+    now = timezone.now()
+
+    def make_entry(params):
+        field_name = params.pop('field_name')
+        if field_name not in field_ids:
+            return 'Unknown field '+str(field_name)
+        if params['image_name'] in known_images:
+            return 'Image already in database'
+        if skip_existing:
+            known_images.add(params['image_name'])
+        entry_params = {'timestamp': now}
+        entry_params.update(params)
+        return Image(field_id=field_ids[field_name], **entry_params)
+
+    (entries, outcomes) = build_bulk_entries(Image, records, make_entry)
+
+    with transaction.atomic():
+        latest_keys = get_latest_image_stats_keys([ e.image_name for e in entries ])
+        Image.objects.bulk_create(entries)
+
+        deltas = {}
+        for entry in entries:
+            new_key = get_image_stats_key(entry.date_obs, entry.tel, entry.quality)
+            old_key = latest_keys.get(entry.image_name)
+            if old_key != None:
+                deltas[old_key] = deltas.get(old_key, 0) - 1
+            deltas[new_key] = deltas.get(new_key, 0) + 1
+            latest_keys[entry.image_name] = new_key
+        update_image_stats(deltas=deltas)
+
+    return outcomes
+
+# Parameters of update_image which are always set, with their defaults, and
+# those which are only set if given
+IMAGE_UPDATE_DEFAULTS = {'tel': '', 'inst': '', 'filt': '', 'grp_id': '',
+                         'track_id': '', 'req_id': '', 'moon_up': False,
+                         'quality': ''}
+IMAGE_UPDATE_OPTIONAL = ['airmass', 'avg_fwhm', 'avg_sky', 'avg_sigsky',
+                         'moon_sep', 'moon_phase', 'elongation', 'nstars',
+                         'ztemp', 'shift_x', 'shift_y']
+
+def upsert_images_bulk(records):
+    """
+    Add a list of images to the database, updating the entries of those
+    already in it, as record_image does for a single image.  Records are
+    applied in order, so a later record for an image updates the entry of
+    an earlier one.
+
+    Keyword arguments:
+    records -- Dictionaries with the keyword arguments of add_image,
+               including field_name, image_name and date_obs.  Images
+               already in the database are updated as by update_image,
+               with the time of this call as their timestamp; new images'
+               timestamp defaults to the same (list, required)
+
+    Returns a list of (successful, response) tuples, one per record.
+    """
+    image_names = [ r.get('image_name') for r in records ]
+    field_names = set([ r.get('field_name') for r in records ])
+    field_ids = { f.name: f.pk for f in Field.objects.filter(name__in=field_names) }
+
+    # The entry updated for an image already in the database, as update_image
+    # updates the first entry found
+    known = {}
+    for image in Image.objects.filter(image_name__in=image_names).order_by('pk'):
+        known.setdefault(image.image_name, image)
+
+    current_keys = get_latest_image_stats_keys(image_names)
+    now = timezone.now()
+
+    new_entries = {}
+    updated_entries = {}
+    deltas = {}
+    outcomes = []
+    for record in records:
+        params = dict(record)
+        try:
+            image_name = params['image_name']
+            field_name = params.pop('field_name', None)
+
+            if image_name in new_entries or image_name in known:
+                entry = copy.copy(new_entries.get(image_name, known.get(image_name)))
+                entry.date_obs = params['date_obs']
+                entry.timestamp = now
+                for (key, default) in IMAGE_UPDATE_DEFAULTS.items():
+                    setattr(entry, key, params.get(key, default))
+                for key in IMAGE_UPDATE_OPTIONAL:
+                    if params.get(key) != None:
+                        setattr(entry, key, params[key])
+                response = 'Successfully updated image information in database'
+            else:
+                if field_name not in field_ids:
+                    outcomes.append( (False, 'Unknown field '+str(field_name)) )
+                    continue
+                entry_params = {'timestamp': now}
+                entry_params.update(params)
+                entry = Image(field_id=field_ids[field_name], **entry_params)
+                response = 'Successfully added image to database'
+
+            clean_record(entry)
+
+        except (KeyError, TypeError, ValueError, ValidationError) as err:
+            outcomes.append( (False, 'Invalid Image record: '+str(err)) )
+            continue
+
+        if entry.pk == None:
+            new_entries[image_name] = entry
+        else:
+            known[image_name] = entry
+            updated_entries[entry.pk] = entry
+
+        new_key = get_image_stats_key(entry.date_obs, entry.tel, entry.quality)
+        old_key = current_keys.get(image_name)
+        if old_key != None:
+            deltas[old_key] = deltas.get(old_key, 0) - 1
+        deltas[new_key] = deltas.get(new_key, 0) + 1
+        current_keys[image_name] = new_key
+
+        outcomes.append( (True, response) )
+
+    update_fields = [ f.name for f in Image._meta.concrete_fields
+                      if not f.primary_key and not f.is_relation ]
+
+    # Updated entries are saved one by one, which is much faster than
+    # bulk_update's CASE statements for this many columns
+    with transaction.atomic():
+        Image.objects.bulk_create(list(new_entries.values()))
+        for entry in updated_entries.values():
+            entry.save(update_fields=update_fields)
+        update_image_stats(deltas=deltas)
+
+    return outcomes
+
+def upsert_sub_requests_bulk(records):
+    """
+    Add a list of observing sub-requests to the database, updating those
+    already in it, as record_sub_obs_request does for a single subrequest.
+
+    Keyword arguments:
+    records -- Dictionaries with the keyword arguments of add_sub_request:
+               sr_id, grp_id, track_id, window_start, window_end, status
+               and optionally time_executed (list, required)
+
+    Returns a list of (successful, response) tuples, one per record.
+    """
+    grp_ids = set(ObsRequest.objects.filter(grp_id__in=[ r.get('grp_id') for r in records ]
+                                            ).values_list('grp_id', flat=True))
+    known = {}
+    for sr in SubObsRequest.objects.filter(sr_id__in=[ r.get('sr_id') for r in records ]
+                                           ).order_by('pk'):
+        known.setdefault(sr.sr_id, sr)
+
+    new_entries = {}
+    updated_entries = {}
+    outcomes = []
+    for record in records:
+        params = dict(record)
+        try:
+            if params.get('grp_id') not in grp_ids:
+                outcomes.append( (False, 'Unrecognised Obsrequest group ID') )
+                continue
+            sr_id = params['sr_id']
+
+            if sr_id in new_entries or sr_id in known:
+                entry = copy.copy(new_entries.get(sr_id, known.get(sr_id)))
+                entry.window_start = params['window_start']
+                entry.window_end = params['window_end']
+                entry.status = params['status']
+                if params.get('time_executed') != None:
+                    entry.time_executed = params['time_executed']
+                response = 'Subrequest updated'
+            else:
+                entry = SubObsRequest(sr_id=sr_id, grp_id=params['grp_id'],
+                                      track_id=params['track_id'],
+                                      window_start=params['window_start'],
+                                      window_end=params['window_end'],
+                                      status=params['status'],
+                                      time_executed=params.get('time_executed'))
+                response = 'Subrequest added'
+
+            clean_record(entry)
+
+        except (KeyError, TypeError, ValueError, ValidationError) as err:
+            outcomes.append( (False, 'Invalid SubObsRequest record: '+str(err)) )
+            continue
+
+        if entry.pk == None:
+            new_entries[sr_id] = entry
+        else:
+            known[sr_id] = entry
+            updated_entries[entry.pk] = entry
+        outcomes.append( (True, response) )
+
+    with transaction.atomic():
+        SubObsRequest.objects.bulk_create(list(new_entries.values()))
+        for entry in updated_entries.values():
+            entry.save(update_fields=['window_start', 'window_end',
+                                      'status', 'time_executed',
+                                      'last_modified'])
+
+    return outcomes
+
+def expire_old_obs_bulk(log=None):
+    """Function to identify observations in the DB which have exceeded their
+    expiry date and set their status to 'EX' with a single UPDATE.
+    Returns the list of group IDs of the observations expired."""
+
+    if log!=None:
+        log.info('Expiring active observations that have exceeded their expiry date')
+
+    expired = list(query_db.get_old_active_obs().values_list('pk','grp_id','time_expire'))
+    if log!=None:
+        log.info(' -> Found '+str(len(expired)))
+
+    with transaction.atomic():
+        ObsRequest.objects.filter(pk__in=[ obs[0] for obs in expired ]).update(request_status='EX')
+
+    if log!=None:
+        for (pk, grp_id, time_expire) in expired:
+            log.info(' -> Expired '+grp_id+' expiry date='+\
+                    time_expire.strftime('%Y-%m-%dT%H:%M:%S'))
+
+    return [ obs[1] for obs in expired ]
+
 ###################################################################################
 def run_test2():
     from astropy.time import Time
@@ -54,6 +54,8 @@ def update_subrequest_status(look_back_days=1.0):
     
     log.info('Returned data for '+str(len(active_obs))+' observation(s)')
     
+    records = []
+    
     for grp_id, obs_dict in active_obs.items():
         
         obs = obs_dict['obsrequest']
@@ -76,10 +78,16 @@ def update_subrequest_status(look_back_days=1.0):
             
             log.info(repr(params))
             
-            message = api_tools.submit_sub_obs_request_record(config,params,
-                                                              testing=config['testing'])
-            
-            log.info(' --> Subrequest '+str(sr.sr_id)+': '+message)
+            records.append(params)
+    
+    # Subrequests are submitted in batches of db_batch_size, each written
+    # by the database in one transaction
+    results = api_tools.submit_sub_obs_request_records(config,records,
+                                                       testing=config['testing'])
+    
+    for params, (update_ok, message) in zip(records, results):
+        
+        log.info(' --> Subrequest '+str(params['sr_id'])+': '+message)
 
     log_utilities.end_day_log( log )
   
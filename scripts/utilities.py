@@ -27,12 +27,13 @@ from astropy import constants
 def short_to_long_name(short_name):
     '''Function to convert the name of a microlensing event in short-hand format to long-hand format.
     Input: Microlensing name string in short-hand format, e.g. OB150001
+           as used by ARTEMiS for OGLE (OB), MOA (KB) and KMTNet (KM) events
     Output: Long-hand name format, e.g. OGLE-2015-BLG-0001
            If an incompatible or long-hand name string is given, the same string is returned.
     '''
 
     # Definitions:
-    survey_codes = { 'OB': 'OGLE', 'KB': 'MOA' }
+    survey_codes = { 'OB': 'OGLE', 'KB': 'MOA', 'KM': 'KMT' }
 
     # Split the string into its components:
     survey = short_name[0:2]
@@ -40,7 +41,7 @@ def short_to_long_name(short_name):
     number = short_name[4:]
 
     # Interpret each component of the name string:
-    if survey in survey_codes.keys():
+    if survey in survey_codes.keys() and year.isdigit() and number.isdigit():
         survey = survey_codes[survey]
         year = '20' + year
         while len(number) < 4: number = '0' + number
@@ -207,6 +208,23 @@ def sex2decdeg(ra_str,dec_str):
 
     return (ra_deg, dec_deg)
 
+def coords_to_degrees(ra, dec):
+    '''Function to convert an RA and Dec given either in sexigesimal format
+    (e.g. "17:54:33.58", "-30:31:02.02") or in decimal degrees to decimal
+    degrees.  Unlike sex2decdeg, raises ValueError for coordinates which
+    cannot be read.'''
+
+    if ':' not in str(ra):
+        return float(ra), float(dec)
+
+    for coord in (str(ra), str(dec)):
+        fields = coord.strip().lstrip('+-').replace(' ',':').split(':')
+        if len(fields) != 3:
+            raise ValueError('Unrecognised sexigesimal coordinate '+coord)
+        [ float(f) for f in fields ]
+
+    return sex2decdeg(str(ra).strip(), str(dec).strip())
+
 def decdeg2sex(ra_deg,dec_deg):
     """Function to convert RA and Dec in decimal degrees to sexigesimal format"""
 